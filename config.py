@@ -99,8 +99,80 @@ class TradingConfig:
     
     # Paramètres de timing
     SCAN_INTERVAL: int = 40  # Scan plus fréquent pour capital élevé
+    POSITION_MANAGEMENT_INTERVAL_SECONDS: float = 5.0  # Gestion des positions (tâche indépendante du scan)
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 300.0  # Enregistrement des métriques temps réel
+    CONSISTENCY_CHECK_INTERVAL_SECONDS: float = 1500.0  # Cohérence positions / soldes Binance
+    DUST_CLEANUP_INTERVAL_SECONDS: float = 3000.0  # Conversion des miettes en BNB
     TIMEFRAME: str = "1MINUTE"  # Timeframe des bougies
     
+    # Paramètres du client API Binance (session asynchrone partagée)
+    API_REQUEST_TIMEOUT_SECONDS: float = 10.0  # Timeout par requête REST
+    API_MAX_CONNECTIONS: int = 20  # Taille du pool de connexions keep-alive
+    API_MAX_CONCURRENT_REQUESTS: int = 10  # Requêtes simultanées maximum
+    PRICE_SNAPSHOT_TTL_SECONDS: float = 2.0  # Durée de validité du snapshot des prix (un rafraîchissement par tick)
+    ACCOUNT_RECONCILE_INTERVAL_SECONDS: float = 300.0  # Rechargement complet des soldes (get_account) entre deux deltas
+    
+    # Limitation au poids API Binance (ordres prioritaires sur le scan)
+    API_WEIGHT_LIMIT_PER_MINUTE: int = 6000  # Limite REQUEST_WEIGHT Binance (par IP et par minute)
+    API_WEIGHT_RESERVE_RATIO: float = 0.2  # Part du poids que le scan ne peut pas consommer (ordres)
+    SCAN_MIN_WEIGHT_HEADROOM: int = 200  # Marge de poids minimale pour lancer un scan
+    
+    # Paramètres du scan concurrent des paires
+    SCAN_MAX_CONCURRENCY: int = 8  # Paires traitées simultanément pendant un scan
+    SCAN_WEIGHT_BUDGET: int = 1200  # Poids API Binance maximum consommé par scan
+    KLINES_REQUEST_WEIGHT: int = 2  # Poids Binance d'une requête klines
+    KLINE_BUNDLE_MAX_AGE_SECONDS: float = 60.0  # Durée de réutilisation des bougies d'une paire hors scan
+    SCAN_BATCH_ANALYSIS: bool = True  # Analyse technique groupée des candidats (matrice paires x bougies)
+    
+    # Filtres de trading Binance par paire (exchangeInfo)
+    SYMBOL_FILTERS_REFRESH_SECONDS: float = 3600.0  # Rafraîchissement de la table des filtres (exchangeInfo)
+    
+    # Gabarits d'ordres pré-calculés (envoi sans calcul sur le chemin critique)
+    ORDER_TEMPLATE_TOLERANCE_PERCENT: float = 0.2  # Dérive max prix / taille pour réutiliser un gabarit d'ordre
+    ORDER_TEMPLATE_TTL_SECONDS: float = 60.0  # Durée de validité d'un gabarit d'ordre
+    
+    # Mise à jour des stops Binance (cancelReplace)
+    STOP_REPLACE_MIN_INTERVAL_SECONDS: float = 1.0  # Intervalle min entre deux cancelReplace d'un même stop
+    
+    # Base SQLite locale (écritures regroupées par un thread dédié)
+    DATABASE_WRITE_QUEUE_SIZE: int = 10000  # Écritures SQLite en attente max (au-delà: métriques abandonnées)
+    DATABASE_WRITE_BATCH_SIZE: int = 500  # Lignes max par transaction du thread d'écriture
+    DATABASE_FLUSH_INTERVAL_SECONDS: float = 0.5  # Fenêtre de regroupement des écritures en une transaction
+    
+    # Archive des données de marché (MarketRecorder)
+    MARKET_RECORDER_ENABLED: bool = True  # Archive des bougies 1m, bookTickers et tickers 24h (data/market)
+    MARKET_RECORDER_DIR: str = "data/market"  # Racine de l'archive partitionnée par type / date / paire
+    MARKET_RECORDER_BUFFER_ROWS: int = 20000  # Lignes en mémoire avant écriture anticipée
+    MARKET_RECORDER_FLUSH_SECONDS: float = 300.0  # Écriture périodique des lignes en mémoire
+    
+    # Backtest sur l'archive de marché
+    BACKTEST_INITIAL_CAPITAL_USDC: float = 10000.0  # Capital USDC de départ du backtest
+    BACKTEST_FEE_PERCENT: float = 0.1  # Frais Binance par ordre (taker, sans BNB)
+    BACKTEST_SLIPPAGE_PERCENT: float = 0.02  # Glissement des ordres au marché simulés
+    BACKTEST_SPREAD_PERCENT: float = 0.02  # Spread supposé (pré-filtre + demi-spread payé à chaque ordre)
+    
+    # Balayage de paramètres (backtests parallèles)
+    BACKTEST_SWEEP_WORKERS: int = 0  # Processus du balayage de paramètres (0 = tous les cœurs)
+    
+    # Optimisation walk-forward
+    WALK_FORWARD_TRAIN_DAYS: int = 14  # Fenêtre d'optimisation (in-sample) du walk-forward
+    WALK_FORWARD_TEST_DAYS: int = 7  # Fenêtre d'évaluation suivante (out-of-sample), pas entre deux plis
+    
+    # Bougies temps réel via WebSocket (CandleStore)
+    CANDLE_STREAM_ENABLED: bool = True  # Streams kline pour les paires actives (fallback REST sinon)
+    CANDLE_STREAM_URL: str = "wss://stream.binance.com:9443"  # Endpoint des streams combinés
+    CANDLE_BUFFER_SIZE: int = 200  # Bougies conservées par paire et par intervalle
+    USER_STREAM_ENABLED: bool = True  # Exécutions d'ordres et soldes via le user-data stream (polling REST sinon)
+    USER_STREAM_URL: str = "wss://stream.binance.com:9443"  # Endpoint du user-data stream (/ws/<listenKey>)
+    USER_STREAM_KEEPALIVE_SECONDS: float = 1800.0  # Prolongation de la listenKey (expire après 60 min)
+    POSITION_ENGINE_ENABLED: bool = True  # SL / trailing / TP évalués à chaque tick bookTicker (polling 5s sinon)
+    POSITION_ENGINE_STALE_SECONDS: float = 30.0  # Sans tick depuis ce délai, la boucle principale reprend les règles de prix
+    VOLATILITY_WINDOW_HOURS: int = 12  # Fenêtre glissante de la volatilité (bougies 1h clôturées)
+    
+    # Cache partagé des indicateurs techniques
+    INDICATOR_CACHE_SIZE: int = 4096  # Entrées LRU (paire, timeframe, bougie, paramètres)
+    STREAMING_INDICATORS_ENABLED: bool = True  # EMA/RSI/MACD/BB/ATR incrémentaux par paire (sinon talib sur la fenêtre)
+    
     # Paramètres techniques
     EMA_FAST_PERIOD: int = 9
     EMA_SLOW_PERIOD: int = 21
@@ -12,17 +12,15 @@ import uuid
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 # Trading & APIs
 import ccxt
 import gspread
 import numpy as np
-import pandas as pd
-import talib
 # Notifications & Logging
 import telegram
-from binance.client import Client
+from binance.client import AsyncClient
 from binance.enums import (ORDER_TYPE_LIMIT, ORDER_TYPE_MARKET, SIDE_BUY, SIDE_SELL,
                            TIME_IN_FORCE_GTC)
 from binance.exceptions import BinanceAPIException, BinanceOrderException
@@ -33,9 +31,18 @@ from telegram import Bot
 from config import API_CONFIG, BLACKLISTED_PAIRS, TradingConfig
 from trading_hours import (get_current_trading_session, get_hours_status_message,
                            get_trading_intensity, is_trading_hours_active)
+from utils.account_state import AccountState
+from utils.candle_store import CandleStore
+from utils.capital_valuation import CapitalValuator
 from utils.database import TradingDatabase
 from utils.enhanced_sheets_logger import EnhancedSheetsLogger
+from utils.exchange_gateway import ExchangeGateway
 from utils.firebase_logger import firebase_logger  # type: ignore
+from utils.indicator_cache import IndicatorCache
+from utils.kline_bundle import KlineBundleCache, klines_to_arrays
+from utils.order_event_bus import OrderEventBus, OrderState
+from utils.order_templates import OrderTemplateBook
+from utils.position_engine import DECISION_STOP_LOSS, DECISION_TRAILING, PositionEngine
 
 
 # === TRADE VALIDATOR INTEGRATION ===
@@ -149,10 +156,23 @@ class TradeValidator:
 trade_validator = TradeValidator(max_loss_threshold=100, max_loss_percentage=0.02)
 
 from utils.logger import setup_logger
+from utils.market_recorder import MarketRecorder
+from utils.price_snapshot import PriceSnapshot
 from utils.risk_manager import RiskManager
-from utils.technical_indicators import TechnicalAnalyzer
+from utils.stop_order_updater import StopOrderUpdater
+from utils.symbol_filters import SymbolFilterTable
+from utils.task_scheduler import (PRIORITY_CONSISTENCY, PRIORITY_MAINTENANCE, PRIORITY_METRICS,
+                                  PRIORITY_POSITIONS, PRIORITY_SCAN, TaskScheduler)
+from utils.technical_indicators import MarketAnalysis, TechnicalAnalyzer
 from utils.telegram_notifier import TelegramNotifier
+from utils.ticker_prefilter import (REJECT_DYNAMIC_BLACKLIST, REJECT_HIGH_SPREAD, REJECT_LOW_VOLUME,
+                                    REJECT_NONE, REJECT_STATIC_BLACKLIST, apply_prefilter,
+                                    parse_ticker_snapshot)
 from utils.trading_hours_notifier import TradingHoursNotifier  # type: ignore
+from utils.trading_rules import (breakout_threshold, loss_pause_end, momentum_exit_reason,
+                                 momentum_exit_window, pair_score, position_size, record_trade_result,
+                                 timeout_reason, trades_last_hour, trailing_levels)
+from utils.volatility_service import VolatilityService
 
 
 class TradeDirection(Enum):
@@ -186,6 +206,7 @@ class Trade:
     db_id: Optional[int] = None
     stop_loss_order_id: Optional[str] = None  # AJOUTÉ: ID ordre stop loss automatique
     take_profit_order_id: Optional[str] = None  # AJOUTÉ: ID ordre take profit automatique
+    oco_order_list_id: Optional[str] = None  # ID de la liste OCO portant le stop loss (cancelReplace impossible)
     trailing_stop_order_id: Optional[str] = None  # AJOUTÉ: ID ordre trailing stop automatique
     last_trailing_update: Optional[datetime] = None  # AJOUTÉ: Dernière mise à jour trailing
 
@@ -198,21 +219,100 @@ class PairScore:
     spread: float
     atr: float = 0.0
 
+@dataclass
+class ScanWeightBudget:
+    """Budget de poids API Binance consommable pendant un scan"""
+    limit: int
+    used: int = 0
+    
+    def consume(self, weight: int) -> bool:
+        """Réserve un poids de requête, False si le budget serait dépassé"""
+        if self.used + weight > self.limit:
+            return False
+        self.used += weight
+        return True
+
 class ScalpingBot:
     def __init__(self):
         self.logger = setup_logger("ScalpingBot")
         self.config = TradingConfig()
         
         # Initialize APIs
-        self.binance_client = Client(
+        self.exchange = ExchangeGateway(
             API_CONFIG.BINANCE_API_KEY,
             API_CONFIG.BINANCE_SECRET_KEY,
-            testnet=API_CONFIG.TESTNET
+            testnet=API_CONFIG.TESTNET,
+            max_connections=self.config.API_MAX_CONNECTIONS,
+            max_concurrent_requests=self.config.API_MAX_CONCURRENT_REQUESTS,
+            default_timeout=self.config.API_REQUEST_TIMEOUT_SECONDS,
+            weight_per_minute=self.config.API_WEIGHT_LIMIT_PER_MINUTE,
+            weight_reserve_ratio=self.config.API_WEIGHT_RESERVE_RATIO
+        )
+        
+        # Prix de toutes les paires en une requête, servis depuis la mémoire pendant un tick
+        self.prices = PriceSnapshot(self.exchange, ttl_seconds=self.config.PRICE_SNAPSHOT_TTL_SECONDS)
+        
+        # Soldes du compte en mémoire (deltas des ordres + réconciliation périodique)
+        self.account = AccountState(
+            self.exchange,
+            reconcile_interval_seconds=self.config.ACCOUNT_RECONCILE_INTERVAL_SECONDS
+        )
+        self.exchange.add_order_listener(self.account.on_order_response)
+        self.capital_valuator = CapitalValuator(self.account, self.prices, quote_asset='USDC')
+        
+        # Filtres de trading de toutes les paires (tick, pas, notionnel min) servis depuis la mémoire
+        self.symbol_filters = SymbolFilterTable(self.exchange)
+        
+        # Gabarits d'ordres pré-calculés pour les paires candidates et latences signal -> ordre
+        self.order_templates = OrderTemplateBook(
+            self.symbol_filters,
+            stop_loss_percent=self.config.STOP_LOSS_PERCENT,
+            take_profit_percent=self.config.TAKE_PROFIT_PERCENT,
+            trailing_activation_percent=self.config.TRAILING_ACTIVATION_PERCENT,
+            min_notional=self.config.MIN_POSITION_SIZE_USDC,
+            tolerance_percent=self.config.ORDER_TEMPLATE_TOLERANCE_PERCENT,
+            ttl_seconds=self.config.ORDER_TEMPLATE_TTL_SECONDS
+        )
+        
+        # Exécutions d'ordres et soldes poussés par le user-data stream
+        self.order_events = OrderEventBus(
+            self.exchange,
+            stream_url=self.config.USER_STREAM_URL,
+            keepalive_interval_seconds=self.config.USER_STREAM_KEEPALIVE_SECONDS
+        )
+        self.order_events.add_account_listener(self.account.on_user_event)
+        self.order_events.add_fill_listener(self.on_order_filled)
+        self.order_events.add_connect_listener(self.resync_automatic_orders)
+        self._automatic_closures: Set[str] = set()
+        self._closing: Set[str] = set()
+        
+        # Bougies temps réel des paires actives (streams kline WebSocket)
+        self.candle_store = CandleStore(
+            stream_url=self.config.CANDLE_STREAM_URL,
+            intervals=(getattr(AsyncClient, f'KLINE_INTERVAL_{self.config.TIMEFRAME}'), "1h"),
+            capacity=self.config.CANDLE_BUFFER_SIZE
+        )
+        
+        # Volatilité 12h incrémentale (alimentée par les bougies 1h du stream)
+        self.volatility_service = VolatilityService(window_hours=self.config.VOLATILITY_WINDOW_HOURS)
+        self.candle_store.add_listener(self.volatility_service.on_kline)
+        
+        # Bougies partagées par paire pour un cycle de scan
+        self.kline_bundles = KlineBundleCache(
+            self.exchange,
+            getattr(AsyncClient, f'KLINE_INTERVAL_{self.config.TIMEFRAME}'),
+            max_age_seconds=self.config.KLINE_BUNDLE_MAX_AGE_SECONDS,
+            candle_store=self.candle_store if self.config.CANDLE_STREAM_ENABLED else None
         )
         
         # Initialize utilities
         self.risk_manager = RiskManager(self.config)
-        self.technical_analyzer = TechnicalAnalyzer()
+        self.indicator_cache = IndicatorCache(max_entries=self.config.INDICATOR_CACHE_SIZE)
+        self.technical_analyzer = TechnicalAnalyzer(
+            indicator_cache=self.indicator_cache,
+            timeframe=getattr(AsyncClient, f'KLINE_INTERVAL_{self.config.TIMEFRAME}'),
+            streaming=self.config.STREAMING_INDICATORS_ENABLED
+        )
         self.telegram_notifier = TelegramNotifier(
             API_CONFIG.TELEGRAM_BOT_TOKEN, 
             API_CONFIG.TELEGRAM_CHAT_ID, 
@@ -253,6 +353,35 @@ class ScalpingBot:
         self.daily_trades = 0
         self.open_positions: Dict[str, Trade] = {}  # Une position par ID unique
         self.start_capital = 0.0
+        
+        # Règles SL / trailing / TP évaluées à chaque tick bookTicker des paires en position
+        self.position_engine = PositionEngine(
+            self.open_positions,
+            stream_url=self.config.CANDLE_STREAM_URL,
+            trailing_step_percent=self.config.TRAILING_STEP_PERCENT,
+            stale_after_seconds=self.config.POSITION_ENGINE_STALE_SECONDS
+        )
+        self.position_engine.set_decision_handler(self.on_position_decision)
+        
+        # Stops Binance déplacés par cancelReplace, demandes regroupées par position
+        self.stop_updater = StopOrderUpdater(
+            self.exchange,
+            self.symbol_filters,
+            self.open_positions,
+            create_stop=self.create_automatic_stop_loss,
+            min_interval_seconds=self.config.STOP_REPLACE_MIN_INTERVAL_SECONDS
+        )
+        
+        # Archive des données de marché vues par le bot (bougies 1m, bookTickers, tickers 24h)
+        self.market_recorder: Optional[MarketRecorder] = None
+        if self.config.MARKET_RECORDER_ENABLED:
+            self.market_recorder = MarketRecorder(
+                root=self.config.MARKET_RECORDER_DIR,
+                kline_interval=getattr(AsyncClient, f'KLINE_INTERVAL_{self.config.TIMEFRAME}'),
+                buffer_rows=self.config.MARKET_RECORDER_BUFFER_ROWS
+            )
+            self.candle_store.add_listener(self.market_recorder.on_kline)
+            self.position_engine.add_tick_listener(self.market_recorder.on_book_ticker)
         self.current_capital = 0.0
         
         # Anti-fragmentation tracking
@@ -267,10 +396,17 @@ class ScalpingBot:
         self.consecutive_loss_pause_until: Optional[datetime] = None  # Pause jusqu'à cette datetime
         
         # Base de données
-        self.database = TradingDatabase()
+        self.database = TradingDatabase(
+            queue_size=self.config.DATABASE_WRITE_QUEUE_SIZE,
+            batch_size=self.config.DATABASE_WRITE_BATCH_SIZE,
+            flush_interval_seconds=self.config.DATABASE_FLUSH_INTERVAL_SECONDS
+        )
+        
+        # Compteur de cycles de scan (vérification périodique de la volatilité du marché)
+        self.scan_cycles = 0
         
-        # Compteur pour métriques temps réel
-        self.metrics_counter = 0
+        # Tâches indépendantes: positions, scan, métriques, cohérence, miettes
+        self.scheduler = TaskScheduler(error_handler=self.on_task_error)
         
         self.logger.info("🚀 Bot de Trading Scalping initialisé")
 
@@ -278,6 +414,24 @@ class ScalpingBot:
         """Lance le bot de trading"""
         self.logger.info("🟢 [STARTING] Démarrage du bot...")
         
+        # Connexion de la passerelle Binance (session HTTP partagée)
+        await self.exchange.connect()
+        
+        # Filtres de trading chargés une fois (rafraîchis ensuite par l'ordonnanceur)
+        await self.symbol_filters.load()
+        
+        # Streams kline temps réel
+        if self.config.CANDLE_STREAM_ENABLED:
+            await self.candle_store.start()
+        
+        # User-data stream (exécutions SL/TP, soldes)
+        if self.config.USER_STREAM_ENABLED:
+            await self.order_events.start()
+        
+        # Moteur de positions événementiel (stream bookTicker)
+        if self.config.POSITION_ENGINE_ENABLED:
+            await self.position_engine.start()
+        
         # Initialisation de la base de données
         await self.database.initialize_database()
         
@@ -311,9 +465,31 @@ class ScalpingBot:
         self.logger.info("🟢 [RUNNING] Bot lancé avec succès")
         
         # Boucle principale
-        await self.main_loop()
+        try:
+            await self.main_loop()
+        finally:
+            await self.position_engine.stop()
+            await self.order_events.stop()
+            await self.candle_store.stop()
+            await self.exchange.close()
+            if self.market_recorder:
+                await self.market_recorder.flush()
+            await self.database.close()
+
+    async def stop(self):
+        """Arrête le bot et libère les connexions"""
+        self.is_running = False
+        self.scheduler.stop()
+        await self.position_engine.stop()
+        await self.order_events.stop()
+        await self.candle_store.stop()
+        await self.exchange.close()
+        if self.market_recorder:
+            await self.market_recorder.flush()
+        await self.database.close()
+        self.logger.info("🔴 [STOPPED] Bot arrêté")
 
-    def detect_phantom_positions(self) -> List[str]:
+    async def detect_phantom_positions(self) -> List[str]:
         """Détecte les positions fantômes (positions ouvertes sans solde correspondant)"""
         phantom_positions = []
         
@@ -321,7 +497,7 @@ class ScalpingBot:
             symbol = trade.pair
             try:
                 base_asset = symbol.replace('USDC', '')
-                available_balance = self.get_asset_balance(base_asset)
+                available_balance = await self.get_asset_balance(base_asset)
                 
                 # Position fantôme si solde pratiquement nul mais position ouverte
                 if available_balance < self.config.PHANTOM_POSITION_THRESHOLD and trade.size > 0.001:
@@ -337,7 +513,7 @@ class ScalpingBot:
     
     async def cleanup_phantom_positions(self):
         """Nettoie automatiquement les positions fantômes"""
-        phantom_positions = self.detect_phantom_positions()
+        phantom_positions = await self.detect_phantom_positions()
         
         if phantom_positions:
             self.logger.info(f"🧹 Nettoyage de {len(phantom_positions)} position(s) fantôme(s)")
@@ -346,8 +522,7 @@ class ScalpingBot:
                 try:
                     trade = self.open_positions[trade_id]
                     symbol = trade.pair
-                    ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-                    current_price = float(ticker['price'])
+                    current_price = await self.prices.get_price(symbol)
                     await self.close_position_virtually(trade_id, current_price, "PHANTOM_CLEANUP")
                     
                 except Exception as e:
@@ -382,6 +557,7 @@ class ScalpingBot:
                         # 🔥 NOUVEAUX CHAMPS pour ordres automatiques
                         'stop_loss_order_id': getattr(trade, 'stop_loss_order_id', None),
                         'take_profit_order_id': getattr(trade, 'take_profit_order_id', None),
+                        'oco_order_list_id': getattr(trade, 'oco_order_list_id', None),
                         'trailing_stop_order_id': getattr(trade, 'trailing_stop_order_id', None),
                         'last_trailing_update': getattr(trade, 'last_trailing_update', None).isoformat() if getattr(trade, 'last_trailing_update', None) is not None else None
                     }
@@ -429,7 +605,7 @@ class ScalpingBot:
                     
                     # Vérifier que le solde existe toujours sur Binance
                     base_asset = pair.replace('USDC', '')
-                    available_balance = self.get_asset_balance(base_asset)
+                    available_balance = await self.get_asset_balance(base_asset)
                     
                     # Seulement restaurer si on a encore le solde
                     if available_balance >= float(position_data['size']) * 0.95:  # Tolérance 5%
@@ -447,6 +623,7 @@ class ScalpingBot:
                             timestamp=datetime.fromisoformat(position_data['timestamp']),
                             stop_loss_order_id=position_data.get('stop_loss_order_id'),  # Restaurer l'ID ordre SL
                             take_profit_order_id=position_data.get('take_profit_order_id'),  # 🔥 NOUVEAU: Restaurer l'ID ordre TP
+                            oco_order_list_id=position_data.get('oco_order_list_id'),
                             trailing_stop_order_id=position_data.get('trailing_stop_order_id'),  # 🔥 NOUVEAU: Restaurer l'ID ordre trailing
                             last_trailing_update=datetime.fromisoformat(position_data['last_trailing_update']) if position_data.get('last_trailing_update') else None  # 🔥 NOUVEAU: Restaurer dernière mise à jour
                         )
@@ -502,14 +679,13 @@ class ScalpingBot:
     async def initialize_capital(self):
         """Initialise le capital à partir de l'API Binance (USDC + valeur crypto)"""
         try:
-            account_info = self.binance_client.get_account()
+            await self.account.reconcile(force=True)
+            balances = await self.account.get_free_balances()
             usdc_balance = 0.0
             crypto_value = 0.0
             significant_balances = []
             self.logger.info("💰 Soldes disponibles:")
-            for balance in account_info['balances']:
-                free_balance = float(balance['free'])
-                asset = balance['asset']
+            for asset, free_balance in balances.items():
                 if free_balance > 0:
                     if asset == 'USDC':
                         usdc_balance = free_balance
@@ -518,8 +694,7 @@ class ScalpingBot:
                         # Conversion en USDC pour le capital initial
                         try:
                             symbol = asset + 'USDC'
-                            ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-                            price_usdc = float(ticker['price'])
+                            price_usdc = await self.prices.get_price(symbol)
                             value_usdc = free_balance * price_usdc
                             crypto_value += value_usdc
                             significant_balances.append(f"{asset}: {free_balance:.8f} ({value_usdc:.2f} USDC)")
@@ -533,179 +708,245 @@ class ScalpingBot:
             self.start_capital = total_capital
             self.current_capital = total_capital
             self.logger.info(f"💰 Capital initial total: {self.start_capital:.2f} USDC (USDC: {usdc_balance:.2f}, Crypto: {crypto_value:.2f})")
-            self.logger.info(f"📊 Taille de position configurée: {self.config.BASE_POSITION_SIZE_PERCENT}% = {self.calculate_position_size():.2f} USDC")
+            position_size = await self.calculate_position_size()
+            self.logger.info(f"📊 Taille de position configurée: {self.config.BASE_POSITION_SIZE_PERCENT}% = {position_size:.2f} USDC")
         except Exception as e:
             self.logger.error(f"❌ Erreur initialisation capital: {e}")
             raise
 
     async def main_loop(self):
-        """Boucle principale du bot"""
-        while self.is_running:
-            try:
-                # Vérification et notification des changements d'horaires
-                await self.hours_notifier.check_and_notify_schedule_changes()
-                
-                # Vérification des horaires de trading
-                if not is_trading_hours_active(self.config):
-                    hours_status = get_hours_status_message(self.config)
-                    self.logger.info(f"⏰ {hours_status}")
-                    
-                    # 🔥 LOG FIREBASE: Statut hors horaires
-                    if self.firebase_logger:
-                        self.firebase_logger.log_message(
-                            level="INFO",
-                            message=hours_status,
-                            module="trading_hours",
-                            capital=self.get_total_capital(),
-                            additional_data={'trading_active': False, 'positions_open': len(self.open_positions)}
-                        )
-                    
-                    await asyncio.sleep(300)  # Attendre 5 minutes si hors horaires
-                    continue
-                
-                # Vérification des conditions d'arrêt quotidien
-                if self.should_stop_daily_trading():
-                    await self.handle_daily_stop()
-                    break
-                
-                # OPTIMISÉ: Vérification pause après pertes consécutives
-                if self.consecutive_loss_pause_until:
-                    now = datetime.now()
-                    if now < self.consecutive_loss_pause_until:
-                        remaining_minutes = (self.consecutive_loss_pause_until - now).total_seconds() / 60
-                        self.logger.info(f"⏸️ En pause de sécurité - Reprise dans {remaining_minutes:.0f} minutes")
-                        await asyncio.sleep(60)  # Vérifier toutes les minutes
-                        continue
-                    else:
-                        # Fin de pause - RÉINITIALISER COMPLÈTEMENT
-                        self.logger.info(f"✅ FIN DE PAUSE: Reprise du trading normal")
-                        self.consecutive_loss_pause_until = None
-                        
-                        # 🔥 RÉINITIALISATION COMPLÈTE DU COMPTEUR
-                        old_consecutive_losses = self.consecutive_losses
-                        self.consecutive_losses = 0
-                        self.last_trade_results = []  # Reset de l'historique des résultats
-                        
-                        self.logger.info(f"🔄 COMPTEURS RÉINITIALISÉS:")
-                        self.logger.info(f"   Pertes consécutives: {old_consecutive_losses} → {self.consecutive_losses}")
-                        self.logger.info(f"   Historique résultats: Reset complet")
-                        
-                        # Notification Telegram de reprise avec détails
-                        message = f"✅ REPRISE DU TRADING\n"
-                        message += f"Fin de la pause de sécurité\n"
-                        message += f"Compteurs réinitialisés: {old_consecutive_losses} → 0 pertes\n"
-                        message += f"Le bot reprend ses activités normalement"
-                        await self.telegram_notifier.send_message(message)
-                        
-                        # Firebase logging pour reprise
-                        if self.firebase_logger:
-                            self.firebase_logger.log_message(
-                                level="INFO",
-                                message=f"✅ REPRISE TRADING: Compteurs réinitialisés ({old_consecutive_losses} → 0)",
-                                module="risk_management",
-                                additional_data={
-                                    'old_consecutive_losses': old_consecutive_losses,
-                                    'new_consecutive_losses': 0,
-                                    'pause_completed': True,
-                                    'counters_reset': True
-                                }
-                            )
-                
-                # Affichage status horaires
-                hours_status = get_hours_status_message(self.config)
-                self.logger.info(f"⏰ {hours_status}")
-                
-                # Scan des paires USDC
-                top_pairs = await self.scan_usdc_pairs()
-                
-                # Recherche de signaux
-                for pair_info in top_pairs:
-                    if len(self.open_positions) >= self.config.MAX_OPEN_POSITIONS:
-                        break
-                    
-                    signal = await self.analyze_pair(pair_info.pair)
-                    if signal:
-                        await self.execute_trade(pair_info.pair, signal)
-                
-                # Gestion des positions ouvertes avec surveillance fréquente
-                if len(self.open_positions) > 0:
-                    # Surveillance rapide toutes les 5 secondes si positions ouvertes
-                    await self.manage_open_positions()
-                    
-                    # Surveillance intensive pour positions à risque
-                    await self.intensive_position_monitoring()
-                else:
-                    # Surveillance normale si pas de positions
-                    await self.manage_open_positions()
+        """Boucle principale du bot: tâches indépendantes (positions, scan, métriques, cohérence, miettes)"""
+        self.scheduler.add(
+            'positions', self.position_management_cycle,
+            interval_seconds=self.config.POSITION_MANAGEMENT_INTERVAL_SECONDS,
+            priority=PRIORITY_POSITIONS, locks=('positions',)
+        )
+        self.scheduler.add(
+            'scan', self.scan_cycle,
+            interval_seconds=self.config.SCAN_INTERVAL,
+            priority=PRIORITY_SCAN
+        )
+        self.scheduler.add(
+            'consistency', self.check_positions_consistency,
+            interval_seconds=self.config.CONSISTENCY_CHECK_INTERVAL_SECONDS,
+            priority=PRIORITY_CONSISTENCY, locks=('positions',),
+            initial_delay_seconds=self.config.CONSISTENCY_CHECK_INTERVAL_SECONDS
+        )
+        self.scheduler.add(
+            'dust', self.convert_dust_to_bnb_if_needed,
+            interval_seconds=self.config.DUST_CLEANUP_INTERVAL_SECONDS,
+            priority=PRIORITY_MAINTENANCE, locks=('positions',),
+            initial_delay_seconds=self.config.DUST_CLEANUP_INTERVAL_SECONDS
+        )
+        self.scheduler.add(
+            'symbol_filters', self.symbol_filters.load,
+            interval_seconds=self.config.SYMBOL_FILTERS_REFRESH_SECONDS,
+            priority=PRIORITY_MAINTENANCE,
+            initial_delay_seconds=self.config.SYMBOL_FILTERS_REFRESH_SECONDS
+        )
+        self.scheduler.add(
+            'metrics', self.metrics_cycle,
+            interval_seconds=self.config.METRICS_FLUSH_INTERVAL_SECONDS,
+            priority=PRIORITY_METRICS,
+            initial_delay_seconds=self.config.METRICS_FLUSH_INTERVAL_SECONDS
+        )
+        if self.market_recorder:
+            self.scheduler.add(
+                'market_recorder', self.market_recorder.flush,
+                interval_seconds=self.config.MARKET_RECORDER_FLUSH_SECONDS,
+                priority=PRIORITY_METRICS,
+                initial_delay_seconds=self.config.MARKET_RECORDER_FLUSH_SECONDS
+            )
+        
+        await self.scheduler.run()
+
+    def on_task_error(self, task_name: str, error: Exception):
+        """Erreur d'une tâche de l'ordonnanceur (la tâche reprend à sa prochaine échéance)"""
+        # Log Firebase pour erreurs critiques
+        if self.firebase_logger:
+            self.firebase_logger.log_message(
+                level="ERROR",
+                message=f"Erreur tâche {task_name}: {str(error)}",
+                module="main_loop",
+                additional_data={'error_type': type(error).__name__, 'task': task_name}
+            )
+
+    async def position_management_cycle(self):
+        """Tâche de gestion des positions: cadence propre, indépendante de la durée du scan"""
+        if not self.open_positions:
+            return
+        
+        await self.manage_open_positions()
+        
+        # Surveillance intensive pour positions à risque
+        await self.intensive_position_monitoring()
+
+    async def scan_cycle(self) -> Optional[float]:
+        """Tâche de scan: horaires, arrêt quotidien, pause de sécurité, scan et ouverture des positions
+
+        Retourne un délai (s) quand le prochain scan doit être repoussé (hors horaires, pause).
+        """
+        # Vérification et notification des changements d'horaires
+        await self.hours_notifier.check_and_notify_schedule_changes()
+        
+        # Vérification des horaires de trading
+        if not is_trading_hours_active(self.config):
+            hours_status = get_hours_status_message(self.config)
+            self.logger.info(f"⏰ {hours_status}")
+            
+            # 🔥 LOG FIREBASE: Statut hors horaires
+            if self.firebase_logger:
+                self.firebase_logger.log_message(
+                    level="INFO",
+                    message=hours_status,
+                    module="trading_hours",
+                    capital=await self.get_total_capital(),
+                    additional_data={'trading_active': False, 'positions_open': len(self.open_positions)}
+                )
+            
+            return 300  # Attendre 5 minutes si hors horaires
+        
+        # Vérification des conditions d'arrêt quotidien
+        if await self.should_stop_daily_trading():
+            async with self.scheduler.locked('positions', priority=PRIORITY_POSITIONS):
+                await self.handle_daily_stop()
+            self.is_running = False
+            self.scheduler.stop()
+            return None
+        
+        # OPTIMISÉ: Vérification pause après pertes consécutives
+        if self.consecutive_loss_pause_until:
+            now = datetime.now()
+            if now < self.consecutive_loss_pause_until:
+                remaining_minutes = (self.consecutive_loss_pause_until - now).total_seconds() / 60
+                self.logger.info(f"⏸️ En pause de sécurité - Reprise dans {remaining_minutes:.0f} minutes")
+                return 60  # Vérifier toutes les minutes
+            else:
+                # Fin de pause - RÉINITIALISER COMPLÈTEMENT
+                self.logger.info(f"✅ FIN DE PAUSE: Reprise du trading normal")
+                self.consecutive_loss_pause_until = None
                 
-                # Enregistrement périodique des métriques (toutes les 10 itérations)
-                self.metrics_counter += 1
-                if self.metrics_counter % 10 == 0:
-                    await self.save_realtime_metrics()
-                    
-                    # Log Firebase pour métriques temps réel
-                    if self.firebase_logger:
-                        try:
-                            total_capital = self.get_total_capital()
-                            
-                            # Log métriques importantes avec log_metric
-                            self.firebase_logger.log_metric("total_capital", total_capital)
-                            self.firebase_logger.log_metric("daily_pnl", self.daily_pnl)
-                            self.firebase_logger.log_metric("open_positions", len(self.open_positions))
-                            self.firebase_logger.log_metric("daily_trades", self.daily_trades)
-                            
-                        except Exception as e:
-                            self.logger.error(f"❌ Erreur Firebase metrics: {e}")
+                # 🔥 RÉINITIALISATION COMPLÈTE DU COMPTEUR
+                old_consecutive_losses = self.consecutive_losses
+                self.consecutive_losses = 0
+                self.last_trade_results = []  # Reset de l'historique des résultats
                 
-                # Vérification de cohérence des positions (toutes les 50 itérations)
-                if self.metrics_counter % 50 == 0:
-                    await self.check_positions_consistency()
+                self.logger.info(f"🔄 COMPTEURS RÉINITIALISÉS:")
+                self.logger.info(f"   Pertes consécutives: {old_consecutive_losses} → {self.consecutive_losses}")
+                self.logger.info(f"   Historique résultats: Reset complet")
                 
-                # 🧹 Nettoyage automatique des miettes (toutes les 100 itérations)
-                if self.metrics_counter % 100 == 0:
-                    await self.convert_dust_to_bnb_if_needed()
+                # Notification Telegram de reprise avec détails
+                message = f"✅ REPRISE DU TRADING\n"
+                message += f"Fin de la pause de sécurité\n"
+                message += f"Compteurs réinitialisés: {old_consecutive_losses} → 0 pertes\n"
+                message += f"Le bot reprend ses activités normalement"
+                await self.telegram_notifier.send_message(message)
                 
-                # Vérification de la volatilité du marché (toutes les 30 itérations)
-                if self.metrics_counter % 30 == 0:
-                    await self.check_market_volatility(top_pairs)
+                # Firebase logging pour reprise
+                if self.firebase_logger:
+                    self.firebase_logger.log_message(
+                        level="INFO",
+                        message=f"✅ REPRISE TRADING: Compteurs réinitialisés ({old_consecutive_losses} → 0)",
+                        module="risk_management",
+                        additional_data={
+                            'old_consecutive_losses': old_consecutive_losses,
+                            'new_consecutive_losses': 0,
+                            'pause_completed': True,
+                            'counters_reset': True
+                        }
+                    )
+        
+        # Affichage status horaires
+        hours_status = get_hours_status_message(self.config)
+        self.logger.info(f"⏰ {hours_status}")
+        
+        # Scan des paires USDC
+        top_pairs = await self.scan_usdc_pairs()
+        
+        # Gabarits d'ordres des candidates, prêts avant l'arrivée d'un signal
+        await self.prepare_order_templates(top_pairs)
+        
+        # Recherche de signaux
+        for pair_info in top_pairs:
+            if len(self.open_positions) >= self.config.MAX_OPEN_POSITIONS:
+                break
+            
+            signal = await self.analyze_pair(pair_info.pair)
+            if signal:
+                signal_at = time.perf_counter()
+                # Ouverture sous verrou: pas de gestion ni de contrôle de cohérence pendant l'ordre
+                async with self.scheduler.locked('positions', priority=PRIORITY_SCAN):
+                    await self.execute_trade(pair_info.pair, signal, signal_at=signal_at)
+        
+        # Abonnements bookTicker du moteur de positions (nouvelles positions / positions fermées)
+        await self.position_engine.sync_subscriptions()
+        
+        # Vérification de la volatilité du marché (tous les 30 scans)
+        self.scan_cycles += 1
+        if self.scan_cycles % 30 == 0:
+            await self.check_market_volatility(top_pairs)
+        
+        return None
+
+    async def prepare_order_templates(self, top_pairs: List[PairScore]):
+        """Pré-calcule quantité, niveaux SL/TP et paramètres d'entrée des paires candidates"""
+        if len(self.open_positions) >= self.config.MAX_OPEN_POSITIONS:
+            return
+        try:
+            prices = await self.prices.get_prices()
+            for pair_info in top_pairs:
+                price = prices.get(pair_info.pair)
+                if price is None:
+                    continue
+                volatility = await self.calculate_volatility_1h(pair_info.pair)
+                position_size = await self.calculate_position_size(pair_info.pair, volatility, verbose=False)
+                self.order_templates.prepare(pair_info.pair, price, position_size)
+        except Exception as e:
+            self.logger.error(f"❌ Erreur préparation des gabarits d'ordres: {e}")
+
+    async def metrics_cycle(self):
+        """Tâche d'enregistrement des métriques temps réel"""
+        await self.save_realtime_metrics()
+        self.log_position_engine_latency()
+        self.log_order_latency()
+        self.logger.debug(f"🗓️ Tâches: {self.scheduler.report()}")
+        
+        # Log Firebase pour métriques temps réel
+        if self.firebase_logger:
+            try:
+                total_capital = await self.get_total_capital()
                 
-                # Pause avant le prochain scan
-                if len(self.open_positions) > 0:
-                    # Scan plus fréquent avec positions ouvertes (5s au lieu de 60s)
-                    await asyncio.sleep(5)
-                else:
-                    # Scan normal sans positions
-                    await asyncio.sleep(self.config.SCAN_INTERVAL)
+                # Log métriques importantes avec log_metric
+                self.firebase_logger.log_metric("total_capital", total_capital)
+                self.firebase_logger.log_metric("daily_pnl", self.daily_pnl)
+                self.firebase_logger.log_metric("open_positions", len(self.open_positions))
+                self.firebase_logger.log_metric("daily_trades", self.daily_trades)
                 
             except Exception as e:
-                self.logger.error(f"❌ Erreur dans la boucle principale: {e}")
-                
-                # Log Firebase pour erreurs critiques
-                if self.firebase_logger:
-                    try:
-                        self.firebase_logger.log_message(
-                            level="ERROR",
-                            message=f"Erreur boucle principale: {str(e)}",
-                            module="main_loop",
-                            additional_data={'error_type': type(e).__name__}
-                        )
-                    except Exception:
-                        pass  # Éviter les boucles d'erreur
-                
-                await asyncio.sleep(5)
+                self.logger.error(f"❌ Erreur Firebase metrics: {e}")
 
     async def scan_usdc_pairs(self) -> List[PairScore]:
         """Scanne et classe les paires USDC par score avec logging détaillé des décisions pour Firebase"""
         try:
             self.logger.info("🔎 Scan des paires USDC en cours...")
+            scan_start = time.perf_counter()
+            
+            # Nouveau cycle: les bougies de chaque paire seront téléchargées une seule fois
+            self.kline_bundles.clear()
+            
+            # Poids API insuffisant (proche de la limite ou 429/418): scan reporté, ordres préservés
+            headroom = self.exchange.weight_headroom()
+            if headroom < self.config.SCAN_MIN_WEIGHT_HEADROOM:
+                self.logger.warning(f"⚠️ Scan reporté: marge de poids API insuffisante ({headroom})")
+                return []
+            
+            # Parallélisme borné et budget de poids API pour ce scan
+            semaphore = asyncio.Semaphore(self.config.SCAN_MAX_CONCURRENCY)
             
             # Récupération des tickers avec gestion d'erreur améliorée
             try:
                 # Essayer d'abord get_ticker() standard
-                tickers = self.binance_client.get_ticker()
-                if not tickers:
-                    # Fallback sur 24hr ticker statistics
-                    tickers = self.binance_client.get_24hr_ticker()
+                tickers = await self.exchange.get_ticker()
                 
                 usdc_pairs = [t for t in tickers if t['symbol'].endswith('USDC')]
                 
@@ -715,6 +956,9 @@ class ScalpingBot:
                     
                 self.logger.info(f"📊 {len(usdc_pairs)} paires USDC trouvées")
                 
+                # Budget borné par la marge réelle de poids (les paires hors budget sont ignorées)
+                budget = ScanWeightBudget(limit=min(self.config.SCAN_WEIGHT_BUDGET, self.exchange.weight_headroom()))
+                
             except Exception as e:
                 self.logger.error(f"❌ Erreur récupération tickers: {e}")
                 return []
@@ -725,6 +969,7 @@ class ScalpingBot:
                 'low_volume': 0,
                 'high_spread': 0,
                 'low_volatility': 0,
+                'budget_exhausted': 0,
                 'total_retrieved': len(usdc_pairs),
                 'total_analyzed': 0  # Sera compté pendant l'analyse
             }
@@ -738,33 +983,61 @@ class ScalpingBot:
             # 📊 Liste pour stocker toutes les décisions détaillées
             detailed_decisions = []
             
-            for ticker in usdc_pairs:
-                try:
-                    symbol = ticker['symbol']
-                    
-                    # Gestion robuste des différentes clés de prix possibles
-                    current_price = None
-                    if 'lastPrice' in ticker:
-                        current_price = float(ticker['lastPrice'])
-                    elif 'price' in ticker:
-                        current_price = float(ticker['price'])
-                    elif 'close' in ticker:
-                        current_price = float(ticker['close'])
-                    else:
-                        self.logger.warning(f"⚠️ Prix non trouvé pour {symbol}, structure: {list(ticker.keys())}")
-                        continue
-                    
-                    # Gestion robuste des autres champs
-                    volume_usdc = float(ticker.get('quoteVolume', ticker.get('volume', 0)))
-                    bid = float(ticker.get('bidPrice', ticker.get('bid', current_price * 0.999)))
-                    ask = float(ticker.get('askPrice', ticker.get('ask', current_price * 1.001)))
-                    spread = (ask - bid) / bid * 100 if bid > 0 else 0
-                    price_change = abs(float(ticker.get('priceChangePercent', ticker.get('priceChange', 0))))
-                    volatility_1h = self.calculate_volatility_1h(symbol)
-                    
-                except Exception as e:
-                    self.logger.error(f"❌ Erreur parsing ticker {ticker.get('symbol', 'UNKNOWN')}: {e}")
-                    continue
+            # 📊 Snapshot des tickers parsé une seule fois en colonnes, puis pré-filtre vectorisé
+            # (blacklist, volume, spread) avant tout appel réseau
+            ticker_frame = parse_ticker_snapshot(usdc_pairs)
+            dropped = len(usdc_pairs) - len(ticker_frame)
+            if dropped:
+                self.logger.warning(f"⚠️ {dropped} tickers sans prix exploitable ignorés")
+            self.prices.update(dict(zip(ticker_frame['symbol'], ticker_frame['price'])))
+            if self.market_recorder:
+                self.market_recorder.record_tickers(ticker_frame)
+            
+            ticker_frame = apply_prefilter(
+                ticker_frame,
+                static_blacklist=BLACKLISTED_PAIRS,
+                dynamic_blacklist=getattr(self, 'dynamic_blacklist', set()),
+                min_volume=self.config.MIN_VOLUME_USDC,
+                max_spread=self.config.MAX_SPREAD_PERCENT
+            )
+            
+            symbols = ticker_frame['symbol'].tolist()
+            prices = ticker_frame['price'].tolist()
+            volumes = ticker_frame['volume'].tolist()
+            spreads = ticker_frame['spread'].tolist()
+            price_changes = ticker_frame['price_change'].tolist()
+            reject_reasons = ticker_frame['reject_reason'].tolist()
+            
+            # Prix courant = clôture provisoire de la bougie horaire en cours
+            for symbol, current_price in zip(symbols, prices):
+                self.volatility_service.update_price(symbol, current_price)
+            
+            # ⚡ Volatilité 12h des seules paires ayant passé le pré-filtre (concurrence et budget bornés)
+            prefiltered = [i for i, reason in enumerate(reject_reasons) if reason == REJECT_NONE]
+            volatilities = await asyncio.gather(*[
+                self.scan_volatility_1h(symbols[i], semaphore, budget)
+                for i in prefiltered
+            ])
+            volatility_by_symbol = {
+                symbols[i]: volatility for i, volatility in zip(prefiltered, volatilities)
+                if volatility is not None
+            }
+            
+            # Candidats retenus par les filtres de base, analysés ensuite en parallèle
+            candidates = []
+            
+            # Univers suivi en temps réel par le CandleStore (paires liquides + positions ouvertes)
+            stream_universe = {trade.pair for trade in self.open_positions.values()}
+            stream_universe.update(symbols[i] for i in prefiltered)
+            
+            for i, symbol in enumerate(symbols):
+                current_price, volume_usdc, spread, price_change = prices[i], volumes[i], spreads[i], price_changes[i]
+                reject_reason = reject_reasons[i]
+                
+                # Volatilité connue (lecture O(1)) même pour les paires rejetées avant le calcul
+                volatility_1h = volatility_by_symbol.get(symbol)
+                if volatility_1h is None:
+                    volatility_1h = self.volatility_service.get(symbol)
                 
                 # 📊 Structure détaillée de la décision
                 decision = {
@@ -780,48 +1053,53 @@ class ScalpingBot:
                         "blacklisted": symbol in BLACKLISTED_PAIRS,
                         "volume_ok": volume_usdc >= self.config.MIN_VOLUME_USDC,
                         "spread_ok": spread <= self.config.MAX_SPREAD_PERCENT,
-                        "volatility_ok": volatility_1h >= self.config.MIN_VOLATILITY_1H_PERCENT,
+                        "volatility_ok": (volatility_1h >= self.config.MIN_VOLATILITY_1H_PERCENT
+                                          if volatility_1h is not None else None),
                         "signal_score_ok": False,  # Sera vérifié plus tard
                         "breaking_high": False  # Sera vérifié plus tard
                     },
                     "final_decision": "PENDING",
                     "reason": ""
                 }
+                detailed_decisions.append(decision)
 
                 # Exclusion des paires blacklistées (statique + dynamique)
-                if symbol in BLACKLISTED_PAIRS:
+                if reject_reason == REJECT_STATIC_BLACKLIST:
                     exclusion_stats['blacklisted'] += 1
                     excluded_pairs['blacklisted'].append(symbol)
                     decision["final_decision"] = "REJECTED"
                     decision["reason"] = "Blacklisted pair (static)"
-                    detailed_decisions.append(decision)
                     continue
                 
                 # 🔥 NOUVEAU: Vérification blacklist dynamique (gaps excessifs)
-                if hasattr(self, 'dynamic_blacklist') and symbol in self.dynamic_blacklist:
+                if reject_reason == REJECT_DYNAMIC_BLACKLIST:
                     exclusion_stats['blacklisted'] += 1
                     excluded_pairs['blacklisted'].append(symbol)
                     decision["final_decision"] = "REJECTED"
                     decision["reason"] = f"Blacklisted pair (dynamic - excessive gaps)"
-                    detailed_decisions.append(decision)
                     continue
                 
                 # Vérification volume minimum
-                if volume_usdc < self.config.MIN_VOLUME_USDC:
+                if reject_reason == REJECT_LOW_VOLUME:
                     exclusion_stats['low_volume'] += 1
                     excluded_pairs['low_volume'].append(f"{symbol}({volume_usdc/1000000:.1f}M)")
                     decision["final_decision"] = "REJECTED"
                     decision["reason"] = f"Volume < {self.config.MIN_VOLUME_USDC/1000000:.0f}M ({volume_usdc/1000000:.1f}M)"
-                    detailed_decisions.append(decision)
                     continue
                 
                 # Vérification spread
-                if spread > self.config.MAX_SPREAD_PERCENT:
+                if reject_reason == REJECT_HIGH_SPREAD:
                     exclusion_stats['high_spread'] += 1
                     excluded_pairs['high_spread'].append(f"{symbol}({spread:.2f}%)")
                     decision["final_decision"] = "REJECTED"
                     decision["reason"] = f"Spread > {self.config.MAX_SPREAD_PERCENT}% ({spread:.2f}%)"
-                    detailed_decisions.append(decision)
+                    continue
+                
+                # Budget de poids API épuisé avant le calcul de volatilité
+                if symbol not in volatility_by_symbol:
+                    exclusion_stats['budget_exhausted'] += 1
+                    decision["final_decision"] = "REJECTED"
+                    decision["reason"] = "API weight budget exhausted"
                     continue
                 
                 # Vérification volatilité horaire
@@ -830,73 +1108,42 @@ class ScalpingBot:
                     excluded_pairs['low_volatility'].append(f"{symbol}({volatility_1h:.1f}%)")
                     decision["final_decision"] = "REJECTED"
                     decision["reason"] = f"Volatility 1h < {self.config.MIN_VOLATILITY_1H_PERCENT}% ({volatility_1h:.1f}%)"
-                    detailed_decisions.append(decision)
                     continue
                 
-                # ✅ Paire validée pour les critères de base - analyser les signaux
-                exclusion_stats['total_analyzed'] += 1  # Compteur des paires réellement analysées
+                # ✅ Paire validée pour les critères de base - analyse des signaux en parallèle
+                candidates.append((decision, symbol, current_price, volume_usdc, spread, price_change))
+            
+            if self.config.CANDLE_STREAM_ENABLED:
+                await self.candle_store.set_universe(stream_universe)
+            
+            # ⚡ Bougies des candidats en parallèle, puis analyse technique groupée (matrice paires x bougies)
+            candidate_candles = await asyncio.gather(*[
+                self.scan_candles(candidate[1], semaphore, budget)
+                for candidate in candidates
+            ], return_exceptions=True)
+            
+            analyses = {}
+            if self.config.SCAN_BATCH_ANALYSIS:
                 try:
-                    # Analyse technique pour calculer le score
-                    klines = self.binance_client.get_klines(
-                        symbol=symbol,
-                        interval=getattr(Client, f'KLINE_INTERVAL_{self.config.TIMEFRAME}'),
-                        limit=100
-                    )
-                    
-                    if len(klines) >= 50:
-                        df = pd.DataFrame(klines, columns=[
-                            'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                            'close_time', 'quote_volume', 'trades_count', 'taker_buy_base', 'taker_buy_quote', 'ignore'
-                        ])
-                        
-                        for col in ['open', 'high', 'low', 'close', 'volume']:
-                            df[col] = df[col].astype(float)
-                        
-                        analysis = self.technical_analyzer.analyze_pair(df, symbol)
-                        decision["signal_score"] = analysis.total_score
-                        decision["conditions"]["signal_score_ok"] = len(analysis.signals) >= self.config.MIN_SIGNAL_CONDITIONS
-                        
-                        # Vérification cassure si activée
-                        if self.config.ENABLE_BREAKOUT_CONFIRMATION:
-                            breaking_high = self.check_breakout_confirmation(symbol, current_price)
-                            decision["conditions"]["breaking_high"] = breaking_high
-                        else:
-                            decision["conditions"]["breaking_high"] = True
-                        
-                        # Décision finale
-                        if decision["conditions"]["signal_score_ok"] and decision["conditions"]["breaking_high"]:
-                            decision["final_decision"] = "VALIDATED"
-                            decision["reason"] = f"All filters passed ✅ (Score: {analysis.total_score:.1f}, Signals: {len(analysis.signals)})"
-                            
-                            # Ajouter à la liste des paires validées
-                            atr = await self.calculate_atr(symbol)
-                            score = (0.6 * price_change + 0.4 * (volume_usdc / 1000000))
-                            
-                            pair_scores.append(PairScore(
-                                pair=symbol,
-                                volatility=price_change,
-                                volume=volume_usdc,
-                                score=score,
-                                spread=spread,
-                                atr=atr
-                            ))
-                        else:
-                            decision["final_decision"] = "REJECTED"
-                            reasons = []
-                            if not decision["conditions"]["signal_score_ok"]:
-                                reasons.append(f"Signal score < {self.config.MIN_SIGNAL_CONDITIONS} ({len(analysis.signals)})")
-                            if not decision["conditions"]["breaking_high"]:
-                                reasons.append("Not breaking high")
-                            decision["reason"] = " & ".join(reasons)
-                    else:
-                        decision["final_decision"] = "REJECTED"
-                        decision["reason"] = "Insufficient klines data"
-                        
+                    analyses = self.technical_analyzer.analyze_batch_candles({
+                        candidate[1]: candles
+                        for candidate, candles in zip(candidates, candidate_candles)
+                        if isinstance(candles, dict) and len(candles['close']) >= 50
+                    })
                 except Exception as e:
-                    decision["final_decision"] = "REJECTED"
-                    decision["reason"] = f"Analysis error: {str(e)}"
-                
-                detailed_decisions.append(decision)
+                    self.logger.error(f"❌ Erreur analyse groupée des candidats: {e}")
+            
+            candidate_scores = await asyncio.gather(*[
+                self.analyze_scan_candidate(*candidate, candles, analyses.get(candidate[1]), semaphore)
+                for candidate, candles in zip(candidates, candidate_candles)
+            ])
+            for decision, scored in zip((c[0] for c in candidates), candidate_scores):
+                if decision["reason"] == "API weight budget exhausted":
+                    exclusion_stats['budget_exhausted'] += 1
+                else:
+                    exclusion_stats['total_analyzed'] += 1  # Compteur des paires réellement analysées
+                if scored:
+                    pair_scores.append(scored)
             
             # � LOGGING FIREBASE: Sauvegarder toutes les décisions détaillées
             if self.firebase_logger and detailed_decisions:
@@ -916,6 +1163,7 @@ class ScalpingBot:
                     rejected_count = sum(1 for d in detailed_decisions if d['final_decision'] == 'REJECTED')
                     
                     # Logger le résumé du scan
+                    scan_duration_ms = int((time.perf_counter() - scan_start) * 1000)
                     summary_data = {
                         'total_pairs': len(detailed_decisions),
                         'validated_pairs': validated_count,
@@ -927,7 +1175,8 @@ class ScalpingBot:
                             'min_volatility_1h': self.config.MIN_VOLATILITY_1H_PERCENT,
                             'min_signal_conditions': self.config.MIN_SIGNAL_CONDITIONS
                         },
-                        'scan_duration_ms': 0  # Peut être ajouté plus tard si besoin
+                        'scan_duration_ms': scan_duration_ms,
+                        'api_weight_used': budget.used
                     }
                     
                     self.firebase_logger.log_scan_summary(summary_data)
@@ -938,7 +1187,7 @@ class ScalpingBot:
                     self.logger.error(f"❌ Erreur logging Firebase décisions: {e}")
             
             # �📊 LOGGING DÉTAILLÉ DES EXCLUSIONS (conservé pour logs console)
-            self.logger.info(f"📊 Scan terminé - {exclusion_stats['total_retrieved']} paires récupérées, {exclusion_stats['total_analyzed']} analysées:")
+            self.logger.info(f"📊 Scan terminé en {(time.perf_counter() - scan_start):.1f}s - {exclusion_stats['total_retrieved']} paires récupérées, {exclusion_stats['total_analyzed']} analysées (poids API: {budget.used}/{budget.limit}):")
             self.logger.info(f"   ⚫ Blacklistées: {exclusion_stats['blacklisted']} paires")
             if excluded_pairs['blacklisted']:
                 self.logger.info(f"      {', '.join(excluded_pairs['blacklisted'][:5])}")
@@ -970,29 +1219,41 @@ class ScalpingBot:
                 
                 self.logger.info(f"🔄 Nouveaux critères: Volume >{min_vol_fallback/1000000:.0f}M, Volatilité >{min_volatility_fallback}%")
                 
-                for ticker in usdc_pairs:
-                    symbol = ticker['symbol']
-                    
-                    if symbol in BLACKLISTED_PAIRS:
-                        continue
-                    
-                    volume_usdc = float(ticker['quoteVolume'])
-                    if volume_usdc < min_vol_fallback:
+                # Pré-filtre vectorisé assoupli sur le snapshot déjà parsé
+                fallback_mask = (
+                    ~ticker_frame['symbol'].isin(BLACKLISTED_PAIRS)
+                    & (ticker_frame['volume'] >= min_vol_fallback)
+                    & (ticker_frame['spread'] <= self.config.MAX_SPREAD_PERCENT)
+                )
+                fallback_frame = ticker_frame[fallback_mask]
+                fallback_symbols = fallback_frame['symbol'].tolist()
+                
+                # ⚡ Volatilités (déjà connues pour la plupart: aucune requête supplémentaire)
+                fallback_volatilities = await asyncio.gather(*[
+                    self.scan_volatility_1h(symbol, semaphore, budget)
+                    for symbol in fallback_symbols
+                ])
+                
+                fallback_candidates = []
+                for symbol, volume_usdc, spread, price_change, volatility_1h in zip(
+                        fallback_symbols, fallback_frame['volume'], fallback_frame['spread'],
+                        fallback_frame['price_change'], fallback_volatilities):
+                    if volatility_1h is None or volatility_1h < min_volatility_fallback:
                         continue
                     
-                    bid = float(ticker['bidPrice'])
-                    ask = float(ticker['askPrice'])
-                    spread = (ask - bid) / bid * 100
-                    if spread > self.config.MAX_SPREAD_PERCENT:
-                        continue
+                    fallback_candidates.append((symbol, volume_usdc, spread, price_change))
+                
+                # ⚡ ATR des paires retenues en parallèle
+                fallback_atrs = await asyncio.gather(*[
+                    self.scan_atr(symbol, semaphore, budget)
+                    for symbol, *_ in fallback_candidates
+                ])
+                
+                for (symbol, volume_usdc, spread, price_change), atr in zip(fallback_candidates, fallback_atrs):
+                    if atr is None:
+                        continue  # Budget de poids API épuisé
                     
-                    price_change = abs(float(ticker['priceChangePercent']))
-                    volatility_1h = self.calculate_volatility_1h(symbol)
-                    if volatility_1h < min_volatility_fallback:
-                        continue
-                    
-                    atr = await self.calculate_atr(symbol)
-                    score = (0.6 * price_change + 0.4 * (volume_usdc / 1000000))
+                    score = pair_score(price_change, volume_usdc)
                     
                     pair_scores_fallback.append(PairScore(
                         pair=symbol,
@@ -1025,6 +1286,8 @@ class ScalpingBot:
                     additional_data={
                         'total_pairs_retrieved': exclusion_stats['total_retrieved'],
                         'total_pairs_analyzed': exclusion_stats['total_analyzed'],
+                        'scan_duration_ms': int((time.perf_counter() - scan_start) * 1000),
+                        'api_weight_used': budget.used,
                         'pairs_validated': len(pair_scores),
                         'top_pairs_selected': len(top_pairs),
                         'exclusions': exclusion_stats,
@@ -1044,23 +1307,121 @@ class ScalpingBot:
             self.logger.error(f"❌ Erreur lors du scan des paires: {e}")
             return []
 
+    async def scan_volatility_1h(self, symbol: str, semaphore: asyncio.Semaphore,
+                                 budget: ScanWeightBudget) -> Optional[float]:
+        """Volatilité 12h d'une paire pendant un scan (None si budget API épuisé)"""
+        bundle = self.kline_bundles.get(symbol)
+        if self.volatility_service.is_fresh(symbol) or bundle.has_hourly_klines:
+            weight = 0
+        else:
+            weight = self.config.KLINES_REQUEST_WEIGHT
+        if not budget.consume(weight):
+            return None
+        
+        async with semaphore:
+            return await self.calculate_volatility_1h(symbol)
+
+    async def scan_atr(self, symbol: str, semaphore: asyncio.Semaphore,
+                       budget: ScanWeightBudget) -> Optional[float]:
+        """ATR d'une paire pendant un scan (None si budget API épuisé)"""
+        bundle = self.kline_bundles.get(symbol)
+        weight = 0 if bundle.has_minute_klines else self.config.KLINES_REQUEST_WEIGHT
+        if not budget.consume(weight):
+            return None
+        
+        async with semaphore:
+            return await self.calculate_atr(symbol)
+
+    async def scan_candles(self, symbol: str, semaphore: asyncio.Semaphore,
+                           budget: ScanWeightBudget) -> Optional[Dict[str, np.ndarray]]:
+        """Bougies d'une paire candidate du scan (None si budget API épuisé)"""
+        # Une seule requête de bougies pour l'analyse, la cassure et l'ATR (bundle partagé)
+        bundle = self.kline_bundles.get(symbol)
+        weight = 0 if bundle.has_minute_klines else self.config.KLINES_REQUEST_WEIGHT
+        if not budget.consume(weight):
+            return None
+        
+        async with semaphore:
+            return await bundle.minute_arrays()
+
+    async def analyze_scan_candidate(self, decision: Dict, symbol: str, current_price: float,
+                                     volume_usdc: float, spread: float, price_change: float,
+                                     candles, analysis: Optional[MarketAnalysis],
+                                     semaphore: asyncio.Semaphore) -> Optional[PairScore]:
+        """Analyse technique d'une paire candidate du scan (met à jour sa décision détaillée)
+
+        candles: bougies de scan_candles (None si budget épuisé, exception si échec du téléchargement)
+        analysis: résultat de l'analyse groupée, sinon analyse individuelle
+        """
+        if candles is None:
+            decision["final_decision"] = "REJECTED"
+            decision["reason"] = "API weight budget exhausted"
+            return None
+        if isinstance(candles, Exception):
+            decision["final_decision"] = "REJECTED"
+            decision["reason"] = f"Analysis error: {str(candles)}"
+            return None
+        
+        async with semaphore:
+            try:
+                if len(candles['close']) < 50:
+                    decision["final_decision"] = "REJECTED"
+                    decision["reason"] = "Insufficient klines data"
+                    return None
+                
+                # Analyse technique pour calculer le score
+                if analysis is None:
+                    analysis = self.technical_analyzer.analyze_candles(candles, symbol)
+                decision["signal_score"] = analysis.total_score
+                decision["conditions"]["signal_score_ok"] = len(analysis.signals) >= self.config.MIN_SIGNAL_CONDITIONS
+                
+                # Vérification cassure si activée
+                if self.config.ENABLE_BREAKOUT_CONFIRMATION:
+                    breaking_high = await self.check_breakout_confirmation(symbol, current_price)
+                    decision["conditions"]["breaking_high"] = breaking_high
+                else:
+                    decision["conditions"]["breaking_high"] = True
+                
+                # Décision finale
+                if decision["conditions"]["signal_score_ok"] and decision["conditions"]["breaking_high"]:
+                    decision["final_decision"] = "VALIDATED"
+                    decision["reason"] = f"All filters passed ✅ (Score: {analysis.total_score:.1f}, Signals: {len(analysis.signals)})"
+                    
+                    atr = await self.calculate_atr(symbol)
+                    score = pair_score(price_change, volume_usdc)
+                    
+                    return PairScore(
+                        pair=symbol,
+                        volatility=price_change,
+                        volume=volume_usdc,
+                        score=score,
+                        spread=spread,
+                        atr=atr
+                    )
+                
+                decision["final_decision"] = "REJECTED"
+                reasons = []
+                if not decision["conditions"]["signal_score_ok"]:
+                    reasons.append(f"Signal score < {self.config.MIN_SIGNAL_CONDITIONS} ({len(analysis.signals)})")
+                if not decision["conditions"]["breaking_high"]:
+                    reasons.append("Not breaking high")
+                decision["reason"] = " & ".join(reasons)
+                return None
+                
+            except Exception as e:
+                decision["final_decision"] = "REJECTED"
+                decision["reason"] = f"Analysis error: {str(e)}"
+                return None
+
     async def calculate_atr(self, symbol: str, period: int = 14) -> float:
         """Calcule l'ATR pour une paire"""
         try:
-            klines = self.binance_client.get_klines(
-                symbol=symbol,
-                interval=Client.KLINE_INTERVAL_1MINUTE,
-                limit=period + 1
-            )
+            candles = await self.kline_bundles.get(symbol).minute_arrays(period + 1)
             
-            if len(klines) < period:
+            if len(candles['close']) < period:
                 return 0.0
             
-            high = np.array([float(k[2]) for k in klines])
-            low = np.array([float(k[3]) for k in klines])
-            close = np.array([float(k[4]) for k in klines])
-            
-            atr = talib.ATR(high, low, close, timeperiod=period) # type: ignore
+            atr = self.technical_analyzer.atr(candles, symbol, period)
             return atr[-1] if not np.isnan(atr[-1]) else 0.0
             
         except Exception as e:
@@ -1070,27 +1431,15 @@ class ScalpingBot:
     async def analyze_pair(self, symbol: str) -> Optional[TradeDirection]:
         """Analyse technique d'une paire pour détecter un signal"""
         try:
-            # Récupération des données
-            klines = self.binance_client.get_klines(
-                symbol=symbol,
-                interval=getattr(Client, f'KLINE_INTERVAL_{self.config.TIMEFRAME}'),
-                limit=100
-            )
+            # Récupération des données (bundle du cycle de scan)
+            bundle = self.kline_bundles.get(symbol)
+            candles = await bundle.minute_arrays()
             
-            if len(klines) < 50:
+            if len(candles['close']) < 50:
                 return None
             
-            # Préparation des données
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades_count', 'taker_buy_base', 'taker_buy_quote', 'ignore'
-            ])
-            
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
-            
-            # 🚀 ANALYSE TECHNIQUE AVANCÉE avec TechnicalAnalyzer
-            analysis = self.technical_analyzer.analyze_pair(df, symbol)
+            # 🚀 ANALYSE TECHNIQUE AVANCÉE avec TechnicalAnalyzer (tableaux numpy)
+            analysis = self.technical_analyzer.analyze_candles(candles, symbol)
             
             # Vérification avec la configuration MIN_SIGNAL_CONDITIONS
             if self.technical_analyzer.is_valid_signal(analysis, self.config.MIN_SIGNAL_CONDITIONS):
@@ -1187,8 +1536,13 @@ class ScalpingBot:
             
             return None
 
-    async def execute_trade(self, symbol: str, direction: TradeDirection):
-        """Exécute un trade avec contrôle anti-fragmentation et logging détaillé des données techniques"""
+    async def execute_trade(self, symbol: str, direction: TradeDirection, signal_at: Optional[float] = None):
+        """Exécute un trade avec contrôle anti-fragmentation et logging détaillé des données techniques
+
+        signal_at: instant du signal (time.perf_counter) pour mesurer la latence signal -> acquittement
+        """
+        if signal_at is None:
+            signal_at = time.perf_counter()
         try:
             # 🚨 CONTRÔLE ANTI-FRAGMENTATION
             now = datetime.now()
@@ -1213,57 +1567,32 @@ class ScalpingBot:
                     
                     return
             
-            # 📊 COLLECTE DES DONNÉES TECHNIQUES COMPLÈTES pour logging détaillé
-            try:
-                ticker_24h = self.binance_client.get_ticker(symbol=symbol)
-                volume_usdc = float(ticker_24h.get('quoteVolume', ticker_24h.get('volume', 0)))
-                bid = float(ticker_24h.get('bidPrice', ticker_24h.get('bid', 0)))
-                ask = float(ticker_24h.get('askPrice', ticker_24h.get('ask', 0)))
-                spread = (ask - bid) / bid * 100 if bid > 0 else 0
-                price_change_24h = float(ticker_24h.get('priceChangePercent', ticker_24h.get('priceChange', 0)))
-            except Exception as e:
-                self.logger.error(f"❌ Erreur récupération ticker {symbol}: {e}")
-                # Valeurs par défaut en cas d'erreur
-                volume_usdc = 0
-                spread = 0
-                price_change_24h = 0
-            
-            # Calcul volatilité 1h
-            volatility_1h = self.calculate_volatility_1h(symbol)
-            
-            # Récupération des données pour analyse technique détaillée
-            klines = self.binance_client.get_klines(
-                symbol=symbol,
-                interval=getattr(Client, f'KLINE_INTERVAL_{self.config.TIMEFRAME}'),
-                limit=100
+            # Calcul volatilité 1h et bougies pour analyse détaillée (bundle du cycle de scan)
+            bundle = self.kline_bundles.get(symbol)
+            volatility_1h, candles = await asyncio.gather(
+                self.calculate_volatility_1h(symbol),
+                bundle.minute_arrays()
             )
             
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades_count', 'taker_buy_base', 'taker_buy_quote', 'ignore'
-            ])
-            
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
-            
             # Analyse technique détaillée
-            analysis = self.technical_analyzer.analyze_pair(df, symbol)
-            
-            # Calcul RSI, MACD, EMA actuels
-            closes = df['close'].values
-            rsi_current = talib.RSI(closes, timeperiod=self.config.RSI_PERIOD)[-1] # type: ignore
-            macd, macd_signal, macd_hist = talib.MACD(closes, # type: ignore
-                                                      fastperiod=self.config.MACD_FAST_PERIOD,
-                                                      slowperiod=self.config.MACD_SLOW_PERIOD, 
-                                                      signalperiod=self.config.MACD_SIGNAL_PERIOD)
-            ema_fast = talib.EMA(closes, timeperiod=self.config.EMA_FAST_PERIOD)[-1] # type: ignore
-            ema_slow = talib.EMA(closes, timeperiod=self.config.EMA_SLOW_PERIOD)[-1] # type: ignore
+            analysis = self.technical_analyzer.analyze_candles(candles, symbol)
+            
+            # RSI, MACD, EMA actuels (cache partagé: déjà calculés par l'analyse sur cette bougie)
+            rsi_current = self.technical_analyzer.rsi(candles, symbol, self.config.RSI_PERIOD)[-1]
+            macd, macd_signal, macd_hist = self.technical_analyzer.macd(
+                candles, symbol,
+                fast=self.config.MACD_FAST_PERIOD,
+                slow=self.config.MACD_SLOW_PERIOD,
+                signal=self.config.MACD_SIGNAL_PERIOD
+            )
+            ema_fast = self.technical_analyzer.ema(candles, symbol, self.config.EMA_FAST_PERIOD)[-1]
+            ema_slow = self.technical_analyzer.ema(candles, symbol, self.config.EMA_SLOW_PERIOD)[-1]
             
-            # Calculer la volatilité pour cette paire
-            volatility = self.calculate_volatility_1h(symbol)
+            # Volatilité de cette paire (déjà calculée depuis le bundle)
+            volatility = volatility_1h
             
             # Vérifications avant entrée avec nouveaux critères
-            can_open, reason = self.can_open_position_enhanced(symbol, volatility)
+            can_open, reason = await self.can_open_position_enhanced(symbol, volatility)
             if not can_open:
                 self.logger.info(f"❌ Trade {symbol} refusé: {reason}")
                 
@@ -1302,8 +1631,8 @@ class ScalpingBot:
                 return
             
             # 🚀 OPTIMISÉ: Vérification cassure AVANT calculs coûteux
-            current_price = float(self.binance_client.get_symbol_ticker(symbol=symbol)['price'])
-            if not self.check_breakout_confirmation(symbol, current_price):
+            current_price = await self.prices.get_price(symbol, force_refresh=True)
+            if not await self.check_breakout_confirmation(symbol, current_price):
                 self.logger.info(f"❌ Trade {symbol} refusé: Cassure non confirmée (prix: {current_price:.4f})")
                 
                 # Firebase logging pour cassure non confirmée
@@ -1321,13 +1650,13 @@ class ScalpingBot:
                 return
             
             # Informations d'allocation avant trade
-            total_capital = self.get_total_capital()
-            usdc_balance = self.get_asset_balance('USDC')
+            total_capital = await self.get_total_capital()
+            usdc_balance = await self.get_asset_balance('USDC')
             base_asset = symbol.replace('USDC', '')
-            current_exposure = self.get_asset_exposure(base_asset)
+            current_exposure = await self.get_asset_exposure(base_asset)
             
             # Calcul de la taille de position avec sizing adaptatif ANTI-FRAGMENTATION
-            position_size = self.calculate_position_size(symbol, volatility)
+            position_size = await self.calculate_position_size(symbol, volatility)
             
             self.logger.info(f"💰 Allocation avant trade {symbol}:")
             self.logger.info(f"   📊 Capital total: {total_capital:.2f} USDC")
@@ -1355,37 +1684,47 @@ class ScalpingBot:
                     }
                 )
             
+            # ⚡ Gabarit préparé pendant le scan: quantité et niveaux déjà arrondis aux filtres de la paire
+            template = self.order_templates.get(symbol, current_price, position_size)
+            
             # Calcul SL et TP (current_price déjà récupéré lors de la vérification cassure)
-            stop_loss = current_price * (1 - self.config.STOP_LOSS_PERCENT / 100)
-            take_profit = current_price * (1 + self.config.TAKE_PROFIT_PERCENT / 100)
-            trailing_stop = current_price * (1 + self.config.TRAILING_ACTIVATION_PERCENT / 100)
+            if template is not None:
+                stop_loss, take_profit, trailing_stop = template.stop_loss, template.take_profit, template.trailing_stop
+            else:
+                stop_loss = current_price * (1 - self.config.STOP_LOSS_PERCENT / 100)
+                take_profit = current_price * (1 + self.config.TAKE_PROFIT_PERCENT / 100)
+                trailing_stop = current_price * (1 + self.config.TRAILING_ACTIVATION_PERCENT / 100)
             
             # Log des niveaux de sortie incluant trailing stop
             self.logger.info(f"🎯 Niveaux de sortie pour {symbol}:")
             self.logger.info(f"   🛑 Stop Loss: {stop_loss:.4f} USDC (-{self.config.STOP_LOSS_PERCENT}%)")
             self.logger.info(f"   🎯 Take Profit: {take_profit:.4f} USDC (+{self.config.TAKE_PROFIT_PERCENT}%)")
-            self.logger.info(f"   📈 Trailing activation: {trailing_stop:.4f} USDC (+{self.config.TRAILING_ACTIVATION_PERCENT}%)")
-            self.logger.info(f"   🔄 Trailing step: {self.config.TRAILING_STEP_PERCENT}%")
-            
-            # Calcul de la quantité
-            quantity = position_size / current_price
-            
-            # Validation et ajustement de la quantité
-            is_valid, validation_msg, adjusted_quantity = self.validate_order_quantity(symbol, quantity, current_price)
-            
-            if not is_valid:
-                self.logger.warning(f"⚠️ Quantité invalide pour {symbol}: {validation_msg}")
-                # Utilisation de la quantité ajustée si possible
-                if adjusted_quantity > 0:
-                    quantity = adjusted_quantity
-                    position_size = quantity * current_price  # Recalcul du capital engagé
-                    self.logger.info(f"🔧 Quantité ajustée: {quantity:.8f} (capital: {position_size:.2f} USDC)")
-                else:
-                    self.logger.error(f"❌ Impossible de trader {symbol}: quantité minimale non respectée")
-                    return
+            self.logger.info(f"   📈 Trailing activation: {trailing_stop:.4f} USDC (+{self.config.TRAILING_ACTIVATION_PERCENT}%)")
+            self.logger.info(f"   🔄 Trailing step: {self.config.TRAILING_STEP_PERCENT}%")
             
-            # Arrondi final selon les règles de la paire
-            quantity = self.round_quantity(symbol, quantity)
+            if template is not None:
+                # Quantité déjà validée et arrondie
+                quantity = template.quantity
+            else:
+                # Calcul de la quantité
+                quantity = position_size / current_price
+                
+                # Validation et ajustement de la quantité
+                is_valid, validation_msg, adjusted_quantity = await self.validate_order_quantity(symbol, quantity, current_price)
+                
+                if not is_valid:
+                    self.logger.warning(f"⚠️ Quantité invalide pour {symbol}: {validation_msg}")
+                    # Utilisation de la quantité ajustée si possible
+                    if adjusted_quantity > 0:
+                        quantity = adjusted_quantity
+                        position_size = quantity * current_price  # Recalcul du capital engagé
+                        self.logger.info(f"🔧 Quantité ajustée: {quantity:.8f} (capital: {position_size:.2f} USDC)")
+                    else:
+                        self.logger.error(f"❌ Impossible de trader {symbol}: quantité minimale non respectée")
+                        return
+                
+                # Arrondi final selon les règles de la paire
+                quantity = await self.round_quantity(symbol, quantity)
             
             # Vérification finale ANTI-FRAGMENTATION
             final_notional = quantity * current_price
@@ -1416,13 +1755,20 @@ class ScalpingBot:
                 )
             
             # Capital avant trade (AVANT l'achat)
-            capital_before_trade = self.get_total_capital()
+            capital_before_trade = await self.get_total_capital()
             
-            # Passage de l'ordre
-            order = self.binance_client.order_market_buy(
-                symbol=symbol,
-                quantity=quantity
-            )
+            # Passage de l'ordre (paramètres du gabarit: il ne reste que la signature et la requête)
+            if template is not None:
+                order = await self.exchange.order_market_buy(**template.entry_params)
+                self.order_templates.discard(symbol)
+            else:
+                order = await self.exchange.order_market_buy(
+                    symbol=symbol,
+                    quantity=quantity
+                )
+            self.order_templates.record_entry(signal_at)
+            self.logger.info(f"⚡ Ordre {symbol} acquitté {(time.perf_counter() - signal_at) * 1000:.1f}ms après le signal "
+                             f"({'gabarit pré-calculé' if template is not None else 'calcul complet'})")
             
             # Création du trade avec capital_before
             trade = Trade(
@@ -1462,7 +1808,8 @@ class ScalpingBot:
                         # Option 2: Fallback - créer séparément
                         self.logger.info(f"🔄 Fallback: création d'ordres séparés pour {symbol}")
                         
-                        # Créer Stop Loss
+                        # Créer Stop Loss (liste OCO renseignée seulement si son propre repli OCO aboutit)
+                        trade.oco_order_list_id = None
                         stop_loss_order_id = await self.create_automatic_stop_loss(trade, symbol, quantity)
                         if stop_loss_order_id:
                             trade.stop_loss_order_id = stop_loss_order_id
@@ -1515,6 +1862,24 @@ class ScalpingBot:
                 self.logger.info(f"⚙️ Ordres automatiques désactivés pour {symbol} - gestion manuelle via bot")
                 trade.stop_loss_order_id = None
                 trade.take_profit_order_id = None
+            
+            if trade.stop_loss_order_id or getattr(trade, 'take_profit_order_id', None):
+                self.order_templates.record_protection(signal_at)
+            
+            # 📊 COLLECTE DES DONNÉES TECHNIQUES COMPLÈTES pour logging détaillé (après l'ordre: hors chemin critique)
+            try:
+                ticker_24h = await self.exchange.get_ticker(symbol=symbol)
+                volume_usdc = float(ticker_24h.get('quoteVolume', ticker_24h.get('volume', 0)))
+                bid = float(ticker_24h.get('bidPrice', ticker_24h.get('bid', 0)))
+                ask = float(ticker_24h.get('askPrice', ticker_24h.get('ask', 0)))
+                spread = (ask - bid) / bid * 100 if bid > 0 else 0
+                price_change_24h = float(ticker_24h.get('priceChangePercent', ticker_24h.get('priceChange', 0)))
+            except Exception as e:
+                self.logger.error(f"❌ Erreur récupération ticker {symbol}: {e}")
+                # Valeurs par défaut en cas d'erreur
+                volume_usdc = 0
+                spread = 0
+                price_change_24h = 0
 
             # �🔥 Sauvegarde immédiate en Firebase
             try:
@@ -1534,6 +1899,7 @@ class ScalpingBot:
                         'stop_loss_order_id': trade.stop_loss_order_id,  # Sauvegarder l'ID ordre stop loss
                         # 🔥 NOUVEAUX CHAMPS pour ordres automatiques
                         'take_profit_order_id': getattr(trade, 'take_profit_order_id', None),
+                        'oco_order_list_id': getattr(trade, 'oco_order_list_id', None),
                         'trailing_stop_order_id': getattr(trade, 'trailing_stop_order_id', None),
                         'last_trailing_update': None  # Nouveau trade, pas encore de trailing update
                     }
@@ -1638,12 +2004,12 @@ class ScalpingBot:
             # Log dans Google Sheets (si activé)
             if self.sheets_logger:
                 # Capital après = USDC total + crypto existant APRÈS l'achat
-                capital_after_trade = self.get_total_capital()
+                capital_after_trade = await self.get_total_capital()
                 
                 self.logger.info(f"📊 Google Sheets - Capital avant: {capital_before_trade:.2f} USDC, après: {capital_after_trade:.2f} USDC (différence: {capital_after_trade - capital_before_trade:+.2f} USDC)")
                 await self.sheets_logger.log_trade(trade, "OPEN", capital_before_trade, capital_after_trade)
             else:
-                capital_after_trade = self.get_total_capital()
+                capital_after_trade = await self.get_total_capital()
             
             # 🔥 LOG FIREBASE: Trade ouvert avec données techniques complètes
             try:
@@ -1749,11 +2115,11 @@ class ScalpingBot:
             limit_price = stop_price * 0.995  # Prix limite légèrement en dessous (-0.5%)
             
             # Arrondir selon les règles de la paire
-            limit_price = self.round_price(symbol, limit_price)
-            stop_price = self.round_price(symbol, stop_price)
+            limit_price = await self.round_price(symbol, limit_price)
+            stop_price = await self.round_price(symbol, stop_price)
             
             # Vérification que la quantité est valide
-            quantity = self.round_quantity(symbol, quantity)
+            quantity = await self.round_quantity(symbol, quantity)
             
             self.logger.info(f"🛑 Création stop loss automatique {symbol}:")
             self.logger.info(f"   📊 Quantité: {quantity:.8f}")
@@ -1762,7 +2128,7 @@ class ScalpingBot:
             
             # Tentative avec ordre STOP_LOSS_LIMIT
             try:
-                stop_order = self.binance_client.create_order(
+                stop_order = await self.exchange.create_order(
                     symbol=symbol,
                     side='SELL',
                     type='STOP_LOSS_LIMIT',
@@ -1818,14 +2184,14 @@ class ScalpingBot:
             take_profit_price = trade.take_profit
             
             # Arrondir les prix
-            stop_price = self.round_price(symbol, stop_price)
-            stop_limit_price = self.round_price(symbol, stop_limit_price)
-            take_profit_price = self.round_price(symbol, take_profit_price)
-            quantity = self.round_quantity(symbol, quantity)
+            stop_price = await self.round_price(symbol, stop_price)
+            stop_limit_price = await self.round_price(symbol, stop_limit_price)
+            take_profit_price = await self.round_price(symbol, take_profit_price)
+            quantity = await self.round_quantity(symbol, quantity)
             
             self.logger.info(f"🔄 Tentative OCO pour {symbol}")
             
-            oco_order = self.binance_client.create_oco_order(
+            oco_order = await self.exchange.create_oco_order(
                 symbol=symbol,
                 side='SELL',
                 quantity=quantity,
@@ -1839,6 +2205,7 @@ class ScalpingBot:
             for order in oco_order.get('orders', []):
                 if order.get('type') == 'STOP_LOSS_LIMIT':
                     stop_loss_id = str(order['orderId'])
+                    trade.oco_order_list_id = str(oco_order['orderListId'])  # Déplacement du stop par la liste
                     self.logger.info(f"✅ OCO créé avec stop loss: ID {stop_loss_id}")
                     return stop_loss_id
             
@@ -1853,15 +2220,15 @@ class ScalpingBot:
         try:
             # Prix de take profit
             take_profit_price = trade.take_profit
-            take_profit_price = self.round_price(symbol, take_profit_price)
-            quantity = self.round_quantity(symbol, quantity)
+            take_profit_price = await self.round_price(symbol, take_profit_price)
+            quantity = await self.round_quantity(symbol, quantity)
             
             self.logger.info(f"🎯 Création take profit automatique {symbol}:")
             self.logger.info(f"   📊 Quantité: {quantity:.8f}")
             self.logger.info(f"   💰 Prix take profit: {take_profit_price:.4f} USDC")
             
             # Création ordre LIMIT pour take profit
-            tp_order = self.binance_client.create_order(
+            tp_order = await self.exchange.create_order(
                 symbol=symbol,
                 side='SELL',
                 type='LIMIT',
@@ -1907,16 +2274,16 @@ class ScalpingBot:
             take_profit_price = trade.take_profit
             
             # Arrondir les prix
-            stop_price = self.round_price(symbol, stop_price)
-            stop_limit_price = self.round_price(symbol, stop_limit_price)
-            take_profit_price = self.round_price(symbol, take_profit_price)
-            quantity = self.round_quantity(symbol, quantity)
+            stop_price = await self.round_price(symbol, stop_price)
+            stop_limit_price = await self.round_price(symbol, stop_limit_price)
+            take_profit_price = await self.round_price(symbol, take_profit_price)
+            quantity = await self.round_quantity(symbol, quantity)
             
             self.logger.info(f"🔄 Création OCO complet pour {symbol}")
             self.logger.info(f"   🎯 Take Profit: {take_profit_price:.4f} USDC")
             self.logger.info(f"   🛑 Stop Loss: {stop_price:.4f} USDC")
             
-            oco_order = self.binance_client.create_oco_order(
+            oco_order = await self.exchange.create_oco_order(
                 symbol=symbol,
                 side='SELL',
                 quantity=quantity,
@@ -1935,6 +2302,8 @@ class ScalpingBot:
                     stop_loss_id = str(order['orderId'])
                 elif order.get('type') == 'LIMIT':
                     take_profit_id = str(order['orderId'])
+            if stop_loss_id:
+                trade.oco_order_list_id = str(oco_order['orderListId'])  # Déplacement du stop par la liste
             
             self.logger.info(f"✅ OCO complet créé - SL: {stop_loss_id}, TP: {take_profit_id}")
             
@@ -1967,16 +2336,11 @@ class ScalpingBot:
             self.logger.error(f"❌ OCO complet non supporté pour {symbol}: {e}")
             return None, None
 
-    def round_price(self, symbol: str, price: float) -> float:
-        """Arrondit un prix selon les règles de la paire"""
+    async def round_price(self, symbol: str, price: float) -> float:
+        """Arrondit un prix au tick de la paire (table des filtres en mémoire)"""
         try:
-            info = self.binance_client.get_symbol_info(symbol)
-            for filter_item in info['filters']: # type: ignore
-                if filter_item['filterType'] == 'PRICE_FILTER':
-                    tick_size = float(filter_item['tickSize'])
-                    precision = len(str(tick_size).split('.')[-1].rstrip('0'))
-                    return round(price, precision)
-            return round(price, 4)
+            await self.symbol_filters.ensure(symbol)
+            return self.symbol_filters.round_price(symbol, price)
         except:
             return round(price, 4)
 
@@ -1984,7 +2348,7 @@ class ScalpingBot:
         """Annule un ordre stop loss automatique"""
         try:
             if hasattr(trade, 'stop_loss_order_id') and trade.stop_loss_order_id:
-                self.binance_client.cancel_order(
+                await self.exchange.cancel_order(
                     symbol=symbol,
                     orderId=int(trade.stop_loss_order_id)
                 )
@@ -1997,13 +2361,59 @@ class ScalpingBot:
 
     async def check_automatic_order_execution(self, trade_id: str, trade) -> bool:
         """Vérifie si un ordre automatique (SL/TP) a été exécuté par Binance et enregistre le trade"""
+        if not self.order_events.connected:
+            return await self.poll_automatic_order_execution(trade_id, trade)
+        
+        # Stream actif: exécutions déjà poussées par on_order_filled, la table couvre les ordres
+        # exécutés avant que leur ID ne soit rattaché au trade
+        for order_id in (getattr(trade, 'stop_loss_order_id', None), getattr(trade, 'take_profit_order_id', None)):
+            order = self.order_events.get_order(order_id) if order_id else None
+            if order is not None and order.status == 'FILLED':
+                await self.handle_automatic_fill(trade_id, trade, order)
+                return True
+        return False
+
+    async def on_order_filled(self, order: OrderState):
+        """Listener du user-data stream: ordre entièrement exécuté"""
+        order_id = str(order.order_id)
+        for trade_id, trade in list(self.open_positions.items()):
+            if order_id in (str(getattr(trade, 'stop_loss_order_id', None)), str(getattr(trade, 'take_profit_order_id', None))):
+                await self.handle_automatic_fill(trade_id, trade, order)
+                return
+
+    async def handle_automatic_fill(self, trade_id: str, trade, order: OrderState):
+        """Enregistre la fermeture d'un trade à partir d'un executionReport FILLED"""
+        executed_price = order.avg_price
+        if str(order.order_id) == str(getattr(trade, 'take_profit_order_id', None)):
+            reason = "TAKE_PROFIT_BINANCE_AUTO"
+        elif executed_price <= trade.stop_loss * 1.01:  # Tolérance 1%
+            reason = "STOP_LOSS_BINANCE_AUTO"
+        else:
+            reason = "TAKE_PROFIT_BINANCE_AUTO"
+        
+        latency_ms = (time.monotonic() - order.received_at) * 1000
+        self.logger.info(f"🤖 Ordre automatique Binance exécuté (user-data stream):")
+        self.logger.info(f"   📊 {trade.pair}: {order.executed_qty:.8f} à {executed_price:.4f} USDC")
+        self.logger.info(f"   🎯 Raison: {reason}")
+        self.logger.info(f"   🕐 Heure: {datetime.fromtimestamp(order.update_time/1000)} (détection: {latency_ms:.1f} ms)")
+        
+        await self.record_automatic_trade_closure(trade_id, trade, executed_price, reason, order.update_time)
+
+    async def resync_automatic_orders(self):
+        """(Re)connexion du stream: rattrapage par REST des exécutions survenues pendant la coupure"""
+        for trade_id, trade in list(self.open_positions.items()):
+            if getattr(trade, 'stop_loss_order_id', None):
+                await self.poll_automatic_order_execution(trade_id, trade)
+
+    async def poll_automatic_order_execution(self, trade_id: str, trade) -> bool:
+        """Vérification par REST (get_order) d'un ordre automatique - utilisée sans user-data stream"""
         try:
             if not hasattr(trade, 'stop_loss_order_id') or not trade.stop_loss_order_id:
                 return False
             
             # Vérifier le statut de l'ordre automatique
             try:
-                order_status = self.binance_client.get_order(
+                order_status = await self.exchange.get_order(
                     symbol=trade.pair,
                     orderId=int(trade.stop_loss_order_id)
                 )
@@ -2047,8 +2457,26 @@ class ScalpingBot:
             return False
 
     async def record_automatic_trade_closure(self, trade_id: str, trade, exit_price: float, reason: str, executed_time: int):
-        """Enregistre la fermeture automatique d'un trade par Binance"""
+        """Enregistre la fermeture automatique d'un trade par Binance (une seule fois par trade)"""
+        # Stream, table des ordres et polling REST peuvent signaler la même exécution
+        if trade_id in self._automatic_closures or trade_id not in self.open_positions:
+            return
+        self._automatic_closures.add(trade_id)
+        try:
+            await self._record_automatic_trade_closure(trade_id, trade, exit_price, reason, executed_time)
+        finally:
+            self._automatic_closures.discard(trade_id)
+
+    async def _record_automatic_trade_closure(self, trade_id: str, trade, exit_price: float, reason: str, executed_time: int):
         try:
+            # Exécution côté Binance, absente des réponses d'ordres du bot: soldes relus
+            # (inutile si le user-data stream a déjà transmis les nouveaux soldes)
+            if not self.order_events.connected:
+                self.account.mark_stale()
+            
+            # Stop exécuté par Binance: mises à jour en attente abandonnées
+            await self.stop_updater.cancel(trade_id)
+            
             # Mise à jour du trade
             trade.status = TradeStatus.CLOSED
             trade.exit_price = exit_price
@@ -2057,7 +2485,7 @@ class ScalpingBot:
             trade.exit_reason = reason
             
             # Calcul P&L
-            capital_after_trade = self.get_total_capital()
+            capital_after_trade = await self.get_total_capital()
             theoretical_pnl = (exit_price - trade.entry_price) * trade.size
             theoretical_pnl_percent = (exit_price - trade.entry_price) / trade.entry_price * 100
             
@@ -2164,7 +2592,7 @@ class ScalpingBot:
             self.logger.info(f"   📊 P&L: {pnl_amount:+.2f} USDC ({pnl_percent:+.2f}%)")
             self.logger.info(f"   ⏱️ Durée: {trade.duration}")
             self.logger.info(f"   🤖 Exécution: Binance automatique")
-            total_capital = self.get_total_capital()
+            total_capital = await self.get_total_capital()
             daily_pnl_percent = self.daily_pnl / total_capital * 100
             self.logger.info(f"   🔄 Total journalier: {self.daily_pnl:+.2f} USDC ({daily_pnl_percent:+.2f}%)")
             
@@ -2183,7 +2611,7 @@ class ScalpingBot:
         """Détecte une exécution manquée via l'historique des trades"""
         try:
             # Récupérer l'historique récent des trades
-            recent_trades = self.binance_client.get_my_trades(symbol=trade.pair, limit=50)
+            recent_trades = await self.exchange.get_my_trades(symbol=trade.pair, limit=50)
             
             # Chercher un trade de vente correspondant à notre position
             for binance_trade in recent_trades:
@@ -2207,7 +2635,7 @@ class ScalpingBot:
             
             # Si aucune exécution trouvée, fermeture virtuelle par sécurité
             self.logger.warning(f"⚠️ Aucune exécution automatique trouvée pour {trade.pair}, fermeture virtuelle")
-            current_price = float(self.binance_client.get_symbol_ticker(symbol=trade.pair)['price'])
+            current_price = await self.prices.get_price(trade.pair)
             await self.record_automatic_trade_closure(trade_id, trade, current_price, "BINANCE_AUTO_UNKNOWN", int(datetime.now().timestamp() * 1000))
             return True
             
@@ -2215,7 +2643,7 @@ class ScalpingBot:
             self.logger.error(f"❌ Erreur détection exécution manquée {trade_id}: {e}")
             return False
 
-    def get_non_dust_trades_on_pair(self, symbol: str) -> int:
+    async def get_non_dust_trades_on_pair(self, symbol: str) -> int:
         """Compte le nombre de trades non-miettes sur une paire"""
         base_asset = symbol.replace('USDC', '')
         non_dust_trades = 0
@@ -2224,8 +2652,7 @@ class ScalpingBot:
             if trade.pair == symbol:
                 try:
                     # Récupération du prix actuel pour calculer la valeur
-                    ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-                    current_price = float(ticker['price'])
+                    current_price = await self.prices.get_price(symbol)
                     position_value = trade.size * current_price
                     
                     # Ne compter que si la valeur dépasse le seuil des miettes
@@ -2244,7 +2671,7 @@ class ScalpingBot:
         
         return non_dust_trades
 
-    def can_open_position(self, symbol: str) -> bool:
+    async def can_open_position(self, symbol: str) -> bool:
         """Vérifie si on peut ouvrir une position"""
         # Vérification nombre de positions
         if len(self.open_positions) >= self.config.MAX_OPEN_POSITIONS:
@@ -2252,22 +2679,22 @@ class ScalpingBot:
             return False
         
         # Vérification position déjà ouverte sur la paire (ignorant les miettes)
-        non_dust_trades_on_pair = self.get_non_dust_trades_on_pair(symbol)
+        non_dust_trades_on_pair = await self.get_non_dust_trades_on_pair(symbol)
         if non_dust_trades_on_pair >= self.config.MAX_TRADES_PER_PAIR:
             self.logger.debug(f"❌ Limite trades non-miettes par paire atteinte: {non_dust_trades_on_pair}/{self.config.MAX_TRADES_PER_PAIR}")
             return False
         
         # Vérification capital USDC disponible (pas le total avec crypto!)
-        position_size = self.calculate_position_size()
-        usdc_balance = self.get_asset_balance('USDC')
+        position_size = await self.calculate_position_size()
+        usdc_balance = await self.get_asset_balance('USDC')
         if usdc_balance < position_size:
             self.logger.debug(f"❌ Capital USDC insuffisant: {usdc_balance:.2f} < {position_size:.2f}")
             return False
         
         # Vérification exposition maximale par asset de base
         base_asset = symbol.replace('USDC', '')
-        current_exposure = self.get_asset_exposure(base_asset)
-        max_exposure_per_asset = self.get_total_capital() * self.config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
+        current_exposure = await self.get_asset_exposure(base_asset)
+        max_exposure_per_asset = await self.get_total_capital() * self.config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
         
         if current_exposure + position_size > max_exposure_per_asset:
             self.logger.debug(f"❌ Exposition {base_asset} trop élevée: {current_exposure:.2f} + {position_size:.2f} > {max_exposure_per_asset:.2f}")
@@ -2280,7 +2707,7 @@ class ScalpingBot:
         
         return True
     
-    def get_asset_exposure(self, base_asset: str) -> float:
+    async def get_asset_exposure(self, base_asset: str) -> float:
         """Calcule l'exposition actuelle sur un asset de base (positions ouvertes + soldes existants NON TRACÉS)"""
         total_exposure = 0.0
         tracked_assets = 0
@@ -2289,8 +2716,7 @@ class ScalpingBot:
         for trade_id, trade in self.open_positions.items():
             if trade.pair.replace('USDC', '') == base_asset:
                 try:
-                    ticker = self.binance_client.get_symbol_ticker(symbol=trade.pair)
-                    current_price = float(ticker['price'])
+                    current_price = await self.prices.get_price(trade.pair)
                     position_value = trade.size * current_price
                     total_exposure += position_value
                     tracked_assets += trade.size
@@ -2304,15 +2730,14 @@ class ScalpingBot:
         
         # 2. Exposition des soldes crypto existants NON TRACÉS (pour éviter double comptage)
         try:
-            existing_balance = self.get_asset_balance(base_asset)
+            existing_balance = await self.get_asset_balance(base_asset)
             if existing_balance > 0.00001:  # Seuil technique pour éviter erreurs
                 # Calculer le solde NON TRACÉ (solde total - soldes des positions ouvertes)
                 untracked_balance = existing_balance - tracked_assets
                 
                 if untracked_balance > 0.00001:  # Il y a un solde non tracé significatif
                     symbol = base_asset + 'USDC'
-                    ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-                    current_price = float(ticker['price'])
+                    current_price = await self.prices.get_price(symbol)
                     untracked_value = untracked_balance * current_price
                     
                     # 🧹 GESTION INTELLIGENTE DES MIETTES pour le solde NON TRACÉ
@@ -2329,45 +2754,30 @@ class ScalpingBot:
         
         return total_exposure
 
-    def calculate_position_size(self, pair: Optional[str] = None, volatility: Optional[float] = None) -> float:
-        """Calcule la taille de position avec sizing adaptatif basé sur la volatilité et horaires"""
-        total_capital = self.get_total_capital()
-        base_size = total_capital * self.config.BASE_POSITION_SIZE_PERCENT / 100
+    async def calculate_position_size(self, pair: Optional[str] = None, volatility: Optional[float] = None,
+                                      verbose: bool = True) -> float:
+        """Calcule la taille de position avec sizing adaptatif basé sur la volatilité et horaires
+
+        verbose: False pour les calculs de préparation (gabarits d'ordres) sans journalisation
+        """
+        total_capital = await self.get_total_capital()
         
-        # Ajustement selon l'intensité horaire
+        # Ajustement selon l'intensité horaire puis selon la volatilité (règle partagée avec le backtest)
         trading_intensity = get_trading_intensity(self.config)
-        base_size *= trading_intensity
-        
-        # Si pas de volatilité fournie, utiliser la taille de base ajustée
-        if volatility is None:
-            return base_size
+        adjusted_size = position_size(self.config, total_capital, trading_intensity, volatility)
         
-        # Position sizing adaptatif selon la volatilité
-        if volatility > self.config.HIGH_VOLATILITY_THRESHOLD:
-            # Réduire la taille pour paires très volatiles
-            reduction_factor = min(0.5, self.config.VOLATILITY_REDUCTION_FACTOR * (volatility / self.config.HIGH_VOLATILITY_THRESHOLD))
-            adjusted_size = base_size * (1 - reduction_factor)
-            self.logger.info(f"📊 Position réduite pour {pair} (volatilité {volatility:.2f}%, intensité {trading_intensity*100:.0f}%): {adjusted_size:.2f} USDC")
-            return adjusted_size
-        elif volatility < self.config.LOW_VOLATILITY_THRESHOLD:
-            # Augmenter légèrement pour paires peu volatiles (plus sûres)
-            adjusted_size = base_size * 1.1
-            self.logger.info(f"📊 Position augmentée pour {pair} (faible volatilité {volatility:.2f}%, intensité {trading_intensity*100:.0f}%): {adjusted_size:.2f} USDC")
-            return adjusted_size
-        else:
-            # Volatilité normale, taille de base ajustée par horaire
-            return base_size
+        if verbose and volatility is not None:
+            if volatility > self.config.HIGH_VOLATILITY_THRESHOLD:
+                self.logger.info(f"📊 Position réduite pour {pair} (volatilité {volatility:.2f}%, intensité {trading_intensity*100:.0f}%): {adjusted_size:.2f} USDC")
+            elif volatility < self.config.LOW_VOLATILITY_THRESHOLD:
+                self.logger.info(f"📊 Position augmentée pour {pair} (faible volatilité {volatility:.2f}%, intensité {trading_intensity*100:.0f}%): {adjusted_size:.2f} USDC")
+        return adjusted_size
 
-    def round_quantity(self, symbol: str, quantity: float) -> float:
-        """Arrondit la quantité selon les règles de la paire"""
+    async def round_quantity(self, symbol: str, quantity: float) -> float:
+        """Arrondit la quantité au pas inférieur de la paire (table des filtres en mémoire)"""
         try:
-            info = self.binance_client.get_symbol_info(symbol)
-            for filter_item in info['filters']: # type: ignore
-                if filter_item['filterType'] == 'LOT_SIZE':
-                    step_size = float(filter_item['stepSize'])
-                    precision = len(str(step_size).split('.')[-1].rstrip('0'))
-                    return round(quantity, precision)
-            return round(quantity, 6)
+            await self.symbol_filters.ensure(symbol)
+            return self.symbol_filters.round_quantity(symbol, quantity)
         except:
             return round(quantity, 6)
     
@@ -2438,39 +2848,17 @@ class ScalpingBot:
             return False
     
     async def update_binance_stop_loss(self, trade, new_stop_price: float):
-        """Met à jour l'ordre stop loss sur Binance avec le nouveau prix"""
+        """Met à jour l'ordre stop loss sur Binance avec le nouveau prix (cancelReplace: une requête)"""
         try:
             symbol = trade.pair
-            quantity = trade.size
-            
-            # Annuler l'ancien ordre stop loss s'il existe
-            if trade.stop_loss_order_id:
-                try:
-                    self.binance_client.cancel_order(symbol=symbol, orderId=trade.stop_loss_order_id)
-                    self.logger.debug(f"🗑️ Ancien stop loss {trade.stop_loss_order_id} annulé")
-                except Exception as e:
-                    self.logger.warning(f"⚠️ Impossible d'annuler ancien stop loss: {e}")
-            
-            # Créer un nouveau stop loss avec le prix mis à jour
-            stop_price = self.round_price(symbol, new_stop_price)
-            limit_price = self.round_price(symbol, stop_price * 0.995)
-            quantity = self.round_quantity(symbol, quantity)
-            
-            # Créer le nouvel ordre
-            new_stop_order = self.binance_client.create_order(
-                symbol=symbol,
-                side='SELL',
-                type='STOP_LOSS_LIMIT',
-                timeInForce='GTC',
-                quantity=quantity,
-                price=limit_price,
-                stopPrice=stop_price
-            )
+            old_order_id = trade.stop_loss_order_id
             
-            # Mettre à jour l'ID du nouvel ordre
-            trade.stop_loss_order_id = str(new_stop_order['orderId'])
+            # Remplacement atomique de l'ancien ordre (création s'il n'en existe pas)
             trade.stop_loss = new_stop_price  # Mettre à jour aussi le stop loss du trade
+            if not await self.stop_updater.replace(trade, new_stop_price):
+                return
             
+            stop_price = await self.round_price(symbol, new_stop_price)
             self.logger.info(f"✅ Stop loss Binance mis à jour: {trade.stop_loss_order_id}")
             
             # 🔥 NOUVEAU: Logging Firebase pour mise à jour ordre
@@ -2483,12 +2871,10 @@ class ScalpingBot:
                         additional_data={
                             'order_type': 'STOP_LOSS_UPDATE',
                             'symbol': symbol,
-                            'old_order_id': getattr(trade, 'old_stop_loss_order_id', None),
+                            'old_order_id': old_order_id,
                             'new_order_id': trade.stop_loss_order_id,
                             'new_stop_price': stop_price,
-                            'new_limit_price': limit_price,
-                            'quantity': quantity,
-                            'binance_response': new_stop_order
+                            'quantity': trade.size
                         }
                     )
                 except Exception as e:
@@ -2499,33 +2885,19 @@ class ScalpingBot:
             self.logger.error(f"❌ Erreur mise à jour stop loss Binance: {e}")
             # En cas d'erreur, on garde l'ancien ordre et on continue la surveillance manuelle
 
-    def get_symbol_filters(self, symbol: str) -> dict:
-        """Récupère les filtres de trading pour un symbole"""
+    async def get_symbol_filters(self, symbol: str) -> dict:
+        """Récupère les filtres de trading pour un symbole (table des filtres en mémoire)"""
         try:
-            info = self.binance_client.get_symbol_info(symbol)
-            filters = {}
-            
-            for filter_item in info['filters']: # type: ignore
-                if filter_item['filterType'] == 'LOT_SIZE':
-                    filters['min_qty'] = float(filter_item['minQty'])
-                    filters['max_qty'] = float(filter_item['maxQty'])
-                    filters['step_size'] = float(filter_item['stepSize'])
-                elif filter_item['filterType'] == 'MIN_NOTIONAL':
-                    filters['min_notional'] = float(filter_item['minNotional'])
-                elif filter_item['filterType'] == 'PRICE_FILTER':
-                    filters['min_price'] = float(filter_item['minPrice'])
-                    filters['max_price'] = float(filter_item['maxPrice'])
-                    filters['tick_size'] = float(filter_item['tickSize'])
-            
-            return filters
+            filters = await self.symbol_filters.ensure(symbol)
+            return filters.as_dict() if filters else {}
         except Exception as e:
             self.logger.error(f"❌ Erreur récupération filtres {symbol}: {e}")
             return {}
     
-    def validate_order_quantity(self, symbol: str, quantity: float, price: float) -> tuple[bool, str, float]:
+    async def validate_order_quantity(self, symbol: str, quantity: float, price: float) -> tuple[bool, str, float]:
         """Valide et ajuste une quantité d'ordre"""
         try:
-            filters = self.get_symbol_filters(symbol)
+            filters = await self.get_symbol_filters(symbol)
             
             if not filters:
                 return True, "Pas de filtres disponibles", quantity
@@ -2540,19 +2912,15 @@ class ScalpingBot:
             if quantity > max_qty:
                 return False, f"Quantité {quantity:.8f} > maximum {max_qty:.8f}", max_qty
             
-            # Arrondi selon step_size
-            step_size = filters.get('step_size', 0)
-            if step_size > 0:
-                quantity = round(quantity / step_size) * step_size
+            # Arrondi au pas inférieur (step_size)
+            quantity = self.symbol_filters.round_quantity(symbol, quantity)
             
             # Vérification valeur notionnelle minimale
             min_notional = filters.get('min_notional', 0)
             notional_value = quantity * price
             if notional_value < min_notional:
                 # Calcul de la quantité minimale pour respecter min_notional
-                min_qty_for_notional = min_notional / price
-                if step_size > 0:
-                    min_qty_for_notional = round(min_qty_for_notional / step_size) * step_size
+                min_qty_for_notional = self.symbol_filters.round_quantity(symbol, min_notional / price, round_up=True)
                 return False, f"Valeur notionnelle {notional_value:.2f} < minimum {min_notional:.2f}", min_qty_for_notional
             
             return True, "OK", quantity
@@ -2561,52 +2929,20 @@ class ScalpingBot:
             self.logger.error(f"❌ Erreur validation quantité {symbol}: {e}")
             return True, f"Erreur validation: {e}", quantity
     
-    def get_asset_balance(self, asset: str) -> float:
+    async def get_asset_balance(self, asset: str) -> float:
         """Récupère le solde disponible d'un asset"""
         try:
-            account_info = self.binance_client.get_account()
-            for balance in account_info['balances']:
-                if balance['asset'] == asset:
-                    return float(balance['free'])
-            return 0.0
+            return await self.account.get_free(asset)
         except Exception as e:
             self.logger.error(f"❌ Erreur récupération solde {asset}: {e}")
             return 0.0
 
-    def get_total_capital(self) -> float:
+    async def get_total_capital(self) -> float:
         """Calcule le capital total dynamique (USDC + valeur de TOUTES les cryptos du compte)"""
         try:
-            account_info = self.binance_client.get_account()
-            total_capital = 0.0
-            
-            # Solde USDC
-            usdc_balance = 0.0
-            crypto_value = 0.0
-            
-            for balance in account_info['balances']:
-                free_balance = float(balance['free'])
-                asset = balance['asset']
-                
-                if free_balance > 0:
-                    if asset == 'USDC':
-                        usdc_balance = free_balance
-                        total_capital += usdc_balance
-                    elif free_balance > 0.00001:  # Seuil pour éviter les poussières
-                        # Conversion en USDC pour tous les autres assets
-                        try:
-                            symbol = asset + 'USDC'
-                            ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-                            price_usdc = float(ticker['price'])
-                            value_usdc = free_balance * price_usdc
-                            crypto_value += value_usdc
-                            total_capital += value_usdc
-                            self.logger.debug(f"💎 {asset}: {free_balance:.8f} x {price_usdc:.4f} = {value_usdc:.2f} USDC")
-                        except Exception:
-                            # Si pas de paire USDC pour cet asset, on ignore
-                            self.logger.debug(f"⚠️ Pas de conversion USDC pour {asset}")
-                            continue
-            
-            self.logger.debug(f"💰 Capital total: {total_capital:.2f} USDC (USDC libre: {usdc_balance:.2f}, Toutes cryptos: {crypto_value:.2f})")
+            total_capital = await self.capital_valuator.total_capital()
+            breakdown = self.capital_valuator.last_breakdown
+            self.logger.debug(f"💰 Capital total: {total_capital:.2f} USDC (USDC libre: {breakdown['quote']:.2f}, Toutes cryptos: {breakdown['crypto']:.2f})")
             return total_capital
             
         except Exception as e:
@@ -2626,23 +2962,22 @@ class ScalpingBot:
                         continue
                 
                 # Récupération du prix actuel
-                ticker = self.binance_client.get_symbol_ticker(symbol=trade.pair)
-                current_price = float(ticker['price'])
+                current_price = await self.prices.get_price(trade.pair)
 
                 # Calcul du P&L
                 pnl_percent = (current_price - trade.entry_price) / trade.entry_price * 100
 
                 # Vérification surexposition dynamique
                 base_asset = trade.pair.replace('USDC', '')
-                current_exposure = self.get_asset_exposure(base_asset)
-                max_exposure_per_asset = self.get_total_capital() * self.config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
+                current_exposure = await self.get_asset_exposure(base_asset)
+                max_exposure_per_asset = await self.get_total_capital() * self.config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
                 if current_exposure > max_exposure_per_asset * 1.01:  # tolérance 1%
                     self.logger.warning(f"⚠️ Surexposition détectée sur {base_asset}: {current_exposure:.2f} USDC > {max_exposure_per_asset:.2f} USDC ({self.config.MAX_EXPOSURE_PER_ASSET_PERCENT}% du capital)")
                     await self.close_position(trade_id, current_price, "SUREXPOSITION_AUTO")
                     continue
 
                 # Vérification timeout adaptatif
-                volatility = self.calculate_volatility_1h(trade.pair)
+                volatility = await self.calculate_volatility_1h(trade.pair)
                 should_timeout, timeout_reason = self.should_timeout_position(trade, current_price, volatility)
                 if should_timeout:
                     self.logger.info(f"⏱️ {timeout_reason}")
@@ -2817,9 +3152,12 @@ class ScalpingBot:
         try:
             for trade_id, trade in list(self.open_positions.items()):
                 try:
+                    # Action du PositionEngine en cours sur ce trade
+                    if self.position_engine.is_busy(trade_id):
+                        continue
+                    
                     # Récupération prix en temps réel
-                    ticker = self.binance_client.get_symbol_ticker(symbol=trade.pair)
-                    current_price = float(ticker['price'])
+                    current_price = await self.prices.get_price(trade.pair)
                     
                     # Calcul distance au stop loss
                     distance_to_stop = (current_price - trade.stop_loss) / trade.stop_loss * 100
@@ -2828,21 +3166,21 @@ class ScalpingBot:
                     if distance_to_stop < 1.0:  # Moins de 1% du stop loss
                         self.logger.warning(f"⚠️ SURVEILLANCE INTENSIVE {trade.pair}: Prix {current_price:.4f} très proche du SL {trade.stop_loss:.4f} ({distance_to_stop:.2f}%)")
                         
-                        # Vérification gap imminent
-                        if current_price <= trade.stop_loss:
+                        # Vérification gap imminent (déjà traitée au tick près si la paire est streamée)
+                        if current_price <= trade.stop_loss and not self.position_engine.is_live(trade.pair):
                             # Exécution immédiate pour éviter gap plus important
-                            await self.close_position(trade_id, current_price, "STOP_LOSS_IMMEDIATE")
+                            await self.close_managed_position(trade_id, current_price, "STOP_LOSS_IMMEDIATE")
                             continue
                     
                     # Surveillance des mouvements rapides (volatilité excessive)
-                    volatility = self.calculate_volatility_1h(trade.pair)
+                    volatility = await self.calculate_volatility_1h(trade.pair)
                     if volatility > 50.0:  # Volatilité extrême
                         pnl_percent = (current_price - trade.entry_price) / trade.entry_price * 100
                         
                         # Sortie préventive si volatilité dangereuse et perte modérée
                         if pnl_percent < -0.2 and volatility > 100.0:  # Perte > 0.2% et volatilité > 100%
                             self.logger.warning(f"🚨 SORTIE PRÉVENTIVE {trade.pair}: Volatilité extrême {volatility:.1f}% + perte {pnl_percent:.2f}%")
-                            await self.close_position(trade_id, current_price, "VOLATILITY_PROTECTION")
+                            await self.close_managed_position(trade_id, current_price, "VOLATILITY_PROTECTION")
                             continue
                     
                 except Exception as e:
@@ -2855,28 +3193,31 @@ class ScalpingBot:
         """Gère les positions ouvertes et la surexposition"""
         for trade_id, trade in list(self.open_positions.items()):
             try:
+                # Action du PositionEngine en cours sur ce trade
+                if self.position_engine.is_busy(trade_id):
+                    continue
+                
                 # Récupération du prix actuel
-                ticker = self.binance_client.get_symbol_ticker(symbol=trade.pair)
-                current_price = float(ticker['price'])
+                current_price = await self.prices.get_price(trade.pair)
 
                 # Calcul du P&L
                 pnl_percent = (current_price - trade.entry_price) / trade.entry_price * 100
 
                 # Vérification surexposition dynamique
                 base_asset = trade.pair.replace('USDC', '')
-                current_exposure = self.get_asset_exposure(base_asset)
-                max_exposure_per_asset = self.get_total_capital() * self.config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
+                current_exposure = await self.get_asset_exposure(base_asset)
+                max_exposure_per_asset = await self.get_total_capital() * self.config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
                 if current_exposure > max_exposure_per_asset * 1.01:  # tolérance 1%
                     self.logger.warning(f"⚠️ Surexposition détectée sur {base_asset}: {current_exposure:.2f} USDC > {max_exposure_per_asset:.2f} USDC ({self.config.MAX_EXPOSURE_PER_ASSET_PERCENT}% du capital)")
-                    await self.close_position(trade_id, current_price, "SUREXPOSITION_AUTO")
+                    await self.close_managed_position(trade_id, current_price, "SUREXPOSITION_AUTO")
                     continue
 
                 # Vérification timeout adaptatif
-                volatility = self.calculate_volatility_1h(trade.pair)
+                volatility = await self.calculate_volatility_1h(trade.pair)
                 should_timeout, timeout_reason = self.should_timeout_position(trade, current_price, volatility)
                 if should_timeout:
                     self.logger.info(f"⏱️ {timeout_reason}")
-                    await self.close_position(trade_id, current_price, timeout_reason)
+                    await self.close_managed_position(trade_id, current_price, timeout_reason)
                     continue
 
                 # Sortie momentum faible (optionnelle)
@@ -2884,125 +3225,193 @@ class ScalpingBot:
                     should_exit_momentum, momentum_reason = await self.check_momentum_exit(trade, current_price, pnl_percent)
                     if should_exit_momentum:
                         self.logger.info(f"📉 {momentum_reason}")
-                        await self.close_position(trade_id, current_price, "MOMENTUM_FAIBLE")
+                        await self.close_managed_position(trade_id, current_price, "MOMENTUM_FAIBLE")
                         continue
 
+                # Règles de prix (SL / trailing / TP): gérées à chaque tick par le PositionEngine
+                # quand la paire reçoit son stream bookTicker
+                if self.position_engine.is_live(trade.pair):
+                    continue
+
                 # Vérification Stop Loss avec protection gap
                 if current_price <= trade.stop_loss:
-                    # Analyse du gap de marché
-                    expected_loss = abs((trade.stop_loss - trade.entry_price) / trade.entry_price * 100)
-                    actual_loss = abs((current_price - trade.entry_price) / trade.entry_price * 100)
-                    gap_excess = actual_loss - expected_loss
-                    
-                    if gap_excess > 0.5:  # Gap significatif détecté
-                        self.logger.error(f"🚨 GAP STOP LOSS {trade.pair}: Perte {actual_loss:.2f}% vs {expected_loss:.2f}% attendu (gap: {gap_excess:.2f}%)")
-                        
-                        # Firebase logging pour analyse des gaps
-                        if self.firebase_logger:
-                            self.firebase_logger.log_message(
-                                level="ERROR",
-                                message=f"🚨 GAP STOP LOSS: {trade.pair} - Gap: {gap_excess:.2f}%",
-                                module="risk_management",
-                                pair=trade.pair,
-                                additional_data={
-                                    'entry_price': trade.entry_price,
-                                    'configured_stop_loss': trade.stop_loss,
-                                    'actual_exit_price': current_price,
-                                    'expected_loss_percent': expected_loss,
-                                    'actual_loss_percent': actual_loss,
-                                    'gap_excess_percent': gap_excess,
-                                    'trade_duration': str(datetime.now() - trade.timestamp)
-                                }
-                            )
-                    
-                    await self.close_position(trade_id, current_price, "STOP_LOSS")
+                    self.log_stop_loss_gap(trade, current_price)
+                    await self.close_managed_position(trade_id, current_price, "STOP_LOSS")
                     continue
 
                 # Trailing Stop (priorité sur Take Profit pour laisser monter)
-                trailing_activated = False
-                if current_price >= trade.trailing_stop:
-                    # Mise à jour du trailing stop
-                    new_stop = current_price * (1 - self.config.TRAILING_STEP_PERCENT / 100)
-                    if new_stop > trade.stop_loss:
-                        trailing_activated = True
-                        old_stop = trade.stop_loss
-                        old_tp = trade.take_profit
-                        
-                        # Annuler l'ancien stop loss automatique
-                        await self.cancel_automatic_stop_loss(trade, trade.pair)
-                        
-                        # Mise à jour du Stop Loss
-                        trade.stop_loss = new_stop
-                        
-                        # Mise à jour du Take Profit pour qu'il suive la progression
-                        # Nouveau TP = prix actuel + même écart relatif que le TP initial
-                        new_take_profit = current_price * (1 + self.config.TAKE_PROFIT_PERCENT / 100)
-                        trade.take_profit = new_take_profit
-                        
-                        # Créer nouveau stop loss automatique avec nouveau niveau
-                        try:
-                            new_stop_order_id = await self.create_automatic_stop_loss(trade, trade.pair, trade.size)
-                            if new_stop_order_id:
-                                trade.stop_loss_order_id = new_stop_order_id
-                        except Exception as e:
-                            self.logger.error(f"❌ Erreur création nouveau stop loss automatique: {e}")
-                        
-                        self.logger.info(f"📈 Trailing Stop mis à jour pour {trade.pair}:")
-                        self.logger.info(f"   🛑 Nouveau SL: {new_stop:.4f} USDC (ancien: {old_stop:.4f})")
-                        self.logger.info(f"   🎯 Nouveau TP: {new_take_profit:.4f} USDC (ancien: {old_tp:.4f})")
-                        
-                        # Firebase logging pour trailing stop
-                        if self.firebase_logger:
-                            profit_percent = (current_price - trade.entry_price) / trade.entry_price * 100
-                            self.firebase_logger.log_message(
-                                level="INFO",
-                                message=f"📈 TRAILING STOP: {trade.pair} - SL: {new_stop:.4f} (+{profit_percent:.2f}%)",
-                                module="position_management",
-                                trade_id=trade_id,
-                                pair=trade.pair,
-                                additional_data={
-                                    'old_stop_loss': old_stop,
-                                    'new_stop_loss': new_stop,
-                                    'old_take_profit': old_tp,
-                                    'new_take_profit': new_take_profit,
-                                    'trigger_price': current_price,
-                                    'profit_percent': profit_percent,
-                                    'entry_price': trade.entry_price,
-                                    'new_stop_order_id': trade.stop_loss_order_id
-                                }
-                            )
-
-                        # Enregistrement en base de données
-                        try:
-                            trailing_data = {
-                                'trade_id': trade.db_id,
-                                'symbol': trade.pair,
-                                'old_stop_loss': old_stop,
-                                'new_stop_loss': new_stop,
-                                'old_take_profit': old_tp,
-                                'new_take_profit': new_take_profit,
-                                'trigger_price': current_price,
-                                'timestamp': datetime.now(),
-                                'profit_percent': (current_price - trade.entry_price) / trade.entry_price * 100
-                            }
-                            await self.database.insert_trailing_stop(trailing_data)
-                        except Exception as e:
-                            self.logger.error(f"❌ Erreur enregistrement trailing stop: {e}")
+                trailing_activated = await self.apply_trailing_stop(trade_id, trade, current_price)
 
                 # Vérification Take Profit (seulement si trailing stop pas activé)
                 if not trailing_activated and current_price >= trade.take_profit:
-                    await self.close_position(trade_id, current_price, "TAKE_PROFIT")
+                    await self.close_managed_position(trade_id, current_price, "TAKE_PROFIT")
                     continue
 
             except Exception as e:
                 self.logger.error(f"❌ Erreur gestion position {trade_id}: {e}")
 
+    async def close_managed_position(self, trade_id: str, exit_price: float, reason: str) -> bool:
+        """Fermeture décidée par la gestion périodique, abandonnée si le PositionEngine agit sur le trade
+
+        Les règles ont été évaluées avant plusieurs await (prix, exposition, volatilité, momentum):
+        entre-temps un tick a pu déclencher SL / trailing sur le même trade.
+        """
+        if self.position_engine.is_busy(trade_id):
+            self.logger.debug(f"⏭️ Fermeture {reason} de {trade_id} abandonnée: action du PositionEngine en cours")
+            return False
+        await self.close_position(trade_id, exit_price, reason)
+        return True
+
+    async def on_position_decision(self, trade_id: str, trade, decision: str, price: float):
+        """Décision du PositionEngine sur un tick bookTicker (prix = meilleur bid)"""
+        if trade_id not in self.open_positions:
+            return
+        
+        if decision == DECISION_TRAILING:
+            await self.apply_trailing_stop(trade_id, trade, price)
+        elif decision == DECISION_STOP_LOSS:
+            self.log_stop_loss_gap(trade, price)
+            await self.close_position(trade_id, price, "STOP_LOSS")
+        else:
+            await self.close_position(trade_id, price, "TAKE_PROFIT")
+
+    def log_position_engine_latency(self):
+        """Percentiles de latence du moteur de positions (tick -> décision, tick -> fin d'action)"""
+        report = self.position_engine.latency_report()
+        decision, action = report['decision'], report['action']
+        if decision:
+            self.logger.info(
+                f"⚡ Latence tick -> décision: p50 {decision['p50_us']:.0f}µs, p90 {decision['p90_us']:.0f}µs, "
+                f"p99 {decision['p99_us']:.0f}µs ({decision['count']} évaluations)"
+            )
+        if action:
+            self.logger.info(
+                f"⚡ Latence tick -> fin d'action: p50 {action['p50_us'] / 1000:.1f}ms, "
+                f"p99 {action['p99_us'] / 1000:.1f}ms ({action['count']} actions)"
+            )
+
+    def log_order_latency(self):
+        """Percentiles de latence signal -> acquittement (ordre d'entrée, ordres SL/TP)"""
+        report = self.order_templates.latency_report()
+        for label, latency in (("ordre d'entrée", report['entry']), ("ordres SL/TP", report['protection'])):
+            if latency:
+                self.logger.info(
+                    f"⚡ Latence signal -> {label}: p50 {latency['p50_us'] / 1000:.1f}ms, "
+                    f"p90 {latency['p90_us'] / 1000:.1f}ms, p99 {latency['p99_us'] / 1000:.1f}ms ({latency['count']} ordres)"
+                )
+        self.logger.debug(f"🧩 Gabarits d'ordres: {self.order_templates.stats}")
+
+    def log_stop_loss_gap(self, trade, current_price: float):
+        """Journalise un gap de marché au déclenchement du stop loss"""
+        # Analyse du gap de marché
+        expected_loss = abs((trade.stop_loss - trade.entry_price) / trade.entry_price * 100)
+        actual_loss = abs((current_price - trade.entry_price) / trade.entry_price * 100)
+        gap_excess = actual_loss - expected_loss
+
+        if gap_excess > 0.5:  # Gap significatif détecté
+            self.logger.error(f"🚨 GAP STOP LOSS {trade.pair}: Perte {actual_loss:.2f}% vs {expected_loss:.2f}% attendu (gap: {gap_excess:.2f}%)")
+
+            # Firebase logging pour analyse des gaps
+            if self.firebase_logger:
+                self.firebase_logger.log_message(
+                    level="ERROR",
+                    message=f"🚨 GAP STOP LOSS: {trade.pair} - Gap: {gap_excess:.2f}%",
+                    module="risk_management",
+                    pair=trade.pair,
+                    additional_data={
+                        'entry_price': trade.entry_price,
+                        'configured_stop_loss': trade.stop_loss,
+                        'actual_exit_price': current_price,
+                        'expected_loss_percent': expected_loss,
+                        'actual_loss_percent': actual_loss,
+                        'gap_excess_percent': gap_excess,
+                        'trade_duration': str(datetime.now() - trade.timestamp)
+                    }
+                )
+
+    async def apply_trailing_stop(self, trade_id: str, trade, current_price: float) -> bool:
+        """Remonte le stop loss (et le take profit) si le prix dépasse le seuil de trailing; True si mis à jour"""
+        # Nouveaux niveaux si le prix dépasse le seuil de trailing et remonte le stop
+        levels = trailing_levels(self.config, current_price, trade.stop_loss, trade.trailing_stop)
+        if levels is None:
+            return False
+
+        new_stop, new_take_profit = levels
+        old_stop = trade.stop_loss
+        old_tp = trade.take_profit
+
+        # Mise à jour du Stop Loss
+        trade.stop_loss = new_stop
+
+        # Mise à jour du Take Profit pour qu'il suive la progression
+        trade.take_profit = new_take_profit
+
+        # Déplacement du stop Binance: cancelReplace en tâche de fond, les pas de trailing
+        # reçus pendant une requête en vol sont regroupés (seul le dernier niveau est envoyé)
+        self.stop_updater.submit(trade_id, trade)
+
+        self.logger.info(f"📈 Trailing Stop mis à jour pour {trade.pair}:")
+        self.logger.info(f"   🛑 Nouveau SL: {new_stop:.4f} USDC (ancien: {old_stop:.4f})")
+        self.logger.info(f"   🎯 Nouveau TP: {new_take_profit:.4f} USDC (ancien: {old_tp:.4f})")
+
+        # Firebase logging pour trailing stop
+        if self.firebase_logger:
+            profit_percent = (current_price - trade.entry_price) / trade.entry_price * 100
+            self.firebase_logger.log_message(
+                level="INFO",
+                message=f"📈 TRAILING STOP: {trade.pair} - SL: {new_stop:.4f} (+{profit_percent:.2f}%)",
+                module="position_management",
+                trade_id=trade_id,
+                pair=trade.pair,
+                additional_data={
+                    'old_stop_loss': old_stop,
+                    'new_stop_loss': new_stop,
+                    'old_take_profit': old_tp,
+                    'new_take_profit': new_take_profit,
+                    'trigger_price': current_price,
+                    'profit_percent': profit_percent,
+                    'entry_price': trade.entry_price,
+                    'new_stop_order_id': trade.stop_loss_order_id
+                }
+            )
+
+        # Enregistrement en base de données
+        try:
+            trailing_data = {
+                'trade_id': trade.db_id,
+                'symbol': trade.pair,
+                'old_stop_loss': old_stop,
+                'new_stop_loss': new_stop,
+                'old_take_profit': old_tp,
+                'new_take_profit': new_take_profit,
+                'trigger_price': current_price,
+                'timestamp': datetime.now(),
+                'profit_percent': (current_price - trade.entry_price) / trade.entry_price * 100
+            }
+            await self.database.insert_trailing_stop(trailing_data)
+        except Exception as e:
+            self.logger.error(f"❌ Erreur enregistrement trailing stop: {e}")
+        return True
+
     async def close_position(self, trade_id: str, exit_price: float, reason: str):
-        """Ferme une position"""
+        """Ferme une position (une seule fermeture en cours par trade)"""
+        # PositionEngine (ticks), gestion périodique et surveillance peuvent décider la même sortie
+        if trade_id in self._closing or trade_id not in self.open_positions:
+            return
+        self._closing.add(trade_id)
+        try:
+            await self._close_position(trade_id, exit_price, reason)
+        finally:
+            self._closing.discard(trade_id)
+
+    async def _close_position(self, trade_id: str, exit_price: float, reason: str):
         try:
             trade = self.open_positions[trade_id]
             symbol = trade.pair
             
+            # Plus de déplacement du stop: la mise à jour en vol se termine avant l'annulation
+            await self.stop_updater.cancel(trade_id)
+            
             # Annuler l'ordre stop loss automatique s'il existe
             await self.cancel_automatic_stop_loss(trade, symbol)
             
@@ -3010,7 +3419,7 @@ class ScalpingBot:
             base_asset = symbol.replace('USDC', '')
             
             # Vérification du solde disponible
-            available_balance = self.get_asset_balance(base_asset)
+            available_balance = await self.get_asset_balance(base_asset)
             quantity_to_sell = trade.size
             
             # Gestion du solde insuffisant avec tolérance
@@ -3030,7 +3439,7 @@ class ScalpingBot:
                 # Ajustement intelligent du solde
                 usable_balance = available_balance * self.config.BALANCE_SAFETY_MARGIN  # Marge de sécurité
                 if usable_balance > 0:
-                    quantity_to_sell = self.round_quantity(symbol, usable_balance)
+                    quantity_to_sell = await self.round_quantity(symbol, usable_balance)
                     self.logger.info(f"🔧 Ajustement quantité de vente: {quantity_to_sell:.8f} {base_asset}")
                     
                     # Vérification que la quantité ajustée est valide
@@ -3042,19 +3451,19 @@ class ScalpingBot:
             # Passage de l'ordre de vente avec gestion d'erreur améliorée
             try:
                 # Vérification finale avant l'ordre
-                final_balance = self.get_asset_balance(base_asset)
+                final_balance = await self.get_asset_balance(base_asset)
                 if final_balance < quantity_to_sell:
                     self.logger.warning(f"⚠️ Solde changé entre les vérifications pour {symbol}")
                     self.logger.warning(f"   Nouveau solde: {final_balance:.8f} {base_asset}")
                     quantity_to_sell = min(quantity_to_sell, final_balance * self.config.BALANCE_SAFETY_MARGIN)
-                    quantity_to_sell = self.round_quantity(symbol, quantity_to_sell)
+                    quantity_to_sell = await self.round_quantity(symbol, quantity_to_sell)
                 
                 if quantity_to_sell <= 0:
                     self.logger.error(f"❌ Quantité finale invalide pour {symbol}, fermeture virtuelle")
                     await self.close_position_virtually(symbol, exit_price, f"{reason}_FINAL_CHECK_FAILED")
                     return
                 
-                order = self.binance_client.order_market_sell(
+                order = await self.exchange.order_market_sell(
                     symbol=symbol,
                     quantity=quantity_to_sell
                 )
@@ -3072,7 +3481,8 @@ class ScalpingBot:
                     
                     # Actualisation forcée des soldes après erreur
                     # Force une nouvelle lecture des soldes
-                    time.sleep(1)  # Attente pour synchronisation Binance
+                    await asyncio.sleep(1)  # Attente pour synchronisation Binance
+                    self.account.mark_stale()
                     
                     # Fermeture virtuelle avec détail de l'erreur
                     await self.close_position_virtually(symbol, exit_price, f"{reason}_BINANCE_INSUFFICIENT_BALANCE")
@@ -3096,7 +3506,7 @@ class ScalpingBot:
             trade.exit_reason = reason
             
             # CORRIGÉ: Calcul P&L réel basé sur la différence de capital
-            capital_after_trade = self.get_total_capital()
+            capital_after_trade = await self.get_total_capital()
             
             # Calcul théorique pour comparaison
             theoretical_pnl = (exit_price - trade.entry_price) * trade.size
@@ -3133,7 +3543,7 @@ class ScalpingBot:
             if self.consecutive_losses >= self.config.MAX_CONSECUTIVE_LOSSES and self.config.ENABLE_CONSECUTIVE_LOSS_PROTECTION:
                 if self.config.AUTO_RESUME_AFTER_PAUSE:
                     # Mode pause temporaire
-                    self.consecutive_loss_pause_until = datetime.now() + timedelta(minutes=self.config.CONSECUTIVE_LOSS_PAUSE_MINUTES)
+                    self.consecutive_loss_pause_until = loss_pause_end(self.config, self.consecutive_losses, datetime.now())
                     
                     self.logger.warning(f"⏸️ PAUSE TEMPORAIRE: {self.consecutive_losses} pertes consécutives")
                     self.logger.warning(f"   Reprise prévue: {self.consecutive_loss_pause_until.strftime('%H:%M:%S')}")
@@ -3213,7 +3623,7 @@ class ScalpingBot:
             self.logger.info(f"   💰 Prix de sortie: {exit_price:.4f} USDC")
             self.logger.info(f"   📊 P&L: {pnl_amount:+.2f} USDC ({pnl_percent:+.2f}%)")
             self.logger.info(f"   ⏱️ Durée: {trade.duration}")
-            total_capital = self.get_total_capital()
+            total_capital = await self.get_total_capital()
             daily_pnl_percent = self.daily_pnl / total_capital * 100
             self.logger.info(f"   🔄 Total journalier: {self.daily_pnl:+.2f} USDC ({daily_pnl_percent:+.2f}%)")
             
@@ -3244,7 +3654,7 @@ class ScalpingBot:
                     self.logger.error(f"❌ Erreur log_message Firebase trade CLOSE {symbol} (Error UUID: {error_uuid}): {log_error}")
             
             # Notification Telegram
-            total_capital = self.get_total_capital()
+            total_capital = await self.get_total_capital()
             await self.telegram_notifier.send_trade_close_notification(trade, pnl_amount, pnl_percent, self.daily_pnl, total_capital)
             
             # Log dans Google Sheets (si activé)
@@ -3351,7 +3761,7 @@ class ScalpingBot:
             self.logger.warning(f"   ⚠️ ATTENTION: Fermeture virtuelle - vérifiez manuellement")
             
             # Notification Telegram avec avertissement
-            total_capital = self.get_total_capital()
+            total_capital = await self.get_total_capital()
             await self.telegram_notifier.send_trade_close_notification(
                 trade, pnl_amount, pnl_percent, self.daily_pnl, total_capital
             )
@@ -3413,9 +3823,9 @@ class ScalpingBot:
         except Exception as e:
             self.logger.error(f"❌ Erreur fermeture virtuelle {trade_id}: {e}")
     
-    def should_stop_daily_trading(self) -> bool:
+    async def should_stop_daily_trading(self) -> bool:
         """Vérifie si on doit arrêter le trading pour la journée"""
-        total_capital = self.get_total_capital()
+        total_capital = await self.get_total_capital()
         daily_pnl_percent = self.daily_pnl / total_capital * 100
         
         # Objectif atteint
@@ -3437,7 +3847,7 @@ class ScalpingBot:
         # Firebase logging pour arrêt quotidien
         if self.firebase_logger:
             reason = "DAILY_TARGET" if self.daily_target_reached else "DAILY_STOP_LOSS"
-            total_capital = self.get_total_capital()
+            total_capital = await self.get_total_capital()
             daily_pnl_percent = self.daily_pnl / total_capital * 100
             
             self.firebase_logger.log_message(
@@ -3459,21 +3869,20 @@ class ScalpingBot:
         # Fermeture des positions ouvertes
         for trade_id in list(self.open_positions.keys()):
             trade = self.open_positions[trade_id]
-            ticker = self.binance_client.get_symbol_ticker(symbol=trade.pair)
-            current_price = float(ticker['price'])
+            current_price = await self.prices.get_price(trade.pair, force_refresh=True)
             reason = "DAILY_TARGET" if self.daily_target_reached else "DAILY_STOP_LOSS"
             await self.close_position(trade_id, current_price, reason)
         
         # Notification finale
         status = "✅ Objectif atteint" if self.daily_target_reached else "🛑 Stop loss quotidien atteint"
-        total_capital = self.get_total_capital()
+        total_capital = await self.get_total_capital()
         await self.telegram_notifier.send_daily_summary(
             status, self.daily_pnl, self.daily_trades, total_capital
         )
         
         # Log performance quotidienne (si activé)
         if self.sheets_logger:
-            total_capital = self.get_total_capital()
+            total_capital = await self.get_total_capital()
             await self.sheets_logger.log_daily_performance(
                 total_capital, self.daily_pnl, self.daily_trades, status
             )
@@ -3490,7 +3899,7 @@ class ScalpingBot:
             today = datetime.now().strftime('%Y-%m-%d')
             
             # Calcul des métriques basé sur le capital total dynamique
-            total_capital = self.get_total_capital()
+            total_capital = await self.get_total_capital()
             daily_pnl_percent = (self.daily_pnl / total_capital) * 100
             winning_trades = 0
             losing_trades = 0
@@ -3561,10 +3970,10 @@ class ScalpingBot:
             
             metrics = {
                 'timestamp': datetime.now(),
-                'current_capital': self.get_total_capital(),  # Capital total dynamique
+                'current_capital': await self.get_total_capital(),  # Capital total dynamique
                 'open_positions': len(self.open_positions),
                 'daily_pnl': self.daily_pnl,
-                'total_pnl': self.get_total_capital() - self.start_capital,  # P&L total par rapport au capital initial USDC
+                'total_pnl': await self.get_total_capital() - self.start_capital,  # P&L total par rapport au capital initial USDC
                 'win_rate': win_rate,
                 'pairs_analyzed': [trade.pair for trade in self.open_positions.values()],
                 'top_pair': list(self.open_positions.values())[0].pair if self.open_positions else None
@@ -3578,13 +3987,10 @@ class ScalpingBot:
     async def convert_dust_to_bnb_if_needed(self):
         """Convertit automatiquement les miettes de crypto en BNB si nécessaire"""
         try:
-            account_info = self.binance_client.get_account()
+            balances = await self.account.get_free_balances()
             dust_assets = []
             
-            for balance in account_info['balances']:
-                asset = balance['asset']
-                free_balance = float(balance['free'])
-                
+            for asset, free_balance in balances.items():
                 # Skip USDC, BNB et les soldes nuls
                 if asset in ['USDC', 'BNB'] or free_balance <= 0.00001:
                     continue
@@ -3592,8 +3998,7 @@ class ScalpingBot:
                 try:
                     # Calcul de la valeur en USDC
                     symbol = asset + 'USDC'
-                    ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-                    price_usdc = float(ticker['price'])
+                    price_usdc = await self.prices.get_price(symbol)
                     value_usdc = free_balance * price_usdc
                     
                     # Si c'est une miette
@@ -3615,7 +4020,8 @@ class ScalpingBot:
                 # Conversion via l'API Binance Dust Transfer
                 try:
                     assets_to_convert = [d['asset'] for d in dust_assets]
-                    result = self.binance_client.transfer_dust(**{'asset': assets_to_convert})
+                    result = await self.exchange.transfer_dust(asset=assets_to_convert)
+                    self.account.mark_stale()  # Soldes modifiés hors ordres: relus au prochain accès
                     
                     if result.get('transferResult'):
                         total_bnb = sum(float(r.get('transferedAmount', 0)) for r in result['transferResult'])
@@ -3645,9 +4051,8 @@ class ScalpingBot:
     async def check_positions_consistency(self):
         """Vérifie la cohérence entre les positions en mémoire et les soldes Binance + gère la surexposition"""
         try:
-            account_info = self.binance_client.get_account()
-            balances = {b['asset']: float(b['free']) for b in account_info['balances']}
-            total_capital = self.get_total_capital()
+            balances = await self.account.get_free_balances()
+            total_capital = await self.get_total_capital()
             max_exposure_per_asset = total_capital * self.config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
             
             # 1. Vérification des incohérences de positions tracées
@@ -3680,7 +4085,7 @@ class ScalpingBot:
                     
                 try:
                     # Calcul exposition actuelle de cet asset
-                    current_exposure = self.get_asset_exposure(asset)
+                    current_exposure = await self.get_asset_exposure(asset)
                     
                     if current_exposure > max_exposure_per_asset:
                         overexposed_assets.append({
@@ -3710,8 +4115,7 @@ class ScalpingBot:
                     # Calculer quelle quantité vendre pour revenir dans la limite
                     try:
                         symbol = asset + 'USDC'
-                        ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-                        current_price = float(ticker['price'])
+                        current_price = await self.prices.get_price(symbol, force_refresh=True)
                         
                         # Quantité à vendre = excès en USDC / prix actuel
                         quantity_to_sell = excess_eur / current_price
@@ -3722,14 +4126,14 @@ class ScalpingBot:
                             quantity_to_sell = balance * 0.95  # Marge de sécurité
                         
                         # Arrondir selon les règles de la paire
-                        quantity_to_sell = self.round_quantity(symbol, quantity_to_sell)
+                        quantity_to_sell = await self.round_quantity(symbol, quantity_to_sell)
                         
                         if quantity_to_sell > 0:
                             self.logger.warning(f"   🔧 VENTE FORCÉE {asset}: {quantity_to_sell:.8f} ({quantity_to_sell * current_price:.2f} USDC)")
                             
                             # Exécuter la vente d'urgence
                             try:
-                                order = self.binance_client.order_market_sell(
+                                order = await self.exchange.order_market_sell(
                                     symbol=symbol,
                                     quantity=quantity_to_sell
                                 )
@@ -3762,8 +4166,7 @@ class ScalpingBot:
                 if not has_tracked_position and balance > 0.001:
                     try:
                         symbol = asset + 'USDC'
-                        ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-                        current_price = float(ticker['price'])
+                        current_price = await self.prices.get_price(symbol)
                         value_usdc = balance * current_price
                         
                         if value_usdc > 100:  # Seuil significatif
@@ -3775,54 +4178,41 @@ class ScalpingBot:
         except Exception as e:
             self.logger.error(f"❌ Erreur vérification cohérence positions: {e}")
 
-    def calculate_volatility_1h(self, symbol: str) -> float:
+    async def calculate_volatility_1h(self, symbol: str) -> float:
         """
         Calcule la volatilité sur les 12 dernières heures pour une paire.
         Méthode : variation max-min sur prix moyen (en %).
         """
         try:
-            # Récupérer les données horaires (sur 12 heures pour une meilleure moyenne)
-            klines = self.binance_client.get_historical_klines(
-                symbol, "1h", "12 hours ago UTC"
-            )
+            # Amorçage depuis les données horaires seulement si une bougie clôturée manque
+            if not self.volatility_service.is_fresh(symbol):
+                candles = await self.kline_bundles.get(symbol).hourly_arrays()
+                self.volatility_service.seed(symbol, candles['open_time'], candles['close'])
 
-            if len(klines) < 2:
+            # Lecture O(1) de la fenêtre glissante 12h
+            volatility = self.volatility_service.get(symbol)
+            if volatility is None:
                 return 0.0
 
-            # Extraire les prix de clôture
-            prices = [float(kline[4]) for kline in klines]
-
-            if len(prices) >= 2:
-                max_price = max(prices)
-                min_price = min(prices)
-                avg_price = sum(prices) / len(prices)
-
-                if avg_price > 0:
-                    volatility = ((max_price - min_price) / avg_price) * 100
-                    self.logger.debug(f"📊 Volatilité 12h {symbol}: {volatility:.2f}%")
-                    return volatility
-                else:
-                    return 0.0
-
-            return 0.0
+            self.logger.debug(f"📊 Volatilité 12h {symbol}: {volatility:.2f}%")
+            return volatility
 
         except Exception as e:
             self.logger.error(f"❌ Erreur calcul volatilité 12h {symbol}: {e}")
             return 0.0
 
-    def count_trades_per_pair(self, symbol: str) -> int:
+    async def count_trades_per_pair(self, symbol: str) -> int:
         """Compte le nombre de trades ouverts NON-MIETTES pour une paire - VÉRIFICATION RENFORCÉE"""
         # Comptage en mémoire par symbole MAIS en ignorant les miettes
-        non_dust_trades = self.get_non_dust_trades_on_pair(symbol)
+        non_dust_trades = await self.get_non_dust_trades_on_pair(symbol)
         
         # Vérification supplémentaire via solde Binance
         try:
             base_asset = symbol.replace('USDC', '')
-            binance_balance = self.get_asset_balance(base_asset)
+            binance_balance = await self.get_asset_balance(base_asset)
             
             # Calculer la valeur du solde en USDC
-            ticker = self.binance_client.get_symbol_ticker(symbol=symbol)
-            current_price = float(ticker['price'])
+            current_price = await self.prices.get_price(symbol)
             balance_value_usdc = binance_balance * current_price
             
             # Si on a un solde significatif (non-miette) mais pas de position non-miette en mémoire = incohérence
@@ -3840,10 +4230,10 @@ class ScalpingBot:
             # En cas d'erreur, utiliser le comptage des trades non-miettes en mémoire
             return non_dust_trades
 
-    def can_open_position_enhanced(self, symbol: str, volatility: float) -> tuple[bool, str]:
+    async def can_open_position_enhanced(self, symbol: str, volatility: float) -> tuple[bool, str]:
         """Vérifie si on peut ouvrir une position selon les nouvelles règles"""
         # 1. Vérifier limite trades par paire - STRICT
-        current_trades = self.count_trades_per_pair(symbol)
+        current_trades = await self.count_trades_per_pair(symbol)
         if current_trades >= self.config.MAX_TRADES_PER_PAIR:
             return False, f"Limite trades par paire atteinte ({current_trades}/{self.config.MAX_TRADES_PER_PAIR})"
 
@@ -3866,12 +4256,12 @@ class ScalpingBot:
         
         # 4. VÉRIFICATION EXPOSITION : Contrôler AVANT + APRÈS la nouvelle position
         base_asset = symbol.replace('USDC', '')
-        current_exposure = self.get_asset_exposure(base_asset)
-        total_capital = self.get_total_capital()
+        current_exposure = await self.get_asset_exposure(base_asset)
+        total_capital = await self.get_total_capital()
         max_exposure_per_asset = total_capital * self.config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
         
         # Calcul de la nouvelle exposition après ajout de la position
-        new_position_size = self.calculate_position_size(symbol, volatility)
+        new_position_size = await self.calculate_position_size(symbol, volatility)
         future_exposure = current_exposure + new_position_size
         
         if current_exposure > max_exposure_per_asset:
@@ -3881,7 +4271,7 @@ class ScalpingBot:
             return False, f"Nouvelle position créerait surexposition {base_asset} ({current_exposure:.2f} + {new_position_size:.2f} = {future_exposure:.2f} USDC > {max_exposure_per_asset:.2f} USDC = {self.config.MAX_EXPOSURE_PER_ASSET_PERCENT}% du capital)"
         
         # 5. VÉRIFICATION CAPITAL : Capital USDC minimum disponible avec marge
-        usdc_balance = self.get_asset_balance('USDC')
+        usdc_balance = await self.get_asset_balance('USDC')
         if usdc_balance < new_position_size * 1.1:  # Marge de sécurité 10%
             return False, f"Capital USDC insuffisant ({usdc_balance:.2f} < {new_position_size * 1.1:.2f} USDC requis)"
         
@@ -3893,70 +4283,45 @@ class ScalpingBot:
         duration_minutes = (datetime.now() - trade.timestamp).total_seconds() / 60
         pnl_percent = (current_price - trade.entry_price) / trade.entry_price * 100
         
-        # Déterminer timeout selon volatilité
-        timeout_threshold = self.config.TRADE_TIMEOUT_LOW_VOLATILITY if volatility < 2.0 else self.config.TRADE_TIMEOUT_HIGH_VOLATILITY
-        
-        # Vérifier conditions de timeout
-        if duration_minutes > timeout_threshold:
-            # P&L dans la zone de timeout
-            min_range, max_range = self.config.MIN_TIMEOUT_PROFIT_RANGE
-            if min_range <= pnl_percent <= max_range:
-                # TODO: Vérifier indicateurs techniques (MACD, RSI neutres)
-                return True, f"TIMEOUT_ADAPTATIF ({duration_minutes:.0f}min, P&L:{pnl_percent:+.2f}%)"
-        
-        return False, ""
+        # Seuil selon volatilité et zone de P&L (règle partagée avec le backtest)
+        # TODO: Vérifier indicateurs techniques (MACD, RSI neutres)
+        reason = timeout_reason(self.config, duration_minutes, pnl_percent, volatility)
+        return (True, reason) if reason else (False, "")
 
     async def check_momentum_exit(self, trade: Trade, current_price: float, pnl_percent: float) -> tuple[bool, str]:
         """Vérifie si on doit sortir pour faiblesse du momentum"""
         try:
-            # Vérifier durée minimale avant sortie momentum
+            # Durée minimale et P&L dans la zone de momentum faible
             duration_minutes = (datetime.now() - trade.timestamp).total_seconds() / 60
-            if duration_minutes < self.config.MOMENTUM_MIN_DURATION_MINUTES:
-                return False, ""  # Trop tôt pour sortie momentum
-            
-            # Vérifier si P&L dans la zone de momentum faible
-            min_range, max_range = self.config.MOMENTUM_PNL_RANGE
-            if not (min_range <= pnl_percent <= max_range):
-                return False, ""  # P&L en dehors de la zone de momentum faible
-            
-            # Récupération des données techniques
-            klines = self.binance_client.get_klines(
-                symbol=trade.pair,
-                interval=getattr(Client, f'KLINE_INTERVAL_{self.config.TIMEFRAME}'),
-                limit=50
-            )
-            
-            if len(klines) < 30:
+            if not momentum_exit_window(self.config, duration_minutes, pnl_percent):
                 return False, ""
             
-            # Préparation des données
-            df = pd.DataFrame(klines, columns=[
-                'timestamp', 'open', 'high', 'low', 'close', 'volume',
-                'close_time', 'quote_volume', 'trades_count', 'taker_buy_base', 'taker_buy_quote', 'ignore'
-            ])
-            
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = df[col].astype(float)
+            # Récupération des données techniques (CandleStore temps réel, sinon REST)
+            interval = getattr(AsyncClient, f'KLINE_INTERVAL_{self.config.TIMEFRAME}')
+            if self.candle_store.is_ready(trade.pair, interval, 50):
+                candles = self.candle_store.ohlcv(trade.pair, interval, 50)
+            else:
+                klines = await self.exchange.get_klines(
+                    symbol=trade.pair,
+                    interval=interval,
+                    limit=50
+                )
+                
+                if len(klines) < 30:
+                    return False, ""
+                
+                # Préparation des données
+                candles = klines_to_arrays(klines)
             
-            # Calcul RSI
-            rsi = talib.RSI(df['close'], timeperiod=self.config.RSI_PERIOD) # type: ignore
-            if np.isnan(rsi.iloc[-1]):
-                return False, ""
+            # Calcul RSI (indicateurs incrémentaux de la paire, sinon cache partagé)
+            rsi = self.technical_analyzer.rsi(candles, trade.pair, self.config.RSI_PERIOD)
             
             # Calcul MACD
-            macd, macdsignal, macdhist = talib.MACD(df['close']) # type: ignore
-            if np.isnan(macdhist.iloc[-1]):
-                return False, ""
+            macd, macdsignal, macdhist = self.technical_analyzer.macd(candles, trade.pair)
             
             # Conditions de sortie momentum faible
-            rsi_condition = rsi.iloc[-1] < self.config.MOMENTUM_RSI_THRESHOLD
-            macd_condition = macdhist.iloc[-1] < 0 if self.config.MOMENTUM_MACD_NEGATIVE else True
-            
-            if rsi_condition and macd_condition:
-                reason = f"Momentum faible détecté (RSI:{rsi.iloc[-1]:.1f}, MACD_hist:{macdhist.iloc[-1]:.6f}, P&L:{pnl_percent:+.2f}%)"
-                return True, reason
-            
-            return False, ""
+            reason = momentum_exit_reason(self.config, rsi[-1], macdhist[-1], pnl_percent)
+            return (True, reason) if reason else (False, "")
             
         except Exception as e:
             self.logger.error(f"❌ Erreur vérification momentum {trade.pair}: {e}")
@@ -3965,11 +4330,7 @@ class ScalpingBot:
     # OPTIMISÉ: Nouvelles fonctions de protection
     def clean_old_trades_from_hour(self):
         """Nettoie les trades de plus d'une heure"""
-        now = datetime.now()
-        self.trades_per_hour = [
-            trade_time for trade_time in self.trades_per_hour 
-            if (now - trade_time).total_seconds() < 3600  # 1 heure = 3600 secondes
-        ]
+        self.trades_per_hour = trades_last_hour(self.trades_per_hour, datetime.now())
 
     def can_trade_within_hourly_limit(self) -> bool:
         """Vérifie si on peut trader selon la limite horaire"""
@@ -4005,54 +4366,34 @@ class ScalpingBot:
 
     def update_trade_result(self, is_profit: bool):
         """Met à jour le suivi des résultats de trades"""
-        self.last_trade_results.append(is_profit)
-        
-        # Garder seulement les 10 derniers trades
-        if len(self.last_trade_results) > 10:
-            self.last_trade_results.pop(0)
+        # 10 derniers résultats, pertes consécutives comptées depuis la fin
+        previous_losses = self.consecutive_losses
+        self.consecutive_losses = record_trade_result(self.last_trade_results, is_profit)
         
         # Si c'est un profit, reset le compteur de pertes consécutives et la pause
         if is_profit:
-            if self.consecutive_losses > 0:
-                self.logger.info(f"✅ PROFIT: Reset du compteur de pertes consécutives ({self.consecutive_losses} → 0)")
-            self.consecutive_losses = 0
+            if previous_losses > 0:
+                self.logger.info(f"✅ PROFIT: Reset du compteur de pertes consécutives ({previous_losses} → 0)")
             self.consecutive_loss_pause_until = None  # Annuler toute pause en cours
-        else:
-            # Compter les pertes consécutives depuis la fin
-            self.consecutive_losses = 0
-            for result in reversed(self.last_trade_results):
-                if not result:  # Si c'est une perte
-                    self.consecutive_losses += 1
-                else:  # Si c'est un profit, arrêter le comptage
-                    break
         
         # Log important si on approche de la limite
         if self.consecutive_losses >= self.config.MAX_CONSECUTIVE_LOSSES - 1:
             self.logger.warning(f"⚠️ ATTENTION: {self.consecutive_losses} pertes consécutives (limite: {self.config.MAX_CONSECUTIVE_LOSSES})")
 
-    def check_breakout_confirmation(self, symbol: str, current_price: float) -> bool:
+    async def check_breakout_confirmation(self, symbol: str, current_price: float) -> bool:
         """Vérifie la confirmation de cassure"""
         if not self.config.ENABLE_BREAKOUT_CONFIRMATION:
             return True
         
         try:
             # Récupérer les dernières bougies pour trouver le dernier sommet
-            klines = self.binance_client.get_klines(
-                symbol=symbol,
-                interval=Client.KLINE_INTERVAL_1MINUTE,
-                limit=20
-            )
+            candles = await self.kline_bundles.get(symbol).minute_arrays(20)
             
-            if len(klines) < 10:
+            # Plus haut des 20 dernières minutes (bougie courante exclue) + seuil
+            confirmation_threshold = breakout_threshold(candles['high'], self.config.BREAKOUT_CONFIRMATION_PERCENT)
+            if confirmation_threshold is None:
                 return True  # Pas assez de données, on laisse passer
             
-            # Trouver le plus haut des 20 dernières minutes
-            highs = [float(k[2]) for k in klines[:-1]]  # Exclure la bougie courante
-            last_high = max(highs)
-            
-            # Vérifier si le prix actuel dépasse le dernier sommet + seuil
-            confirmation_threshold = last_high * (1 + self.config.BREAKOUT_CONFIRMATION_PERCENT / 100)
-            
             if current_price > confirmation_threshold:
                 self.logger.info(f"✅ Cassure confirmée {symbol}: {current_price:.4f} > {confirmation_threshold:.4f}")
                 return True
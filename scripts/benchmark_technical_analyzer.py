@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de l'analyse technique par paire
+Compare le chemin DataFrame (klines REST -> DataFrame 12 colonnes -> astype -> analyze_pair)
+au chemin tableaux numpy (colonnes OHLCV -> analyze_candles) et à l'analyse groupée
+(matrice paires x bougies -> analyze_batch), et vérifie la parité des résultats
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import numpy as np
+    import pandas as pd
+
+    from utils.kline_bundle import KLINE_COLUMNS, klines_to_arrays
+    from utils.technical_indicators import TechnicalAnalyzer
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    print("Assurez-vous d'avoir installé: pip install numpy pandas TA-Lib")
+    sys.exit(1)
+
+
+def synthetic_klines(count: int, seed: int) -> list:
+    """Klines au format REST Binance (valeurs en chaînes)"""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.3, count))
+    open_ = close + rng.normal(0, 0.1, count)
+    high = np.maximum(open_, close) + np.abs(rng.normal(0, 0.2, count))
+    low = np.minimum(open_, close) - np.abs(rng.normal(0, 0.2, count))
+    volume = np.abs(rng.normal(100, 40, count))
+    return [
+        [1_700_000_000_000 + i * 60_000, f"{open_[i]:.8f}", f"{high[i]:.8f}", f"{low[i]:.8f}",
+         f"{close[i]:.8f}", f"{volume[i]:.8f}", 0, "0", 0, "0", "0", "0"]
+        for i in range(count)
+    ]
+
+
+def dataframe_path(analyzer: TechnicalAnalyzer, klines: list, pair: str):
+    """Chemin historique des call sites: DataFrame 12 colonnes + astype(float)"""
+    df = pd.DataFrame(klines, columns=KLINE_COLUMNS)
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        df[col] = df[col].astype(float)
+    return analyzer.analyze_pair(df, pair)
+
+
+def signature(analysis) -> tuple:
+    return (
+        tuple((s.indicator, s.condition, s.strength.name, s.description) for s in analysis.signals),
+        analysis.total_score, analysis.recommendation, analysis.trend, analysis.momentum, analysis.volatility
+    )
+
+
+def bench(func, iterations: int) -> float:
+    """Durée moyenne par appel en microsecondes"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run_benchmark(pairs: int = 40, candles: int = 100, iterations: int = 50):
+    print("⏱️ BENCHMARK ANALYSE TECHNIQUE PAR PAIRE")
+    print("=" * 40)
+
+    analyzer = TechnicalAnalyzer()
+    dataset = [synthetic_klines(candles, seed) for seed in range(pairs)]
+    # Côté tableaux: colonnes déjà disponibles (CandleStore / KlineBundle)
+    arrays = [klines_to_arrays(klines) for klines in dataset]
+
+    # Parité des résultats
+    mismatches = sum(
+        signature(dataframe_path(analyzer, klines, f"P{i}")) != signature(analyzer.analyze_candles(candles_, f"P{i}"))
+        for i, (klines, candles_) in enumerate(zip(dataset, arrays))
+    )
+    print(f"\n🔍 Parité DataFrame / tableaux: {pairs - mismatches}/{pairs} paires identiques")
+
+    before = bench(lambda: [dataframe_path(analyzer, k, "X") for k in dataset], iterations) / pairs
+    after = bench(lambda: [analyzer.analyze_candles(c, "X") for c in arrays], iterations) / pairs
+    conversion = bench(lambda: [klines_to_arrays(k) for k in dataset], iterations) / pairs
+
+    print(f"\n📊 {pairs} paires x {candles} bougies, {iterations} itérations")
+    print(f"   Avant (DataFrame + astype + analyse):   {before:8.1f} µs / paire")
+    print(f"   Après (tableaux numpy + analyse):       {after:8.1f} µs / paire")
+    print(f"   Après + conversion klines REST:         {after + conversion:8.1f} µs / paire")
+    print(f"   🚀 Gain: x{before / after:.1f} (x{before / (after + conversion):.1f} depuis le REST)")
+
+    return mismatches == 0
+
+
+def run_batch_benchmark(candles: int = 100, iterations: int = 20):
+    print("\n⏱️ BENCHMARK ANALYSE GROUPÉE (PAIRES x BOUGIES)")
+    print("=" * 40)
+
+    analyzer = TechnicalAnalyzer()
+    ok = True
+    for pairs in (10, 40, 160):
+        arrays = [klines_to_arrays(synthetic_klines(candles, seed)) for seed in range(pairs)]
+        names = [f"P{i}" for i in range(pairs)]
+        matrices = [np.vstack([a[field] for a in arrays]) for field in ('open', 'high', 'low', 'close', 'volume')]
+
+        batch = analyzer.analyze_batch(names, *matrices)
+        mismatches = sum(
+            signature(analyzer.analyze_candles(a, name)) != signature(analysis)
+            for a, name, analysis in zip(arrays, names, batch)
+        )
+        ok &= mismatches == 0
+
+        single = bench(lambda: [analyzer.analyze_candles(a, n) for a, n in zip(arrays, names)], iterations)
+        grouped = bench(lambda: analyzer.analyze_batch(names, *matrices), iterations)
+        print(f"   {pairs:4d} paires: {single / 1000:7.2f} ms (analyses individuelles) -> "
+              f"{grouped / 1000:6.2f} ms (groupée) x{single / grouped:.1f} - parité {pairs - mismatches}/{pairs}")
+
+    return ok
+
+
+if __name__ == "__main__":
+    single_ok = run_benchmark()
+    batch_ok = run_batch_benchmark()
+    sys.exit(0 if single_ok and batch_ok else 1)
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Faux user-data stream Binance (serveur WebSocket local)
+Diffuse des événements executionReport / outboundAccountPosition à la demande, pour tester
+l'OrderEventBus hors ligne. Toute listenKey est acceptée sur /ws/<listenKey>.
+
+Usage:
+    python scripts/fake_user_stream.py --port 8766 --symbol BTCUSDC --interval 5
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import websockets
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    print("Assurez-vous d'avoir installé: pip install websockets")
+    sys.exit(1)
+
+
+def now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def execution_report(order_id: int, symbol: str, status: str, quantity: float, price: float,
+                     side: str = 'SELL', order_type: str = 'STOP_LOSS_LIMIT', stop_price: float = 0.0,
+                     executed_qty: float = 0.0, order_list_id: int = -1) -> Dict:
+    """executionReport au format Binance (exécution au prix limite)"""
+    event_time = now_ms()
+    return {
+        'e': 'executionReport', 'E': event_time, 's': symbol, 'c': f"fake{order_id}",
+        'S': side, 'o': order_type, 'f': 'GTC', 'q': f"{quantity:.8f}", 'p': f"{price:.8f}",
+        'P': f"{stop_price:.8f}", 'g': order_list_id,
+        'x': 'TRADE' if executed_qty > 0 else ('NEW' if status == 'NEW' else status),
+        'X': status, 'i': order_id, 'l': f"{executed_qty:.8f}", 'z': f"{executed_qty:.8f}",
+        'L': f"{price if executed_qty > 0 else 0:.8f}", 'n': '0', 'N': None, 'T': event_time,
+        'Z': f"{executed_qty * price:.8f}"
+    }
+
+
+def account_position(balances: Dict[str, float]) -> Dict:
+    """outboundAccountPosition: soldes disponibles absolus des assets modifiés"""
+    event_time = now_ms()
+    return {
+        'e': 'outboundAccountPosition', 'E': event_time, 'u': event_time,
+        'B': [{'a': asset, 'f': f"{free:.8f}", 'l': '0.00000000'} for asset, free in balances.items()]
+    }
+
+
+class FakeUserStream:
+    """Serveur local: chaque événement poussé est diffusé à tous les clients connectés"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.clients: Set = set()
+        self.connections = 0
+        self._server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}"
+
+    async def start(self):
+        self._server = await websockets.serve(self._handler, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handler(self, websocket, *args):
+        self.clients.add(websocket)
+        self.connections += 1
+        try:
+            await websocket.wait_closed()
+        finally:
+            self.clients.discard(websocket)
+
+    async def wait_for_clients(self, count: int = 1, timeout: float = 5.0) -> bool:
+        """Attend qu'au moins `count` clients soient connectés"""
+        deadline = time.monotonic() + timeout
+        while len(self.clients) < count and time.monotonic() < deadline:
+            await asyncio.sleep(0.01)
+        return len(self.clients) >= count
+
+    async def push(self, event: Dict):
+        """Diffuse un événement à tous les clients"""
+        message = json.dumps(event)
+        for client in list(self.clients):
+            try:
+                await client.send(message)
+            except websockets.ConnectionClosed:
+                self.clients.discard(client)
+
+    async def expire_listen_key(self):
+        """Simule l'expiration de la listenKey (Binance envoie listenKeyExpired)"""
+        await self.push({'e': 'listenKeyExpired', 'E': now_ms()})
+
+
+class FakeListenKeyExchange:
+    """Passerelle minimale: listenKeys factices pour l'OrderEventBus"""
+
+    def __init__(self):
+        self._keys = itertools.count(1)
+        self.keepalives = 0
+        self.closed: Optional[str] = None
+
+    async def get_listen_key(self) -> str:
+        return f"fakeListenKey{next(self._keys)}"
+
+    async def keepalive_listen_key(self, listen_key: str) -> Dict:
+        self.keepalives += 1
+        return {}
+
+    async def close_listen_key(self, listen_key: str) -> Dict:
+        self.closed = listen_key
+        return {}
+
+
+async def run_scenario(port: int, symbol: str, interval: float):
+    """Boucle de démonstration: ordre stop loss créé puis exécuté toutes les `interval` secondes"""
+    stream = FakeUserStream(port=port)
+    await stream.start()
+    print(f"🎬 Faux user-data stream sur {stream.url}/ws/<listenKey>")
+
+    for order_id in itertools.count(1):
+        await asyncio.sleep(interval)
+        if not stream.clients:
+            continue
+        await stream.push(execution_report(order_id, symbol, 'NEW', 1.0, 100.0, stop_price=100.5))
+        await asyncio.sleep(interval / 2)
+        await stream.push(execution_report(order_id, symbol, 'FILLED', 1.0, 100.0, stop_price=100.5, executed_qty=1.0))
+        await stream.push(account_position({'USDC': 100.0 * order_id}))
+        print(f"   📤 Ordre {order_id} exécuté ({len(stream.clients)} client(s))")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Faux user-data stream Binance")
+    parser.add_argument('--port', type=int, default=8766)
+    parser.add_argument('--symbol', default='BTCUSDC')
+    parser.add_argument('--interval', type=float, default=5.0)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_scenario(args.port, args.symbol, args.interval))
+    except KeyboardInterrupt:
+        print("\n🛑 Arrêt du faux user-data stream")
+
+
+if __name__ == "__main__":
+    main()
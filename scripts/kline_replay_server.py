@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Serveur WebSocket local de rejeu des streams kline Binance
+Permet de tester le CandleStore hors ligne avec des frames enregistrées
+
+Usage:
+    python scripts/kline_replay_server.py record --symbols BTCUSDC ETHUSDC --count 500 --output data/kline_frames.jsonl
+    python scripts/kline_replay_server.py serve --input data/kline_frames.jsonl --port 8765 --speed 10
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import websockets
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    print("Assurez-vous d'avoir installé: pip install websockets")
+    sys.exit(1)
+
+
+async def record_frames(symbols: List[str], intervals: List[str], count: int, output: str,
+                        stream_url: str = "wss://stream.binance.com:9443"):
+    """Enregistre des frames du stream combiné Binance au format JSONL"""
+    streams = "/".join(f"{s.lower()}@kline_{i}" for s in symbols for i in intervals)
+    url = f"{stream_url}/stream?streams={streams}"
+    print(f"📡 Enregistrement de {count} frames depuis {url}")
+
+    Path(output).parent.mkdir(parents=True, exist_ok=True)
+    start = time.monotonic()
+    with open(output, 'w') as f:
+        async with websockets.connect(url) as ws:
+            for i in range(count):
+                raw = await ws.recv()
+                f.write(json.dumps({'t': round(time.monotonic() - start, 3), 'frame': json.loads(raw)}) + "\n")
+                if (i + 1) % 100 == 0:
+                    print(f"   {i + 1}/{count} frames")
+
+    print(f"✅ Frames enregistrées dans {output}")
+
+
+def load_frames(path: str) -> List[dict]:
+    """Charge les frames enregistrées"""
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def make_replay_handler(frames: List[dict], speed: float = 1.0):
+    """Handler websockets qui rejoue les frames à chaque client connecté"""
+
+    async def handler(websocket, *args):
+        async def consume_requests():
+            # Répond aux SUBSCRIBE/UNSUBSCRIBE comme Binance (result null)
+            async for raw in websocket:
+                try:
+                    request = json.loads(raw)
+                    await websocket.send(json.dumps({'result': None, 'id': request.get('id')}))
+                except Exception:
+                    pass
+
+        consumer = asyncio.create_task(consume_requests())
+        try:
+            previous_t = frames[0]['t'] if frames else 0.0
+            for entry in frames:
+                delay = (entry['t'] - previous_t) / speed if speed > 0 else 0
+                previous_t = entry['t']
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await websocket.send(json.dumps(entry['frame']))
+            # Connexion maintenue ouverte après le rejeu
+            await consumer
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            consumer.cancel()
+
+    return handler
+
+
+async def serve(frames: List[dict], host: str = "127.0.0.1", port: int = 8765, speed: float = 1.0):
+    """Sert les frames sur ws://host:port (chemin /stream accepté comme Binance)"""
+    async with websockets.serve(make_replay_handler(frames, speed), host, port):
+        print(f"🎬 Rejeu de {len(frames)} frames sur ws://{host}:{port}/stream (vitesse x{speed})")
+        await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu local des streams kline Binance")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    rec = sub.add_parser('record', help="Enregistrer des frames depuis Binance")
+    rec.add_argument('--symbols', nargs='+', required=True)
+    rec.add_argument('--intervals', nargs='+', default=['1m', '1h'])
+    rec.add_argument('--count', type=int, default=500)
+    rec.add_argument('--output', default='data/kline_frames.jsonl')
+
+    srv = sub.add_parser('serve', help="Rejouer des frames enregistrées")
+    srv.add_argument('--input', default='data/kline_frames.jsonl')
+    srv.add_argument('--host', default='127.0.0.1')
+    srv.add_argument('--port', type=int, default=8765)
+    srv.add_argument('--speed', type=float, default=1.0)
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == 'record':
+            asyncio.run(record_frames(args.symbols, args.intervals, args.count, args.output))
+        else:
+            asyncio.run(serve(load_frames(args.input), args.host, args.port, args.speed))
+    except KeyboardInterrupt:
+        print("\n🛑 Arrêt du serveur de rejeu")
+
+
+if __name__ == "__main__":
+    main()
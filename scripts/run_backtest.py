@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Backtest des règles du bot sur les bougies 1m archivées par le MarketRecorder
+
+Usage:
+    python scripts/run_backtest.py --root data/market --start 2025-10-01 --end 2025-10-14
+    python scripts/run_backtest.py --symbols BTCUSDC ETHUSDC SOLUSDC --capital 5000 --trades 20
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from config import TradingConfig
+    from utils.backtester import Backtester, MarketData, to_datetime
+    from utils.market_recorder import KLINES, MarketArchive
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest des règles du bot sur l'archive de marché")
+    parser.add_argument('--root', default='data/market', help="Racine de l'archive")
+    parser.add_argument('--symbols', nargs='+', help="Paires à rejouer (toutes par défaut)")
+    parser.add_argument('--start', help="Première date incluse (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Dernière date incluse (YYYY-MM-DD)")
+    parser.add_argument('--capital', type=float, help="Capital USDC de départ")
+    parser.add_argument('--trades', type=int, default=10, help="Nombre de trades affichés")
+    args = parser.parse_args()
+
+    archive = MarketArchive(args.root)
+    if not archive.symbols(KLINES):
+        print(f"❌ Aucune bougie dans l'archive {args.root}")
+        sys.exit(1)
+
+    data = MarketData.from_archive(archive, args.symbols, args.start, args.end)
+    print(f"📂 {len(data.symbols)} paires, {data.candles} bougies "
+          f"({to_datetime(int(data.open_time[0]))} -> {to_datetime(int(data.open_time[-1]))})")
+
+    backtester = Backtester(TradingConfig(), data, initial_capital=args.capital)
+    result = backtester.run()
+    summary = result.summary()
+
+    print("\n📊 RÉSULTATS")
+    print("=" * 40)
+    print(f"Trades: {summary['trades']} | Taux de réussite: {summary['win_rate']:.1f}%")
+    print(f"P&L: {summary['pnl']:+.2f} USDC ({summary['pnl_percent']:+.2f}%)")
+    print(f"Drawdown max: {summary['max_drawdown_percent']:.2f}%")
+    print(f"Frais: {summary['fees']:.2f} USDC | Glissement: {summary['slippage']:.2f} USDC "
+          f"({summary['fee_drag_percent']:.2f}% du capital)")
+    print(f"Sorties: {result.exit_reasons()}")
+    print(f"Refus: {backtester.stats['refused']}")
+    print(f"⚡ {backtester.stats['elapsed_seconds']:.2f}s ({backtester.stats['candles_per_minute'] / 1e6:.1f}M bougies/min)")
+
+    for trade in result.trades[-args.trades:]:
+        print(f"  {to_datetime(trade.entry_time):%Y-%m-%d %H:%M} {trade.pair:<12} {trade.pnl:+8.2f} USDC "
+              f"{trade.duration_minutes:5.0f}min {trade.exit_reason}")
+
+
+if __name__ == "__main__":
+    main()
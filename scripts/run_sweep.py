@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Balayage des paramètres de TradingConfig par backtests parallèles sur l'archive de marché
+
+Usage (grille: valeurs séparées par des virgules):
+    python scripts/run_sweep.py --param STOP_LOSS_PERCENT=0.2,0.25,0.3 --param TAKE_PROFIT_PERCENT=0.8,1.2
+
+Usage (tirage aléatoire: intervalle min:max ou liste de valeurs):
+    python scripts/run_sweep.py --random 200 --param STOP_LOSS_PERCENT=0.15:0.5 --param MIN_SIGNAL_CONDITIONS=3,4,5
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import pandas as pd
+    from config import TradingConfig
+    from utils.backtester import MarketData
+    from utils.market_recorder import MarketArchive
+    from utils.parameter_sweep import ParameterSweep, config_fields, grid, random_search
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+def parse_value(kind: type, text: str):
+    if kind is bool:
+        return text.lower() in ('1', 'true', 'oui', 'yes')
+    return kind(text) if kind in (int, float) else text
+
+
+def parse_space(specs):
+    """NOM=v1,v2,v3 (valeurs) ou NOM=min:max (intervalle, tirage aléatoire uniquement)"""
+    types = config_fields()
+    space = {}
+    for spec in specs:
+        name, _, values = spec.partition('=')
+        if name not in types:
+            raise ValueError(f"Paramètre inconnu dans TradingConfig: {name}")
+        if ':' in values:
+            low, high = values.split(':', 1)
+            space[name] = (parse_value(types[name], low), parse_value(types[name], high))
+        else:
+            space[name] = [parse_value(types[name], value) for value in values.split(',')]
+    return space
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balayage parallèle des paramètres de TradingConfig")
+    parser.add_argument('--param', action='append', required=True, help="NOM=v1,v2 ou NOM=min:max")
+    parser.add_argument('--random', type=int, help="Nombre de combinaisons tirées au hasard (grille sinon)")
+    parser.add_argument('--seed', type=int, help="Graine du tirage aléatoire")
+    parser.add_argument('--root', default='data/market', help="Racine de l'archive")
+    parser.add_argument('--symbols', nargs='+', help="Paires à rejouer (toutes par défaut)")
+    parser.add_argument('--start', help="Première date incluse (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Dernière date incluse (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, help="Processus (BACKTEST_SWEEP_WORKERS par défaut)")
+    parser.add_argument('--top', type=int, default=20, help="Lignes affichées")
+    parser.add_argument('--output', help="Fichier CSV du tableau complet")
+    args = parser.parse_args()
+
+    try:
+        space = parse_space(args.param)
+        if args.random:
+            combinations = random_search(space, args.random, args.seed)
+        elif any(isinstance(values, tuple) for values in space.values()):
+            raise ValueError("Les intervalles min:max nécessitent --random")
+        else:
+            combinations = grid(space)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    data = MarketData.from_archive(MarketArchive(args.root), args.symbols, args.start, args.end)
+    print(f"📂 {len(data.symbols)} paires, {data.candles} bougies, {len(combinations)} combinaisons")
+
+    with ParameterSweep(data, TradingConfig(), workers=args.workers) as sweep:
+        table = sweep.run(combinations)
+        print(f"⚡ {sweep.stats['combinations']} backtests en {sweep.stats['elapsed_seconds']:.1f}s "
+              f"sur {sweep.workers} processus ({sweep.stats['errors']} erreurs)")
+
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(table.head(args.top).round(3).to_string())
+    if args.output:
+        table.to_csv(args.output)
+        print(f"💾 Tableau complet: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Optimisation walk-forward de TradingConfig sur l'archive de marché
+Optimise sur chaque fenêtre d'entraînement, évalue sur la fenêtre suivante, compare à config.py
+
+Usage:
+    python scripts/run_walk_forward.py --param STOP_LOSS_PERCENT=0.2,0.25,0.3 --param TAKE_PROFIT_PERCENT=0.8,1.2
+    python scripts/run_walk_forward.py --random 100 --seed 1 --param STOP_LOSS_PERCENT=0.15:0.5 \\
+        --train-days 21 --test-days 7 --output data/walk_forward
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import pandas as pd
+    from config import TradingConfig
+    from run_sweep import parse_space
+    from utils.backtester import MarketData
+    from utils.market_recorder import MarketArchive
+    from utils.parameter_sweep import RESULT_COLUMNS, grid, random_search
+    from utils.walk_forward import WalkForward
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Optimisation walk-forward de TradingConfig")
+    parser.add_argument('--param', action='append', required=True, help="NOM=v1,v2 ou NOM=min:max")
+    parser.add_argument('--random', type=int, help="Nombre de combinaisons tirées au hasard (grille sinon)")
+    parser.add_argument('--seed', type=int, help="Graine du tirage aléatoire")
+    parser.add_argument('--train-days', type=int, help="Jours d'entraînement (WALK_FORWARD_TRAIN_DAYS par défaut)")
+    parser.add_argument('--test-days', type=int, help="Jours de test (WALK_FORWARD_TEST_DAYS par défaut)")
+    parser.add_argument('--step-days', type=int, help="Décalage entre plis (jours de test par défaut)")
+    parser.add_argument('--objective', default='pnl', choices=RESULT_COLUMNS, help="Critère d'optimisation")
+    parser.add_argument('--root', default='data/market', help="Racine de l'archive")
+    parser.add_argument('--symbols', nargs='+', help="Paires à rejouer (toutes par défaut)")
+    parser.add_argument('--start', help="Première date incluse (YYYY-MM-DD)")
+    parser.add_argument('--end', help="Dernière date incluse (YYYY-MM-DD)")
+    parser.add_argument('--workers', type=int, help="Processus (BACKTEST_SWEEP_WORKERS par défaut)")
+    parser.add_argument('--output', help="Préfixe des fichiers CSV (plis et stabilité)")
+    args = parser.parse_args()
+
+    try:
+        space = parse_space(args.param)
+        if args.random:
+            combinations = random_search(space, args.random, args.seed)
+        elif any(isinstance(values, tuple) for values in space.values()):
+            raise ValueError("Les intervalles min:max nécessitent --random")
+        else:
+            combinations = grid(space)
+
+        data = MarketData.from_archive(MarketArchive(args.root), args.symbols, args.start, args.end)
+        walk_forward = WalkForward(data, combinations, TradingConfig(), args.train_days, args.test_days,
+                                   args.step_days, args.objective, args.workers)
+        print(f"📂 {len(data.symbols)} paires, {data.candles} bougies, {len(walk_forward.windows())} plis "
+              f"x {len(combinations)} combinaisons")
+        report = walk_forward.run()
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print("\n📊 PLIS (paramètres optimisés in-sample, résultats out-of-sample)")
+        print(report.folds.round(3).to_string())
+        print("\n📐 STABILITÉ DES PARAMÈTRES")
+        print(report.stability.round(3).to_string())
+
+    summary = report.summary()
+    print(f"\nHors échantillon: {summary['test_pnl']:+.2f} USDC sur {summary['test_trades']} trades "
+          f"(config.py: {summary['baseline_test_pnl']:+.2f} USDC)")
+    print(f"Efficacité walk-forward: {summary['efficiency']:.2f} | Plis gagnants: {summary['profitable_folds_percent']:.0f}%")
+
+    if args.output:
+        report.folds.to_csv(f"{args.output}_folds.csv")
+        report.stability.to_csv(f"{args.output}_stability.csv")
+        print(f"💾 {args.output}_folds.csv, {args.output}_stability.csv")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test du backtest événementiel
+Parité des signaux vectorisés (talib et indicateurs incrémentaux) et de la volatilité avec le bot, chemin intra-bougie (SL / trailing / TP),
+limites d'ouverture, coûts simulés et débit sur plusieurs paires
+"""
+
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from config import TradingConfig
+    from utils.backtester import (CANDLE_FIELDS, HOUR_MS, MINUTE_MS, Backtester, BacktestTrade, MarketData,
+                                  SimulatedExchange, TradeLimits, rolling_volatility)
+    from utils.market_recorder import KLINES, schema_dtype
+    from utils.technical_indicators import TechnicalAnalyzer
+    from utils.trading_rules import entry_levels
+    from utils.volatility_service import VolatilityService
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+START_MS = 1_760_000_000_000 - 1_760_000_000_000 % HOUR_MS
+
+
+def synthetic_klines(minutes: int, seed: int) -> np.ndarray:
+    """Marche aléatoire 1m avec cycles de tendance (assez de signaux pour ouvrir des positions)"""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.0015, minutes) + 0.0004 * np.sin(np.arange(minutes) / 200)
+    close = 50 * np.exp(np.cumsum(returns))
+    open_ = np.r_[close[0], close[:-1]]
+    data = np.empty(minutes, dtype=schema_dtype(KLINES))
+    data['open_time'] = START_MS + np.arange(minutes) * MINUTE_MS
+    data['open'], data['close'] = open_, close
+    data['high'] = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.0007, minutes)))
+    data['low'] = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.0007, minutes)))
+    data['volume'] = rng.lognormal(5.5, 0.8, minutes)
+    return data
+
+
+def single_candle_data(open_: float, high: float, low: float, close: float) -> MarketData:
+    def column(value):
+        return np.array([[value]])
+    return MarketData(symbols=['TESTUSDC'], open_time=np.array([START_MS]), open=column(open_),
+                      high=column(high), low=column(low), close=column(close), volume=column(100.0))
+
+
+def open_trade(config, price: float = 100.0) -> BacktestTrade:
+    stop_loss, take_profit, trailing_stop = entry_levels(config, price)
+    return BacktestTrade(pair='TESTUSDC', row=0, entry_index=-1, entry_time=START_MS, entry_price=price,
+                         fill_price=price, quantity=10.0, cost=1000.0, stop_loss=stop_loss,
+                         take_profit=take_profit, trailing_stop=trailing_stop, volatility=1.0)
+
+
+def run_test() -> bool:
+    print("🧪 TEST BACKTEST ÉVÉNEMENTIEL")
+    print("=" * 40)
+
+    config = TradingConfig()
+    config.TRADING_HOURS_ENABLED = False
+    analyzer = TechnicalAnalyzer()
+    klines = synthetic_klines(1440 * 3, seed=1)
+
+    # Test 1: signaux vectorisés == analyze_arrays + is_valid_signal sur des fenêtres tirées au hasard
+    rng = np.random.default_rng(7)
+    ends = rng.choice(np.arange(100, len(klines)), 300, replace=False)
+    windows = np.stack([np.arange(end - 100, end) for end in ends])
+    columns = [klines[name][windows] for name in ('open', 'high', 'low', 'close', 'volume')]
+    valid, _, _ = analyzer.batch_valid_signals(*columns, min_conditions=config.MIN_SIGNAL_CONDITIONS)
+    expected = [analyzer.is_valid_signal(analyzer.analyze_arrays('TESTUSDC', *(klines[name][end - 100:end]
+                                                                              for name in ('open', 'high', 'low', 'close', 'volume'))),
+                                         config.MIN_SIGNAL_CONDITIONS)
+                for end in ends]
+    ok = bool(np.array_equal(valid, np.array(expected)))
+    print(f"\n🔍 Test 1: {len(ends)} fenêtres, {int(valid.sum())} signaux valides identiques au bot: {ok}")
+
+    # Test 2: bot en indicateurs incrémentaux (STREAMING_INDICATORS_ENABLED) alimenté fenêtre par fenêtre:
+    # amorçage sur tout l'historique au lieu des 100 bougies -> verdicts rarement différents près d'un seuil
+    streaming = TechnicalAnalyzer(streaming=True)
+    history = synthetic_klines(2800, seed=6)
+    sliding_ends = np.arange(100, len(history))
+    sliding = np.stack([np.arange(end - 100, end) for end in sliding_ends])
+    batch_valid, _, _ = analyzer.batch_valid_signals(*(history[name][sliding] for name in CANDLE_FIELDS),
+                                                     min_conditions=config.MIN_SIGNAL_CONDITIONS)
+    live = np.array([streaming.is_valid_signal(
+        streaming.analyze_arrays('TESTUSDC', *(history[name][end - 100:end] for name in CANDLE_FIELDS),
+                                 open_time=history['open_time'][end - 100:end].astype(np.float64)),
+        config.MIN_SIGNAL_CONDITIONS) for end in sliding_ends])
+    differences = int(np.sum(batch_valid != live))
+    streaming_ok = differences <= len(sliding_ends) // 200
+    print(f"🔍 Test 2: {len(sliding_ends)} fenêtres glissantes, {differences} verdicts différents du bot en "
+          f"indicateurs incrémentaux (max 0.5%): {streaming_ok}")
+    ok &= streaming_ok
+
+    # Test 3: volatilité 12h vectorisée == VolatilityService (bougies 1h amorcées + prix courant)
+    open_time, close = klines['open_time'], klines['close']
+    vectorized = rolling_volatility(open_time, close, config.VOLATILITY_WINDOW_HOURS)
+    service = VolatilityService(config.VOLATILITY_WINDOW_HOURS)
+    mismatches = 0
+    for minute in list(range(55, 65)) + list(rng.choice(np.arange(120, len(klines)), 200, replace=False)):
+        hours = np.arange(open_time[0], open_time[minute] + 1, HOUR_MS)[-(config.VOLATILITY_WINDOW_HOURS + 1):]
+        last_minutes = np.minimum((hours - open_time[0]) // MINUTE_MS + 59, minute)
+        service.seed('TESTUSDC', hours, close[last_minutes], int(open_time[minute]) + MINUTE_MS)
+        service.update_price('TESTUSDC', float(close[minute]))
+        live = service.get('TESTUSDC')
+        live = np.nan if live is None else live
+        if not (np.isnan(live) and np.isnan(vectorized[minute]) or np.isclose(live, vectorized[minute])):
+            mismatches += 1
+    volatility_ok = mismatches == 0
+    print(f"🔍 Test 3: volatilité 12h identique au service ({mismatches} écarts): {volatility_ok}")
+    ok &= volatility_ok
+
+    # Test 4: chemin intra-bougie (stop au niveau, trailing qui repousse le TP, TP sans trailing, gap)
+    backtester = Backtester(config, single_candle_data(100.0, 100.1, 99.0, 99.5), analyzer=analyzer)
+    trade = open_trade(config)
+    stop_exit = backtester.walk_candle(trade, 0)
+    backtester = Backtester(config, single_candle_data(100.0, 101.5, 99.9, 101.4), analyzer=analyzer)
+    trailed = open_trade(config)
+    trailing_exit = backtester.walk_candle(trailed, 0)
+    config.TRAILING_ACTIVATION_PERCENT = 5.0
+    backtester = Backtester(config, single_candle_data(100.0, 101.5, 99.9, 101.4), analyzer=analyzer)
+    take_profit_exit = backtester.walk_candle(open_trade(config), 0)
+    config.TRAILING_ACTIVATION_PERCENT = TradingConfig.TRAILING_ACTIVATION_PERCENT
+    backtester = Backtester(config, single_candle_data(99.0, 99.2, 98.8, 99.1), analyzer=analyzer)
+    gap_exit = backtester.walk_candle(open_trade(config), 0)
+    path_ok = (stop_exit == (trade.stop_loss, "STOP_LOSS") and trailing_exit is None
+               and trailed.trailing_updates > 0 and trailed.take_profit > 101.2 and trailed.stop_loss > 100.0
+               and take_profit_exit is not None and take_profit_exit[1] == "TAKE_PROFIT"
+               and np.isclose(take_profit_exit[0], 100.0 * (1 + config.TAKE_PROFIT_PERCENT / 100))
+               and gap_exit == (99.0, "STOP_LOSS"))
+    print(f"🔍 Test 4: SL {stop_exit}, trailing (SL {trailed.stop_loss:.2f}, TP {trailed.take_profit:.2f}), "
+          f"TP {take_profit_exit}, gap {gap_exit}: {path_ok}")
+    ok &= path_ok
+
+    # Test 5: limite horaire et pause après pertes consécutives sur l'horloge simulée
+    limits = TradeLimits(config)
+    now = datetime.fromtimestamp(START_MS / 1000, tz=timezone.utc)
+    for i in range(config.MAX_TRADES_PER_HOUR):
+        limits.record_entry(f"PAIR{i}USDC", now + timedelta(minutes=i))
+    hourly = limits.refusal(now + timedelta(minutes=10))
+    after_hour = limits.refusal(now + timedelta(minutes=61))
+    for i in range(config.MAX_CONSECUTIVE_LOSSES):
+        limits.record_result(False, now + timedelta(minutes=70 + i))
+    paused_at = now + timedelta(minutes=75)
+    resumed_at = paused_at + timedelta(minutes=config.CONSECUTIVE_LOSS_PAUSE_MINUTES)
+    limits_ok = (hourly == 'hourly_limit' and after_hour is None and limits.in_pause(paused_at)
+                 and limits.refusal(paused_at) == 'consecutive_losses' and not limits.in_pause(resumed_at)
+                 and limits.consecutive_losses == 0 and limits.too_recent('PAIR3USDC', now + timedelta(minutes=4))
+                 and not limits.too_recent('PAIR3USDC', now + timedelta(minutes=6)))
+    print(f"🔍 Test 5: limite horaire ({hourly}), pause de {config.CONSECUTIVE_LOSS_PAUSE_MINUTES} min: {limits_ok}")
+    ok &= limits_ok
+
+    # Test 6: aller-retour au même prix = 2 x (frais + demi-spread + glissement)
+    exchange = SimulatedExchange(10000.0, fee_percent=0.1, slippage_percent=0.02, spread_percent=0.02)
+    quantity, _ = exchange.buy(100.0, 1000.0)
+    proceeds, _ = exchange.sell(100.0, quantity)
+    round_trip_percent = (1000.0 - proceeds) / 1000.0 * 100
+    costs = exchange.stats['fees'] + exchange.stats['slippage']
+    costs_ok = 0.25 < round_trip_percent < 0.27 and np.isclose(costs, 10000.0 - exchange.balance, rtol=1e-3)
+    print(f"🔍 Test 6: coût aller-retour {round_trip_percent:.3f}% ({costs:.2f} USDC): {costs_ok}")
+    ok &= costs_ok
+
+    # Test 7: rejeu de 5 paires sur 5 jours
+    data = MarketData.from_klines({f"S{i}USDC": synthetic_klines(1440 * 5, seed=i) for i in range(5)})
+    backtester = Backtester(config, data, analyzer=analyzer, blacklist=[])
+    result = backtester.run()
+    summary = result.summary()
+    run_ok = (summary['trades'] > 0 and backtester.stats['candles'] == 5 * 1440 * 5
+              and np.isclose(result.final_capital - result.initial_capital, sum(t.pnl for t in result.trades))
+              and all(t.exit_index >= t.entry_index for t in result.trades)
+              and backtester.stats['candles_per_minute'] > 1_000_000)
+    print(f"🔍 Test 7: {summary['trades']} trades, PnL {summary['pnl']:+.2f} USDC, "
+          f"{backtester.stats['candles_per_minute'] / 1e6:.1f}M bougies/min, sorties {result.exit_reasons()}: {run_ok}")
+    ok &= run_ok
+
+    print(f"\n📊 Stats: {summary}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_test() else 1)
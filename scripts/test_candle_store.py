@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test hors ligne du CandleStore
+Rejoue des frames kline synthétiques via le serveur WebSocket local et vérifie les buffers
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import numpy as np
+    import websockets
+
+    from scripts.kline_replay_server import make_replay_handler
+    from utils.candle_store import CandleStore
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    print("Assurez-vous d'avoir installé: pip install numpy websockets")
+    sys.exit(1)
+
+SYMBOL = "BTCUSDC"
+START_MS = 1_700_000_000_000
+
+
+def make_kline(open_time: int, interval: str, price: float, closed: bool) -> dict:
+    """Frame kline au format du stream combiné Binance"""
+    return {
+        'stream': f"{SYMBOL.lower()}@kline_{interval}",
+        'data': {
+            'e': 'kline', 'E': open_time, 's': SYMBOL,
+            'k': {
+                't': open_time, 'T': open_time + 59_999, 's': SYMBOL, 'i': interval,
+                'o': f"{price:.2f}", 'c': f"{price + 1:.2f}", 'h': f"{price + 2:.2f}",
+                'l': f"{price - 1:.2f}", 'v': "10.0", 'x': closed
+            }
+        }
+    }
+
+
+def seed_klines(count: int) -> list:
+    """Bougies REST d'amorçage (format get_klines)"""
+    return [[START_MS + i * 60_000, "100", "102", "99", "101", "10", 0, "0", 0, "0", "0", "0"]
+            for i in range(count)]
+
+
+def synthetic_frames(seeded: int, new_candles: int) -> list:
+    """Mises à jour de la bougie en cours puis nouvelles bougies"""
+    frames = []
+    t = 0.0
+    for i in range(seeded - 1, seeded + new_candles):
+        open_time = START_MS + i * 60_000
+        for closed in (False, True):
+            frames.append({'t': t, 'frame': make_kline(open_time, '1m', 200.0 + i, closed)})
+            t += 0.001
+    return frames
+
+
+async def run_test() -> bool:
+    print("🧪 TEST CANDLESTORE (rejeu WebSocket local)")
+    print("=" * 40)
+
+    seeded, new_candles, capacity = 30, 50, 64
+    frames = synthetic_frames(seeded, new_candles)
+
+    async with websockets.serve(make_replay_handler(frames, speed=1.0), "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        store = CandleStore(stream_url=f"ws://127.0.0.1:{port}", intervals=('1m',), capacity=capacity)
+        store.seed(SYMBOL, '1m', seed_klines(seeded))
+        await store.set_universe([SYMBOL])
+        await store.start()
+
+        for _ in range(50):
+            await asyncio.sleep(0.1)
+            if store.stats['messages'] >= len(frames):
+                break
+
+        ok = True
+        candles = store.ohlcv(SYMBOL, '1m')
+
+        # Test 1: nombre de bougies (bornées par la capacité)
+        expected = min(seeded + new_candles, capacity)
+        print(f"\n🔍 Test 1: {len(candles['close'])} bougies (attendu {expected})")
+        ok &= len(candles['close']) == expected
+
+        # Test 2: ordre chronologique et continuité
+        steps = np.diff(candles['open_time'])
+        print(f"🔍 Test 2: pas constant de 60s: {bool(np.all(steps == 60_000))}")
+        ok &= bool(np.all(steps == 60_000))
+
+        # Test 3: dernière bougie = dernière frame rejouée
+        last_close = candles['close'][-1]
+        print(f"🔍 Test 3: dernière clôture {last_close} (attendu {201.0 + seeded + new_candles - 1})")
+        ok &= last_close == 201.0 + seeded + new_candles - 1
+
+        # Test 4: vues sans copie
+        shared = np.shares_memory(candles['close'], store._buffers[(SYMBOL, '1m')]._data)
+        print(f"🔍 Test 4: vue sans copie: {shared}")
+        ok &= shared
+
+        # Test 5: disponibilité pour les consommateurs
+        ready = store.is_ready(SYMBOL, '1m', 50)
+        print(f"🔍 Test 5: paire prête pour l'analyse: {ready}")
+        ok &= ready
+
+        await store.stop()
+
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
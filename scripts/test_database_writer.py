@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test de la base SQLite (connexion WAL persistante + thread d'écriture)
+Écritures mises en file sans attente disque, regroupées en transactions, relues après flush;
+une ligne invalide n'annule pas le lot, file pleine sans blocage de la boucle pour les écritures critiques
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from utils.database import TradingDatabase
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+def trade_data(symbol: str) -> dict:
+    return {
+        'symbol': symbol, 'side': 'BUY', 'entry_price': 60000.0, 'quantity': 0.01,
+        'stop_loss': 59100.0, 'take_profit': 61200.0, 'trailing_stop': 60300.0,
+        'entry_time': datetime.now(), 'capital_engaged': 600.0,
+        'signals_detected': {'direction': 'LONG'}
+    }
+
+
+async def run_test() -> bool:
+    print("🧪 TEST BASE SQLITE (WAL + THREAD D'ÉCRITURE)")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = TradingDatabase(f"{tmp}/data/trading_bot.db", flush_interval_seconds=0.05)
+        await database.initialize_database()
+
+        with database.get_connection() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        ok = journal_mode == 'wal'
+        print(f"\n🔍 Test 1: journal en mode {journal_mode}: {ok}")
+
+        # Test 2: ID du trade connu sans attendre l'écriture, mise à jour de sortie ordonnée
+        first_id = await database.insert_trade(trade_data('BTCUSDC'))
+        second_id = await database.insert_trade(trade_data('ETHUSDC'))
+        await database.update_trade_exit(first_id, {
+            'exit_price': 61000.0, 'exit_time': datetime.now(), 'exit_reason': 'TAKE_PROFIT',
+            'pnl_amount': 10.0, 'pnl_percent': 1.67
+        })
+        trades = {trade['id']: trade for trade in await database.get_trades_history()}
+        ids_ok = (second_id == first_id + 1 and trades[first_id]['status'] == 'CLOSED'
+                  and trades[second_id]['status'] == 'OPEN')
+        print(f"🔍 Test 2: IDs {first_id}/{second_id} attribués à l'appel, sortie appliquée après flush: {ids_ok}")
+        ok &= ids_ok
+
+        # Test 3: 5000 trailing stops mis en file en quelques µs chacun, regroupés en transactions
+        transactions_before = database.stats['transactions']
+        started_at = time.perf_counter()
+        for i in range(5000):
+            await database.insert_trailing_stop({
+                'trade_id': second_id, 'symbol': 'ETHUSDC', 'old_stop_loss': 3000.0 + i,
+                'new_stop_loss': 3001.0 + i, 'trigger_price': 3100.0 + i,
+                'timestamp': datetime.now(), 'profit_percent': 0.5
+            })
+        per_call_us = (time.perf_counter() - started_at) / 5000 * 1e6
+        history = await database.get_trailing_stops_history('ETHUSDC')
+        transactions = database.stats['transactions'] - transactions_before
+        batch_ok = len(history) == 5000 and transactions <= 20 and per_call_us < 200
+        print(f"🔍 Test 3: 5000 lignes, {per_call_us:.1f} µs/appel, {transactions} transactions: {batch_ok}")
+        ok &= batch_ok
+
+        # Test 4: fermeture -> file vidée, données persistées pour une nouvelle instance
+        await database.insert_realtime_metrics({
+            'timestamp': datetime.now(), 'current_capital': 1000.0, 'open_positions': 1,
+            'daily_pnl': 10.0, 'total_pnl': 10.0, 'win_rate': 100.0
+        })
+        await database.close()
+        reopened = TradingDatabase(f"{tmp}/data/trading_bot.db")
+        await reopened.initialize_database()
+        with reopened.get_connection() as conn:
+            metrics_count = conn.execute("SELECT COUNT(*) FROM realtime_metrics").fetchone()[0]
+        next_id = await reopened.insert_trade(trade_data('SOLUSDC'))
+        await reopened.close()
+        close_ok = metrics_count == 1 and next_id == second_id + 1
+        print(f"🔍 Test 4: écritures conservées à la fermeture, ID suivant {next_id}: {close_ok}")
+        ok &= close_ok
+
+        # Test 5: signal invalide (NOT NULL) dans le même lot qu'un trade -> seul le signal est perdu
+        batch_db = TradingDatabase(f"{tmp}/batch/trading_bot.db", flush_interval_seconds=0.2)
+        await batch_db.initialize_database()
+        trade_id = await batch_db.insert_trade(trade_data('BTCUSDC'))
+        await batch_db.insert_signal({'symbol': 'BTCUSDC', 'timestamp': datetime.now(), 'signal_type': 'BUY',
+                                      'signal_strength': None, 'price': 60000.0, 'volume': 1e6})
+        await batch_db.update_trade_exit(trade_id, {
+            'exit_price': 61000.0, 'exit_time': datetime.now(), 'exit_reason': 'TAKE_PROFIT',
+            'pnl_amount': 10.0, 'pnl_percent': 1.67
+        })
+        await batch_db.flush()
+        trades = await batch_db.get_trades_history()
+        with batch_db.get_connection() as conn:
+            signals_count = conn.execute("SELECT COUNT(*) FROM signals").fetchone()[0]
+        fallback_ok = (len(trades) == 1 and trades[0]['status'] == 'CLOSED' and signals_count == 0
+                       and batch_db.stats['row_fallbacks'] == 1 and batch_db.stats['errors'] == 1)
+        print(f"🔍 Test 5: lot refusé -> trade conservé ({len(trades)}), signal invalide seul perdu: {fallback_ok}")
+        ok &= fallback_ok
+        await batch_db.close()
+
+        # Test 6: file pleine -> écritures critiques (et barrière de flush) débordées sans attente, ordre conservé
+        full_db = TradingDatabase(f"{tmp}/full/trading_bot.db", queue_size=2, flush_interval_seconds=0.05)
+        started_at = time.perf_counter()
+        ids = [await full_db.insert_trade(trade_data(f"S{i}USDC")) for i in range(5)]
+        await full_db.update_trade_exit(ids[-1], {
+            'exit_price': 61000.0, 'exit_time': datetime.now(), 'exit_reason': 'TAKE_PROFIT',
+            'pnl_amount': 10.0, 'pnl_percent': 1.67
+        })
+        await full_db.insert_realtime_metrics({
+            'timestamp': datetime.now(), 'current_capital': 1000.0, 'open_positions': 1,
+            'daily_pnl': 10.0, 'total_pnl': 10.0, 'win_rate': 100.0
+        })
+        enqueue_ms = (time.perf_counter() - started_at) * 1000
+        await full_db.initialize_database()
+        await full_db.flush()
+        trades = {trade['id']: trade for trade in await full_db.get_trades_history()}
+        spill_ok = (enqueue_ms < 100 and len(trades) == 5 and trades[ids[-1]]['status'] == 'CLOSED'
+                    and full_db.stats['spilled'] == 5 and full_db.stats['dropped'] == 1)
+        print(f"🔍 Test 6: file pleine -> {enqueue_ms:.1f} ms pour 7 écritures, {len(trades)} trades, "
+              f"métrique abandonnée: {spill_ok}")
+        ok &= spill_ok
+        await full_db.close()
+
+        print(f"\n📊 Stats: {database.stats}")
+
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
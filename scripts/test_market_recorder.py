@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test de l'archive des données de marché
+Écriture partitionnée par type / date / paire, lecture memory-map, rejeu chronologique et regroupement journalier,
+au format Parquet (si pyarrow est installé) et .npy
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from utils.market_recorder import (BOOK_TICKER, KLINES, PYARROW_AVAILABLE, TICKER_24H, MarketArchive,
+                                       MarketRecorder)
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+DAY_MS = 86_400_000
+START_MS = 1_760_000_000_000 - 1_760_000_000_000 % DAY_MS + DAY_MS - 30 * 60_000  # 23:30 UTC
+
+
+def kline_row(open_time: int, price: float) -> tuple:
+    return (float(open_time), price, price * 1.001, price * 0.999, price * 1.0005, 12.5)
+
+
+async def run_format(tmp: str, use_parquet: bool) -> bool:
+    """Tests 1 à 5 sur une archive au format Parquet ou .npy"""
+    recorder = MarketRecorder(root=tmp, buffer_rows=100000, use_parquet=use_parquet)
+    archive = MarketArchive(tmp)
+    extension = '.parquet' if use_parquet else '.npy'
+    label = 'Parquet' if use_parquet else '.npy'
+
+    # 1h de bougies 1m à cheval sur minuit, en trois écritures; bougies non clôturées / 1h ignorées
+    for flush_at in (20, 40, 60):
+        for minute in range(flush_at - 20, flush_at):
+            open_time = START_MS + minute * 60_000
+            recorder.on_kline('BTCUSDC', '1m', kline_row(open_time, 60000.0 + minute), True)
+            recorder.on_kline('ETHUSDC', '1m', kline_row(open_time + 30_000, 3000.0 + minute), True)
+            recorder.on_kline('BTCUSDC', '1m', kline_row(open_time, 1.0), False)
+            recorder.on_kline('BTCUSDC', '1h', kline_row(open_time, 1.0), True)
+        await recorder.flush()
+
+    dates = archive.dates(KLINES)
+    btc = archive.read(KLINES, 'BTCUSDC')
+    files = archive.partitions(KLINES, 'BTCUSDC')
+    ok = (len(dates) == 2 and len(btc) == 60 and bool(np.all(np.diff(btc['open_time']) == 60_000))
+          and btc['close'][-1] == (60000.0 + 59) * 1.0005 and all(p.suffix == extension for p in files))
+    print(f"\n🔍 Test 1 [{label}]: 60 bougies clôturées, partitions {dates}: {ok}")
+
+    # Test 2: lecture d'une journée (.npy: memory-map sans copie, Parquet: read_table(memory_map=True))
+    day_two = archive.read(KLINES, 'BTCUSDC', start=dates[1], end=dates[1])
+    loaded = [archive.load_partition(p, KLINES) for p in files]
+    mapped = all(isinstance(data, np.memmap) != use_parquet for data in loaded)
+    mmap_ok = len(day_two) == 30 and mapped and day_two.dtype.names == ('open_time', 'open', 'high', 'low', 'close', 'volume')
+    print(f"🔍 Test 2 [{label}]: lecture d'une journée ({len(day_two)} lignes) par memory-map: {mmap_ok}")
+    ok &= mmap_ok
+
+    # Test 3: rejeu multi-paires dans l'ordre chronologique
+    replay = list(archive.replay(KLINES))
+    times = [timestamp for timestamp, _, _ in replay]
+    replay_ok = len(replay) == 120 and times == sorted(times) and replay[0][1] == 'BTCUSDC' and replay[1][1] == 'ETHUSDC'
+    print(f"🔍 Test 3 [{label}]: rejeu de {len(replay)} bougies BTC/ETH entrelacées: {replay_ok}")
+    ok &= replay_ok
+
+    # Test 4: bookTickers et snapshot tickers 24h
+    for i in range(500):
+        recorder.on_book_ticker('BTCUSDC', 60000.0 + i, 0.5, 60000.5 + i, 0.7)
+    recorder.record_tickers(pd.DataFrame({
+        'symbol': ['BTCUSDC', 'ETHUSDC'], 'price': [60000.0, 3000.0], 'volume': [1e9, 5e8],
+        'bid': [59999.0, 2999.5], 'ask': [60001.0, 3000.5], 'spread': [0.003, 0.03], 'price_change': [1.2, 2.4]
+    }))
+    await recorder.flush()
+    book = archive.read(BOOK_TICKER, 'BTCUSDC')
+    tickers = archive.read_frame(TICKER_24H, 'ETHUSDC')
+    kinds_ok = len(book) == 500 and book['ask'][-1] == 60499.5 and tickers['price_change'].iloc[0] == 2.4
+    print(f"🔍 Test 4 [{label}]: {len(book)} bookTickers et snapshot 24h relus: {kinds_ok}")
+    ok &= kinds_ok
+
+    # Test 5: regroupement de la journée terminée en un fichier par paire
+    files_before = len(archive.partitions(KLINES, 'BTCUSDC', dates[0], dates[0]))
+    recorder.compact_day(KLINES, dates[0])
+    compacted = archive.partitions(KLINES, 'BTCUSDC', dates[0], dates[0])
+    compact_ok = (files_before == 2 and len(compacted) == 1 and compacted[0].name == f"day{extension}"
+                  and len(archive.read(KLINES, 'BTCUSDC')) == 60)
+    print(f"🔍 Test 5 [{label}]: journée {dates[0]} regroupée ({files_before} -> {len(compacted)} fichier): {compact_ok}")
+    ok &= compact_ok
+    return ok
+
+
+async def run_test() -> bool:
+    print("🧪 TEST ARCHIVE DES DONNÉES DE MARCHÉ")
+    print("=" * 40)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ok = await run_format(f"{tmp}/npy", use_parquet=False)
+
+    if PYARROW_AVAILABLE:
+        with tempfile.TemporaryDirectory() as tmp:
+            ok &= await run_format(f"{tmp}/parquet", use_parquet=True)
+
+            # Test 6: journée mêlant .npy (avant installation de pyarrow) et Parquet -> regroupée en Parquet
+            legacy = MarketRecorder(root=tmp, use_parquet=False)
+            recorder = MarketRecorder(root=tmp, use_parquet=True)
+            for minute in range(10):
+                target = legacy if minute < 5 else recorder
+                target.on_kline('SOLUSDC', '1m', kline_row(START_MS + minute * 60_000, 150.0 + minute), True)
+                if minute in (4, 9):
+                    await target.flush()
+            archive = MarketArchive(tmp)
+            date = archive.dates(KLINES)[0]
+            mixed = sorted(p.suffix for p in archive.partitions(KLINES, 'SOLUSDC'))
+            recorder.compact_day(KLINES, date)
+            compacted = archive.partitions(KLINES, 'SOLUSDC')
+            sol = archive.read(KLINES, 'SOLUSDC')
+            mixed_ok = (mixed == ['.npy', '.parquet'] and [p.name for p in compacted] == ['day.parquet']
+                        and len(sol) == 10 and sol['open'][-1] == 159.0)
+            print(f"\n🔍 Test 6: journée {mixed} regroupée en {[p.name for p in compacted]}: {mixed_ok}")
+            ok &= mixed_ok
+    else:
+        print("\n⏭️ Tests Parquet ignorés: pyarrow non installé (pip install pyarrow)")
+
+    # Test 7: coût d'un enregistrement dans le callback
+    recorder = MarketRecorder(root="unused", buffer_rows=100000)
+    started_at = time.perf_counter()
+    for i in range(50000):
+        recorder.on_book_ticker('ETHUSDC', 3000.0, 1.0, 3000.1, 1.0)
+    per_call_us = (time.perf_counter() - started_at) / 50000 * 1e6
+    cost_ok = per_call_us < 20
+    print(f"🔍 Test 7: {per_call_us:.2f} µs par bookTicker enregistré: {cost_ok}")
+    ok &= cost_ok
+
+    print(f"\n📊 Stats: {recorder.stats} (Parquet {'testé' if PYARROW_AVAILABLE else 'non testé'})")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
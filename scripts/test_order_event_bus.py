@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test hors ligne de l'OrderEventBus
+Événements executionReport / outboundAccountPosition diffusés par le faux user-data stream local
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from scripts.fake_user_stream import (FakeListenKeyExchange, FakeUserStream, account_position,
+                                          execution_report)
+    from utils.account_state import AccountState
+    from utils.order_event_bus import OrderEventBus
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    print("Assurez-vous d'avoir installé: pip install websockets")
+    sys.exit(1)
+
+SYMBOL = "BTCUSDC"
+
+
+async def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        await asyncio.sleep(0.005)
+    return condition()
+
+
+async def run_test() -> bool:
+    print("🧪 TEST ORDEREVENTBUS (faux user-data stream local)")
+    print("=" * 40)
+
+    stream = FakeUserStream()
+    await stream.start()
+    exchange = FakeListenKeyExchange()
+    bus = OrderEventBus(exchange, stream_url=stream.url)
+    account = AccountState(exchange)
+
+    fills = []
+    fill_latencies = []
+    connects = []
+
+    async def on_fill(order):
+        fill_latencies.append((time.perf_counter() - sent_at[order.order_id]) * 1000)
+        fills.append(order)
+
+    bus.add_fill_listener(on_fill)
+    bus.add_account_listener(account.on_user_event)
+    bus.add_connect_listener(lambda: connects.append(time.monotonic()))
+    sent_at = {}
+
+    await bus.start()
+    ok = await stream.wait_for_clients() and await wait_until(lambda: bus.connected)
+    print(f"\n🔍 Test 1: connexion au stream: {ok}")
+
+    # Test 2: table des ordres (ordre créé, pas de diffusion avant exécution)
+    await stream.push(execution_report(1001, SYMBOL, 'NEW', 0.5, 60000.0, stop_price=60100.0))
+    table_ok = await wait_until(lambda: bus.get_order(1001) is not None)
+    table_ok &= bus.get_order('1001').status == 'NEW' and not fills
+    print(f"🔍 Test 2: ordre NEW dans la table, aucun fill diffusé: {table_ok}")
+    ok &= table_ok
+
+    # Test 3: exécutions diffusées dès réception
+    for order_id in range(2001, 2051):
+        sent_at[order_id] = time.perf_counter()
+        await stream.push(execution_report(order_id, SYMBOL, 'FILLED', 0.5, 60000.0, executed_qty=0.5))
+    fills_ok = await wait_until(lambda: len(fills) == 50)
+    fills_ok &= all(abs(order.avg_price - 60000.0) < 1e-6 for order in fills)
+    print(f"🔍 Test 3: {len(fills)}/50 fills diffusés, prix moyen correct: {fills_ok}")
+    ok &= fills_ok
+    if fill_latencies:
+        fill_latencies.sort()
+        print(f"   ⏱️ Latence envoi -> listener: médiane {fill_latencies[len(fill_latencies) // 2]:.2f} ms, "
+              f"max {fill_latencies[-1]:.2f} ms")
+
+    # Test 4: soldes transmis à l'AccountState
+    await stream.push(account_position({'USDC': 1234.5, 'BTC': 0.25}))
+    balance_ok = await wait_until(lambda: account._balances.get('USDC') is not None)
+    balance_ok &= account._balances['USDC'].free == 1234.5 and account._balances['BTC'].free == 0.25
+    print(f"🔍 Test 4: outboundAccountPosition appliqué à l'AccountState: {balance_ok}")
+    ok &= balance_ok
+
+    # Test 5: listenKey expirée -> reconnexion et nouvelle notification de connexion
+    connections_before = stream.connections
+    await stream.expire_listen_key()
+    reconnect_ok = await wait_until(lambda: stream.connections > connections_before and bus.connected)
+    reconnect_ok &= len(connects) == 2
+    print(f"🔍 Test 5: reconnexion après listenKeyExpired: {reconnect_ok}")
+    ok &= reconnect_ok
+
+    await bus.stop()
+    await stream.stop()
+    print(f"\n📊 Stats: {bus.stats}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test des gabarits d'ordres pré-calculés
+Préparation pendant le scan, réutilisation au signal, invalidation sur dérive et latences
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from utils.order_templates import OrderTemplateBook
+    from utils.symbol_filters import SymbolFilterTable, parse_symbol_filters
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+def make_table() -> SymbolFilterTable:
+    table = SymbolFilterTable(exchange=None)
+    table._filters['BTCUSDC'] = parse_symbol_filters({'symbol': 'BTCUSDC', 'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.01', 'maxPrice': '1000000', 'tickSize': '0.01000000'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.00001', 'maxQty': '9000', 'stepSize': '0.00001000'},
+        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000'}
+    ]})
+    return table
+
+
+def run_test() -> bool:
+    print("🧪 TEST GABARITS D'ORDRES")
+    print("=" * 40)
+
+    book = OrderTemplateBook(make_table(), stop_loss_percent=1.5, take_profit_percent=2.0,
+                             trailing_activation_percent=0.5, min_notional=500.0, tolerance_percent=0.2)
+
+    # Test 1: gabarit arrondi aux filtres de la paire
+    template = book.prepare('BTCUSDC', 61234.567, 1000.0)
+    ok = (template is not None and template.quantity == 0.01633 and template.entry_params['quantity'] == '0.01633'
+          and template.stop_loss == 60316.05 and template.take_profit == 62459.26)
+    print(f"\n🔍 Test 1: quantité {template.quantity if template else None} et niveaux arrondis au tick: {ok}")
+
+    # Test 2: réutilisation au signal si prix et taille n'ont pas dérivé
+    reuse_ok = (book.get('BTCUSDC', 61300.0, 1000.0) is template
+                and book.get('BTCUSDC', 61500.0, 1000.0) is None
+                and book.get('BTCUSDC', 61234.567, 1100.0) is None
+                and book.get('ETHUSDC', 3000.0, 1000.0) is None)
+    print(f"🔍 Test 2: gabarit réutilisé (dérive < 0.2%), ignoré sinon: {reuse_ok}")
+    ok &= reuse_ok
+
+    # Test 3: taille sous le minimum anti-fragmentation -> pas de gabarit
+    reject_ok = book.prepare('BTCUSDC', 61234.567, 300.0) is None and book.get('BTCUSDC', 61234.567, 300.0) is None
+    print(f"🔍 Test 3: gabarit refusé sous le notionnel minimum: {reject_ok}")
+    ok &= reject_ok
+
+    # Test 4: coût de la préparation et de la lecture au signal
+    started_at = time.perf_counter()
+    for i in range(10000):
+        book.prepare('BTCUSDC', 61000.0 + i * 0.01, 1000.0)
+    prepare_us = (time.perf_counter() - started_at) * 100
+    started_at = time.perf_counter()
+    for _ in range(10000):
+        book.get('BTCUSDC', 61100.0, 1000.0)
+    get_us = (time.perf_counter() - started_at) * 100
+    cost_ok = get_us < 50
+    print(f"🔍 Test 4: préparation {prepare_us:.1f} µs, lecture au signal {get_us:.2f} µs: {cost_ok}")
+    ok &= cost_ok
+
+    # Test 5: latences signal -> acquittement
+    for _ in range(20):
+        signal_at = time.perf_counter()
+        time.sleep(0.001)
+        book.record_entry(signal_at)
+    report = book.latency_report()
+    latency_ok = report['entry']['count'] == 20 and report['entry']['p50_us'] >= 1000 and not report['protection']
+    print(f"🔍 Test 5: latence signal -> entrée p50 {report['entry']['p50_us'] / 1000:.2f}ms: {latency_ok}")
+    ok &= latency_ok
+
+    print(f"\n📊 Stats: {book.stats}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_test() else 1)
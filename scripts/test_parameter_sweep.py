@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test du balayage parallèle des paramètres
+Données partagées par memory-map, grille / tirage aléatoire, cache des signaux et parité pool / séquentiel
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from config import TradingConfig
+    from test_backtester import synthetic_klines
+    from utils.backtester import Backtester, MarketData
+    from utils.parameter_sweep import ParameterSweep, grid, random_search, run_backtest
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+def run_test() -> bool:
+    print("🧪 TEST BALAYAGE DE PARAMÈTRES")
+    print("=" * 40)
+
+    config = TradingConfig()
+    config.TRADING_HOURS_ENABLED = False
+    data = MarketData.from_klines({f"S{i}USDC": synthetic_klines(1440 * 3, seed=i) for i in range(4)})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Test 1: grille écrite en .npy puis relue en memory-map, en lecture seule
+        shared = MarketData.load(data.save(tmp))
+        ok = (shared.symbols == data.symbols and np.array_equal(shared.close, data.close, equal_nan=True)
+              and not shared.close.flags.writeable and not shared.close.flags.owndata)
+        print(f"\n🔍 Test 1: {len(shared.symbols)} paires relues par memory-map (lecture seule): {ok}")
+
+        # Test 2: grille complète et paramètres inconnus refusés
+        combinations = grid({'STOP_LOSS_PERCENT': [0.2, 0.3, 0.5], 'TAKE_PROFIT_PERCENT': [0.8, 1.2]})
+        try:
+            grid({'STOP_LOSS': [0.2]})
+            rejected = False
+        except ValueError:
+            rejected = True
+        grid_ok = len(combinations) == 6 and len({tuple(c.values()) for c in combinations}) == 6 and rejected
+        print(f"🔍 Test 2: grille de {len(combinations)} combinaisons, paramètre inconnu refusé: {grid_ok}")
+        ok &= grid_ok
+
+        # Test 3: tirage aléatoire reproductible, dans les bornes, entiers pour les champs int
+        space = {'STOP_LOSS_PERCENT': (0.15, 0.5), 'MAX_TRADES_PER_HOUR': (2, 8), 'MIN_SIGNAL_CONDITIONS': [3, 4, 5]}
+        samples = random_search(space, 50, seed=3)
+        random_ok = (samples == random_search(space, 50, seed=3)
+                     and all(0.15 <= s['STOP_LOSS_PERCENT'] <= 0.5 for s in samples)
+                     and all(isinstance(s['MAX_TRADES_PER_HOUR'], int) and 2 <= s['MAX_TRADES_PER_HOUR'] <= 8
+                             for s in samples)
+                     and {s['MIN_SIGNAL_CONDITIONS'] for s in samples} <= {3, 4, 5})
+        print(f"🔍 Test 3: {len(samples)} tirages reproductibles dans les bornes: {random_ok}")
+        ok &= random_ok
+
+        # Test 4: signaux en cache réutilisés entre backtests (mêmes résultats, scan évité)
+        cache = {}
+        first = Backtester(config, shared, signal_cache=cache)
+        first.run()
+        started_at = time.perf_counter()
+        cached = run_backtest(shared, {'STOP_LOSS_PERCENT': 0.4}, config, cache)
+        cached_seconds = time.perf_counter() - started_at
+        started_at = time.perf_counter()
+        uncached = run_backtest(shared, {'STOP_LOSS_PERCENT': 0.4}, config)
+        uncached_seconds = time.perf_counter() - started_at
+        cache_ok = (cached['pnl'] == uncached['pnl'] and cached['trades'] == uncached['trades']
+                    and len(cache) == len(shared.symbols) and cached_seconds < uncached_seconds)
+        print(f"🔍 Test 4: backtest avec cache {cached_seconds:.2f}s vs {uncached_seconds:.2f}s, "
+              f"résultats identiques: {cache_ok}")
+        ok &= cache_ok
+
+    # Test 5: pool de processus == exécution séquentielle, tableau classé par PnL
+    with ParameterSweep(data, config, workers=2) as sweep:
+        table = sweep.run(combinations)
+        data_dir = sweep.data_dir
+    expected = sorted((run_backtest(data, params, config)['pnl'] for params in combinations), reverse=True)
+    sweep_ok = (len(table) == 6 and np.allclose(table['pnl'].to_numpy(), expected)
+                and table.index[0] == 1 and sweep.stats['errors'] == 0 and not data_dir.exists()
+                and {'win_rate', 'max_drawdown_percent', 'fee_drag_percent'} <= set(table.columns))
+    print(f"🔍 Test 5: {len(table)} backtests sur {sweep.workers} processus, meilleur PnL "
+          f"{table['pnl'].iloc[0]:+.2f} USDC: {sweep_ok}")
+    ok &= sweep_ok
+
+    # Test 6: combinaison invalide isolée sans arrêter le balayage
+    with ParameterSweep(data, config, workers=2) as sweep:
+        partial = sweep.run([{'STOP_LOSS_PERCENT': 0.3}, {'STOP_LOSS_PERCENT': 'x'}])
+    errors_ok = len(partial) == 1 and sweep.stats['errors'] == 1
+    print(f"🔍 Test 6: erreur isolée ({sweep.stats['errors']} sur {sweep.stats['combinations']}): {errors_ok}")
+    ok &= errors_ok
+
+    print(f"\n📊 Stats: {sweep.stats}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_test() else 1)
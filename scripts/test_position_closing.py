@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Test hors ligne des fermetures concurrentes d'une position
+PositionEngine (ticks) et gestion périodique décident la même sortie: une seule vente au marché,
+et la gestion périodique renonce si le moteur agit sur le trade pendant ses vérifications
+"""
+
+import asyncio
+import logging
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from config import TradingConfig
+    from main import ScalpingBot, Trade, TradeDirection
+    from utils.position_engine import DECISION_STOP_LOSS
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+class FakeExchange:
+    """Ventes au marché factices avec latence réseau"""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.sells = []
+
+    async def order_market_sell(self, symbol: str, quantity: float):
+        self.sells.append((symbol, quantity))
+        await asyncio.sleep(self.latency)
+        return {'orderId': len(self.sells), 'status': 'FILLED'}
+
+
+class FakeStopUpdater:
+    async def cancel(self, trade_id: str):
+        await asyncio.sleep(0.01)
+
+
+class FakeEngine:
+    """PositionEngine sans stream: actions en cours et paires non streamées"""
+
+    def __init__(self):
+        self.busy = set()
+
+    def is_busy(self, trade_id: str) -> bool:
+        return trade_id in self.busy
+
+    def is_live(self, symbol: str) -> bool:
+        return False
+
+
+class FakePrices:
+    """Prix courant; un tick SL du moteur peut survenir pendant la lecture"""
+
+    def __init__(self, engine: FakeEngine, price: float, busy_during_read: set = frozenset()):
+        self.engine = engine
+        self.price = price
+        self.busy_during_read = busy_during_read
+
+    async def get_price(self, symbol: str) -> float:
+        await asyncio.sleep(0.01)
+        self.engine.busy.update(self.busy_during_read)
+        return self.price
+
+
+class FakeNotifier:
+    async def send_message(self, message: str):
+        pass
+
+    async def send_trade_close_notification(self, *args):
+        pass
+
+
+def make_bot() -> ScalpingBot:
+    """Bot sans connexions: seules les dépendances de la fermeture sont renseignées"""
+    bot = ScalpingBot.__new__(ScalpingBot)
+    bot.logger = logging.getLogger("test_position_closing")
+    bot.config = TradingConfig()
+    bot.exchange = FakeExchange()
+    bot.stop_updater = FakeStopUpdater()
+    bot.telegram_notifier = FakeNotifier()
+    bot.firebase_logger = None
+    bot.sheets_logger = None
+    bot.open_positions = {}
+    bot._closing = set()
+    bot.current_capital = 10000.0
+    bot.daily_pnl = 0.0
+    bot.daily_trades = 0
+    bot.consecutive_losses = 0
+    bot.last_trade_results = []
+    bot.consecutive_loss_pause_until = None
+    bot.is_running = True
+    bot.position_engine = FakeEngine()
+    bot.prices = FakePrices(bot.position_engine, 3001.0)
+
+    async def cancel_automatic_stop_loss(trade, symbol):
+        await asyncio.sleep(0.01)
+
+    async def get_asset_balance(asset):
+        await asyncio.sleep(0.01)
+        return 10.0
+
+    async def get_total_capital():
+        return 10000.0
+
+    async def get_asset_exposure(asset):
+        return 3000.0
+
+    async def calculate_volatility_1h(symbol):
+        return 1.0
+
+    bot.cancel_automatic_stop_loss = cancel_automatic_stop_loss
+    bot.get_asset_balance = get_asset_balance
+    bot.get_total_capital = get_total_capital
+    bot.get_asset_exposure = get_asset_exposure
+    bot.calculate_volatility_1h = calculate_volatility_1h
+    return bot
+
+
+def open_trade(bot: ScalpingBot, trade_id: str = "T1") -> Trade:
+    trade = Trade(id=trade_id, pair='ETHUSDC', direction=TradeDirection.LONG, size=1.0, entry_price=3000.0,
+                  stop_loss=2992.5, take_profit=3036.0, trailing_stop=3015.0, timestamp=datetime.now())
+    bot.open_positions[trade_id] = trade
+    return trade
+
+
+async def run_test() -> bool:
+    print("🧪 TEST FERMETURES CONCURRENTES")
+    print("=" * 40)
+
+    # Test 1: stop loss du PositionEngine et timeout de la gestion périodique en même temps
+    bot = make_bot()
+    trade = open_trade(bot)
+    await asyncio.gather(
+        bot.on_position_decision("T1", trade, DECISION_STOP_LOSS, 2990.0),
+        bot.close_position("T1", 2991.0, "TIMEOUT_ADAPTATIF"),
+    )
+    ok = len(bot.exchange.sells) == 1 and "T1" not in bot.open_positions and trade.exit_reason == "STOP_LOSS"
+    print(f"\n🔍 Test 1: 2 décisions simultanées -> {len(bot.exchange.sells)} vente ({trade.exit_reason}): {ok}")
+
+    # Test 2: fermeture demandée après coup -> ignorée, garde libérée
+    await bot.close_position("T1", 2990.0, "MOMENTUM_FAIBLE")
+    after_ok = len(bot.exchange.sells) == 1 and not bot._closing and bot.daily_trades == 1
+    print(f"🔍 Test 2: fermeture d'un trade déjà fermé ignorée: {after_ok}")
+    ok &= after_ok
+
+    # Test 3: deux trades distincts fermés en parallèle
+    bot = make_bot()
+    open_trade(bot, "A")
+    open_trade(bot, "B")
+    await asyncio.gather(bot.close_position("A", 3010.0, "TAKE_PROFIT"), bot.close_position("B", 3010.0, "TAKE_PROFIT"))
+    parallel_ok = len(bot.exchange.sells) == 2 and not bot.open_positions
+    print(f"🔍 Test 3: trades distincts fermés en parallèle ({len(bot.exchange.sells)} ventes): {parallel_ok}")
+    ok &= parallel_ok
+
+    # Test 4: timeout décidé pendant qu'un tick SL du moteur prend la main -> fermeture abandonnée
+    managed = make_bot()
+    managed.config.ENABLE_MOMENTUM_EXIT = False
+    late_trade = open_trade(managed)
+    late_trade.timestamp = datetime.now() - timedelta(minutes=45)
+    managed.prices.busy_during_read = {"T1"}
+    await managed.manage_open_positions()
+    busy_ok = not managed.exchange.sells and "T1" in managed.open_positions
+    print(f"🔍 Test 4: moteur actif pendant les vérifications -> aucune vente ({len(managed.exchange.sells)}): {busy_ok}")
+    ok &= busy_ok
+
+    # Test 5: moteur inactif -> le timeout ferme la position
+    managed.position_engine.busy.clear()
+    managed.prices.busy_during_read = set()
+    await managed.manage_open_positions()
+    timeout_ok = len(managed.exchange.sells) == 1 and late_trade.exit_reason.startswith("TIMEOUT_ADAPTATIF")
+    print(f"🔍 Test 5: moteur inactif -> {late_trade.exit_reason}: {timeout_ok}")
+    ok &= timeout_ok
+
+    print(f"\n📊 Stats: {bot.daily_trades} trades fermés, P&L journalier {bot.daily_pnl:+.2f} USDC")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Test hors ligne du PositionEngine
+Ticks bookTicker rejoués par le serveur WebSocket local: décisions SL / trailing / TP et latences
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import websockets
+
+    from scripts.kline_replay_server import make_replay_handler
+    from utils.position_engine import (DECISION_STOP_LOSS, DECISION_TAKE_PROFIT, DECISION_TRAILING,
+                                       PositionEngine, evaluate_exit)
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    print("Assurez-vous d'avoir installé: pip install numpy websockets")
+    sys.exit(1)
+
+TRAILING_STEP = 0.2
+
+
+def book_ticker(symbol: str, bid: float, update_id: int) -> dict:
+    """Frame bookTicker au format du stream combiné Binance"""
+    return {
+        'stream': f"{symbol.lower()}@bookTicker",
+        'data': {'u': update_id, 's': symbol, 'b': f"{bid:.4f}", 'B': "1.0",
+                 'a': f"{bid * 1.0001:.4f}", 'A': "1.0"}
+    }
+
+
+def make_trade(pair: str, entry: float) -> SimpleNamespace:
+    return SimpleNamespace(pair=pair, entry_price=entry, stop_loss=entry * 0.99,
+                           take_profit=entry * 1.02, trailing_stop=entry * 1.005)
+
+
+def check_rules() -> bool:
+    """Priorité des règles (même ordre que manage_open_positions)"""
+    trade = make_trade("BTCUSDC", 100.0)
+    cases = [
+        (98.0, DECISION_STOP_LOSS),
+        (100.0, None),
+        (100.6, DECISION_TRAILING),
+        (103.0, DECISION_TRAILING),  # Trailing prioritaire sur le take profit
+    ]
+    ok = all(evaluate_exit(trade, price, TRAILING_STEP) == expected for price, expected in cases)
+    trade.trailing_stop = 1e9
+    ok &= evaluate_exit(trade, 103.0, TRAILING_STEP) == DECISION_TAKE_PROFIT
+    return ok
+
+
+async def run_test() -> bool:
+    print("🧪 TEST POSITIONENGINE (rejeu bookTicker local)")
+    print("=" * 40)
+
+    ok = check_rules()
+    print(f"\n🔍 Test 1: priorité SL > trailing > TP: {ok}")
+
+    # Paire suivie (hausse -> trailing, puis chute -> stop loss), paire bruit sans position
+    path = [100.0 + 0.01 * i for i in range(100)] + [100.9 - 0.05 * i for i in range(60)]
+    frames = []
+    for i, price in enumerate(path):
+        frames.append({'t': i * 0.002, 'frame': book_ticker("BTCUSDC", price, i)})
+        frames.append({'t': i * 0.002 + 0.001, 'frame': book_ticker("ETHUSDC", 2000.0 + i, i)})
+
+    positions = {"BTCUSDC_1": make_trade("BTCUSDC", 100.0)}
+    decisions = []
+
+    async def on_decision(trade_id, trade, decision, price):
+        decisions.append((decision, price))
+        await asyncio.sleep(0.001)  # Ordre simulé
+        if decision == DECISION_TRAILING:
+            trade.stop_loss = price * (1 - TRAILING_STEP / 100)
+        else:
+            positions.pop(trade_id, None)
+
+    async with websockets.serve(make_replay_handler(frames, speed=1.0), "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        engine = PositionEngine(positions, stream_url=f"ws://127.0.0.1:{port}", trailing_step_percent=TRAILING_STEP)
+        engine.set_decision_handler(on_decision)
+        await engine.start()
+
+        deadline = time.monotonic() + 10
+        while engine.stats['ticks'] < len(frames) and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+        await asyncio.sleep(0.05)
+
+        # Test 2: seules les positions de la paire tickée sont évaluées
+        evaluated_ok = engine.stats['evaluations'] <= len(path)
+        print(f"🔍 Test 2: {engine.stats['evaluations']} évaluations pour {engine.stats['ticks']} ticks "
+              f"(paire sans position ignorée): {evaluated_ok}")
+        ok &= evaluated_ok
+
+        # Test 3: trailing puis stop loss sur la chute, position fermée une seule fois
+        kinds = [decision for decision, _ in decisions]
+        sequence_ok = (DECISION_TRAILING in kinds and kinds[-1] == DECISION_STOP_LOSS
+                       and kinds.count(DECISION_STOP_LOSS) == 1 and not positions)
+        print(f"🔍 Test 3: {kinds.count(DECISION_TRAILING)} trailing puis stop loss à "
+              f"{decisions[-1][1] if decisions else 0:.2f}: {sequence_ok}")
+        ok &= sequence_ok
+
+        # Test 4: latences mesurées
+        report = engine.latency_report()
+        latency_ok = bool(report['decision']) and bool(report['action'])
+        print(f"🔍 Test 4: percentiles de latence disponibles: {latency_ok}")
+        ok &= latency_ok
+        if latency_ok:
+            d, a = report['decision'], report['action']
+            print(f"   ⏱️ Tick -> décision: p50 {d['p50_us']:.1f}µs, p90 {d['p90_us']:.1f}µs, p99 {d['p99_us']:.1f}µs")
+            print(f"   ⏱️ Tick -> fin d'action: p50 {a['p50_us'] / 1000:.2f}ms, p99 {a['p99_us'] / 1000:.2f}ms")
+
+        await engine.stop()
+
+    print(f"\n📊 Stats: {engine.stats}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test hors ligne du limiteur de poids API
+Priorité des ordres sur le scan, resynchronisation X-MBX-USED-WEIGHT-1M et suspension sur 429
+(serveur HTTP local imitant l'API REST Binance)
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from aiohttp import web
+
+    from utils.exchange_gateway import ExchangeGateway, WeightTrackingClient
+    from utils.rate_limiter import (PRIORITY_ORDERS, PRIORITY_SCAN, WeightRateLimiter, request_priority,
+                                    request_weight)
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    print("Assurez-vous d'avoir installé: pip install aiohttp python-binance")
+    sys.exit(1)
+
+
+async def check_priorities() -> bool:
+    """Seau vide: l'ordre arrivé après les requêtes de scan passe en premier"""
+    limiter = WeightRateLimiter(weight_per_minute=600, reserve_ratio=0.2)  # 10 de poids par seconde
+    await limiter.acquire(600, PRIORITY_ORDERS)
+    served = []
+
+    async def request(name: str, weight: int, priority: int):
+        await limiter.acquire(weight, priority)
+        served.append(name)
+
+    tasks = [asyncio.create_task(request(f"scan{i}", 2, PRIORITY_SCAN)) for i in range(3)]
+    await asyncio.sleep(0.05)
+    tasks.append(asyncio.create_task(request("order", 1, PRIORITY_ORDERS)))
+    await asyncio.gather(*tasks)
+    return served[0] == "order" and limiter.headroom(PRIORITY_SCAN) == 0
+
+
+def check_weights() -> bool:
+    return (request_weight('get_ticker', {}) == 80 and request_weight('get_ticker', {'symbol': 'BTCUSDC'}) == 2
+            and request_weight('get_account', {}) == 20 and request_weight('get_klines', {'limit': 100}) == 1
+            and request_weight('get_klines', {'limit': 1000}) == 5
+            and request_priority('cancel_order', {}) == PRIORITY_ORDERS
+            and request_priority('get_klines', {}) == PRIORITY_SCAN)
+
+
+async def run_test() -> bool:
+    print("🧪 TEST LIMITEUR DE POIDS API")
+    print("=" * 40)
+
+    ok = check_weights()
+    print(f"\n🔍 Test 1: poids des endpoints: {ok}")
+
+    priorities_ok = await check_priorities()
+    print(f"🔍 Test 2: ordre servi avant le scan, réserve préservée: {priorities_ok}")
+    ok &= priorities_ok
+
+    state = {'used': 0, 'throttle': False}
+
+    async def ticker(request):
+        if state['throttle']:
+            return web.json_response({'code': -1003, 'msg': 'Too many requests'}, status=429,
+                                     headers={'Retry-After': '1', 'X-MBX-USED-WEIGHT-1M': '6000'})
+        state['used'] += 80
+        return web.json_response([{'symbol': 'BTCUSDC', 'lastPrice': '60000'}],
+                                 headers={'X-MBX-USED-WEIGHT-1M': str(state['used'] + 4000)})
+
+    app = web.Application()
+    app.router.add_get('/api/v3/ticker/24hr', ticker)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    gateway = ExchangeGateway('key', 'secret', weight_per_minute=6000)
+    client = WeightTrackingClient('key', 'secret')
+    client.API_URL = f"http://127.0.0.1:{port}/api"
+    client.rate_limiter = gateway.rate_limiter
+    gateway.client = client
+
+    # Test 3: le poids annoncé par Binance (d'autres processus sur la même IP) borne la marge
+    await gateway.get_ticker()
+    headroom = gateway.weight_headroom()
+    sync_ok = gateway.rate_limiter.server_used_weight == 4080 and headroom <= 6000 - 4080 - 1200
+    print(f"🔍 Test 3: en-tête 4080 utilisés -> marge scan {headroom}: {sync_ok}")
+    ok &= sync_ok
+
+    # Test 4: 429 -> suspension Retry-After, puis reprise
+    state['throttle'] = True
+    try:
+        await gateway.get_ticker()
+    except Exception:
+        pass
+    state['throttle'] = False
+    blocked_ok = gateway.rate_limiter.is_blocked() and gateway.weight_headroom() == 0
+    started_at = time.monotonic()
+    await gateway.get_ticker()
+    waited = time.monotonic() - started_at
+    blocked_ok &= waited >= 0.9
+    print(f"🔍 Test 4: 429 -> requêtes suspendues {waited:.2f}s puis reprise: {blocked_ok}")
+    ok &= blocked_ok
+
+    await gateway.close()
+    await runner.cleanup()
+
+    print(f"\n📊 Stats: {gateway.rate_limiter.stats}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
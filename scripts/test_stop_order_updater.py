@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test hors ligne du StopOrderUpdater
+Trailing au rythme des ticks: cancelReplace regroupés par position, reprise si l'ancien stop a disparu,
+stop jambe de l'OCO d'entrée remplacé par annulation de la liste
+"""
+
+import asyncio
+import itertools
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from utils.account_state import AccountState
+    from utils.stop_order_updater import CANCEL_REPLACE_FAILURE, StopOrderUpdater
+    from utils.symbol_filters import SymbolFilterTable, parse_symbol_filters
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+class CancelReplaceError(Exception):
+    def __init__(self, code: int):
+        super().__init__(f"APIError(code={code})")
+        self.code = code
+
+
+class FakeExchange:
+    """Ordres stop factices, latence réseau simulée"""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.order_ids = itertools.count(100)
+        self.open_orders = {}
+        self.order_lists = {}  # orderListId -> IDs des jambes
+        self.calls = []
+        self.listeners = []
+
+    async def cancel_replace_order(self, **params):
+        self.calls.append(('cancel_replace_order', params))
+        await asyncio.sleep(self.latency)
+        old = self.open_orders.get(params['cancelOrderId'])
+        if old is None or 'orderListId' in old:
+            raise CancelReplaceError(CANCEL_REPLACE_FAILURE)  # Jambe d'OCO: annulation refusée
+        del self.open_orders[params['cancelOrderId']]
+        new_id = next(self.order_ids)
+        self.open_orders[new_id] = params
+        response = {
+            'cancelResult': 'SUCCESS', 'newOrderResult': 'SUCCESS',
+            'cancelResponse': {'symbol': params['symbol'], 'side': 'SELL', 'origQty': str(old['quantity']),
+                               'price': str(old['price']), 'executedQty': '0'},
+            'newOrderResponse': {'orderId': new_id, 'executedQty': '0', 'transactTime': 1}
+        }
+        for callback in self.listeners:
+            callback('cancel_replace_order', params, response)
+        return response
+
+    async def create_order(self, **params):
+        self.calls.append(('create_order', params))
+        await asyncio.sleep(self.latency)
+        new_id = next(self.order_ids)
+        self.open_orders[new_id] = params
+        return {'orderId': new_id}
+
+    async def cancel_order_list(self, symbol: str, orderListId: int):
+        self.calls.append(('cancel_order_list', {'symbol': symbol, 'orderListId': orderListId}))
+        await asyncio.sleep(self.latency)
+        legs = self.order_lists.pop(orderListId)
+        for order_id in legs:
+            self.open_orders.pop(order_id, None)
+        return {'orderListId': orderListId, 'listOrderStatus': 'ALL_DONE',
+                'orders': [{'symbol': symbol, 'orderId': order_id} for order_id in legs]}
+
+    async def get_order(self, symbol: str, orderId: int):
+        order = self.open_orders.get(orderId)
+        if order is None:
+            raise CancelReplaceError(-2013)  # Ordre inconnu
+        return {'orderId': orderId, 'status': 'NEW', 'orderListId': order.get('orderListId', -1)}
+
+
+def make_filters() -> SymbolFilterTable:
+    table = SymbolFilterTable(exchange=None)
+    table._filters['BTCUSDC'] = parse_symbol_filters({'symbol': 'BTCUSDC', 'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '0.01', 'maxPrice': '1000000', 'tickSize': '0.01000000'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.00001', 'maxQty': '9000', 'stepSize': '0.00001000'}
+    ]})
+    return table
+
+
+async def run_test() -> bool:
+    print("🧪 TEST STOPORDERUPDATER (cancelReplace)")
+    print("=" * 40)
+
+    exchange = FakeExchange()
+    exchange.open_orders[1] = {'quantity': 0.5, 'price': 59000.0}
+    trade = SimpleNamespace(pair='BTCUSDC', size=0.5, stop_loss=59500.0, stop_loss_order_id='1')
+    positions = {'T1': trade}
+    updater = StopOrderUpdater(exchange, make_filters(), positions, min_interval_seconds=0.1)
+
+    # Test 1: 200 pas de trailing à 1ms d'intervalle -> quelques requêtes, dernier niveau appliqué
+    for i in range(200):
+        trade.stop_loss = 59500.0 + i * 1.5
+        updater.submit('T1', trade)
+        await asyncio.sleep(0.001)
+    while updater.is_pending('T1'):
+        await asyncio.sleep(0.01)
+    replaces = [params for method, params in exchange.calls if method == 'cancel_replace_order']
+    ok = (len(replaces) <= 6 and replaces[-1]['stopPrice'] == 59798.5
+          and list(exchange.open_orders) == [int(trade.stop_loss_order_id)])
+    print(f"\n🔍 Test 1: 200 pas de trailing -> {len(replaces)} cancelReplace, un seul stop actif "
+          f"à {replaces[-1]['stopPrice']}: {ok}")
+
+    # Test 2: une seule requête par mise à jour (plus de cancel + create)
+    single_ok = all(method == 'cancel_replace_order' for method, _ in exchange.calls)
+    print(f"🔍 Test 2: aucune paire annulation + création séparée: {single_ok}")
+    ok &= single_ok
+
+    # Test 3: ancien stop disparu (annulé hors du bot) -> nouvel ordre créé
+    exchange.open_orders.clear()
+    new_id = await updater.replace(trade, 60000.0)
+    recover_ok = new_id is not None and exchange.calls[-1][0] == 'create_order' and updater.stats['recoveries'] == 1
+    print(f"🔍 Test 3: cancelReplace refusé (-2022), stop recréé: {recover_ok}")
+    ok &= recover_ok
+
+    # Test 4: position fermée pendant l'attente -> demande abandonnée
+    calls_before = len(exchange.calls)
+    trade.stop_loss = 60100.0
+    updater.submit('T1', trade)
+    positions.clear()
+    await updater.cancel('T1')
+    await asyncio.sleep(0.2)
+    closed_ok = len(exchange.calls) == calls_before
+    print(f"🔍 Test 4: aucune requête après fermeture de la position: {closed_ok}")
+    ok &= closed_ok
+
+    # Test 5: fonds bloqués inchangés après cancelReplace (libération + nouveau blocage)
+    account = AccountState(exchange)
+    account._balances['BTC'] = SimpleNamespace(free=0.0, locked=0.5)
+    exchange.listeners.append(account.on_order_response)
+    exchange.open_orders[7] = {'quantity': 0.5, 'price': 59000.0}
+    trade.stop_loss_order_id = '7'
+    positions['T1'] = trade
+    await updater.replace(trade, 60200.0)
+    balance = account._balances['BTC']
+    account_ok = abs(balance.locked - 0.5) < 1e-12 and abs(balance.free) < 1e-12
+    print(f"🔍 Test 5: soldes bloqués cohérents après cancelReplace: {account_ok}")
+    ok &= account_ok
+
+    # Test 6: jambe d'OCO inconnue du trade (position restaurée) -> détectée, liste annulée, puis cancelReplace
+    exchange.open_orders.clear()
+    exchange.order_lists[9] = [10, 11]
+    exchange.open_orders[10] = {'quantity': 0.5, 'price': 59000.0, 'orderListId': 9}  # STOP_LOSS_LIMIT
+    exchange.open_orders[11] = {'quantity': 0.5, 'price': 61000.0, 'orderListId': 9}  # LIMIT_MAKER
+    trade.stop_loss_order_id, trade.take_profit_order_id = '10', '11'
+    calls_before = len(exchange.calls)
+    first_id = await updater.replace(trade, 60300.0)
+    second_id = await updater.replace(trade, 60400.0)
+    methods = [method for method, _ in exchange.calls[calls_before:]]
+    oco_ok = (first_id is not None and second_id == trade.stop_loss_order_id
+              and methods == ['cancel_replace_order', 'cancel_order_list', 'create_order', 'cancel_replace_order']
+              and trade.take_profit_order_id is None and not exchange.order_lists
+              and list(exchange.open_orders) == [int(second_id)] and updater.stats['order_lists'] == 1)
+    print(f"🔍 Test 6: stop jambe d'OCO -> {methods}, stop suivant par cancelReplace: {oco_ok}")
+    ok &= oco_ok
+
+    # Test 7: OCO d'entrée connu (trade.oco_order_list_id) -> pas de cancelReplace voué à l'échec
+    exchange.open_orders.clear()
+    exchange.order_lists[12] = [13, 14]
+    exchange.open_orders[13] = {'quantity': 0.5, 'price': 59000.0, 'orderListId': 12}
+    exchange.open_orders[14] = {'quantity': 0.5, 'price': 61000.0, 'orderListId': 12}
+    trade.stop_loss_order_id, trade.take_profit_order_id, trade.oco_order_list_id = '13', '14', '12'
+    calls_before = len(exchange.calls)
+    new_id = await updater.replace(trade, 60500.0)
+    methods = [method for method, _ in exchange.calls[calls_before:]]
+    direct_ok = (methods == ['cancel_order_list', 'create_order'] and trade.oco_order_list_id is None
+                 and list(exchange.open_orders) == [int(new_id)] and exchange.open_orders[int(new_id)]['stopPrice'] == 60500.0)
+    print(f"🔍 Test 7: OCO d'entrée connu -> {methods}: {direct_ok}")
+    ok &= direct_ok
+
+    print(f"\n📊 Stats: {updater.stats}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
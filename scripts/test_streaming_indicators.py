@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Test de parité des indicateurs incrémentaux avec talib
+Sur des bougies enregistrées (frames de kline_replay_server.py) ou, à défaut, synthétiques
+
+Usage:
+    python scripts/test_streaming_indicators.py
+    python scripts/test_streaming_indicators.py --input data/kline_frames.jsonl
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    import numpy as np
+    import talib
+
+    from utils.streaming_indicators import (StreamingATR, StreamingBollinger, StreamingEMA,
+                                            StreamingIndicatorSet, StreamingMACD, StreamingRSI,
+                                            StreamingSMA)
+    from utils.technical_indicators import TechnicalAnalyzer
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    print("Assurez-vous d'avoir installé: pip install numpy TA-Lib")
+    sys.exit(1)
+
+TOLERANCE = 1e-8
+
+
+def recorded_series(path: str, min_candles: int = 60) -> Dict[str, Dict[str, np.ndarray]]:
+    """Bougies clôturées par (paire, intervalle) à partir des frames enregistrées"""
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    rows: Dict[str, Dict[float, tuple]] = {}
+    for record in records:
+        data = record['frame'].get('data', {})
+        if data.get('e') != 'kline' or not data['k'].get('x'):
+            continue
+        k = data['k']
+        rows.setdefault(f"{k['s']}@{k['i']}", {})[float(k['t'])] = (
+            float(k['t']), float(k['o']), float(k['h']), float(k['l']), float(k['c']), float(k['v'])
+        )
+
+    series = {}
+    for name, by_time in rows.items():
+        if len(by_time) >= min_candles:
+            matrix = np.array([by_time[t] for t in sorted(by_time)], dtype=np.float64).T
+            series[name] = dict(zip(('open_time', 'open', 'high', 'low', 'close', 'volume'), matrix))
+    return series
+
+
+def synthetic_series(count: int = 1000, seeds: int = 5) -> Dict[str, Dict[str, np.ndarray]]:
+    series = {}
+    for seed in range(seeds):
+        rng = np.random.default_rng(seed)
+        close = 100 + np.cumsum(rng.normal(0, 0.3, count))
+        open_ = close + rng.normal(0, 0.1, count)
+        series[f"SYNTH{seed}@1m"] = {
+            'open_time': 1_700_000_000_000 + np.arange(count, dtype=np.float64) * 60_000,
+            'open': open_,
+            'high': np.maximum(open_, close) + np.abs(rng.normal(0, 0.2, count)),
+            'low': np.minimum(open_, close) - np.abs(rng.normal(0, 0.2, count)),
+            'close': close,
+            'volume': np.abs(rng.normal(100, 40, count))
+        }
+    return series
+
+
+def same(a: np.ndarray, b: np.ndarray) -> bool:
+    return bool(np.allclose(a, b, rtol=TOLERANCE, atol=TOLERANCE, equal_nan=True))
+
+
+def replay(indicator, inputs: List[np.ndarray], outputs: int = 1) -> List[np.ndarray]:
+    """Rejoue une série bougie par bougie; vérifie au passage que preview() == update()"""
+    values = [[] for _ in range(outputs)]
+    for row in zip(*inputs):
+        preview = indicator.preview(*row)
+        update = indicator.update(*row)
+        preview, update = (preview, update) if outputs > 1 else ((preview,), (update,))
+        if not same(np.array(preview), np.array(update)):
+            raise AssertionError(f"preview {preview} != update {update}")
+        for i in range(outputs):
+            values[i].append(update[i])
+    return [np.array(v) for v in values]
+
+
+def check_indicators(name: str, candles: Dict[str, np.ndarray]) -> bool:
+    """Parité de chaque indicateur incrémental avec talib sur la série complète"""
+    o, h, l, c, v = (candles[k] for k in ('open', 'high', 'low', 'close', 'volume'))
+    macd = talib.MACD(c, fastperiod=12, slowperiod=26, signalperiod=9)
+    bbands = talib.BBANDS(c, timeperiod=20, nbdevup=2, nbdevdn=2)
+
+    checks = {
+        'EMA9': (replay(StreamingEMA(9), [c]), [talib.EMA(c, timeperiod=9)]),
+        'EMA50': (replay(StreamingEMA(50), [c]), [talib.EMA(c, timeperiod=50)]),
+        'RSI14': (replay(StreamingRSI(14), [c]), [talib.RSI(c, timeperiod=14)]),
+        'MACD': (replay(StreamingMACD(12, 26, 9), [c], 3), list(macd)),
+        'BBANDS': (replay(StreamingBollinger(20, 2, 2), [c], 3), list(bbands)),
+        'ATR14': (replay(StreamingATR(14), [h, l, c]), [talib.ATR(h, l, c, timeperiod=14)]),
+        'SMA20 volume': (replay(StreamingSMA(20), [v]), [talib.SMA(v, timeperiod=20)]),
+    }
+
+    ok = True
+    for indicator, (streamed, expected) in checks.items():
+        passed = all(same(s, e) for s, e in zip(streamed, expected))
+        ok &= passed
+        if not passed:
+            print(f"   ❌ {name} {indicator}: divergence avec talib")
+    return ok
+
+
+def check_sliding_windows(name: str, candles: Dict[str, np.ndarray], window: int = 100) -> bool:
+    """StreamingIndicatorSet sur des fenêtres glissantes (comme le CandleStore) vs talib sur l'historique"""
+    state = StreamingIndicatorSet()
+    total = len(candles['close'])
+    ok = True
+
+    for end in range(window, total + 1):
+        view = {k: values[end - window:end] for k, values in candles.items()}
+        if not state.sync(view):
+            print(f"   ❌ {name}: synchronisation refusée à la bougie {end}")
+            return False
+        streamed = state.indicators(view)
+
+        # Première fenêtre: identique à talib sur la fenêtre; ensuite: talib sur tout l'historique
+        history = {k: values[(end - window if end == window else 0):end] for k, values in candles.items()}
+        c = history['close']
+        expected = {
+            'ema21': talib.EMA(c, timeperiod=21)[-1],
+            'rsi': talib.RSI(c, timeperiod=14)[-1],
+            'macdhist': talib.MACD(c, fastperiod=12, slowperiod=26, signalperiod=9)[2][-1],
+            'bb_lower': talib.BBANDS(c, timeperiod=20, nbdevup=2, nbdevdn=2)[2][-1],
+            'atr': talib.ATR(history['high'], history['low'], c, timeperiod=14)[-1],
+            'hammer': talib.CDLHAMMER(history['open'], history['high'], history['low'], c)[-1],
+        }
+        for key, value in expected.items():
+            if not same(np.array(streamed[key][-1]), np.array(value)):
+                print(f"   ❌ {name} fenêtre {end}: {key} {streamed[key][-1]} != {value}")
+                ok = False
+        if not ok:
+            break
+    return ok
+
+
+def bench(candles: Dict[str, np.ndarray], window: int = 100, iterations: int = 300) -> None:
+    """Coût par nouvelle bougie: incrémental vs recalcul talib complet sur la fenêtre"""
+    analyzer = TechnicalAnalyzer()
+    state = StreamingIndicatorSet()
+    views = [{k: v[end - window:end] for k, v in candles.items()}
+             for end in range(window, min(len(candles['close']), window + iterations) + 1)]
+
+    start = time.perf_counter()
+    for view in views:
+        analyzer.compute_indicators(view['open'], view['high'], view['low'], view['close'], view['volume'])
+    full = (time.perf_counter() - start) / len(views) * 1e6
+
+    start = time.perf_counter()
+    for view in views:
+        state.sync(view)
+        state.indicators(view)
+    incremental = (time.perf_counter() - start) / len(views) * 1e6
+
+    print(f"\n⏱️ Recalcul talib ({window} bougies): {full:7.1f} µs / bougie")
+    print(f"⏱️ Incrémental:                  {incremental:7.1f} µs / bougie")
+
+
+def main() -> bool:
+    parser = argparse.ArgumentParser(description="Parité indicateurs incrémentaux / talib")
+    parser.add_argument('--input', help="Frames enregistrées (JSONL de kline_replay_server.py)")
+    args = parser.parse_args()
+
+    print("🧪 TEST PARITÉ INDICATEURS INCRÉMENTAUX / TALIB")
+    print("=" * 50)
+
+    series = recorded_series(args.input) if args.input else synthetic_series()
+    if not series:
+        print("❌ Aucune série exploitable (60 bougies clôturées minimum par paire)")
+        return False
+    print(f"📊 {len(series)} séries ({'enregistrées' if args.input else 'synthétiques'})")
+
+    ok = True
+    for name, candles in series.items():
+        indicators_ok = check_indicators(name, candles)
+        windows_ok = check_sliding_windows(name, candles)
+        print(f"{'✅' if indicators_ok and windows_ok else '❌'} {name}: {len(candles['close'])} bougies")
+        ok &= indicators_ok and windows_ok
+
+    longest = max(series.values(), key=lambda candles: len(candles['close']))
+    if len(longest['close']) > 100:
+        bench(longest)
+
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
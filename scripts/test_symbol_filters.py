@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test de la table des filtres de trading
+Arrondis exacts au tick / au pas comparés à une référence Decimal, et une seule requête exchangeInfo
+"""
+
+import asyncio
+import random
+import sys
+import time
+from decimal import ROUND_DOWN, ROUND_HALF_UP, Decimal
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from utils.symbol_filters import SymbolFilterTable, parse_symbol_filters
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+TICKS = ['0.01000000', '0.00010000', '0.05000000', '0.00000100', '1.00000000', '0.25000000']
+STEPS = ['0.00001000', '0.00100000', '1.00000000', '0.10000000', '0.00000001']
+
+
+def symbol_info(symbol: str, tick: str, step: str) -> dict:
+    return {'symbol': symbol, 'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': tick, 'maxPrice': '1000000.00000000', 'tickSize': tick},
+        {'filterType': 'LOT_SIZE', 'minQty': step, 'maxQty': '900000.00000000', 'stepSize': step},
+        {'filterType': 'NOTIONAL', 'minNotional': '5.00000000'}
+    ]}
+
+
+def reference(value: float, step: str, rounding: str) -> float:
+    """Multiple du pas calculé en Decimal"""
+    step_decimal = Decimal(step)
+    steps = (Decimal(repr(value)) / step_decimal).to_integral_value(rounding=rounding)
+    return float(steps * step_decimal)
+
+
+class FakeExchange:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_exchange_info(self) -> dict:
+        self.calls += 1
+        return {'symbols': [symbol_info(f"C{i}USDC", TICKS[i % len(TICKS)], STEPS[i % len(STEPS)])
+                            for i in range(2000)]}
+
+
+def check_rounding(samples: int = 20000) -> bool:
+    rng = random.Random(42)
+    errors = 0
+    for _ in range(samples):
+        tick, step = rng.choice(TICKS), rng.choice(STEPS)
+        filters = parse_symbol_filters(symbol_info("X", tick, step))
+        value = round(rng.uniform(0, 5000), rng.randint(0, 10))
+        if filters.round_price(value) != reference(value, tick, ROUND_HALF_UP):
+            errors += 1
+        if filters.round_quantity(value) != reference(value, step, ROUND_DOWN):
+            errors += 1
+    return errors == 0
+
+
+async def run_test() -> bool:
+    print("🧪 TEST TABLE DES FILTRES DE TRADING")
+    print("=" * 40)
+
+    ok = check_rounding()
+    print(f"\n🔍 Test 1: arrondis identiques à la référence Decimal (20000 tirages): {ok}")
+
+    # Cas connus des flottants: 0.1 + 0.2, quantité juste sous un pas
+    filters = parse_symbol_filters(symbol_info("BTCUSDC", '0.01000000', '0.00001000'))
+    cases_ok = (filters.round_price(0.1 + 0.2) == 0.3 and filters.round_quantity(0.30000000000000004) == 0.3
+                and filters.round_quantity(0.0012399999) == 0.00123
+                and filters.round_quantity(0.001231, round_up=True) == 0.00124
+                and filters.price_precision == 2 and filters.quantity_precision == 5)
+    print(f"🔍 Test 2: cas limites des flottants et précisions entières: {cases_ok}")
+    ok &= cases_ok
+
+    exchange = FakeExchange()
+    table = SymbolFilterTable(exchange)
+    await table.load()
+
+    started_at = time.perf_counter()
+    for i in range(100000):
+        table.round_price(f"C{i % 2000}USDC", 123.456789)
+    per_call_us = (time.perf_counter() - started_at) * 10
+    await table.ensure("UNKNOWNUSDC")
+    await table.ensure("UNKNOWNUSDC")
+    table_ok = exchange.calls == 1 and len(table) == 2000 and table.get("UNKNOWNUSDC") is None
+    print(f"🔍 Test 3: 100000 arrondis ({per_call_us:.2f} µs/appel) avec {exchange.calls} requête exchangeInfo: {table_ok}")
+    ok &= table_ok
+
+    print(f"\n📊 Stats: {table.stats}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
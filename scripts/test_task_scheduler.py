@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test hors ligne du TaskScheduler
+Un scan lent ne doit pas retarder la gestion des positions; le verrou partagé va au plus prioritaire
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from utils.task_scheduler import (PRIORITY_METRICS, PRIORITY_POSITIONS, PRIORITY_SCAN, PriorityLock,
+                                      TaskScheduler)
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+async def check_priority_lock() -> bool:
+    """Les attentes sont servies par priorité, pas par ordre d'arrivée"""
+    lock = PriorityLock()
+    await lock.acquire(PRIORITY_SCAN)
+    order = []
+
+    async def waiter(name: str, priority: int):
+        await lock.acquire(priority)
+        order.append(name)
+        lock.release()
+
+    tasks = [asyncio.create_task(waiter('metrics', PRIORITY_METRICS)),
+             asyncio.create_task(waiter('scan', PRIORITY_SCAN)),
+             asyncio.create_task(waiter('positions', PRIORITY_POSITIONS))]
+    await asyncio.sleep(0.01)
+    lock.release()
+    await asyncio.gather(*tasks)
+    return order == ['positions', 'scan', 'metrics'] and not lock.locked()
+
+
+async def run_test() -> bool:
+    print("🧪 TEST TASKSCHEDULER")
+    print("=" * 40)
+
+    ok = await check_priority_lock()
+    print(f"\n🔍 Test 1: verrou attribué par priorité: {ok}")
+
+    scheduler = TaskScheduler()
+    position_runs = []
+    scan_runs = []
+    errors = []
+
+    async def positions():
+        position_runs.append(time.perf_counter())
+
+    async def scan():
+        scan_runs.append(time.perf_counter())
+        await asyncio.sleep(0.5)  # Scan lent (appels réseau simulés)
+        async with scheduler.locked('positions', priority=PRIORITY_SCAN):
+            await asyncio.sleep(0.01)  # Ouverture de position
+
+    async def failing():
+        raise RuntimeError("erreur simulée")
+
+    scheduler.error_handler = lambda name, error: errors.append(name)
+    scheduler.add('positions', positions, 0.05, PRIORITY_POSITIONS, locks=('positions',))
+    scheduler.add('scan', scan, 1.0, PRIORITY_SCAN)
+    scheduler.add('failing', failing, 0.2, PRIORITY_METRICS)
+
+    runner = asyncio.create_task(scheduler.run())
+    await asyncio.sleep(1.0)
+    scheduler.stop()
+    await runner
+
+    # Test 2: la gestion des positions tourne pendant le scan lent
+    gaps = [b - a for a, b in zip(position_runs, position_runs[1:])]
+    cadence_ok = len(position_runs) >= 15 and max(gaps) < 0.15
+    print(f"🔍 Test 2: {len(position_runs)} cycles positions pendant {len(scan_runs)} scan(s), "
+          f"écart max {max(gaps) * 1000:.0f} ms: {cadence_ok}")
+    ok &= cadence_ok
+
+    # Test 3: une tâche en erreur est signalée et continue de tourner
+    report = scheduler.report()
+    errors_ok = report['failing']['errors'] >= 3 and len(errors) == report['failing']['errors']
+    print(f"🔍 Test 3: {report['failing']['errors']} erreurs signalées sans arrêter l'ordonnanceur: {errors_ok}")
+    ok &= errors_ok
+
+    print(f"\n📊 Stats: {report}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if asyncio.run(run_test()) else 1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test de l'optimisation walk-forward
+Découpage en plis, chauffe sans entrée, parité des plis parallèles avec un calcul séquentiel,
+stabilité des paramètres et reproductibilité
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Ajouter le répertoire parent au PATH pour les imports
+sys.path.append(str(Path(__file__).parent.parent))
+
+try:
+    from config import TradingConfig
+    from test_backtester import synthetic_klines
+    from utils.backtester import Backtester, MarketData
+    from utils.parameter_sweep import grid, run_backtest
+    from utils.walk_forward import WalkForward, backtest_window, walk_forward_windows
+except ImportError as e:
+    print(f"❌ Erreur import: {e}")
+    sys.exit(1)
+
+
+def serial_fold(data: MarketData, config: TradingConfig, combinations, window):
+    """Même pli calculé sans pool: meilleure combinaison in-sample puis PnL hors échantillon"""
+    start, end, start_minute = backtest_window(window[0], window[1])
+    rows = [run_backtest(data.slice(start, end), params, config, start_minute=start_minute - start)
+            for params in combinations]
+    best = max(rows, key=lambda row: (row['pnl'], -row['max_drawdown_percent']))
+    params = {name: best[name] for name in combinations[0]}
+    start, end, start_minute = backtest_window(window[2], window[3])
+    test = run_backtest(data.slice(start, end), params, config, start_minute=start_minute - start)
+    return params, test['pnl']
+
+
+def run_test() -> bool:
+    print("🧪 TEST WALK-FORWARD")
+    print("=" * 40)
+
+    config = TradingConfig()
+    config.TRADING_HOURS_ENABLED = False
+    data = MarketData.from_klines({f"S{i}USDC": synthetic_klines(1440 * 6, seed=i) for i in range(4)})
+    combinations = grid({'STOP_LOSS_PERCENT': [0.2, 0.4], 'TAKE_PROFIT_PERCENT': [0.8, 1.5]})
+
+    # Test 1: plis de 2 jours d'entraînement + 1 jour de test, décalés d'un jour
+    windows = walk_forward_windows(len(data.open_time), train_days=2, test_days=1)
+    ok = (len(windows) == 4 and all(train_end == test_start for _, train_end, test_start, _ in windows)
+          and all(b[2] == a[3] for a, b in zip(windows, windows[1:])) and windows[-1][3] == len(data.open_time))
+    print(f"\n🔍 Test 1: {len(windows)} plis, fenêtres de test contiguës: {ok}")
+
+    # Test 2: 24h de chauffe avant la fenêtre, aucune entrée avant son début
+    start, end, start_minute = backtest_window(windows[1][2], windows[1][3])
+    backtester = Backtester(config, data.slice(start, end), start_minute=start_minute - start)
+    trades = backtester.run().trades
+    warmup_ok = start_minute - start == 1440 and len(trades) > 0 and min(t.entry_index for t in trades) >= 1440
+    print(f"🔍 Test 2: {len(trades)} trades, première entrée après la chauffe: {warmup_ok}")
+    ok &= warmup_ok
+
+    # Test 3: plis parallèles == calcul séquentiel (paramètres retenus et PnL hors échantillon)
+    walk_forward = WalkForward(data, combinations, config, train_days=2, test_days=1, workers=2)
+    report = walk_forward.run()
+    expected = [serial_fold(data, config, combinations, window) for window in windows]
+    folds = report.folds
+    parity_ok = (len(folds) == 4
+                 and all({name: folds.loc[i + 1, name] for name in params} == params
+                         for i, (params, _) in enumerate(expected))
+                 and np.allclose(folds['test_pnl'].to_numpy(), [pnl for _, pnl in expected]))
+    print(f"🔍 Test 3: {len(folds)} plis identiques au calcul séquentiel: {parity_ok}")
+    ok &= parity_ok
+
+    # Test 4: stabilité des paramètres retenus et comparaison à la configuration de référence
+    stability = report.stability
+    summary = report.summary()
+    stability_ok = (set(stability.index) == {'STOP_LOSS_PERCENT', 'TAKE_PROFIT_PERCENT'}
+                    and all(0 < share <= 1 for share in stability['mode_share'])
+                    and all(changes <= 3 for changes in stability['changes'])
+                    and all(len(history.split(', ')) == 4 for history in stability['history'])
+                    and np.isclose(summary['test_pnl'], folds['test_pnl'].sum())
+                    and 'baseline_test_pnl' in summary)
+    print(f"🔍 Test 4: stabilité {stability[['history', 'mode_share', 'changes']].to_dict('index')}: {stability_ok}")
+    ok &= stability_ok
+
+    # Test 5: pipeline reproductible (même rapport avec un seul processus)
+    again = WalkForward(data, combinations, config, train_days=2, test_days=1, workers=1).run()
+    reproducible = again.folds.equals(folds)
+    print(f"🔍 Test 5: rapport identique sur 1 processus: {reproducible}")
+    ok &= reproducible
+
+    # Test 6: historique trop court refusé
+    try:
+        WalkForward(data, combinations, config, train_days=5, test_days=2).run()
+        rejected = False
+    except ValueError:
+        rejected = True
+    print(f"🔍 Test 6: historique trop court refusé: {rejected}")
+    ok &= rejected
+
+    print(f"\n📊 Stats: {summary}")
+    print(f"\n{'✅ TOUS LES TESTS PASSÉS' if ok else '❌ ÉCHEC DES TESTS'}")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_test() else 1)
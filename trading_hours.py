@@ -5,20 +5,29 @@ Fonctions pour optimiser les heures de trading
 """
 
 from datetime import datetime
+from typing import Optional
 
 import pytz
 
 from config import TradingConfig
 
 
-def is_trading_hours_active(config: TradingConfig) -> bool:
+def _paris_time(now: Optional[datetime]) -> datetime:
+    """Heure française/européenne (maintenant, ou instant donné pour le backtest)"""
+    tz_fr = pytz.timezone('Europe/Paris')
+    if now is None:
+        return datetime.now(tz_fr)
+    if now.tzinfo is None:
+        return tz_fr.localize(now)
+    return now.astimezone(tz_fr)
+
+def is_trading_hours_active(config: TradingConfig, now: Optional[datetime] = None) -> bool:
     """Vérifie si on est dans les horaires de trading autorisés"""
     if not config.TRADING_HOURS_ENABLED:
         return True  # Si désactivé, toujours actif
     
     # Heure française/européenne
-    tz_fr = pytz.timezone('Europe/Paris')
-    now = datetime.now(tz_fr)
+    now = _paris_time(now)
     current_hour = now.hour
     current_day = now.weekday()  # 0=Lundi, 6=Dimanche
     
@@ -35,13 +44,12 @@ def is_trading_hours_active(config: TradingConfig) -> bool:
     # Vérification horaires
     return start_hour <= current_hour < end_hour
 
-def get_trading_intensity(config: TradingConfig) -> float:
+def get_trading_intensity(config: TradingConfig, now: Optional[datetime] = None) -> float:
     """Retourne l'intensité de trading selon l'heure (0.0 à 1.0)"""
-    if not is_trading_hours_active(config):
+    if not is_trading_hours_active(config, now):
         return 0.0  # Hors horaires = pas de trading
     
-    tz_fr = pytz.timezone('Europe/Paris')
-    now = datetime.now(tz_fr)
+    now = _paris_time(now)
     current_hour = now.hour
     current_day = now.weekday()
     
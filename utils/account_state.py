@@ -0,0 +1,243 @@
+"""
+État du compte en mémoire
+Soldes chargés une fois (get_account), mis à jour par les réponses d'ordres et les événements
+du user-data stream, puis réconciliés périodiquement avec Binance
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+# Devises de cotation reconnues pour découper un symbole (BTCUSDC -> BTC, USDC)
+QUOTE_ASSETS = ('USDC', 'USDT', 'FDUSD', 'BTC', 'ETH', 'BNB')
+
+# Écart toléré entre la mémoire et Binance lors d'une réconciliation
+_DRIFT_TOLERANCE = 1e-8
+
+
+@dataclass
+class AssetBalance:
+    """Solde d'un asset"""
+    free: float = 0.0
+    locked: float = 0.0
+
+
+class AccountState:
+    """Soldes du compte servis depuis la mémoire
+
+    - reconcile(): rechargement complet via get_account (au premier accès, puis toutes les
+      reconcile_interval_seconds, ou au prochain accès après mark_stale())
+    - on_order_response(): deltas appliqués à partir des réponses d'ordres (listener de la passerelle)
+    - on_user_event(): outboundAccountPosition / balanceUpdate du user-data stream
+    """
+
+    def __init__(self, exchange, reconcile_interval_seconds: float = 300.0,
+                 quote_assets: Tuple[str, ...] = QUOTE_ASSETS):
+        self.logger = logging.getLogger(__name__)
+        self.exchange = exchange
+        self.reconcile_interval_seconds = reconcile_interval_seconds
+        self.quote_assets = quote_assets
+        self._balances: Dict[str, AssetBalance] = {}
+        self._stream_times: Dict[str, int] = {}
+        self._loaded_at: Optional[float] = None
+        self._stale = True
+        self._lock = asyncio.Lock()
+        self.version = 0  # Incrémenté à chaque modification des soldes
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'reads': 0,
+            'reconciles': 0,
+            'order_updates': 0,
+            'stream_updates': 0,
+            'drifts': 0
+        }
+
+    # =================== RÉCONCILIATION ===================
+
+    def needs_reconcile(self) -> bool:
+        """True si les soldes doivent être relus depuis Binance"""
+        if self._stale or self._loaded_at is None:
+            return True
+        return time.monotonic() - self._loaded_at > self.reconcile_interval_seconds
+
+    def mark_stale(self):
+        """Force un rechargement complet au prochain accès (état incertain)"""
+        self._stale = True
+
+    async def reconcile(self, force: bool = False) -> Dict[str, AssetBalance]:
+        """Recharge tous les soldes en une requête (un seul rechargement simultané)"""
+        async with self._lock:
+            if not force and not self.needs_reconcile():
+                return self._balances  # Rechargé par une autre tâche pendant l'attente
+
+            account_info = await self.exchange.get_account()
+            balances = {}
+            for balance in account_info['balances']:
+                free, locked = float(balance['free']), float(balance['locked'])
+                if free > 0 or locked > 0:
+                    balances[balance['asset']] = AssetBalance(free, locked)
+
+            if self._loaded_at is not None:
+                drifted = [
+                    asset for asset in set(balances) | set(self._balances)
+                    if abs(balances.get(asset, AssetBalance()).free
+                           - self._balances.get(asset, AssetBalance()).free) > _DRIFT_TOLERANCE
+                ]
+                if drifted:
+                    self.stats['drifts'] += len(drifted)
+                    self.logger.debug(f"🔄 Soldes corrigés par la réconciliation: {', '.join(sorted(drifted))}")
+
+            self._balances = balances
+            self.version += 1
+            self._loaded_at = time.monotonic()
+            self._stale = False
+            self.stats['reconciles'] += 1
+            return self._balances
+
+    # =================== LECTURES ===================
+
+    async def get_free(self, asset: str) -> float:
+        """Solde disponible d'un asset"""
+        if self.needs_reconcile():
+            await self.reconcile()
+        self.stats['reads'] += 1
+        balance = self._balances.get(asset)
+        return balance.free if balance is not None else 0.0
+
+    async def get_free_balances(self) -> Dict[str, float]:
+        """Soldes disponibles non nuls {asset: free} (copie, sûre à parcourir entre deux await)"""
+        if self.needs_reconcile():
+            await self.reconcile()
+        self.stats['reads'] += 1
+        return {asset: balance.free for asset, balance in self._balances.items() if balance.free > 0}
+
+    # =================== DELTAS ===================
+
+    def split_symbol(self, symbol: str) -> Optional[Tuple[str, str]]:
+        """(base, quote) d'un symbole, None si la devise de cotation est inconnue"""
+        for quote in self.quote_assets:
+            if symbol.endswith(quote) and len(symbol) > len(quote):
+                return symbol[:-len(quote)], quote
+        return None
+
+    def _adjust(self, asset: str, free: float = 0.0, locked: float = 0.0, at_ms: Optional[int] = None):
+        """Applique un delta, sauf si le stream a déjà publié un solde plus récent pour l'asset"""
+        if at_ms is not None and self._stream_times.get(asset, 0) >= at_ms:
+            return
+        balance = self._balances.setdefault(asset, AssetBalance())
+        balance.free += free
+        balance.locked += locked
+        self.version += 1
+        if balance.free < -_DRIFT_TOLERANCE or balance.locked < -_DRIFT_TOLERANCE:
+            self.logger.warning(f"⚠️ Solde négatif calculé pour {asset}, rechargement programmé")
+            self.mark_stale()
+
+    def apply_order_fills(self, order: Dict[str, Any]):
+        """Applique les exécutions d'un ordre au marché (réponse FULL de Binance)"""
+        assets = self.split_symbol(order['symbol'])
+        if assets is None or 'fills' not in order:
+            self.mark_stale()  # Paire ou commissions inconnues
+            return
+
+        base, quote = assets
+        sign = 1.0 if order['side'] == 'BUY' else -1.0
+        at_ms = order.get('transactTime')
+        self._adjust(base, free=sign * float(order['executedQty']), at_ms=at_ms)
+        self._adjust(quote, free=-sign * float(order['cummulativeQuoteQty']), at_ms=at_ms)
+        for fill in order['fills']:
+            self._adjust(fill['commissionAsset'], free=-float(fill['commission']), at_ms=at_ms)
+        self.stats['order_updates'] += 1
+
+    def apply_order_lock(self, symbol: str, side: str, quantity: float, price: Optional[float],
+                         at_ms: Optional[int] = None, release: bool = False):
+        """Bloque (ou libère) les fonds réservés par un ordre en attente (LIMIT, STOP_LOSS_LIMIT, OCO)"""
+        assets = self.split_symbol(symbol)
+        if assets is None or (side == 'BUY' and not price):
+            self.mark_stale()
+            return
+
+        base, quote = assets
+        asset, amount = (base, quantity) if side == 'SELL' else (quote, quantity * price)
+        if release:
+            amount = -amount
+        self._adjust(asset, free=-amount, locked=amount, at_ms=at_ms)
+        self.stats['order_updates'] += 1
+
+    def on_order_response(self, method: str, params: Dict[str, Any], response: Dict[str, Any]):
+        """Listener de la passerelle: met à jour les soldes à partir de la réponse d'un ordre"""
+        try:
+            order_type = params.get('type')
+            if method in ('order_market_buy', 'order_market_sell') or order_type == 'MARKET':
+                self.apply_order_fills(response)
+
+            elif method in ('create_order', 'create_oco_order'):
+                if float(response.get('executedQty', 0) or 0) > 0:
+                    self.mark_stale()  # Exécution immédiate: soldes relus
+                    return
+                price = params.get('price')
+                self.apply_order_lock(
+                    params['symbol'], params['side'], float(params['quantity']),
+                    float(price) if price is not None else None,
+                    at_ms=response.get('transactTime', response.get('transactionTime'))
+                )
+
+            elif method == 'cancel_replace_order':
+                cancelled = response.get('cancelResponse', {})
+                created = response.get('newOrderResponse', {})
+                if float(cancelled.get('executedQty', 0) or 0) > 0 or float(created.get('executedQty', 0) or 0) > 0:
+                    self.mark_stale()  # Exécution partielle ou immédiate: soldes relus
+                    return
+                self.apply_order_lock(
+                    cancelled['symbol'], cancelled['side'], float(cancelled['origQty']),
+                    float(cancelled.get('price', 0) or 0),
+                    at_ms=created.get('transactTime'), release=True
+                )
+                price = params.get('price')
+                self.apply_order_lock(
+                    params['symbol'], params['side'], float(params['quantity']),
+                    float(price) if price is not None else None,
+                    at_ms=created.get('transactTime')
+                )
+
+            elif method == 'cancel_order':
+                if float(response.get('executedQty', 0) or 0) > 0:
+                    self.mark_stale()  # Ordre partiellement exécuté avant l'annulation
+                    return
+                self.apply_order_lock(
+                    response['symbol'], response['side'], float(response['origQty']),
+                    float(response.get('price', 0) or 0),
+                    at_ms=response.get('transactTime'), release=True
+                )
+
+            elif method == 'cancel_order_list':
+                self.mark_stale()  # Jambes d'un OCO bloquant la même quantité: soldes relus
+
+        except Exception as e:
+            self.logger.error(f"❌ Erreur mise à jour soldes après {method}: {e}")
+            self.mark_stale()
+
+    def on_user_event(self, event: Dict[str, Any]):
+        """Événement du user-data stream (outboundAccountPosition, balanceUpdate)"""
+        try:
+            event_type = event.get('e')
+            if event_type == 'outboundAccountPosition':
+                # Soldes absolus des assets modifiés
+                updated_at = int(event.get('u', event.get('E', 0)))
+                for balance in event['B']:
+                    asset = balance['a']
+                    self._balances[asset] = AssetBalance(float(balance['f']), float(balance['l']))
+                    self._stream_times[asset] = max(self._stream_times.get(asset, 0), updated_at)
+                self.version += 1
+                self.stats['stream_updates'] += 1
+
+            elif event_type == 'balanceUpdate':
+                # Dépôt, retrait ou transfert: delta sur le solde disponible
+                self._adjust(event['a'], free=float(event['d']), at_ms=int(event.get('T', event.get('E', 0))))
+                self.stats['stream_updates'] += 1
+
+        except Exception as e:
+            self.logger.error(f"❌ Erreur événement compte: {e}")
+            self.mark_stale()
@@ -0,0 +1,694 @@
+"""
+Backtest événementiel de la stratégie du bot sur les bougies 1m archivées (MarketArchive)
+Mêmes règles de décision que ScalpingBot (utils/trading_rules, evaluate_exit, TechnicalAnalyzer):
+
+- scan à chaque clôture de bougie: horaires, pré-filtre (blacklist, volume 24h, spread), volatilité 12h,
+  signaux et cassure, classement par score puis analyse des MAX_PAIRS_TO_ANALYZE meilleures paires
+- entrées soumises aux contrôles de execute_trade (anti-fragmentation, limites par paire, horaire et de
+  pertes consécutives, positions, exposition, volatilité extrême, taille minimale)
+- sorties SL / trailing / TP sur le chemin intra-bougie, puis surexposition, timeout et momentum à la clôture
+- arrêt quotidien (objectif / stop loss journalier) et pause après pertes consécutives sur l'horloge simulée
+- ordres au marché simulés avec frais, demi-spread et glissement
+
+Les signaux de toutes les fenêtres de 100 bougies sont évalués en passes vectorisées
+(TechnicalAnalyzer.batch_valid_signals); la boucle événementielle ne visite que les minutes avec une
+entrée possible ou une position ouverte.
+
+Hypothèses: chemin intra-bougie O -> L -> H -> C (bougie haussière) ou O -> H -> L -> C (baissière),
+spread constant (BACKTEST_SPREAD_PERCENT), volume 24h et variation 24h reconstitués depuis les bougies 1m,
+compteurs quotidiens remis à zéro à minuit (heure de Paris), mode adaptatif du scan non simulé.
+Signaux calculés par talib sur chaque fenêtre de 100 bougies: le bot en indicateurs incrémentaux
+(STREAMING_INDICATORS_ENABLED) amorce EMA / MACD / RSI / ATR sur tout l'historique de la paire, d'où de
+rares verdicts différents quand un indicateur est au seuil (signe de l'histogramme MACD, ~0.1% des fenêtres).
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pytz
+from numpy.lib.stride_tricks import sliding_window_view
+
+from config import BLACKLISTED_PAIRS
+from trading_hours import get_trading_intensity, is_trading_hours_active
+from utils.market_recorder import KLINES, MarketArchive
+from utils.position_engine import DECISION_STOP_LOSS, DECISION_TAKE_PROFIT, evaluate_exit
+from utils.technical_indicators import TechnicalAnalyzer
+from utils.trading_rules import (entry_levels, loss_pause_end, momentum_exit_reason, momentum_exit_window,
+                                 pair_score, pnl_percent, position_size, record_trade_result, timeout_reason,
+                                 trades_last_hour, trailing_levels)
+
+MINUTE_MS = 60_000
+HOUR_MS = 3_600_000
+DAY_MINUTES = 1440
+
+ANALYSIS_CANDLES = 100  # Bougies de l'analyse technique (KlineBundle)
+BREAKOUT_CANDLES = 20   # Bougies de la confirmation de cassure
+MOMENTUM_CANDLES = 50   # Bougies de la sortie momentum
+SIGNAL_CHUNK = 8192     # Fenêtres évaluées par passe vectorisée
+EXTREME_VOLATILITY_PERCENT = 30.0
+PARIS_TZ = pytz.timezone('Europe/Paris')
+
+CANDLE_FIELDS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def to_datetime(timestamp_ms: int) -> datetime:
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc)
+
+
+@dataclass
+class MarketData:
+    """Bougies 1m de plusieurs paires alignées sur une grille commune (paires x minutes, NaN si absente)"""
+    symbols: List[str]
+    open_time: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    @classmethod
+    def from_klines(cls, klines: Dict[str, np.ndarray]) -> 'MarketData':
+        """Tableaux structurés de l'archive (open_time, open, high, low, close, volume) par paire"""
+        symbols = sorted(symbol for symbol, rows in klines.items() if len(rows))
+        if not symbols:
+            raise ValueError("Aucune bougie à rejouer")
+        start = min(int(klines[symbol]['open_time'][0]) for symbol in symbols)
+        end = max(int(klines[symbol]['open_time'][-1]) for symbol in symbols)
+        start -= start % MINUTE_MS
+        open_time = np.arange(start, end + MINUTE_MS, MINUTE_MS, dtype=np.int64)
+
+        columns = {name: np.full((len(symbols), len(open_time)), np.nan) for name in CANDLE_FIELDS}
+        for i, symbol in enumerate(symbols):
+            rows = klines[symbol]
+            index = (np.asarray(rows['open_time'], dtype=np.int64) - start) // MINUTE_MS
+            for name in CANDLE_FIELDS:
+                columns[name][i, index] = rows[name]
+        return cls(symbols=symbols, open_time=open_time, **columns)
+
+    @classmethod
+    def from_archive(cls, archive: MarketArchive, symbols: Optional[List[str]] = None,
+                     start: Optional[str] = None, end: Optional[str] = None) -> 'MarketData':
+        """Bougies 1m de l'archive entre deux dates incluses (YYYY-MM-DD)"""
+        symbols = symbols or archive.symbols(KLINES)
+        return cls.from_klines({symbol: archive.read(KLINES, symbol, start, end) for symbol in symbols})
+
+    def save(self, directory: str) -> Path:
+        """Écrit la grille en fichiers .npy (un par colonne) pour la partager entre processus"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / 'symbols.txt').write_text("\n".join(self.symbols))
+        for name in ('open_time',) + CANDLE_FIELDS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        return directory
+
+    @classmethod
+    def load(cls, directory: str) -> 'MarketData':
+        """Grille écrite par save(), en lecture seule par memory-map (pages partagées entre processus)"""
+        directory = Path(directory)
+        symbols = (directory / 'symbols.txt').read_text().split("\n")
+        # np.asarray: vue ndarray sur le fichier mappé (l'indexation d'un np.memmap passe par du Python)
+        columns = {name: np.asarray(np.load(directory / f"{name}.npy", mmap_mode='r'))
+                   for name in ('open_time',) + CANDLE_FIELDS}
+        return cls(symbols=symbols, **columns)
+
+    def slice(self, start: int, end: int) -> 'MarketData':
+        """Minutes [start, end) de la grille (vues, sans copie)"""
+        return MarketData(symbols=self.symbols, open_time=self.open_time[start:end],
+                          **{name: getattr(self, name)[:, start:end] for name in CANDLE_FIELDS})
+
+    @property
+    def candles(self) -> int:
+        """Nombre de bougies présentes (toutes paires)"""
+        return int(np.count_nonzero(~np.isnan(self.close)))
+
+    def window(self, row: int, end: int, size: int) -> Dict[str, np.ndarray]:
+        """Colonnes OHLCV des `size` bougies se terminant à la minute `end` (vues, sans copie)"""
+        start = max(0, end - size + 1)
+        return {name: getattr(self, name)[row, start:end + 1] for name in CANDLE_FIELDS}
+
+
+def rolling_volume_24h(close: np.ndarray, volume: np.ndarray) -> np.ndarray:
+    """Volume USDC des 1440 dernières bougies (NaN tant que l'historique est incomplet)"""
+    totals = np.concatenate(([0.0], np.cumsum(np.nan_to_num(close * volume))))
+    result = np.full(len(close), np.nan)
+    result[DAY_MINUTES - 1:] = totals[DAY_MINUTES:] - totals[:len(close) - DAY_MINUTES + 1]
+    return result
+
+
+def rolling_price_change_24h(open_: np.ndarray, close: np.ndarray) -> np.ndarray:
+    """Variation absolue sur 24h en % (ouverture d'il y a 1440 bougies -> clôture courante)"""
+    result = np.full(len(close), np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[DAY_MINUTES - 1:] = np.abs(close[DAY_MINUTES - 1:] / open_[:len(close) - DAY_MINUTES + 1] - 1) * 100
+    return result
+
+
+def rolling_volatility(open_time: np.ndarray, close: np.ndarray, window_hours: int = 12) -> np.ndarray:
+    """Volatilité (%) à chaque minute: clôtures des `window_hours` dernières heures fermées + clôture courante
+
+    Mêmes règles que SymbolVolatility.volatility (NaN quand le service n'a encore aucune heure fermée).
+    """
+    first_hour = open_time[0] // HOUR_MS
+    hour_index = open_time // HOUR_MS - first_hour
+    hour_close = np.full(int(hour_index[-1]) + 1, np.nan)
+    last_minute = open_time % HOUR_MS == HOUR_MS - MINUTE_MS
+    hour_close[hour_index[last_minute]] = close[last_minute]
+
+    rolling = pd.Series(hour_close).rolling(window_hours, min_periods=1)
+    hour_max, hour_min = rolling.max().to_numpy(), rolling.min().to_numpy()
+    hour_sum, hour_count = rolling.sum().to_numpy(), rolling.count().to_numpy()
+
+    # Dernière heure fermée à la clôture de la bougie (la 60e minute ferme son heure)
+    last_closed = (open_time + MINUTE_MS) // HOUR_MS - first_hour - 1
+    previous = np.maximum(last_closed, 0)
+    count = np.where(last_closed >= 0, np.nan_to_num(hour_count[previous]), 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        max_price = np.fmax(hour_max[previous], close)
+        min_price = np.fmin(hour_min[previous], close)
+        average = (np.nan_to_num(hour_sum[previous]) + close) / (count + 1)
+        volatility = (max_price - min_price) / average * 100
+    volatility[(count == 0) | np.isnan(close)] = np.nan
+    return volatility
+
+
+class SimulatedExchange:
+    """Ordres au marché simulés: demi-spread et glissement sur le prix, frais sur le montant"""
+
+    def __init__(self, balance: float, fee_percent: float = 0.1, slippage_percent: float = 0.02,
+                 spread_percent: float = 0.02):
+        self.balance = balance
+        self.fee_percent = fee_percent
+        self.slippage_percent = slippage_percent
+        self.spread_percent = spread_percent
+        self._impact = (spread_percent / 2 + slippage_percent) / 100
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'orders': 0,
+            'fees': 0.0,
+            'slippage': 0.0
+        }
+
+    def buy(self, price: float, quote_amount: float) -> Tuple[float, float]:
+        """Achat pour `quote_amount` USDC: (quantité reçue nette de frais, prix d'exécution)"""
+        fill_price = price * (1 + self._impact)
+        fee = quote_amount * self.fee_percent / 100
+        quantity = (quote_amount - fee) / fill_price
+        self.balance -= quote_amount
+        self.stats['orders'] += 1
+        self.stats['fees'] += fee
+        self.stats['slippage'] += quote_amount - quote_amount * price / fill_price
+        return quantity, fill_price
+
+    def sell(self, price: float, quantity: float) -> Tuple[float, float]:
+        """Vente de `quantity`: (USDC reçus nets de frais, prix d'exécution)"""
+        fill_price = price * (1 - self._impact)
+        gross = quantity * fill_price
+        fee = gross * self.fee_percent / 100
+        self.balance += gross - fee
+        self.stats['orders'] += 1
+        self.stats['fees'] += fee
+        self.stats['slippage'] += quantity * (price - fill_price)
+        return gross - fee, fill_price
+
+
+@dataclass
+class BacktestTrade:
+    """Position simulée (niveaux calculés sur le prix du signal, comme execute_trade)"""
+    pair: str
+    row: int
+    entry_index: int
+    entry_time: int
+    entry_price: float
+    fill_price: float
+    quantity: float
+    cost: float
+    stop_loss: float
+    take_profit: float
+    trailing_stop: float
+    volatility: float
+    exit_index: Optional[int] = None
+    exit_time: Optional[int] = None
+    exit_price: Optional[float] = None
+    exit_reason: str = ""
+    proceeds: float = 0.0
+    trailing_updates: int = 0
+
+    @property
+    def pnl(self) -> float:
+        """P&L réel en USDC (frais et glissement inclus)"""
+        return self.proceeds - self.cost
+
+    @property
+    def pnl_percent(self) -> float:
+        return pnl_percent(self.entry_price, self.exit_price) if self.exit_price else 0.0
+
+    @property
+    def duration_minutes(self) -> float:
+        return ((self.exit_time or self.entry_time) - self.entry_time) / MINUTE_MS
+
+
+class TradeLimits:
+    """Limites d'ouverture du bot sur l'horloge simulée: anti-fragmentation, trades par heure,
+    pertes consécutives et pause de sécurité (mêmes règles que ScalpingBot)"""
+
+    def __init__(self, config):
+        self.config = config
+        self.trades_per_hour: List[datetime] = []
+        self.last_trade_time: Dict[str, datetime] = {}
+        self.last_trade_results: List[bool] = []
+        self.consecutive_losses = 0
+        self.pause_until: Optional[datetime] = None
+
+    def in_pause(self, now: datetime) -> bool:
+        """Pause de sécurité en cours (scan suspendu); à la fin de la pause, compteurs réinitialisés"""
+        if self.pause_until is None:
+            return False
+        if now < self.pause_until:
+            return True
+        self.pause_until = None
+        self.consecutive_losses = 0
+        self.last_trade_results = []
+        return False
+
+    def too_recent(self, symbol: str, now: datetime) -> bool:
+        last = self.last_trade_time.get(symbol)
+        return last is not None and (now - last).total_seconds() < self.config.MIN_TRADE_INTERVAL_SECONDS
+
+    def refusal(self, now: datetime) -> Optional[str]:
+        """Motif de refus lié aux limites horaire et de pertes consécutives (None si autorisé)"""
+        self.trades_per_hour = trades_last_hour(self.trades_per_hour, now)
+        if len(self.trades_per_hour) >= self.config.MAX_TRADES_PER_HOUR:
+            return 'hourly_limit'
+        if self.config.ENABLE_CONSECUTIVE_LOSS_PROTECTION:
+            if self.in_pause(now) or self.consecutive_losses >= self.config.MAX_CONSECUTIVE_LOSSES:
+                return 'consecutive_losses'
+        return None
+
+    def record_entry(self, symbol: str, now: datetime):
+        self.last_trade_time[symbol] = now
+        self.trades_per_hour.append(now)
+
+    def record_result(self, is_profit: bool, now: datetime):
+        self.consecutive_losses = record_trade_result(self.last_trade_results, is_profit)
+        if is_profit:
+            self.pause_until = None
+        elif self.config.ENABLE_CONSECUTIVE_LOSS_PROTECTION:
+            self.pause_until = loss_pause_end(self.config, self.consecutive_losses, now) or self.pause_until
+
+
+@dataclass
+class BacktestResult:
+    """Trades simulés, capital réalisé après chaque sortie et compteurs du backtest"""
+    trades: List[BacktestTrade]
+    initial_capital: float
+    final_capital: float
+    equity: np.ndarray
+    stats: Dict = field(default_factory=dict)
+
+    def summary(self) -> Dict[str, float]:
+        """PnL, taux de réussite, drawdown maximum et coût des frais / glissement"""
+        pnls = np.array([trade.pnl for trade in self.trades])
+        curve = np.concatenate(([self.initial_capital], self.equity))
+        peaks = np.maximum.accumulate(curve)
+        costs = self.stats.get('fees', 0.0) + self.stats.get('slippage', 0.0)
+        return {
+            'trades': len(self.trades),
+            'pnl': float(self.final_capital - self.initial_capital),
+            'pnl_percent': float((self.final_capital / self.initial_capital - 1) * 100),
+            'win_rate': float((pnls > 0).mean() * 100) if len(pnls) else 0.0,
+            'avg_pnl_percent': float(np.mean([trade.pnl_percent for trade in self.trades])) if self.trades else 0.0,
+            'max_drawdown_percent': float(((peaks - curve) / peaks).max() * 100),
+            'fees': float(self.stats.get('fees', 0.0)),
+            'slippage': float(self.stats.get('slippage', 0.0)),
+            'fee_drag_percent': float(costs / self.initial_capital * 100)
+        }
+
+    def exit_reasons(self) -> Dict[str, int]:
+        reasons: Dict[str, int] = {}
+        for trade in self.trades:
+            key = trade.exit_reason.split(' ')[0]
+            reasons[key] = reasons.get(key, 0) + 1
+        return reasons
+
+
+class Backtester:
+    """Rejoue les bougies 1m de plusieurs paires à travers les règles de décision du bot"""
+
+    def __init__(self, config, data: MarketData, analyzer: Optional[TechnicalAnalyzer] = None,
+                 initial_capital: Optional[float] = None, blacklist: Optional[List[str]] = None,
+                 signal_cache: Optional[Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray]]] = None,
+                 start_minute: int = 0):
+        self.logger = logging.getLogger(__name__)
+        self.config = config
+        self.data = data
+        self.analyzer = analyzer or TechnicalAnalyzer()
+        self.initial_capital = config.BACKTEST_INITIAL_CAPITAL_USDC if initial_capital is None else initial_capital
+        self.blacklist = set(BLACKLISTED_PAIRS if blacklist is None else blacklist)
+        self._hours: Dict[int, Tuple[bool, float]] = {}
+        self._volatility: Dict[int, np.ndarray] = {}
+        # Signaux de toutes les fenêtres complètes par (paire, MIN_SIGNAL_CONDITIONS), réutilisables
+        # par plusieurs backtests sur les mêmes données (balayage de paramètres)
+        self.signal_cache = signal_cache
+        # Minutes avant start_minute: historique de chauffe (volume 24h, volatilité), aucune entrée
+        self.start_minute = start_minute
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'candles': 0,
+            'windows_analyzed': 0,
+            'scan_candidates': 0,
+            'entry_attempts': 0,
+            'minutes_visited': 0,
+            'refused': {},
+            'elapsed_seconds': 0.0,
+            'candles_per_minute': 0.0
+        }
+
+    # =================== PRÉ-CALCULS VECTORISÉS ===================
+
+    def trading_hours(self, timestamp_ms: int) -> Tuple[bool, float]:
+        """(horaires actifs, intensité) de l'heure contenant cet instant (calculé une fois par heure)"""
+        hour = timestamp_ms // HOUR_MS
+        cached = self._hours.get(hour)
+        if cached is None:
+            now = to_datetime(hour * HOUR_MS)
+            cached = self._hours[hour] = (is_trading_hours_active(self.config, now),
+                                          get_trading_intensity(self.config, now))
+        return cached
+
+    def scan_signals(self, row: int) -> Dict[str, np.ndarray]:
+        """Minutes où la paire est validée par le scan (pré-filtre, volatilité, signaux, cassure)
+
+        Retourne les minutes retenues avec leur score de classement, la validité du signal
+        (is_valid_signal) et la volatilité 12h.
+        """
+        config, data = self.config, self.data
+        open_, high, low, close, volume = (getattr(data, name)[row] for name in CANDLE_FIELDS)
+        volume_24h = rolling_volume_24h(close, volume)
+        price_change = rolling_price_change_24h(open_, close)
+        volatility = self.volatility(row)
+
+        # Fenêtre d'analyse complète (aucune bougie manquante sur les 100 dernières minutes)
+        missing = np.concatenate(([0], np.cumsum(np.isnan(close))))
+        complete = np.zeros(len(close), dtype=bool)
+        complete[ANALYSIS_CANDLES - 1:] = missing[ANALYSIS_CANDLES:] == missing[:len(close) - ANALYSIS_CANDLES + 1]
+
+        with np.errstate(invalid='ignore'):
+            prefilter = (
+                complete
+                & (volume_24h >= config.MIN_VOLUME_USDC)
+                & (config.BACKTEST_SPREAD_PERCENT <= config.MAX_SPREAD_PERCENT)
+                & (volatility >= config.MIN_VOLATILITY_1H_PERCENT)
+            )
+        if data.symbols[row] in self.blacklist:
+            prefilter[:] = False
+        minutes = np.flatnonzero(prefilter)
+
+        if self.signal_cache is None:
+            valid, count = self.window_signals(row, minutes)
+        else:
+            key = (row, config.MIN_SIGNAL_CONDITIONS)
+            if key not in self.signal_cache:
+                all_valid = np.zeros(len(close), dtype=bool)
+                all_count = np.zeros(len(close), dtype=np.int64)
+                complete_minutes = np.flatnonzero(complete)
+                all_valid[complete_minutes], all_count[complete_minutes] = self.window_signals(row, complete_minutes)
+                self.signal_cache[key] = (all_valid, all_count)
+            all_valid, all_count = self.signal_cache[key]
+            valid, count = all_valid[minutes], all_count[minutes]
+
+        # Cassure: prix > plus haut des 19 bougies précédentes + seuil
+        selected = count >= config.MIN_SIGNAL_CONDITIONS
+        if config.ENABLE_BREAKOUT_CONFIRMATION and len(minutes):
+            previous_high = sliding_window_view(high, BREAKOUT_CANDLES - 1)[minutes - (BREAKOUT_CANDLES - 1)].max(axis=1)
+            selected &= close[minutes] > previous_high * (1 + config.BREAKOUT_CONFIRMATION_PERCENT / 100)
+
+        minutes = minutes[selected]
+        return {
+            'minute': minutes,
+            'score': pair_score(price_change[minutes], volume_24h[minutes]),
+            'valid': valid[selected],
+            'volatility': volatility[minutes]
+        }
+
+    def window_signals(self, row: int, minutes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(signal valide, nombre de signaux) des fenêtres de 100 bougies se terminant aux minutes données"""
+        data = self.data
+        valid = np.zeros(len(minutes), dtype=bool)
+        count = np.zeros(len(minutes), dtype=np.int64)
+        windows = [sliding_window_view(getattr(data, name)[row], ANALYSIS_CANDLES) for name in CANDLE_FIELDS]
+        for start in range(0, len(minutes), SIGNAL_CHUNK):
+            chunk = minutes[start:start + SIGNAL_CHUNK] - (ANALYSIS_CANDLES - 1)
+            valid[start:start + len(chunk)], count[start:start + len(chunk)], _ = self.analyzer.batch_valid_signals(
+                *(window[chunk] for window in windows), min_conditions=self.config.MIN_SIGNAL_CONDITIONS
+            )
+        self.stats['windows_analyzed'] += len(minutes)
+        return valid, count
+
+    def entry_attempts(self) -> Dict[str, np.ndarray]:
+        """Tentatives d'entrée dans l'ordre du scan: par minute, meilleures paires validées
+        (MAX_PAIRS_TO_ANALYZE) dont le signal est valide pour analyze_pair"""
+        parts = []
+        for row in range(len(self.data.symbols)):
+            signals = self.scan_signals(row)
+            signals['row'] = np.full(len(signals['minute']), row)
+            parts.append(signals)
+        merged = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+        self.stats['scan_candidates'] += len(merged['minute'])
+
+        order = np.lexsort((-merged['score'], merged['minute']))
+        merged = {key: values[order] for key, values in merged.items()}
+        _, first, counts = np.unique(merged['minute'], return_index=True, return_counts=True)
+        rank = np.arange(len(merged['minute'])) - np.repeat(first, counts)
+        keep = (rank < self.config.MAX_PAIRS_TO_ANALYZE) & merged['valid'] & (merged['minute'] >= self.start_minute)
+        return {key: values[keep] for key, values in merged.items()}
+
+    # =================== BOUCLE ÉVÉNEMENTIELLE ===================
+
+    def run(self) -> BacktestResult:
+        started_at = time.perf_counter()
+        config, data = self.config, self.data
+        attempts = self.entry_attempts()
+        attempt_minutes = attempts['minute']
+        self.stats['entry_attempts'] = len(attempt_minutes)
+
+        exchange = SimulatedExchange(self.initial_capital, config.BACKTEST_FEE_PERCENT,
+                                     config.BACKTEST_SLIPPAGE_PERCENT, config.BACKTEST_SPREAD_PERCENT)
+        limits = TradeLimits(config)
+        positions: List[BacktestTrade] = []
+        closed: List[BacktestTrade] = []
+        equity: List[float] = []
+        state = {'day': None, 'daily_pnl': 0.0, 'day_stopped': False}
+
+        def close_trade(trade: BacktestTrade, index: int, price: float, reason: str):
+            trade.proceeds, _ = exchange.sell(price, trade.quantity)
+            trade.exit_index, trade.exit_time = index, int(data.open_time[index]) + MINUTE_MS
+            trade.exit_price, trade.exit_reason = price, reason
+            positions.remove(trade)
+            closed.append(trade)
+            state['daily_pnl'] += trade.pnl
+            limits.record_result(trade.pnl > 0, to_datetime(trade.exit_time))
+            equity.append(exchange.balance + sum(p.quantity * data.close[p.row, index] for p in positions))
+
+        minute, next_attempt, total = 0, 0, len(data.open_time)
+        while minute < total:
+            if not positions:
+                if next_attempt >= len(attempt_minutes):
+                    break
+                minute = int(attempt_minutes[next_attempt])  # Aucune position: saut à la prochaine entrée possible
+            self.stats['minutes_visited'] += 1
+            now_ms = int(data.open_time[minute]) + MINUTE_MS  # Décisions à la clôture de la bougie
+            now = to_datetime(now_ms)
+
+            day = now.astimezone(PARIS_TZ).date()
+            if day != state['day']:
+                state.update(day=day, daily_pnl=0.0, day_stopped=False)
+
+            # Règles de prix sur le chemin intra-bougie (positions ouvertes avant cette bougie)
+            for trade in list(positions):
+                if trade.entry_index < minute:
+                    exit_ = self.walk_candle(trade, minute)
+                    if exit_ is not None:
+                        close_trade(trade, minute, *exit_)
+
+            # Clôture: surexposition, timeout adaptatif, momentum faible
+            if positions:
+                total_capital = exchange.balance + sum(p.quantity * data.close[p.row, minute] for p in positions)
+                for trade in list(positions):
+                    reason = self.close_rules(trade, minute, now_ms, total_capital)
+                    if reason is not None:
+                        close_trade(trade, minute, float(data.close[trade.row, minute]), reason)
+
+            # Scan: horaires, arrêt quotidien, pause de sécurité, puis entrées dans l'ordre du classement
+            active, intensity = self.trading_hours(now_ms)
+            scan_end = next_attempt
+            while scan_end < len(attempt_minutes) and attempt_minutes[scan_end] == minute:
+                scan_end += 1
+            if active and not state['day_stopped']:
+                total_capital = exchange.balance + sum(p.quantity * data.close[p.row, minute] for p in positions)
+                daily_pnl_percent = state['daily_pnl'] / total_capital * 100
+                if (daily_pnl_percent >= config.DAILY_TARGET_PERCENT
+                        or daily_pnl_percent <= -config.DAILY_STOP_LOSS_PERCENT):
+                    reason = "DAILY_TARGET" if daily_pnl_percent > 0 else "DAILY_STOP_LOSS"
+                    for trade in list(positions):
+                        close_trade(trade, minute, float(data.close[trade.row, minute]), reason)
+                    state['day_stopped'] = True
+                elif not limits.in_pause(now):
+                    for attempt in range(next_attempt, scan_end):
+                        if len(positions) >= config.MAX_OPEN_POSITIONS:
+                            break
+                        trade = self.try_entry(attempts, attempt, minute, now, intensity, exchange, limits, positions)
+                        if trade is not None:
+                            positions.append(trade)
+            next_attempt = scan_end
+            minute += 1
+
+        # Positions encore ouvertes en fin de données
+        last = total - 1
+        for trade in list(positions):
+            price = data.close[trade.row, last]
+            close_trade(trade, last, float(price if not np.isnan(price) else trade.entry_price), "FIN_BACKTEST")
+
+        elapsed = time.perf_counter() - started_at
+        self.stats['candles'] = data.candles
+        self.stats['elapsed_seconds'] = elapsed
+        self.stats['candles_per_minute'] = self.stats['candles'] / elapsed * 60 if elapsed > 0 else 0.0
+        self.stats.update(exchange.stats)
+        return BacktestResult(trades=closed, initial_capital=self.initial_capital,
+                              final_capital=exchange.balance, equity=np.array(equity), stats=dict(self.stats))
+
+    def refuse(self, reason: str) -> None:
+        self.stats['refused'][reason] = self.stats['refused'].get(reason, 0) + 1
+        return None
+
+    def try_entry(self, attempts: Dict[str, np.ndarray], attempt: int, minute: int, now: datetime,
+                  intensity: float, exchange: SimulatedExchange, limits: TradeLimits,
+                  positions: List[BacktestTrade]) -> Optional[BacktestTrade]:
+        """Contrôles de execute_trade / can_open_position_enhanced puis achat au marché"""
+        config, data = self.config, self.data
+        row = int(attempts['row'][attempt])
+        symbol = data.symbols[row]
+        volatility = float(attempts['volatility'][attempt])
+        price = float(data.close[row, minute])
+
+        # Anti-fragmentation
+        if limits.too_recent(symbol, now):
+            return self.refuse('too_recent')
+
+        # Limites par paire, horaire, pertes consécutives, volatilité et positions
+        if sum(1 for trade in positions if trade.row == row) >= config.MAX_TRADES_PER_PAIR:
+            return self.refuse('pair_limit')
+        reason = limits.refusal(now)
+        if reason:
+            return self.refuse(reason)
+        if volatility < config.MIN_VOLATILITY_1H_PERCENT:
+            return self.refuse('low_volatility')
+        if len(positions) >= config.MAX_OPEN_POSITIONS:
+            return self.refuse('max_positions')
+
+        # Exposition par actif et capital USDC disponible
+        total_capital = exchange.balance + sum(trade.quantity * data.close[trade.row, minute] for trade in positions)
+        size = position_size(config, total_capital, intensity, volatility)
+        exposure = sum(trade.quantity * price for trade in positions if trade.row == row)
+        max_exposure = total_capital * config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
+        if exposure > max_exposure or exposure + size > max_exposure:
+            return self.refuse('exposure')
+        if exchange.balance < size * 1.1:
+            return self.refuse('usdc_balance')
+
+        # Protection volatilité extrême et taille minimale (anti-fragmentation)
+        if volatility > EXTREME_VOLATILITY_PERCENT:
+            return self.refuse('extreme_volatility')
+        if size < config.MIN_POSITION_SIZE_USDC:
+            return self.refuse('min_size')
+
+        quantity, fill_price = exchange.buy(price, size)
+        stop_loss, take_profit, trailing_stop = entry_levels(config, price)
+        limits.record_entry(symbol, now)
+        return BacktestTrade(
+            pair=symbol, row=row, entry_index=minute, entry_time=int(data.open_time[minute]) + MINUTE_MS,
+            entry_price=price, fill_price=fill_price, quantity=quantity, cost=size,
+            stop_loss=stop_loss, take_profit=take_profit, trailing_stop=trailing_stop, volatility=volatility
+        )
+
+    def walk_candle(self, trade: BacktestTrade, minute: int) -> Optional[Tuple[float, str]]:
+        """SL / trailing / TP sur le chemin intra-bougie; (prix de sortie, motif) si la position est fermée
+
+        Les niveaux traversés entre deux points du chemin sont évalués au prix du niveau
+        (exécution au niveau, ou à l'ouverture en cas de gap).
+        """
+        row, data = trade.row, self.data
+        open_, high, low, close = (float(data.open[row, minute]), float(data.high[row, minute]),
+                                   float(data.low[row, minute]), float(data.close[row, minute]))
+        if np.isnan(close):
+            return None
+        path = (open_, low, high, close) if close >= open_ else (open_, high, low, close)
+        step = self.config.TRAILING_STEP_PERCENT
+
+        previous = None
+        for price in path:
+            if previous is not None and price < previous:
+                # Baisse: stop loss touché au niveau du stop
+                if price <= trade.stop_loss:
+                    return trade.stop_loss, "STOP_LOSS"
+            elif previous is not None and price > previous and trade.take_profit <= price:
+                # Hausse jusqu'au take profit: sortie sauf si le trailing l'a déjà repoussé
+                if evaluate_exit(trade, max(trade.take_profit, previous), step) == DECISION_TAKE_PROFIT:
+                    return max(trade.take_profit, previous), "TAKE_PROFIT"
+                self.trail(trade, price)
+            else:
+                decision = evaluate_exit(trade, price, step)
+                if decision == DECISION_STOP_LOSS:
+                    return price, "STOP_LOSS"  # Gap à l'ouverture
+                if decision == DECISION_TAKE_PROFIT:
+                    return price, "TAKE_PROFIT"
+                self.trail(trade, price)
+            previous = price
+        return None
+
+    def trail(self, trade: BacktestTrade, price: float):
+        levels = trailing_levels(self.config, price, trade.stop_loss, trade.trailing_stop)
+        if levels is not None:
+            trade.stop_loss, trade.take_profit = levels
+            trade.trailing_updates += 1
+
+    def close_rules(self, trade: BacktestTrade, minute: int, now_ms: int, total_capital: float) -> Optional[str]:
+        """Règles évaluées à la clôture (manage_open_positions): surexposition, timeout, momentum"""
+        config, data = self.config, self.data
+        price = float(data.close[trade.row, minute])
+        if np.isnan(price):
+            return None
+
+        max_exposure = total_capital * config.MAX_EXPOSURE_PER_ASSET_PERCENT / 100
+        if trade.quantity * price > max_exposure * 1.01:  # tolérance 1%
+            return "SUREXPOSITION_AUTO"
+
+        duration_minutes = (now_ms - trade.entry_time) / MINUTE_MS
+        pnl = pnl_percent(trade.entry_price, price)
+        volatility = self.volatility(trade.row)[minute]
+        reason = timeout_reason(config, duration_minutes, pnl, 0.0 if np.isnan(volatility) else float(volatility))
+        if reason:
+            return reason
+
+        if config.ENABLE_MOMENTUM_EXIT and momentum_exit_window(config, duration_minutes, pnl):
+            candles = data.window(trade.row, minute, MOMENTUM_CANDLES)
+            if len(candles['close']) >= 30 and not np.isnan(candles['close']).any():
+                rsi = self.analyzer.rsi(candles, None, config.RSI_PERIOD)
+                _, _, macdhist = self.analyzer.macd(candles, None)
+                if momentum_exit_reason(config, rsi[-1], macdhist[-1], pnl):
+                    return "MOMENTUM_FAIBLE"
+        return None
+
+    def volatility(self, row: int) -> np.ndarray:
+        """Volatilité 12h de la paire à chaque minute (série calculée une fois par paire)"""
+        if row not in self._volatility:
+            self._volatility[row] = rolling_volatility(self.data.open_time, self.data.close[row],
+                                                       self.config.VOLATILITY_WINDOW_HOURS)
+        return self._volatility[row]
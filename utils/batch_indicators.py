@@ -0,0 +1,139 @@
+"""
+Indicateurs techniques groupés sur des matrices (paires x bougies)
+EMA, lissages de Wilder et SMA sont des opérateurs linéaires: leurs matrices de poids sont précalculées
+une fois par longueur de fenêtre puis appliquées à toutes les paires en un seul produit matriciel.
+Résultats identiques à talib (à la précision flottante près), limités aux dernières bougies.
+"""
+
+from functools import lru_cache
+from typing import Dict
+
+import numpy as np
+import talib
+
+# Bougies nécessaires aux patterns de chandeliers talib (valeur de la dernière bougie)
+PATTERN_TAIL = 32
+
+# Seuil talib TA_IS_ZERO
+_EPSILON = 1e-8
+
+
+@lru_cache(maxsize=64)
+def _smoothing_weights(length: int, start: int, period: int, alpha: float) -> np.ndarray:
+    """Poids (bougies x bougies) d'un lissage exponentiel amorcé par la moyenne de `period` valeurs
+
+    Ligne t: contribution de chaque entrée à la valeur en t (nulle avant l'amorçage, en start + period - 1).
+    EMA: alpha = 2 / (period + 1) ; Wilder (RSI, ATR): alpha = 1 / period.
+    """
+    weights = np.zeros((length, length))
+    seed = start + period - 1
+    if seed >= length:
+        return weights
+
+    weights[seed, start:seed + 1] = 1.0 / period
+    for t in range(seed + 1, length):
+        weights[t] = (1.0 - alpha) * weights[t - 1]
+        weights[t, t] += alpha
+    return weights
+
+
+@lru_cache(maxsize=64)
+def _rolling_sum_weights(length: int, period: int) -> np.ndarray:
+    """Poids (bougies x bougies) d'une somme glissante sur `period` bougies"""
+    weights = np.zeros((length, length))
+    for t in range(period - 1, length):
+        weights[t, t - period + 1:t + 1] = 1.0
+    return weights
+
+
+@lru_cache(maxsize=64)
+def _operators(length: int, tail: int) -> Dict[str, np.ndarray]:
+    """Opérateurs (bougies x tail) appliqués aux matrices de prix: X @ op -> dernières valeurs"""
+    def last(weights: np.ndarray) -> np.ndarray:
+        return np.ascontiguousarray(weights[-tail:].T)
+
+    ema = {period: _smoothing_weights(length, 0, period, 2.0 / (period + 1)) for period in (9, 20, 21, 50)}
+
+    # MACD (12, 26, 9): EMA rapide alignée sur l'EMA lente, signal amorcé sur la première valeur du MACD
+    macd = _smoothing_weights(length, 26 - 12, 12, 2.0 / 13) - _smoothing_weights(length, 0, 26, 2.0 / 27)
+    signal = _smoothing_weights(length, 25, 9, 2.0 / 10)
+
+    operators = {f'ema{period}': last(weights) for period, weights in ema.items()}
+    operators.update({
+        'macd': last(macd),
+        'macdsignal': np.ascontiguousarray(macd.T @ signal[-tail:].T),
+        # Wilder 14 sur les variations / True Range (définis à partir de la 2e bougie)
+        'wilder14': last(_smoothing_weights(length, 1, 14, 1.0 / 14)),
+        'sum20': last(_rolling_sum_weights(length, 20)),
+    })
+    for operator in operators.values():
+        operator.setflags(write=False)
+    return operators
+
+
+def batch_indicators(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                     volume: np.ndarray, tail: int = 20) -> Dict[str, np.ndarray]:
+    """Indicateurs de l'analyse technique pour toutes les paires (matrices paires x bougies alignées)
+
+    Retourne les mêmes clés que TechnicalAnalyzer.compute_indicators, en matrices (paires x tail)
+    des dernières valeurs (patterns de chandeliers et ROC: dernière bougie uniquement).
+    """
+    count, length = close.shape
+    tail = min(tail, length)
+    ops = _operators(length, tail)
+    positions = np.arange(length - tail, length)
+
+    def masked(values: np.ndarray, first_valid: int) -> np.ndarray:
+        values[:, positions < first_valid] = np.nan
+        return values
+
+    indicators = {f'ema{p}': masked(close @ ops[f'ema{p}'], p - 1) for p in (9, 20, 21, 50)}
+
+    macd = masked(close @ ops['macd'], 33)
+    macdsignal = masked(close @ ops['macdsignal'], 33)
+    indicators.update({'macd': macd, 'macdsignal': macdsignal, 'macdhist': macd - macdsignal})
+
+    # RSI 14 (Wilder)
+    diff = np.zeros_like(close)
+    diff[:, 1:] = np.diff(close, axis=1)
+    gain = np.where(diff > 0, diff, 0.0) @ ops['wilder14']
+    loss = np.where(diff < 0, -diff, 0.0) @ ops['wilder14']
+    total = gain + loss
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = np.where(np.abs(total) >= _EPSILON, 100.0 * (gain / total), 0.0)
+    indicators['rsi'] = masked(rsi, 14)
+
+    # Bollinger (20, 2): SMA + écart-type population
+    middle = close @ ops['sum20'] / 20
+    variance = (close * close) @ ops['sum20'] / 20 - middle * middle
+    std = np.sqrt(np.where(variance >= _EPSILON, variance, 0.0))
+    indicators.update({
+        'bb_upper': masked(middle + 2 * std, 19),
+        'bb_middle': masked(middle, 19),
+        'bb_lower': masked(middle - 2 * std, 19),
+    })
+
+    # ATR 14 (Wilder sur le True Range)
+    true_range = np.zeros_like(close)
+    previous_close = close[:, :-1]
+    true_range[:, 1:] = np.maximum(high[:, 1:], previous_close) - np.minimum(low[:, 1:], previous_close)
+    indicators['atr'] = masked(true_range @ ops['wilder14'], 14)
+    indicators['volume_sma20'] = masked(volume @ ops['sum20'] / 20, 19)
+
+    # Patterns: un seul appel talib sur les fins de séries concaténées (fenêtres indépendantes)
+    pattern_tail = min(PATTERN_TAIL, length)
+    o, h, l, c = (np.ascontiguousarray(m[:, -pattern_tail:]).ravel() for m in (open_, high, low, close))
+    last = slice(pattern_tail - 1, None, pattern_tail)
+    indicators['hammer'] = talib.CDLHAMMER(o, h, l, c)[last].reshape(count, 1)
+    indicators['engulfing'] = talib.CDLENGULFING(o, h, l, c)[last].reshape(count, 1)
+    indicators['morning_star'] = talib.CDLMORNINGSTAR(o, h, l, c)[last].reshape(count, 1)
+
+    # ROC 10 de la dernière bougie (même formule que talib.ROC)
+    if length > 10:
+        previous = close[:, -11]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            roc = np.where(previous != 0.0, (close[:, -1] / previous - 1.0) * 100.0, 0.0)
+    else:
+        roc = np.full(count, np.nan)
+    indicators['roc'] = roc.reshape(count, 1)
+    return indicators
@@ -0,0 +1,298 @@
+"""
+Stockage des bougies en mémoire alimenté par les WebSockets Binance
+Buffers circulaires numpy par paire et par intervalle, vues OHLCV sans copie
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+    print("⚠️ websockets non installé. Installez avec: pip install websockets")
+
+# Ordre des colonnes dans les buffers
+CANDLE_FIELDS = ('open_time', 'open', 'high', 'low', 'close', 'volume')
+
+INTERVAL_MS = {
+    '1m': 60_000,
+    '3m': 180_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '30m': 1_800_000,
+    '1h': 3_600_000,
+}
+
+
+class CandleRingBuffer:
+    """Buffer circulaire de bougies à fenêtre toujours contiguë
+
+    Chaque bougie est écrite deux fois (slot et slot + capacité) : les N dernières bougies
+    forment donc toujours une tranche contiguë, exposée sous forme de vues numpy sans copie.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._data = np.zeros((len(CANDLE_FIELDS), 2 * capacity), dtype=np.float64)
+        self._slot = -1  # Slot de la bougie la plus récente
+        self.count = 0
+
+    @property
+    def last_open_time(self) -> Optional[int]:
+        if self.count == 0:
+            return None
+        return int(self._data[0, self._slot])
+
+    def _write(self, slot: int, row: Tuple[float, ...]):
+        self._data[:, slot] = row
+        self._data[:, slot + self.capacity] = row
+
+    def upsert(self, row: Tuple[float, ...]) -> bool:
+        """Ajoute une bougie ou met à jour la bougie en cours (même open_time)
+
+        Retourne False si la bougie est plus ancienne que la dernière stockée.
+        """
+        open_time = row[0]
+        last_open_time = self.last_open_time
+
+        if last_open_time is not None and open_time < last_open_time:
+            return False
+
+        if last_open_time is not None and open_time == last_open_time:
+            self._write(self._slot, row)
+            return True
+
+        self._slot = (self._slot + 1) % self.capacity
+        self._write(self._slot, row)
+        self.count = min(self.count + 1, self.capacity)
+        return True
+
+    def reset(self):
+        self._slot = -1
+        self.count = 0
+
+    def view(self, count: Optional[int] = None) -> np.ndarray:
+        """Vue (champs x bougies) des dernières bougies, de la plus ancienne à la plus récente"""
+        n = self.count if count is None else min(count, self.count)
+        end = self._slot + 1 + self.capacity
+        return self._data[:, end - n:end]
+
+
+class CandleStore:
+    """Bougies des paires actives maintenues en mémoire par les streams kline combinés
+
+    - un buffer circulaire par (paire, intervalle)
+    - abonnements SUBSCRIBE/UNSUBSCRIBE quand l'univers change, sans reconnexion
+    - amorçage des buffers depuis le REST (seed) puis mise à jour continue par le stream
+    """
+
+    def __init__(self, stream_url: str = "wss://stream.binance.com:9443",
+                 intervals: Iterable[str] = ('1m', '1h'), capacity: int = 200,
+                 stale_after_seconds: float = 30.0):
+        self.logger = logging.getLogger(__name__)
+        self.stream_url = stream_url.rstrip('/')
+        self.intervals = tuple(intervals)
+        self.capacity = capacity
+        self.stale_after_seconds = stale_after_seconds
+
+        self._buffers: Dict[Tuple[str, str], CandleRingBuffer] = {}
+        self._last_update: Dict[Tuple[str, str], float] = {}
+        self._universe: Set[str] = set()
+        self._subscribed: Set[str] = set()
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._request_id = 0
+        self._listeners: List[Callable] = []
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'messages': 0,
+            'reconnections': 0,
+            'gaps': 0
+        }
+
+    # =================== CYCLE DE VIE ===================
+
+    async def start(self):
+        """Démarre la tâche de réception des streams"""
+        if not WEBSOCKETS_AVAILABLE:
+            self.logger.warning("⚠️ CandleStore désactivé: websockets non installé")
+            return
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+            self.logger.info(f"📡 CandleStore démarré ({', '.join(self.intervals)})")
+
+    async def stop(self):
+        """Arrête la tâche de réception"""
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.logger.info("📡 CandleStore arrêté")
+
+    async def _run(self):
+        """Boucle de connexion avec reconnexion automatique"""
+        backoff = 1.0
+        while self._running:
+            try:
+                async with websockets.connect(f"{self.stream_url}/stream", ping_interval=20) as ws:
+                    self._ws = ws
+                    self._subscribed = set()
+                    await self._sync_subscriptions()
+                    backoff = 1.0
+
+                    async for raw in ws:
+                        self._handle_message(raw)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"⚠️ Stream kline interrompu: {e} - reconnexion dans {backoff:.0f}s")
+            finally:
+                self._ws = None
+
+            if self._running:
+                self.stats['reconnections'] += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    # =================== UNIVERS ET ABONNEMENTS ===================
+
+    def _streams_for(self, symbols: Iterable[str]) -> Set[str]:
+        return {f"{symbol.lower()}@kline_{interval}" for symbol in symbols for interval in self.intervals}
+
+    async def set_universe(self, symbols: Iterable[str]):
+        """Définit les paires suivies (abonnements mis à jour si connecté)"""
+        self._universe = set(symbols)
+        await self._sync_subscriptions()
+
+    async def _sync_subscriptions(self):
+        if self._ws is None:
+            return
+
+        wanted = self._streams_for(self._universe)
+        to_add = sorted(wanted - self._subscribed)
+        to_remove = sorted(self._subscribed - wanted)
+
+        try:
+            # Binance limite le nombre de messages entrants: envoi par paquets
+            for method, streams in (('UNSUBSCRIBE', to_remove), ('SUBSCRIBE', to_add)):
+                for i in range(0, len(streams), 200):
+                    self._request_id += 1
+                    await self._ws.send(json.dumps({
+                        'method': method,
+                        'params': streams[i:i + 200],
+                        'id': self._request_id
+                    }))
+                    await asyncio.sleep(0.25)
+
+            for stream in to_remove:
+                symbol = stream.split('@')[0].upper()
+                for interval in self.intervals:
+                    self._buffers.pop((symbol, interval), None)
+                    self._last_update.pop((symbol, interval), None)
+
+            self._subscribed = wanted
+            if to_add or to_remove:
+                self.logger.info(f"📡 Streams kline: +{len(to_add)} / -{len(to_remove)} ({len(wanted)} actifs)")
+
+        except Exception as e:
+            self.logger.error(f"❌ Erreur mise à jour abonnements kline: {e}")
+
+    # =================== MISE À JOUR DES BUFFERS ===================
+
+    def add_listener(self, callback: Callable):
+        """Enregistre un callback(symbol, interval, row, closed) appelé à chaque bougie reçue"""
+        self._listeners.append(callback)
+
+    def _buffer(self, symbol: str, interval: str) -> CandleRingBuffer:
+        key = (symbol, interval)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = CandleRingBuffer(self.capacity)
+            self._buffers[key] = buffer
+        return buffer
+
+    def _handle_message(self, raw):
+        try:
+            message = json.loads(raw)
+            data = message.get('data')
+            if not data or data.get('e') != 'kline':
+                return  # Réponse d'abonnement ou message inconnu
+
+            kline = data['k']
+            self.stats['messages'] += 1
+            self.apply_kline(
+                kline['s'], kline['i'],
+                (float(kline['t']), float(kline['o']), float(kline['h']),
+                 float(kline['l']), float(kline['c']), float(kline['v'])),
+                closed=bool(kline.get('x', False))
+            )
+
+        except Exception as e:
+            self.logger.error(f"❌ Erreur message kline: {e}")
+
+    def apply_kline(self, symbol: str, interval: str, row: Tuple[float, ...], closed: bool = False):
+        """Applique une bougie du stream (nouvelle bougie ou mise à jour de la bougie en cours)"""
+        key = (symbol, interval)
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.count == 0:
+            return  # Pas encore amorcé depuis le REST
+
+        # Trou dans la série (déconnexion): le buffer devra être ré-amorcé
+        step = INTERVAL_MS.get(interval)
+        if step and row[0] > buffer.last_open_time + step:
+            self.stats['gaps'] += 1
+            buffer.reset()
+            self._last_update.pop(key, None)
+            return
+
+        if buffer.upsert(row):
+            self._last_update[key] = time.monotonic()
+            for callback in self._listeners:
+                try:
+                    callback(symbol, interval, row, closed)
+                except Exception as e:
+                    self.logger.error(f"❌ Erreur listener kline: {e}")
+
+    def seed(self, symbol: str, interval: str, klines: List[List]):
+        """Amorce le buffer d'une paire avec des bougies REST (format get_klines)"""
+        buffer = self._buffer(symbol, interval)
+        buffer.reset()
+        for k in klines[-self.capacity:]:
+            buffer.upsert((float(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5])))
+        self._last_update[(symbol, interval)] = time.monotonic()
+
+    # =================== LECTURE ===================
+
+    def is_ready(self, symbol: str, interval: str, min_count: int = 1) -> bool:
+        """True si le buffer est amorcé, assez rempli et mis à jour récemment"""
+        key = (symbol, interval)
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.count < min_count or self._ws is None:
+            return False
+        if symbol not in self._universe:
+            return False
+        last_update = self._last_update.get(key)
+        return last_update is not None and time.monotonic() - last_update <= self.stale_after_seconds
+
+    def ohlcv(self, symbol: str, interval: str, count: Optional[int] = None) -> Optional[Dict[str, np.ndarray]]:
+        """Vues numpy (sans copie) des dernières bougies: open_time, open, high, low, close, volume"""
+        buffer = self._buffers.get((symbol, interval))
+        if buffer is None or buffer.count == 0:
+            return None
+        view = buffer.view(count)
+        return {field: view[i] for i, field in enumerate(CANDLE_FIELDS)}
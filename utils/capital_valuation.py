@@ -0,0 +1,90 @@
+"""
+Valorisation du capital total en USDC
+Soldes en mémoire (AccountState) x un seul snapshot de prix (PriceSnapshot), calcul vectoriel
+mémorisé tant que ni les soldes ni les prix n'ont changé
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class CapitalValuator:
+    """Capital total = solde de la devise de cotation + valeur des autres assets via leur paire directe
+
+    - Routes asset -> paire (ex: XRP -> XRPUSDC) mises en cache; les assets sans paire sont
+      revérifiés seulement quand de nouvelles paires apparaissent dans le snapshot
+    - Résultat mémorisé par couple (version des soldes, version des prix): un appel par position
+      ou par métrique dans le même tick ne coûte qu'une lecture mémoire
+    """
+
+    def __init__(self, account, prices, quote_asset: str = 'USDC', dust_threshold: float = 0.00001):
+        self.logger = logging.getLogger(__name__)
+        self.account = account
+        self.prices = prices
+        self.quote_asset = quote_asset
+        self.dust_threshold = dust_threshold
+
+        self._routes: Dict[str, Optional[str]] = {}
+        self._routes_version = -1
+        self._memo_key: Optional[Tuple[int, int]] = None
+        self._memo_value = 0.0
+        self.last_breakdown: Dict[str, object] = {}
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'hits': 0,
+            'computations': 0
+        }
+
+    def _route(self, asset: str, prices: Dict[str, float]) -> Optional[str]:
+        """Paire de conversion directe vers la devise de cotation (None si inexistante)"""
+        if self._routes_version != self.prices.symbols_version:
+            # Nouvelles paires: seules les routes absentes sont à revérifier
+            self._routes = {a: symbol for a, symbol in self._routes.items() if symbol is not None}
+            self._routes_version = self.prices.symbols_version
+
+        if asset not in self._routes:
+            symbol = asset + self.quote_asset
+            self._routes[asset] = symbol if symbol in prices else None
+        return self._routes[asset]
+
+    async def total_capital(self) -> float:
+        """Capital total en devise de cotation (soldes disponibles)"""
+        balances = await self.account.get_free_balances()
+        account_version = self.account.version
+        prices = await self.prices.get_prices()
+
+        key = (account_version, self.prices.version)
+        if key == self._memo_key:
+            self.stats['hits'] += 1
+            return self._memo_value
+
+        quote_balance = balances.get(self.quote_asset, 0.0)
+        priced: List[Tuple[str, float, str]] = []
+        unpriced: List[str] = []
+        for asset, free in balances.items():
+            if asset == self.quote_asset or free <= self.dust_threshold:
+                continue
+            symbol = self._route(asset, prices)
+            if symbol is None:
+                unpriced.append(asset)
+            else:
+                priced.append((asset, free, symbol))
+
+        quantities = np.fromiter((free for _, free, _ in priced), dtype=np.float64, count=len(priced))
+        rates = np.fromiter((prices[symbol] for _, _, symbol in priced), dtype=np.float64, count=len(priced))
+        values = quantities * rates
+        crypto_value = float(values.sum())
+
+        self._memo_key = key
+        self._memo_value = quote_balance + crypto_value
+        self.last_breakdown = {
+            'quote': quote_balance,
+            'crypto': crypto_value,
+            'assets': {asset: float(value) for (asset, _, _), value in zip(priced, values)},
+            'unpriced': unpriced
+        }
+        self.stats['computations'] += 1
+        return self._memo_value
@@ -1,5 +1,7 @@
 """
 Module de gestion de base de données SQLite pour le bot de trading
+Connexion persistante en mode WAL; les écritures sont mises en file et regroupées en transactions
+par un thread dédié, la boucle de trading n'attend jamais le disque
 """
 
 import asyncio
@@ -7,283 +9,458 @@ import json
 import logging
 import os
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from queue import Empty, Full, Queue
+from typing import Any, Dict, List, Optional, Tuple
+
+# Réglages de la connexion persistante
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",      # Lectures concurrentes, écritures séquentielles dans le journal
+    "PRAGMA synchronous=NORMAL",    # fsync au checkpoint seulement (sûr en WAL)
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",     # 16MB
+    "PRAGMA busy_timeout=5000"
+)
 
 
 class TradingDatabase:
     """Gestionnaire de base de données SQLite pour le trading"""
     
-    def __init__(self, db_path: str = "data/trading_bot.db"):
+    def __init__(self, db_path: str = "data/trading_bot.db", queue_size: int = 10000,
+                 batch_size: int = 500, flush_interval_seconds: float = 0.5):
         self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
         self.ensure_directory()
         
+        self._queue: Queue = Queue(maxsize=queue_size)
+        self._overflow: List[Any] = []  # Écritures critiques et barrières reçues file pleine, dans l'ordre
+        self._overflow_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._writer_thread: Optional[threading.Thread] = None
+        self._next_trade_id = 0
+        
+        # Statistiques d'utilisation
+        self.stats = {
+            'queued': 0,
+            'written': 0,
+            'transactions': 0,
+            'dropped': 0,
+            'spilled': 0,
+            'row_fallbacks': 0,
+            'errors': 0,
+            'max_queue_depth': 0
+        }
+        
     def ensure_directory(self):
         """Crée le répertoire data s'il n'existe pas"""
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
     
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # Pour des résultats en dict
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+        return conn
+    
     @contextmanager
     def get_connection(self):
-        """Context manager pour les connexions DB"""
-        conn = None
+        """Connexion de lecture persistante (le thread d'écriture a la sienne)"""
+        if self._reader is None:
+            self._reader = self._open()
+        yield self._reader
+    
+    # =================== ÉCRITURE EN ARRIÈRE-PLAN ===================
+    
+    def start_writer(self):
+        """Démarre le thread d'écriture (connexion dédiée)"""
+        if self._writer_thread and self._writer_thread.is_alive():
+            return
+        if self._writer is None:
+            self._writer = self._open()
+        self._writer_thread = threading.Thread(target=self._writer_worker, name="sqlite-writer", daemon=True)
+        self._writer_thread.start()
+        logging.info("💾 Thread d'écriture SQLite démarré")
+    
+    def _put(self, entry: Any, spill: bool) -> bool:
+        """Ajout sans attente; file pleine: débordement en mémoire (si ``spill``) plutôt que bloquer la boucle
+
+        Tant que le débordement n'est pas vidé, les nouvelles entrées le suivent pour conserver l'ordre
+        (insert_trade puis update_trade_exit)
+        """
+        with self._overflow_lock:
+            if not self._overflow:
+                try:
+                    self._queue.put_nowait(entry)
+                    return True
+                except Full:
+                    pass
+            if not spill:
+                return False
+            self._overflow.append(entry)
+            self.stats['spilled'] += 1
+            return True
+    
+    def _take_overflow(self) -> List[Any]:
+        """Débordement à écrire, une fois les entrées plus anciennes de la file consommées"""
+        with self._overflow_lock:
+            if not self._overflow or not self._queue.empty():
+                return []
+            batch, self._overflow = self._overflow, []
+            return batch
+    
+    def _enqueue(self, sql: str, params: Tuple, critical: bool = False):
+        """Met une écriture en file; les écritures non critiques sont abandonnées si la file est pleine"""
+        if not self._put((sql, params), spill=critical):
+            self.stats['dropped'] += 1
+            logging.error(f"❌ File d'écriture SQLite pleine: écriture abandonnée ({sql.split('(')[0].strip()})")
+            return
+        self.stats['queued'] += 1
+        depth = self._queue.qsize()
+        if depth > self.stats['max_queue_depth']:
+            self.stats['max_queue_depth'] = depth
+    
+    def _writer_worker(self):
+        """Regroupe les écritures arrivées pendant ``flush_interval_seconds`` dans une transaction"""
+        while True:
+            batch = self._take_overflow()
+            if batch:
+                stop = None in batch
+                self._write_batch([entry for entry in batch if entry is not None])
+                if stop:
+                    return
+                continue
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval_seconds)]
+            except Empty:
+                continue
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(batch) < self.batch_size and batch[-1] is not None and not isinstance(batch[-1], threading.Event):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except Empty:
+                    break
+            
+            stop = batch[-1] is None
+            self._write_batch([entry for entry in batch if entry is not None])
+            if stop:
+                return
+    
+    def _write_batch(self, batch: List):
+        """Une transaction par lot; les requêtes identiques consécutives passent par executemany
+
+        Lot refusé (rollback complet): réécriture ligne par ligne, seule la ligne fautive est perdue
+        """
+        barriers = [entry for entry in batch if isinstance(entry, threading.Event)]
+        rows = [entry for entry in batch if not isinstance(entry, threading.Event)]
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row  # Pour des résultats en dict
-            yield conn
+            if rows:
+                with self._writer:  # type: ignore
+                    index = 0
+                    while index < len(rows):
+                        sql = rows[index][0]
+                        end = index
+                        while end < len(rows) and rows[end][0] == sql:
+                            end += 1
+                        self._writer.executemany(sql, [params for _, params in rows[index:end]])  # type: ignore
+                        index = end
+                self.stats['written'] += len(rows)
+                self.stats['transactions'] += 1
+        except Exception as e:
+            self.stats['row_fallbacks'] += 1
+            logging.warning(f"⚠️ Lot SQLite refusé ({len(rows)} lignes): {e} - écriture ligne par ligne")
+            self._write_rows(rows)
         finally:
+            for barrier in barriers:
+                barrier.set()
+    
+    def _write_rows(self, rows: List[Tuple[str, Tuple]]):
+        """Une transaction par ligne: une ligne invalide n'annule pas les écritures des autres appelants"""
+        for sql, params in rows:
+            try:
+                with self._writer:  # type: ignore
+                    self._writer.execute(sql, params)  # type: ignore
+                self.stats['written'] += 1
+                self.stats['transactions'] += 1
+            except Exception as e:
+                self.stats['errors'] += 1
+                logging.error(f"❌ Erreur écriture SQLite: {e} | {' '.join(sql.split())} | {params}")
+    
+    async def flush(self, timeout: float = 5.0) -> bool:
+        """Attend que les écritures en file soient committées (lecture de ses propres écritures)"""
+        if not self._writer_thread or not self._writer_thread.is_alive():
+            return True
+        barrier = threading.Event()
+        self._put(barrier, spill=True)
+        return await asyncio.to_thread(barrier.wait, timeout)
+    
+    async def close(self):
+        """Vide la file, arrête le thread d'écriture et ferme les connexions"""
+        if self._writer is None and self._reader is None:
+            return
+        if self._writer_thread and self._writer_thread.is_alive():
+            self._put(None, spill=True)
+            await asyncio.to_thread(self._writer_thread.join, 10)
+        for conn in (self._writer, self._reader):
             if conn:
                 conn.close()
+        self._writer = self._reader = None
+        logging.info(f"💾 Base SQLite fermée ({self.stats['written']} lignes en {self.stats['transactions']} transactions)")
     
     async def initialize_database(self):
-        """Initialise la base de données avec toutes les tables"""
-        with self.get_connection() as conn:
-            # Table des trades
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS trades (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    side TEXT NOT NULL,
-                    entry_price REAL NOT NULL,
-                    exit_price REAL,
-                    quantity REAL NOT NULL,
-                    stop_loss REAL NOT NULL,
-                    take_profit REAL NOT NULL,
-                    trailing_stop REAL NOT NULL,
-                    entry_time TIMESTAMP NOT NULL,
-                    exit_time TIMESTAMP,
-                    status TEXT NOT NULL DEFAULT 'OPEN',
-                    exit_reason TEXT,
-                    pnl_amount REAL DEFAULT 0,
-                    pnl_percent REAL DEFAULT 0,
-                    commission REAL DEFAULT 0,
-                    capital_engaged REAL NOT NULL,
-                    signals_detected TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Table des trailing stops
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS trailing_stops (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    trade_id INTEGER NOT NULL,
-                    symbol TEXT NOT NULL,
-                    old_stop_loss REAL NOT NULL,
-                    new_stop_loss REAL NOT NULL,
-                    trigger_price REAL NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
-                    profit_percent REAL NOT NULL,
-                    FOREIGN KEY (trade_id) REFERENCES trades (id)
-                )
-            """)
-            
-            # Table des performances quotidiennes
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS daily_performance (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    date DATE NOT NULL UNIQUE,
-                    start_capital REAL NOT NULL,
-                    end_capital REAL NOT NULL,
-                    daily_pnl REAL NOT NULL,
-                    daily_pnl_percent REAL NOT NULL,
-                    total_trades INTEGER NOT NULL,
-                    winning_trades INTEGER NOT NULL,
-                    losing_trades INTEGER NOT NULL,
-                    win_rate REAL NOT NULL,
-                    max_drawdown REAL NOT NULL,
-                    profit_factor REAL,
-                    sharpe_ratio REAL,
-                    best_trade REAL,
-                    worst_trade REAL,
-                    avg_trade_duration REAL,
-                    status TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Table des métriques en temps réel
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS realtime_metrics (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    timestamp TIMESTAMP NOT NULL,
-                    current_capital REAL NOT NULL,
-                    open_positions INTEGER NOT NULL,
-                    daily_pnl REAL NOT NULL,
-                    total_pnl REAL NOT NULL,
-                    win_rate REAL NOT NULL,
-                    pairs_analyzed TEXT,
-                    top_pair TEXT,
-                    api_calls_count INTEGER DEFAULT 0,
-                    uptime_seconds INTEGER DEFAULT 0
-                )
-            """)
-            
-            # Table des signaux détectés
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS signals (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    symbol TEXT NOT NULL,
-                    timestamp TIMESTAMP NOT NULL,
-                    signal_type TEXT NOT NULL,
-                    signal_strength INTEGER NOT NULL,
-                    price REAL NOT NULL,
-                    volume REAL NOT NULL,
-                    technical_indicators TEXT,
-                    action_taken TEXT,
-                    reason TEXT
-                )
-            """)
-            
-            # Index pour optimiser les requêtes
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_date ON trades(entry_time)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_daily_performance_date ON daily_performance(date)")
-            conn.execute("CREATE INDEX IF NOT EXISTS idx_trailing_stops_trade_id ON trailing_stops(trade_id)")
-            
-            conn.commit()
-            logging.info("✅ Base de données initialisée")
+        """Initialise la base de données avec toutes les tables et démarre le thread d'écriture"""
+        self._writer = self._writer or self._open()
+        conn = self._writer
+        # Table des trades
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS trades (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                side TEXT NOT NULL,
+                entry_price REAL NOT NULL,
+                exit_price REAL,
+                quantity REAL NOT NULL,
+                stop_loss REAL NOT NULL,
+                take_profit REAL NOT NULL,
+                trailing_stop REAL NOT NULL,
+                entry_time TIMESTAMP NOT NULL,
+                exit_time TIMESTAMP,
+                status TEXT NOT NULL DEFAULT 'OPEN',
+                exit_reason TEXT,
+                pnl_amount REAL DEFAULT 0,
+                pnl_percent REAL DEFAULT 0,
+                commission REAL DEFAULT 0,
+                capital_engaged REAL NOT NULL,
+                signals_detected TEXT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Table des trailing stops
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS trailing_stops (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                trade_id INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                old_stop_loss REAL NOT NULL,
+                new_stop_loss REAL NOT NULL,
+                trigger_price REAL NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                profit_percent REAL NOT NULL,
+                FOREIGN KEY (trade_id) REFERENCES trades (id)
+            )
+        """)
+        
+        # Table des performances quotidiennes
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS daily_performance (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                date DATE NOT NULL UNIQUE,
+                start_capital REAL NOT NULL,
+                end_capital REAL NOT NULL,
+                daily_pnl REAL NOT NULL,
+                daily_pnl_percent REAL NOT NULL,
+                total_trades INTEGER NOT NULL,
+                winning_trades INTEGER NOT NULL,
+                losing_trades INTEGER NOT NULL,
+                win_rate REAL NOT NULL,
+                max_drawdown REAL NOT NULL,
+                profit_factor REAL,
+                sharpe_ratio REAL,
+                best_trade REAL,
+                worst_trade REAL,
+                avg_trade_duration REAL,
+                status TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        
+        # Table des métriques en temps réel
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS realtime_metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TIMESTAMP NOT NULL,
+                current_capital REAL NOT NULL,
+                open_positions INTEGER NOT NULL,
+                daily_pnl REAL NOT NULL,
+                total_pnl REAL NOT NULL,
+                win_rate REAL NOT NULL,
+                pairs_analyzed TEXT,
+                top_pair TEXT,
+                api_calls_count INTEGER DEFAULT 0,
+                uptime_seconds INTEGER DEFAULT 0
+            )
+        """)
+        
+        # Table des signaux détectés
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS signals (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                symbol TEXT NOT NULL,
+                timestamp TIMESTAMP NOT NULL,
+                signal_type TEXT NOT NULL,
+                signal_strength INTEGER NOT NULL,
+                price REAL NOT NULL,
+                volume REAL NOT NULL,
+                technical_indicators TEXT,
+                action_taken TEXT,
+                reason TEXT
+            )
+        """)
+        
+        # Index pour optimiser les requêtes
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_trades_date ON trades(entry_time)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_daily_performance_date ON daily_performance(date)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_trailing_stops_trade_id ON trailing_stops(trade_id)")
+        
+        conn.commit()
+        
+        # IDs de trades attribués ici: insert_trade n'attend pas l'écriture pour connaître l'ID
+        self._next_trade_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM trades").fetchone()[0]
+        logging.info("✅ Base de données initialisée")
+        
+        self.start_writer()
     
     async def insert_trade(self, trade_data: Dict) -> int:
-        """Insert un nouveau trade"""
-        with self.get_connection() as conn:
-            cursor = conn.execute("""
-                INSERT INTO trades (
-                    symbol, side, entry_price, quantity, stop_loss, take_profit,
-                    trailing_stop, entry_time, capital_engaged, signals_detected, status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                trade_data['symbol'],
-                trade_data['side'],
-                trade_data['entry_price'],
-                trade_data['quantity'],
-                trade_data['stop_loss'],
-                trade_data['take_profit'],
-                trade_data['trailing_stop'],
-                trade_data['entry_time'],
-                trade_data['capital_engaged'],
-                json.dumps(trade_data.get('signals_detected', [])),
-                'OPEN'
-            ))
-            conn.commit()
-            return cursor.lastrowid # type: ignore
+        """Insert un nouveau trade (mis en file), retourne son ID"""
+        self._next_trade_id += 1
+        trade_id = self._next_trade_id
+        self._enqueue("""
+            INSERT INTO trades (
+                id, symbol, side, entry_price, quantity, stop_loss, take_profit,
+                trailing_stop, entry_time, capital_engaged, signals_detected, status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            trade_id,
+            trade_data['symbol'],
+            trade_data['side'],
+            trade_data['entry_price'],
+            trade_data['quantity'],
+            trade_data['stop_loss'],
+            trade_data['take_profit'],
+            trade_data['trailing_stop'],
+            trade_data['entry_time'],
+            trade_data['capital_engaged'],
+            json.dumps(trade_data.get('signals_detected', [])),
+            'OPEN'
+        ), critical=True)
+        return trade_id
     
     async def update_trade_exit(self, trade_id: int, exit_data: Dict):
-        """Met à jour un trade à la fermeture"""
-        with self.get_connection() as conn:
-            conn.execute("""
-                UPDATE trades SET
-                    exit_price = ?, exit_time = ?, status = ?, exit_reason = ?,
-                    pnl_amount = ?, pnl_percent = ?, commission = ?
-                WHERE id = ?
-            """, (
-                exit_data['exit_price'],
-                exit_data['exit_time'],
-                'CLOSED',
-                exit_data['exit_reason'],
-                exit_data['pnl_amount'],
-                exit_data['pnl_percent'],
-                exit_data.get('commission', 0),
-                trade_id
-            ))
-            conn.commit()
+        """Met à jour un trade à la fermeture (mis en file)"""
+        self._enqueue("""
+            UPDATE trades SET
+                exit_price = ?, exit_time = ?, status = ?, exit_reason = ?,
+                pnl_amount = ?, pnl_percent = ?, commission = ?
+            WHERE id = ?
+        """, (
+            exit_data['exit_price'],
+            exit_data['exit_time'],
+            'CLOSED',
+            exit_data['exit_reason'],
+            exit_data['pnl_amount'],
+            exit_data['pnl_percent'],
+            exit_data.get('commission', 0),
+            trade_id
+        ), critical=True)
     
     async def insert_trailing_stop(self, trailing_data: Dict):
         """Insert un événement de trailing stop"""
-        with self.get_connection() as conn:
-            conn.execute("""
-                INSERT INTO trailing_stops (
-                    trade_id, symbol, old_stop_loss, new_stop_loss,
-                    trigger_price, timestamp, profit_percent
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (
-                trailing_data['trade_id'],
-                trailing_data['symbol'],
-                trailing_data['old_stop_loss'],
-                trailing_data['new_stop_loss'],
-                trailing_data['trigger_price'],
-                trailing_data['timestamp'],
-                trailing_data['profit_percent']
-            ))
-            conn.commit()
+        self._enqueue("""
+            INSERT INTO trailing_stops (
+                trade_id, symbol, old_stop_loss, new_stop_loss,
+                trigger_price, timestamp, profit_percent
+            ) VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            trailing_data['trade_id'],
+            trailing_data['symbol'],
+            trailing_data['old_stop_loss'],
+            trailing_data['new_stop_loss'],
+            trailing_data['trigger_price'],
+            trailing_data['timestamp'],
+            trailing_data['profit_percent']
+        ))
     
     async def insert_daily_performance(self, perf_data: Dict):
         """Insert les performances quotidiennes"""
-        with self.get_connection() as conn:
-            conn.execute("""
-                INSERT OR REPLACE INTO daily_performance (
-                    date, start_capital, end_capital, daily_pnl, daily_pnl_percent,
-                    total_trades, winning_trades, losing_trades, win_rate,
-                    max_drawdown, profit_factor, sharpe_ratio, best_trade,
-                    worst_trade, avg_trade_duration, status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                perf_data['date'],
-                perf_data['start_capital'],
-                perf_data['end_capital'],
-                perf_data['daily_pnl'],
-                perf_data['daily_pnl_percent'],
-                perf_data['total_trades'],
-                perf_data['winning_trades'],
-                perf_data['losing_trades'],
-                perf_data['win_rate'],
-                perf_data['max_drawdown'],
-                perf_data.get('profit_factor'),
-                perf_data.get('sharpe_ratio'),
-                perf_data.get('best_trade'),
-                perf_data.get('worst_trade'),
-                perf_data.get('avg_trade_duration'),
-                perf_data['status']
-            ))
-            conn.commit()
+        self._enqueue("""
+            INSERT OR REPLACE INTO daily_performance (
+                date, start_capital, end_capital, daily_pnl, daily_pnl_percent,
+                total_trades, winning_trades, losing_trades, win_rate,
+                max_drawdown, profit_factor, sharpe_ratio, best_trade,
+                worst_trade, avg_trade_duration, status
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            perf_data['date'],
+            perf_data['start_capital'],
+            perf_data['end_capital'],
+            perf_data['daily_pnl'],
+            perf_data['daily_pnl_percent'],
+            perf_data['total_trades'],
+            perf_data['winning_trades'],
+            perf_data['losing_trades'],
+            perf_data['win_rate'],
+            perf_data['max_drawdown'],
+            perf_data.get('profit_factor'),
+            perf_data.get('sharpe_ratio'),
+            perf_data.get('best_trade'),
+            perf_data.get('worst_trade'),
+            perf_data.get('avg_trade_duration'),
+            perf_data['status']
+        ), critical=True)
     
     async def insert_realtime_metrics(self, metrics: Dict):
         """Insert les métriques en temps réel"""
-        with self.get_connection() as conn:
-            conn.execute("""
-                INSERT INTO realtime_metrics (
-                    timestamp, current_capital, open_positions, daily_pnl,
-                    total_pnl, win_rate, pairs_analyzed, top_pair,
-                    api_calls_count, uptime_seconds
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                metrics['timestamp'],
-                metrics['current_capital'],
-                metrics['open_positions'],
-                metrics['daily_pnl'],
-                metrics['total_pnl'],
-                metrics['win_rate'],
-                json.dumps(metrics.get('pairs_analyzed', [])),
-                metrics.get('top_pair'),
-                metrics.get('api_calls_count', 0),
-                metrics.get('uptime_seconds', 0)
-            ))
-            conn.commit()
+        self._enqueue("""
+            INSERT INTO realtime_metrics (
+                timestamp, current_capital, open_positions, daily_pnl,
+                total_pnl, win_rate, pairs_analyzed, top_pair,
+                api_calls_count, uptime_seconds
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            metrics['timestamp'],
+            metrics['current_capital'],
+            metrics['open_positions'],
+            metrics['daily_pnl'],
+            metrics['total_pnl'],
+            metrics['win_rate'],
+            json.dumps(metrics.get('pairs_analyzed', [])),
+            metrics.get('top_pair'),
+            metrics.get('api_calls_count', 0),
+            metrics.get('uptime_seconds', 0)
+        ))
     
     async def insert_signal(self, signal_data: Dict):
         """Insert un signal détecté"""
-        with self.get_connection() as conn:
-            conn.execute("""
-                INSERT INTO signals (
-                    symbol, timestamp, signal_type, signal_strength,
-                    price, volume, technical_indicators, action_taken, reason
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                signal_data['symbol'],
-                signal_data['timestamp'],
-                signal_data['signal_type'],
-                signal_data['signal_strength'],
-                signal_data['price'],
-                signal_data['volume'],
-                json.dumps(signal_data.get('technical_indicators', {})),
-                signal_data.get('action_taken'),
-                signal_data.get('reason')
-            ))
-            conn.commit()
+        self._enqueue("""
+            INSERT INTO signals (
+                symbol, timestamp, signal_type, signal_strength,
+                price, volume, technical_indicators, action_taken, reason
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            signal_data['symbol'],
+            signal_data['timestamp'],
+            signal_data['signal_type'],
+            signal_data['signal_strength'],
+            signal_data['price'],
+            signal_data['volume'],
+            json.dumps(signal_data.get('technical_indicators', {})),
+            signal_data.get('action_taken'),
+            signal_data.get('reason')
+        ))
     
     # Méthodes de requête pour les investisseurs
     async def get_performance_summary(self, days: int = 30) -> Dict:
         """Récupère un résumé des performances"""
+        await self.flush()
         with self.get_connection() as conn:
             # Performance globale
             cursor = conn.execute("""
@@ -321,6 +498,7 @@ class TradingDatabase:
     
     async def get_trades_history(self, limit: int = 100) -> List[Dict]:
         """Récupère l'historique des trades"""
+        await self.flush()
         with self.get_connection() as conn:
             cursor = conn.execute("""
                 SELECT * FROM trades 
@@ -332,6 +510,7 @@ class TradingDatabase:
     
     async def get_trailing_stops_history(self, symbol: str = None) -> List[Dict]: # type: ignore
         """Récupère l'historique des trailing stops"""
+        await self.flush()
         with self.get_connection() as conn:
             if symbol:
                 cursor = conn.execute("""
@@ -0,0 +1,236 @@
+"""
+Passerelle d'échange asynchrone pour Binance
+Client REST partagé (pool keep-alive), requêtes concurrentes, timeouts par appel
+et limitation globale au poids API Binance
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+from binance.client import AsyncClient
+
+from .rate_limiter import PRIORITY_SCAN, WeightRateLimiter, request_priority, request_weight
+
+
+class WeightTrackingClient(AsyncClient):
+    """AsyncClient qui transmet les en-têtes de poids de chaque réponse au limiteur"""
+
+    rate_limiter: Optional[WeightRateLimiter] = None
+
+    async def _handle_response(self, response: aiohttp.ClientResponse):
+        if self.rate_limiter is not None:
+            self.rate_limiter.update_from_headers(response.headers, response.status)
+        return await super()._handle_response(response)
+
+    async def cancel_replace_order(self, **params):
+        """POST /api/v3/order/cancelReplace (absent de python-binance)"""
+        return await self._post('order/cancelReplace', True, data=params)
+
+    async def cancel_order_list(self, **params):
+        """DELETE /api/v3/orderList (annulation d'un OCO, absente de python-binance)"""
+        return await self._delete('orderList', True, data=params)
+
+
+class ExchangeGateway:
+    """Passerelle asyncio vers l'API REST Binance
+
+    Toutes les requêtes passent par une seule session aiohttp (connexions keep-alive
+    réutilisées) : les appels ne bloquent plus la boucle asyncio et plusieurs requêtes
+    peuvent être en vol simultanément, dans la limite de ``max_concurrent_requests``.
+    Chaque appel réserve d'abord son poids Binance auprès du ``rate_limiter`` (ordres prioritaires).
+    """
+
+    def __init__(self, api_key: str, api_secret: str, testnet: bool = False,
+                 max_connections: int = 20, max_concurrent_requests: int = 10,
+                 default_timeout: float = 10.0, weight_per_minute: int = 6000,
+                 weight_reserve_ratio: float = 0.2):
+        self.logger = logging.getLogger(__name__)
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.testnet = testnet
+        self.max_connections = max_connections
+        self.default_timeout = default_timeout
+
+        self.client: Optional[AsyncClient] = None
+        self._semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._connect_lock = asyncio.Lock()
+        self._order_listeners: List[Callable] = []
+        self.rate_limiter = WeightRateLimiter(weight_per_minute, reserve_ratio=weight_reserve_ratio)
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'requests': 0,
+            'timeouts': 0,
+            'errors': 0,
+            'in_flight': 0
+        }
+
+    async def connect(self):
+        """Ouvre la session HTTP partagée (idempotent)"""
+        async with self._connect_lock:
+            if self.client is not None:
+                return
+
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            self.client = await WeightTrackingClient.create(
+                api_key=self.api_key,
+                api_secret=self.api_secret,
+                testnet=self.testnet,
+                session_params={'connector': connector}
+            )
+            self.client.rate_limiter = self.rate_limiter
+            self.logger.info(f"🔌 Passerelle Binance connectée (pool: {self.max_connections} connexions)")
+
+    async def close(self):
+        """Ferme la session HTTP partagée"""
+        if self.client is not None:
+            await self.client.close_connection()
+            self.client = None
+            self.logger.info("🔌 Passerelle Binance fermée")
+
+    async def _call(self, method: str, timeout: Optional[float] = None, **params) -> Any:
+        """Exécute un appel AsyncClient avec limite de poids, limite de concurrence et timeout"""
+        if self.client is None:
+            await self.connect()
+
+        func = getattr(self.client, method)
+        call_timeout = timeout if timeout is not None else self.default_timeout
+
+        # Poids réservé avant le slot de concurrence: une requête de scan en attente de poids
+        # n'occupe pas de connexion
+        await self.rate_limiter.acquire(request_weight(method, params), request_priority(method, params))
+
+        async with self._semaphore:
+            self.stats['requests'] += 1
+            self.stats['in_flight'] += 1
+            try:
+                return await asyncio.wait_for(func(**params), timeout=call_timeout)
+            except asyncio.TimeoutError:
+                self.stats['timeouts'] += 1
+                self.logger.warning(f"⏱️ Timeout Binance {method} après {call_timeout:.1f}s")
+                raise
+            except Exception:
+                self.stats['errors'] += 1
+                raise
+            finally:
+                self.stats['in_flight'] -= 1
+
+    def add_order_listener(self, callback: Callable):
+        """Enregistre un callback(method, params, response) appelé après chaque ordre accepté"""
+        self._order_listeners.append(callback)
+
+    async def _order_call(self, method: str, timeout: Optional[float] = None, **params) -> Any:
+        """Appel d'ordre (création/annulation) suivi de la notification des listeners"""
+        response = await self._call(method, timeout=timeout, **params)
+        for callback in self._order_listeners:
+            try:
+                callback(method, params, response)
+            except Exception as e:
+                self.logger.error(f"❌ Erreur listener ordre: {e}")
+        return response
+
+    def weight_headroom(self, priority: int = PRIORITY_SCAN) -> int:
+        """Poids API encore consommable sans attendre (par défaut: trafic de scan)"""
+        return self.rate_limiter.headroom(priority)
+
+    # =================== DONNÉES DE MARCHÉ ===================
+
+    async def get_klines(self, symbol: str, interval: str, limit: int = 500,
+                         timeout: Optional[float] = None) -> List[List]:
+        """Bougies récentes d'une paire"""
+        return await self._call('get_klines', timeout=timeout, symbol=symbol, interval=interval, limit=limit)
+
+    async def get_historical_klines(self, symbol: str, interval: str, start_str: str,
+                                    timeout: Optional[float] = None) -> List[List]:
+        """Bougies historiques depuis une date (ex: '12 hours ago UTC')"""
+        return await self._call('get_historical_klines', timeout=timeout,
+                                symbol=symbol, interval=interval, start_str=start_str)
+
+    async def get_symbol_ticker(self, symbol: Optional[str] = None,
+                                timeout: Optional[float] = None) -> Any:
+        """Dernier prix d'une paire (ou de toutes les paires si symbol est None)"""
+        if symbol is None:
+            return await self._call('get_symbol_ticker', timeout=timeout)
+        return await self._call('get_symbol_ticker', timeout=timeout, symbol=symbol)
+
+    async def get_ticker(self, symbol: Optional[str] = None,
+                         timeout: Optional[float] = None) -> Any:
+        """Statistiques 24h d'une paire (ou de toutes les paires si symbol est None)"""
+        if symbol is None:
+            return await self._call('get_ticker', timeout=timeout)
+        return await self._call('get_ticker', timeout=timeout, symbol=symbol)
+
+    async def get_exchange_info(self, timeout: Optional[float] = None) -> Dict:
+        """Informations de l'exchange (règles et filtres de toutes les paires)"""
+        return await self._call('get_exchange_info', timeout=timeout)
+
+    async def get_symbol_info(self, symbol: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Informations et filtres d'une paire"""
+        return await self._call('get_symbol_info', timeout=timeout, symbol=symbol)
+
+    # =================== COMPTE ===================
+
+    async def get_account(self, timeout: Optional[float] = None) -> Dict:
+        """Informations du compte (soldes)"""
+        return await self._call('get_account', timeout=timeout)
+
+    async def get_my_trades(self, symbol: str, limit: int = 500,
+                            timeout: Optional[float] = None) -> List[Dict]:
+        """Historique des exécutions sur une paire"""
+        return await self._call('get_my_trades', timeout=timeout, symbol=symbol, limit=limit)
+
+    async def transfer_dust(self, asset: List[str], timeout: Optional[float] = None) -> Dict:
+        """Conversion des miettes en BNB"""
+        return await self._call('transfer_dust', timeout=timeout, asset=asset)
+
+    async def get_listen_key(self, timeout: Optional[float] = None) -> str:
+        """Crée une listenKey pour le user-data stream"""
+        return await self._call('stream_get_listen_key', timeout=timeout)
+
+    async def keepalive_listen_key(self, listen_key: str, timeout: Optional[float] = None) -> Dict:
+        """Prolonge la validité d'une listenKey (60 min)"""
+        return await self._call('stream_keepalive', timeout=timeout, listenKey=listen_key)
+
+    async def close_listen_key(self, listen_key: str, timeout: Optional[float] = None) -> Dict:
+        """Ferme une listenKey"""
+        return await self._call('stream_close', timeout=timeout, listenKey=listen_key)
+
+    # =================== ORDRES ===================
+
+    async def create_order(self, timeout: Optional[float] = None, **params) -> Dict:
+        """Crée un ordre (LIMIT, STOP_LOSS_LIMIT, ...)"""
+        return await self._order_call('create_order', timeout=timeout, **params)
+
+    async def create_oco_order(self, timeout: Optional[float] = None, **params) -> Dict:
+        """Crée un ordre OCO"""
+        return await self._order_call('create_oco_order', timeout=timeout, **params)
+
+    async def order_market_buy(self, timeout: Optional[float] = None, **params) -> Dict:
+        """Ordre d'achat au marché"""
+        return await self._order_call('order_market_buy', timeout=timeout, **params)
+
+    async def order_market_sell(self, timeout: Optional[float] = None, **params) -> Dict:
+        """Ordre de vente au marché"""
+        return await self._order_call('order_market_sell', timeout=timeout, **params)
+
+    async def cancel_order(self, timeout: Optional[float] = None, **params) -> Dict:
+        """Annule un ordre"""
+        return await self._order_call('cancel_order', timeout=timeout, **params)
+
+    async def cancel_order_list(self, timeout: Optional[float] = None, **params) -> Dict:
+        """Annule toutes les jambes d'un OCO (orderListId)"""
+        return await self._order_call('cancel_order_list', timeout=timeout, **params)
+
+    async def cancel_replace_order(self, timeout: Optional[float] = None, **params) -> Dict:
+        """Annule un ordre et en place un nouveau en une requête (cancelReplaceMode, cancelOrderId, ...)"""
+        return await self._order_call('cancel_replace_order', timeout=timeout, **params)
+
+    async def get_order(self, timeout: Optional[float] = None, **params) -> Dict:
+        """Statut d'un ordre"""
+        return await self._call('get_order', timeout=timeout, **params)
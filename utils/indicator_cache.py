@@ -0,0 +1,62 @@
+"""
+Cache LRU des indicateurs techniques
+Clé: (paire, timeframe, open_time de la dernière bougie, nombre de bougies, paramètres de l'indicateur)
+"""
+
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Tuple
+
+
+class IndicatorCache:
+    """Cache LRU partagé: chaque indicateur d'une bougie n'est calculé qu'une fois
+
+    La clôture de la dernière bougie sert d'empreinte: si la bougie en cours a évolué
+    (même open_time, prix différent), l'entrée est recalculée et remplacée.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.logger = logging.getLogger(__name__)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'refreshes': 0,
+            'evictions': 0
+        }
+
+    def get_or_compute(self, key: Tuple[Hashable, ...], fingerprint: float, compute: Callable[[], Any]) -> Any:
+        """Valeur en cache pour la clé, sinon calculée puis mémorisée"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] == fingerprint:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry[1]
+            self.stats['refreshes'] += 1
+        else:
+            self.stats['misses'] += 1
+
+        value = compute()
+        self._entries[key] = (fingerprint, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+        return value
+
+    def invalidate_symbol(self, symbol: str):
+        """Supprime toutes les entrées d'une paire"""
+        for key in [k for k in self._entries if k[0] == symbol]:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,140 @@
+"""
+Bundle de bougies par paire
+Téléchargement unique des klines par cycle de scan, partagé entre analyse, ATR, cassure et volatilité
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from utils.candle_store import CANDLE_FIELDS
+
+KLINE_COLUMNS = [
+    'timestamp', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_volume', 'trades_count', 'taker_buy_base', 'taker_buy_quote', 'ignore'
+]
+
+
+def klines_to_arrays(klines: List[List]) -> Dict[str, np.ndarray]:
+    """Convertit des klines REST en colonnes numpy OHLCV"""
+    if not klines:
+        return {field: np.empty(0, dtype=np.float64) for field in CANDLE_FIELDS}
+    matrix = np.array([k[:6] for k in klines], dtype=np.float64).T
+    return {field: np.ascontiguousarray(matrix[i]) for i, field in enumerate(CANDLE_FIELDS)}
+
+
+class KlineBundle:
+    """Bougies d'une paire chargées à la demande, une seule fois par cycle
+
+    - bougies du timeframe de trading (analyse technique, ATR, cassure)
+    - bougies 1h (volatilité 12h)
+    Si le CandleStore suit la paire, ses vues temps réel sont utilisées sans aucune requête ;
+    sinon chaque série n'est téléchargée qu'au premier accès (et amorce le CandleStore).
+    """
+
+    def __init__(self, exchange, symbol: str, interval: str,
+                 minute_limit: int = 100, hourly_limit: int = 13, candle_store=None):
+        self.exchange = exchange
+        self.symbol = symbol
+        self.interval = interval
+        self.minute_limit = minute_limit
+        self.hourly_limit = hourly_limit
+        self.candle_store = candle_store
+        self.created_at = time.monotonic()
+
+        self._minute: Optional[Dict[str, np.ndarray]] = None
+        self._hourly: Optional[Dict[str, np.ndarray]] = None
+        self._minute_lock = asyncio.Lock()
+        self._hourly_lock = asyncio.Lock()
+
+    def _streamed(self, interval: str, count: int) -> Optional[Dict[str, np.ndarray]]:
+        """Vues du CandleStore si la paire y est suivie et à jour"""
+        if self.candle_store is not None and self.candle_store.is_ready(self.symbol, interval, count):
+            return self.candle_store.ohlcv(self.symbol, interval, count)
+        return None
+
+    @property
+    def has_minute_klines(self) -> bool:
+        return self._minute is not None or self._streamed(self.interval, self.minute_limit) is not None
+
+    @property
+    def has_hourly_klines(self) -> bool:
+        return self._hourly is not None or self._streamed("1h", self.hourly_limit) is not None
+
+    async def _fetch(self, interval: str, limit: int) -> Dict[str, np.ndarray]:
+        klines = await self.exchange.get_klines(symbol=self.symbol, interval=interval, limit=limit)
+        if self.candle_store is not None:
+            self.candle_store.seed(self.symbol, interval, klines)
+        return klines_to_arrays(klines)
+
+    async def minute_arrays(self, count: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Colonnes OHLCV du timeframe de trading (les `count` dernières bougies)"""
+        count = count or self.minute_limit
+        streamed = self._streamed(self.interval, count)
+        if streamed is not None:
+            return streamed
+
+        async with self._minute_lock:
+            if self._minute is None:
+                self._minute = await self._fetch(self.interval, self.minute_limit)
+        return {field: values[-count:] for field, values in self._minute.items()}
+
+    async def hourly_arrays(self) -> Dict[str, np.ndarray]:
+        """Colonnes OHLCV 1h couvrant les 12 dernières heures"""
+        streamed = self._streamed("1h", self.hourly_limit)
+        if streamed is not None:
+            return streamed
+
+        async with self._hourly_lock:
+            if self._hourly is None:
+                self._hourly = await self._fetch("1h", self.hourly_limit)
+        return self._hourly
+
+
+class KlineBundleCache:
+    """Bundles de bougies par paire, réinitialisés à chaque cycle de scan"""
+
+    def __init__(self, exchange, interval: str, max_age_seconds: float = 60.0,
+                 minute_limit: int = 100, hourly_limit: int = 13, candle_store=None):
+        self.logger = logging.getLogger(__name__)
+        self.exchange = exchange
+        self.interval = interval
+        self.max_age_seconds = max_age_seconds
+        self.minute_limit = minute_limit
+        self.hourly_limit = hourly_limit
+        self.candle_store = candle_store
+        self._bundles: Dict[str, KlineBundle] = {}
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'hits': 0,
+            'misses': 0
+        }
+
+    def get(self, symbol: str) -> KlineBundle:
+        """Bundle courant d'une paire (nouveau si absent ou trop ancien)"""
+        bundle = self._bundles.get(symbol)
+        if bundle is not None and time.monotonic() - bundle.created_at <= self.max_age_seconds:
+            self.stats['hits'] += 1
+            return bundle
+
+        self.stats['misses'] += 1
+        bundle = KlineBundle(
+            self.exchange, symbol, self.interval,
+            minute_limit=self.minute_limit,
+            hourly_limit=self.hourly_limit,
+            candle_store=self.candle_store
+        )
+        self._bundles[symbol] = bundle
+        return bundle
+
+    def invalidate(self, symbol: str):
+        """Supprime le bundle d'une paire"""
+        self._bundles.pop(symbol, None)
+
+    def clear(self):
+        """Nouveau cycle de scan: tous les bundles seront re-téléchargés"""
+        self._bundles.clear()
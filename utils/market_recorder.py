@@ -0,0 +1,255 @@
+"""
+Archive colonnaire des données de marché vues par le bot
+Bougies 1m clôturées, bookTickers et snapshots des tickers 24h, partitionnés par type / date / paire:
+
+    {root}/{kind}/date=YYYY-MM-DD/symbol=XXXUSDC/part-*.parquet
+
+Écriture par petits lots (buffer mémoire vidé dans un thread), lecture par memory-map pour
+l'analyse et le rejeu. Sans pyarrow, les partitions sont des fichiers .npy (structurés, non compressés).
+"""
+
+import asyncio
+import heapq
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    print("⚠️ pyarrow non installé (archive en .npy). Installez avec: pip install pyarrow")
+
+# Colonnes par type de donnée (la première est l'horodatage en ms UTC)
+KLINES = 'klines'
+BOOK_TICKER = 'book_ticker'
+TICKER_24H = 'ticker_24h'
+
+SCHEMAS = {
+    KLINES: ('open_time', 'open', 'high', 'low', 'close', 'volume'),
+    BOOK_TICKER: ('time', 'bid', 'bid_qty', 'ask', 'ask_qty'),
+    TICKER_24H: ('time', 'price', 'volume', 'bid', 'ask', 'price_change'),
+}
+
+
+def schema_dtype(kind: str) -> np.dtype:
+    """dtype structuré numpy d'un type de donnée (horodatage int64, valeurs float64)"""
+    columns = SCHEMAS[kind]
+    return np.dtype([(columns[0], np.int64)] + [(name, np.float64) for name in columns[1:]])
+
+
+def partition_date(timestamp_ms: int) -> str:
+    return datetime.fromtimestamp(timestamp_ms / 1000, tz=timezone.utc).strftime('%Y-%m-%d')
+
+
+class MarketRecorder:
+    """Enregistre les données de marché dans l'archive
+
+    Les callbacks (on_kline, on_book_ticker, record_tickers) ne font qu'ajouter des lignes en mémoire;
+    flush() écrit les partitions dans un thread. Au changement de jour, les fichiers de la veille sont
+    regroupés en un seul fichier par paire.
+    """
+
+    def __init__(self, root: str = "data/market", kline_interval: str = "1m", buffer_rows: int = 20000,
+                 compression: str = "zstd", use_parquet: Optional[bool] = None):
+        self.logger = logging.getLogger(__name__)
+        self.root = Path(root)
+        self.kline_interval = kline_interval
+        self.buffer_rows = buffer_rows
+        self.compression = compression
+        self.use_parquet = PYARROW_AVAILABLE if use_parquet is None else use_parquet and PYARROW_AVAILABLE
+
+        self._buffers: Dict[Tuple[str, str], List[tuple]] = {}
+        self._buffered = 0
+        self._sequence = 0
+        self._current_date: Optional[str] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'rows_buffered': 0,
+            'rows_written': 0,
+            'files_written': 0,
+            'days_compacted': 0,
+            'errors': 0
+        }
+
+    # =================== ENREGISTREMENT ===================
+
+    def _append(self, kind: str, symbol: str, row: tuple):
+        self._buffers.setdefault((kind, symbol), []).append(row)
+        self._buffered += 1
+        self.stats['rows_buffered'] += 1
+        if self._buffered >= self.buffer_rows and (self._flush_task is None or self._flush_task.done()):
+            try:
+                self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+            except RuntimeError:
+                pass  # Hors boucle asyncio: vidé au prochain flush() explicite
+
+    def on_kline(self, symbol: str, interval: str, row: Tuple[float, ...], closed: bool):
+        """Listener CandleStore: seules les bougies clôturées de l'intervalle archivé sont gardées"""
+        if closed and interval == self.kline_interval:
+            self._append(KLINES, symbol, (int(row[0]),) + tuple(row[1:6]))
+
+    def on_book_ticker(self, symbol: str, bid: float, bid_qty: float, ask: float, ask_qty: float):
+        """Listener PositionEngine: meilleur bid / ask reçu du stream bookTicker"""
+        self._append(BOOK_TICKER, symbol, (int(time.time() * 1000), bid, bid_qty, ask, ask_qty))
+
+    def record_tickers(self, frame, timestamp_ms: Optional[int] = None):
+        """Snapshot des tickers 24h (DataFrame de parse_ticker_snapshot)"""
+        timestamp_ms = int(time.time() * 1000) if timestamp_ms is None else timestamp_ms
+        columns = [frame[name].to_numpy(dtype=np.float64) for name in SCHEMAS[TICKER_24H][1:]]
+        for i, symbol in enumerate(frame['symbol'].tolist()):
+            self._append(TICKER_24H, symbol, (timestamp_ms,) + tuple(float(column[i]) for column in columns))
+
+    # =================== ÉCRITURE ===================
+
+    async def flush(self):
+        """Écrit les lignes en mémoire dans l'archive (thread séparé)"""
+        async with self._write_lock:
+            buffers, self._buffers, self._buffered = self._buffers, {}, 0
+            today = partition_date(int(time.time() * 1000))
+            finished_day = self._current_date if self._current_date not in (None, today) else None
+            self._current_date = today
+            if not buffers and not finished_day:
+                return
+            try:
+                await asyncio.to_thread(self._write, buffers, finished_day)
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.logger.error(f"❌ Erreur écriture archive marché: {e}")
+
+    def _write(self, buffers: Dict[Tuple[str, str], List[tuple]], finished_day: Optional[str]):
+        for (kind, symbol), rows in buffers.items():
+            data = np.array(rows, dtype=schema_dtype(kind))
+            dates = np.array([partition_date(t) for t in data[SCHEMAS[kind][0]]])
+            for date in np.unique(dates):
+                self._write_part(kind, symbol, str(date), data[dates == date])
+        if finished_day:
+            for kind in SCHEMAS:
+                self.compact_day(kind, finished_day)
+
+    def _partition_dir(self, kind: str, date: str, symbol: str) -> Path:
+        return self.root / kind / f"date={date}" / f"symbol={symbol}"
+
+    def _write_part(self, kind: str, symbol: str, date: str, data: np.ndarray, name: Optional[str] = None):
+        directory = self._partition_dir(kind, date, symbol)
+        directory.mkdir(parents=True, exist_ok=True)
+        if name is None:
+            self._sequence += 1
+            name = f"part-{int(time.time() * 1000)}-{self._sequence:06d}"
+        extension = '.parquet' if self.use_parquet else '.npy'
+        path = directory / f"{name}{extension}"
+        temporary = directory / f".{name}{extension}.tmp"
+
+        if self.use_parquet:
+            table = pa.table({column: data[column] for column in SCHEMAS[kind]})
+            pq.write_table(table, temporary, compression=self.compression)
+        else:
+            with open(temporary, 'wb') as f:
+                np.save(f, data)
+        os.replace(temporary, path)  # Un lecteur ne voit jamais de fichier partiel
+
+        self.stats['rows_written'] += len(data)
+        self.stats['files_written'] += 1
+
+    def compact_day(self, kind: str, date: str):
+        """Regroupe les fichiers d'une journée terminée en un fichier par paire"""
+        archive = MarketArchive(self.root)
+        day_dir = self.root / kind / f"date={date}"
+        if not day_dir.exists():
+            return
+        for symbol_dir in day_dir.iterdir():
+            files = archive.partitions(kind, symbol_dir.name.split('=', 1)[1], date, date)
+            parts = [p for p in files if p.name.startswith('part-')]
+            if not parts or len(files) == 1 and files[0].stem == 'day':
+                continue
+            data = np.sort(np.concatenate([archive.load_partition(p, kind) for p in files]), order=SCHEMAS[kind][0])
+            self._write_part(kind, symbol_dir.name.split('=', 1)[1], date, data, name='day')
+            for part in parts:
+                part.unlink()
+        self.stats['days_compacted'] += 1
+
+
+class MarketArchive:
+    """Lecture de l'archive pour l'analyse et le rejeu (partitions .parquet ou .npy memory-mappées)"""
+
+    def __init__(self, root: str = "data/market"):
+        self.root = Path(root)
+
+    def dates(self, kind: str) -> List[str]:
+        directory = self.root / kind
+        if not directory.exists():
+            return []
+        return sorted(p.name.split('=', 1)[1] for p in directory.iterdir() if p.name.startswith('date='))
+
+    def symbols(self, kind: str, date: Optional[str] = None) -> List[str]:
+        dates = [date] if date else self.dates(kind)
+        found = set()
+        for day in dates:
+            directory = self.root / kind / f"date={day}"
+            if directory.exists():
+                found.update(p.name.split('=', 1)[1] for p in directory.iterdir() if p.name.startswith('symbol='))
+        return sorted(found)
+
+    def partitions(self, kind: str, symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> List[Path]:
+        """Fichiers d'une paire entre deux dates incluses (YYYY-MM-DD)"""
+        files = []
+        for day in self.dates(kind):
+            if (start and day < start) or (end and day > end):
+                continue
+            directory = self.root / kind / f"date={day}" / f"symbol={symbol}"
+            if directory.exists():
+                files.extend(sorted(p for p in directory.iterdir()
+                                    if p.suffix in ('.parquet', '.npy') and not p.name.startswith('.')))
+        return files
+
+    @staticmethod
+    def load_partition(path: Path, kind: str) -> np.ndarray:
+        """Partition en tableau structuré (memory-map, sans copie pour les .npy)"""
+        if path.suffix == '.npy':
+            return np.load(path, mmap_mode='r')
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError(f"pyarrow requis pour lire {path}")
+        table = pq.read_table(path, memory_map=True)
+        data = np.empty(table.num_rows, dtype=schema_dtype(kind))
+        for column in SCHEMAS[kind]:
+            data[column] = table.column(column).to_numpy()
+        return data
+
+    def read(self, kind: str, symbol: str, start: Optional[str] = None, end: Optional[str] = None) -> np.ndarray:
+        """Lignes d'une paire triées par horodatage (vue memory-map si une seule partition)"""
+        parts = [self.load_partition(path, kind) for path in self.partitions(kind, symbol, start, end)]
+        if not parts:
+            return np.empty(0, dtype=schema_dtype(kind))
+        if len(parts) == 1:
+            return parts[0]
+        return np.sort(np.concatenate(parts), order=SCHEMAS[kind][0])
+
+    def read_frame(self, kind: str, symbol: str, start: Optional[str] = None, end: Optional[str] = None):
+        """Même lecture en DataFrame pandas (index = horodatage UTC)"""
+        data = self.read(kind, symbol, start, end)
+        frame = pd.DataFrame({column: data[column] for column in SCHEMAS[kind][1:]})
+        frame.index = pd.to_datetime(data[SCHEMAS[kind][0]], unit='ms', utc=True)
+        return frame
+
+    def replay(self, kind: str, symbols: Optional[List[str]] = None, start: Optional[str] = None,
+               end: Optional[str] = None) -> Iterator[Tuple[int, str, np.void]]:
+        """Rejeu multi-paires dans l'ordre chronologique: (horodatage_ms, symbole, ligne)"""
+        time_column = SCHEMAS[kind][0]
+
+        def rows(symbol: str, data: np.ndarray):
+            for row in data:
+                yield int(row[time_column]), symbol, row
+
+        streams = [rows(symbol, self.read(kind, symbol, start, end)) for symbol in symbols or self.symbols(kind)]
+        return heapq.merge(*streams, key=lambda item: (item[0], item[1]))
@@ -0,0 +1,246 @@
+"""
+Bus d'événements d'ordres alimenté par le user-data stream Binance
+Table des ordres en mémoire (executionReport) et diffusion immédiate des exécutions
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Set
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+    print("⚠️ websockets non installé. Installez avec: pip install websockets")
+
+# Statuts définitifs d'un ordre
+TERMINAL_STATUSES = ('FILLED', 'CANCELED', 'EXPIRED', 'REJECTED', 'EXPIRED_IN_MATCH')
+
+
+@dataclass
+class OrderState:
+    """Dernier état connu d'un ordre (executionReport)"""
+    order_id: int
+    symbol: str
+    side: str
+    order_type: str
+    status: str
+    price: float
+    stop_price: float
+    quantity: float
+    executed_qty: float
+    cumulative_quote_qty: float
+    last_price: float
+    order_list_id: int
+    update_time: int
+    received_at: float  # time.monotonic() à la réception
+
+    @property
+    def avg_price(self) -> float:
+        """Prix moyen d'exécution (prix limite si rien n'est exécuté)"""
+        if self.executed_qty > 0:
+            return self.cumulative_quote_qty / self.executed_qty
+        return self.price
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+
+class OrderEventBus:
+    """Consommateur du user-data stream
+
+    - executionReport: table des ordres par orderId; les ordres FILLED sont diffusés aux fill listeners
+    - outboundAccountPosition / balanceUpdate: transmis aux account listeners (AccountState)
+    - connect listeners: appelés à chaque (re)connexion, pour rattraper les événements manqués
+    """
+
+    def __init__(self, exchange, stream_url: str = "wss://stream.binance.com:9443",
+                 keepalive_interval_seconds: float = 1800.0, max_orders: int = 2000):
+        self.logger = logging.getLogger(__name__)
+        self.exchange = exchange
+        self.stream_url = stream_url.rstrip('/')
+        self.keepalive_interval_seconds = keepalive_interval_seconds
+        self.max_orders = max_orders
+
+        self._orders: "OrderedDict[int, OrderState]" = OrderedDict()
+        self._fill_listeners: List[Callable] = []
+        self._account_listeners: List[Callable] = []
+        self._connect_listeners: List[Callable] = []
+        self._pending: Set[asyncio.Task] = set()
+        self._listen_key: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self.connected = False
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'events': 0,
+            'fills': 0,
+            'reconnections': 0,
+            'keepalives': 0
+        }
+
+    # =================== CYCLE DE VIE ===================
+
+    async def start(self):
+        """Démarre la tâche de réception du user-data stream"""
+        if not WEBSOCKETS_AVAILABLE:
+            self.logger.warning("⚠️ OrderEventBus désactivé: websockets non installé")
+            return
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+            self.logger.info("📡 OrderEventBus démarré (user-data stream)")
+
+    async def stop(self):
+        """Arrête la réception et ferme la listenKey"""
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._listen_key is not None:
+            try:
+                await self.exchange.close_listen_key(self._listen_key)
+            except Exception as e:
+                self.logger.debug(f"⚠️ Fermeture listenKey impossible: {e}")
+            self._listen_key = None
+        self.logger.info("📡 OrderEventBus arrêté")
+
+    async def _run(self):
+        """Boucle de connexion avec reconnexion automatique (nouvelle listenKey à chaque fois)"""
+        backoff = 1.0
+        while self._running:
+            keepalive = None
+            try:
+                self._listen_key = await self.exchange.get_listen_key()
+                async with websockets.connect(f"{self.stream_url}/ws/{self._listen_key}", ping_interval=20) as ws:
+                    self.connected = True
+                    backoff = 1.0
+                    keepalive = asyncio.create_task(self._keepalive())
+                    self._dispatch(self._connect_listeners)
+
+                    async for raw in ws:
+                        self.handle_message(raw)
+                        if not self.connected:
+                            break  # listenKey expirée: reconnexion avec une nouvelle clé
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"⚠️ User-data stream interrompu: {e} - reconnexion dans {backoff:.0f}s")
+            finally:
+                self.connected = False
+                if keepalive is not None:
+                    keepalive.cancel()
+
+            if self._running:
+                self.stats['reconnections'] += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    async def _keepalive(self):
+        """Prolonge la listenKey (expirée par Binance après 60 min sans keepalive)"""
+        while True:
+            await asyncio.sleep(self.keepalive_interval_seconds)
+            try:
+                await self.exchange.keepalive_listen_key(self._listen_key)
+                self.stats['keepalives'] += 1
+            except Exception as e:
+                self.logger.warning(f"⚠️ Keepalive listenKey échoué: {e}")
+
+    # =================== LISTENERS ===================
+
+    def add_fill_listener(self, callback: Callable):
+        """Enregistre un callback(order_state) appelé quand un ordre est entièrement exécuté"""
+        self._fill_listeners.append(callback)
+
+    def add_account_listener(self, callback: Callable):
+        """Enregistre un callback(event) pour outboundAccountPosition / balanceUpdate"""
+        self._account_listeners.append(callback)
+
+    def add_connect_listener(self, callback: Callable):
+        """Enregistre un callback() appelé à chaque (re)connexion du stream"""
+        self._connect_listeners.append(callback)
+
+    async def _guard(self, coroutine):
+        try:
+            await coroutine
+        except Exception as e:
+            self.logger.error(f"❌ Erreur listener user-data stream: {e}")
+
+    def _dispatch(self, listeners: List[Callable], *args):
+        """Appelle les listeners sans bloquer la lecture du stream (callbacks async lancés en tâche)"""
+        for callback in listeners:
+            try:
+                result = callback(*args)
+                if asyncio.iscoroutine(result):
+                    task = asyncio.get_running_loop().create_task(self._guard(result))
+                    self._pending.add(task)
+                    task.add_done_callback(self._pending.discard)
+            except Exception as e:
+                self.logger.error(f"❌ Erreur listener user-data stream: {e}")
+
+    # =================== ÉVÉNEMENTS ===================
+
+    def handle_message(self, raw):
+        """Traite un message brut du stream"""
+        try:
+            event = json.loads(raw)
+            self.stats['events'] += 1
+            event_type = event.get('e')
+
+            if event_type == 'executionReport':
+                order = self._apply_execution_report(event)
+                if order.status == 'FILLED':
+                    self.stats['fills'] += 1
+                    self._dispatch(self._fill_listeners, order)
+
+            elif event_type in ('outboundAccountPosition', 'balanceUpdate'):
+                self._dispatch(self._account_listeners, event)
+
+            elif event_type == 'listenKeyExpired':
+                self.logger.warning("⚠️ listenKey expirée, reconnexion")
+                self.connected = False
+
+        except Exception as e:
+            self.logger.error(f"❌ Erreur message user-data stream: {e}")
+
+    def _apply_execution_report(self, event: Dict[str, Any]) -> OrderState:
+        order = OrderState(
+            order_id=int(event['i']),
+            symbol=event['s'],
+            side=event['S'],
+            order_type=event['o'],
+            status=event['X'],
+            price=float(event['p']),
+            stop_price=float(event.get('P', 0) or 0),
+            quantity=float(event['q']),
+            executed_qty=float(event['z']),
+            cumulative_quote_qty=float(event['Z']),
+            last_price=float(event.get('L', 0) or 0),
+            order_list_id=int(event.get('g', -1)),
+            update_time=int(event.get('T', event.get('E', 0))),
+            received_at=time.monotonic()
+        )
+        self._orders[order.order_id] = order
+        self._orders.move_to_end(order.order_id)
+        while len(self._orders) > self.max_orders:
+            self._orders.popitem(last=False)
+        return order
+
+    def get_order(self, order_id) -> Optional[OrderState]:
+        """Dernier état connu d'un ordre (None si aucun événement reçu depuis le démarrage)"""
+        try:
+            return self._orders.get(int(order_id))
+        except (TypeError, ValueError):
+            return None
@@ -0,0 +1,129 @@
+"""
+Gabarits d'ordres pré-calculés
+Pour chaque paire candidate du scan: quantité arrondie pour la taille de position courante,
+niveaux SL / TP / trailing arrondis au tick et paramètres de l'ordre d'entrée prêts à l'envoi.
+Au signal, il ne reste que la signature (timestamp + HMAC) et la requête.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from .position_engine import LatencyRecorder
+
+
+@dataclass
+class OrderTemplate:
+    """Ordre d'entrée au marché et niveaux de sortie préparés pour un prix de référence"""
+    symbol: str
+    reference_price: float
+    position_size: float
+    quantity: float
+    stop_loss: float
+    take_profit: float
+    trailing_stop: float
+    entry_params: Dict[str, str] = field(default_factory=dict)
+    prepared_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def notional(self) -> float:
+        return self.quantity * self.reference_price
+
+
+class OrderTemplateBook:
+    """Gabarits d'ordres par paire et latences signal -> acquittement
+
+    Un gabarit reste utilisable tant que le prix et la taille de position n'ont pas dérivé de plus
+    de ``tolerance_percent`` et qu'il a moins de ``ttl_seconds``; sinon le chemin complet
+    (validation + arrondis) est utilisé.
+    """
+
+    def __init__(self, symbol_filters, stop_loss_percent: float, take_profit_percent: float,
+                 trailing_activation_percent: float, min_notional: float = 0.0,
+                 tolerance_percent: float = 0.1, ttl_seconds: float = 60.0):
+        self.logger = logging.getLogger(__name__)
+        self.symbol_filters = symbol_filters
+        self.stop_loss_percent = stop_loss_percent
+        self.take_profit_percent = take_profit_percent
+        self.trailing_activation_percent = trailing_activation_percent
+        self.min_notional = min_notional
+        self.tolerance_percent = tolerance_percent
+        self.ttl_seconds = ttl_seconds
+        self._templates: Dict[str, OrderTemplate] = {}
+
+        self.entry_latency = LatencyRecorder()       # Signal -> acquittement de l'ordre d'entrée
+        self.protection_latency = LatencyRecorder()  # Signal -> acquittement des ordres SL/TP
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'prepared': 0,
+            'rejected': 0,
+            'hits': 0,
+            'misses': 0,
+            'stale': 0
+        }
+
+    def prepare(self, symbol: str, price: float, position_size: float) -> Optional[OrderTemplate]:
+        """Pré-calcule le gabarit d'une paire (None si la quantité ne respecte pas les filtres)"""
+        filters = self.symbol_filters.get(symbol)
+        if filters is None or price <= 0 or position_size <= 0:
+            self.stats['rejected'] += 1
+            return None
+
+        quantity = filters.round_quantity(position_size / price)
+        notional = quantity * price
+        if (quantity < filters.min_qty or quantity > filters.max_qty
+                or notional < max(filters.min_notional, self.min_notional)):
+            self._templates.pop(symbol, None)
+            self.stats['rejected'] += 1
+            return None
+
+        template = OrderTemplate(
+            symbol=symbol,
+            reference_price=price,
+            position_size=position_size,
+            quantity=quantity,
+            stop_loss=filters.round_price(price * (1 - self.stop_loss_percent / 100)),
+            take_profit=filters.round_price(price * (1 + self.take_profit_percent / 100)),
+            trailing_stop=filters.round_price(price * (1 + self.trailing_activation_percent / 100)),
+            entry_params={
+                'symbol': symbol,
+                'quantity': f"{quantity:.{filters.quantity_precision}f}",
+                'newOrderRespType': 'FULL'
+            }
+        )
+        self._templates[symbol] = template
+        self.stats['prepared'] += 1
+        return template
+
+    def get(self, symbol: str, price: float, position_size: float) -> Optional[OrderTemplate]:
+        """Gabarit encore valable pour ce prix et cette taille de position"""
+        template = self._templates.get(symbol)
+        if template is None:
+            self.stats['misses'] += 1
+            return None
+
+        tolerance = self.tolerance_percent / 100
+        if (time.monotonic() - template.prepared_at > self.ttl_seconds
+                or abs(price - template.reference_price) > template.reference_price * tolerance
+                or abs(position_size - template.position_size) > template.position_size * tolerance):
+            self.stats['stale'] += 1
+            return None
+
+        self.stats['hits'] += 1
+        return template
+
+    def discard(self, symbol: str):
+        """Oublie le gabarit d'une paire (utilisé ou invalidé)"""
+        self._templates.pop(symbol, None)
+
+    def record_entry(self, signal_at: float):
+        self.entry_latency.record(time.perf_counter() - signal_at)
+
+    def record_protection(self, signal_at: float):
+        self.protection_latency.record(time.perf_counter() - signal_at)
+
+    def latency_report(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles des latences signal -> ordre d'entrée et signal -> ordres de protection"""
+        return {'entry': self.entry_latency.percentiles(), 'protection': self.protection_latency.percentiles()}
@@ -0,0 +1,180 @@
+"""
+Balayage parallèle des paramètres de TradingConfig
+Grille ou tirage aléatoire de valeurs, un backtest par combinaison réparti sur tous les cœurs.
+
+Les bougies sont écrites une fois en .npy et chaque processus les ouvre en memory-map (lecture seule,
+pages partagées par le système); les signaux des fenêtres de 100 bougies sont calculés une fois par
+processus et par MIN_SIGNAL_CONDITIONS, puis réutilisés par toutes les combinaisons.
+"""
+
+import itertools
+import logging
+import os
+import random
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from config import TradingConfig
+from utils.backtester import Backtester, MarketData
+
+# Colonnes de résultat du tableau classé (BacktestResult.summary)
+RESULT_COLUMNS = ('trades', 'pnl', 'pnl_percent', 'win_rate', 'max_drawdown_percent', 'fee_drag_percent')
+
+
+def config_fields() -> Dict[str, type]:
+    """Champs de TradingConfig et leur type"""
+    return {f.name: f.type for f in fields(TradingConfig)}
+
+
+def validate_space(space: Dict[str, Any]):
+    unknown = sorted(set(space) - set(config_fields()))
+    if unknown:
+        raise ValueError(f"Paramètres inconnus dans TradingConfig: {', '.join(unknown)}")
+
+
+def grid(space: Dict[str, Sequence]) -> List[Dict[str, Any]]:
+    """Toutes les combinaisons des valeurs proposées pour chaque paramètre"""
+    validate_space(space)
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_search(space: Dict[str, Any], samples: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Combinaisons tirées au hasard
+
+    Pour chaque paramètre: liste = valeurs possibles, tuple (min, max) = intervalle
+    (entier si le champ de TradingConfig est un int, réel sinon).
+    """
+    validate_space(space)
+    types = config_fields()
+    rng = random.Random(seed)
+    combinations = []
+    for _ in range(samples):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                params[name] = rng.randint(low, high) if types[name] is int else rng.uniform(low, high)
+            else:
+                params[name] = rng.choice(list(values))
+        combinations.append(params)
+    return combinations
+
+
+def run_backtest(data: MarketData, params: Dict[str, Any], base_config: Optional[TradingConfig] = None,
+                 signal_cache: Optional[Dict] = None, start_minute: int = 0) -> Dict[str, Any]:
+    """Backtest d'une combinaison: paramètres + résumé (PnL, taux de réussite, drawdown, frais)"""
+    config = replace(base_config or TradingConfig(), **params)
+    backtester = Backtester(config, data, signal_cache=signal_cache, start_minute=start_minute)
+    summary = backtester.run().summary()
+    row = dict(params)
+    row.update({column: summary[column] for column in RESULT_COLUMNS})
+    row['elapsed_seconds'] = backtester.stats['elapsed_seconds']
+    return row
+
+
+# Fenêtre de backtest: (début, fin, début des entrées) en minutes de la grille (None = grille entière)
+Window = Optional[Tuple[int, int, int]]
+
+# État de chaque processus du pool (initialisé une fois par _init_worker)
+_worker_data: Optional[MarketData] = None
+_worker_signals: Dict[Window, Dict] = {}
+
+
+def _init_worker(data_dir: str):
+    global _worker_data
+    _worker_data = MarketData.load(data_dir)
+
+
+def _run_in_worker(task: Tuple[Dict[str, Any], Optional[TradingConfig], Window]) -> Dict[str, Any]:
+    params, base_config, window = task
+    try:
+        # Signaux en cache par fenêtre (les indices de minutes sont relatifs à la fenêtre)
+        signal_cache = _worker_signals.setdefault(window, {})
+        if window is None:
+            return run_backtest(_worker_data, params, base_config, signal_cache)
+        start, end, start_minute = window
+        return run_backtest(_worker_data.slice(start, end), params, base_config, signal_cache, start_minute - start)
+    except Exception as e:
+        logging.getLogger(__name__).error(f"❌ Erreur backtest {params}: {e}")
+        return dict(params, error=str(e))
+
+
+class ParameterSweep:
+    """Exécute les backtests d'un ensemble de combinaisons dans un pool de processus"""
+
+    def __init__(self, data: MarketData, base_config: Optional[TradingConfig] = None,
+                 workers: Optional[int] = None, data_dir: Optional[str] = None):
+        self.logger = logging.getLogger(__name__)
+        self.base_config = base_config or TradingConfig()
+        configured = self.base_config.BACKTEST_SWEEP_WORKERS if workers is None else workers
+        self.workers = configured or os.cpu_count() or 1
+
+        # Données partagées: écrites une fois, ouvertes en memory-map par chaque processus
+        self._temporary_dir = None if data_dir else tempfile.mkdtemp(prefix='backtest_data_')
+        self.data_dir = data.save(data_dir or self._temporary_dir)
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'combinations': 0,
+            'errors': 0,
+            'elapsed_seconds': 0.0,
+            'backtests_per_minute': 0.0
+        }
+
+    def run(self, combinations: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Backtests en parallèle, tableau classé par PnL décroissant (rang 1 = meilleur)"""
+        rows = self.run_windows([(params, None) for params in combinations])
+        return ranked_table([row for row in rows if 'error' not in row])
+
+    def run_windows(self, tasks: List[Tuple[Dict[str, Any], Window]]) -> List[Dict[str, Any]]:
+        """Backtests (combinaison, fenêtre) en parallèle; lignes dans l'ordre des tâches ('error' si échec)"""
+        started_at = time.perf_counter()
+        # Tâches regroupées par fenêtre et MIN_SIGNAL_CONDITIONS: signaux en cache réutilisés par chaque processus
+        order = sorted(range(len(tasks)), key=lambda i: (tasks[i][1] or (0, 0, 0), tasks[i][0].get(
+            'MIN_SIGNAL_CONDITIONS', self.base_config.MIN_SIGNAL_CONDITIONS)))
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                 initargs=(str(self.data_dir),)) as pool:
+            results = list(pool.map(_run_in_worker, [(tasks[i][0], self.base_config, tasks[i][1]) for i in order]))
+        rows: List[Dict[str, Any]] = [{} for _ in tasks]
+        for i, row in zip(order, results):
+            rows[i] = row
+
+        failed = [row for row in rows if 'error' in row]
+        elapsed = time.perf_counter() - started_at
+        self.stats['combinations'] += len(rows)
+        self.stats['errors'] += len(failed)
+        self.stats['elapsed_seconds'] += elapsed
+        self.stats['backtests_per_minute'] = len(rows) / elapsed * 60 if elapsed > 0 else 0.0
+        if failed:
+            self.logger.warning(f"⚠️ {len(failed)} combinaisons en erreur sur {len(rows)}")
+        self.logger.info(f"✅ {len(rows)} backtests en {elapsed:.1f}s sur {self.workers} processus")
+        return rows
+
+    def close(self):
+        """Supprime la copie temporaire des données"""
+        if self._temporary_dir:
+            shutil.rmtree(self._temporary_dir, ignore_errors=True)
+            self._temporary_dir = None
+
+    def __enter__(self) -> 'ParameterSweep':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def ranked_table(rows: List[Dict[str, Any]], objective: str = 'pnl') -> pd.DataFrame:
+    """Résultats triés par objectif décroissant (PnL par défaut) puis drawdown croissant, index = rang"""
+    table = pd.DataFrame(rows)
+    if table.empty:
+        return table
+    table = table.sort_values([objective, 'max_drawdown_percent'], ascending=[False, True]).reset_index(drop=True)
+    table.index = pd.RangeIndex(1, len(table) + 1, name='rank')
+    return table
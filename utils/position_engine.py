@@ -0,0 +1,255 @@
+"""
+Moteur de positions événementiel
+Streams bookTicker des paires en position: règles SL / trailing / TP évaluées à chaque mise à jour
+du meilleur bid, uniquement pour les positions de la paire concernée
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+try:
+    import websockets
+    WEBSOCKETS_AVAILABLE = True
+except ImportError:
+    WEBSOCKETS_AVAILABLE = False
+    print("⚠️ websockets non installé. Installez avec: pip install websockets")
+
+# Décisions du moteur (même priorité que manage_open_positions)
+DECISION_STOP_LOSS = 'STOP_LOSS'
+DECISION_TRAILING = 'TRAILING'
+DECISION_TAKE_PROFIT = 'TAKE_PROFIT'
+
+
+def evaluate_exit(trade, price: float, trailing_step_percent: float) -> Optional[str]:
+    """Règle de sortie déclenchée par un prix (None si aucune)
+
+    Stop loss d'abord, puis trailing stop (prioritaire sur le take profit pour laisser monter).
+    """
+    if price <= trade.stop_loss:
+        return DECISION_STOP_LOSS
+    if price >= trade.trailing_stop and price * (1 - trailing_step_percent / 100) > trade.stop_loss:
+        return DECISION_TRAILING
+    if price >= trade.take_profit:
+        return DECISION_TAKE_PROFIT
+    return None
+
+
+class LatencyRecorder:
+    """Dernières latences mesurées (µs) et leurs percentiles"""
+
+    def __init__(self, size: int = 5000):
+        self._samples = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds * 1e6)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentiles(self) -> Dict[str, float]:
+        if not self._samples:
+            return {}
+        values = np.fromiter(self._samples, dtype=np.float64, count=len(self._samples))
+        p50, p90, p99 = np.percentile(values, (50, 90, 99))
+        return {'count': len(values), 'p50_us': p50, 'p90_us': p90, 'p99_us': p99, 'max_us': values.max()}
+
+
+class PositionEngine:
+    """Évalue les règles de sortie à chaque tick de prix des paires en position
+
+    - positions: dictionnaire {trade_id: Trade} du bot (lu, jamais modifié)
+    - decision handler: coroutine(trade_id, trade, decision, price) lancée en tâche; une seule
+      action en cours par trade (les ticks suivants sont ignorés jusqu'à la fin de l'action)
+    - latences: réception du tick -> décision, et réception -> fin de l'action
+    """
+
+    def __init__(self, positions: Dict, stream_url: str = "wss://stream.binance.com:9443",
+                 trailing_step_percent: float = 0.2, stale_after_seconds: float = 30.0):
+        self.logger = logging.getLogger(__name__)
+        self.positions = positions
+        self.stream_url = stream_url.rstrip('/')
+        self.trailing_step_percent = trailing_step_percent
+        self.stale_after_seconds = stale_after_seconds
+
+        self._handler: Optional[Callable] = None
+        self._tick_listeners: List[Callable] = []
+        self._index: Dict[str, List[str]] = {}
+        self._indexed_ids: Set[str] = set()
+        self._busy: Set[str] = set()
+        self._pending: Set[asyncio.Task] = set()
+        self._last_tick: Dict[str, float] = {}
+        self._subscribed: Set[str] = set()
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+        self._request_id = 0
+
+        self.decision_latency = LatencyRecorder()
+        self.action_latency = LatencyRecorder()
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'ticks': 0,
+            'evaluations': 0,
+            'decisions': 0,
+            'suppressed': 0,
+            'reconnections': 0
+        }
+
+    def set_decision_handler(self, handler: Callable):
+        """Coroutine(trade_id, trade, decision, price) appelée pour chaque décision"""
+        self._handler = handler
+
+    def add_tick_listener(self, callback: Callable):
+        """Enregistre un callback(symbol, bid, bid_qty, ask, ask_qty) appelé à chaque bookTicker"""
+        self._tick_listeners.append(callback)
+
+    # =================== CYCLE DE VIE ===================
+
+    async def start(self):
+        """Démarre la tâche de réception des bookTicker"""
+        if not WEBSOCKETS_AVAILABLE:
+            self.logger.warning("⚠️ PositionEngine désactivé: websockets non installé")
+            return
+        if self._task is None:
+            self._running = True
+            self._task = asyncio.create_task(self._run())
+            self.logger.info("⚡ PositionEngine démarré (bookTicker)")
+
+    async def stop(self):
+        """Arrête la réception"""
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.logger.info("⚡ PositionEngine arrêté")
+
+    async def _run(self):
+        """Boucle de connexion avec reconnexion automatique"""
+        backoff = 1.0
+        while self._running:
+            try:
+                async with websockets.connect(f"{self.stream_url}/stream", ping_interval=20) as ws:
+                    self._ws = ws
+                    self._subscribed = set()
+                    await self.sync_subscriptions()
+                    backoff = 1.0
+
+                    async for raw in ws:
+                        self.handle_message(raw, time.perf_counter())
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"⚠️ Stream bookTicker interrompu: {e} - reconnexion dans {backoff:.0f}s")
+            finally:
+                self._ws = None
+                self._last_tick.clear()
+
+            if self._running:
+                self.stats['reconnections'] += 1
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+    # =================== POSITIONS ET ABONNEMENTS ===================
+
+    def _refresh_index(self):
+        """Index paire -> trades, reconstruit quand les positions ouvertes changent"""
+        if self._indexed_ids == self.positions.keys():
+            return
+        index: Dict[str, List[str]] = {}
+        for trade_id, trade in self.positions.items():
+            index.setdefault(trade.pair, []).append(trade_id)
+        self._index = index
+        self._indexed_ids = set(self.positions)
+
+    async def sync_subscriptions(self):
+        """Abonne le stream aux paires en position (à appeler après ouverture/fermeture)"""
+        self._refresh_index()
+        if self._ws is None:
+            return
+
+        wanted = {f"{symbol.lower()}@bookTicker" for symbol in self._index}
+        to_add = sorted(wanted - self._subscribed)
+        to_remove = sorted(self._subscribed - wanted)
+        try:
+            for method, streams in (('UNSUBSCRIBE', to_remove), ('SUBSCRIBE', to_add)):
+                if streams:
+                    self._request_id += 1
+                    await self._ws.send(json.dumps({'method': method, 'params': streams, 'id': self._request_id}))
+            self._subscribed = wanted
+        except Exception as e:
+            self.logger.error(f"❌ Erreur abonnements bookTicker: {e}")
+
+    def is_live(self, symbol: str) -> bool:
+        """True si la paire reçoit des ticks récents (les règles de prix sont alors gérées ici)"""
+        last_tick = self._last_tick.get(symbol)
+        return last_tick is not None and time.perf_counter() - last_tick <= self.stale_after_seconds
+
+    def is_busy(self, trade_id: str) -> bool:
+        """True si une action du moteur est en cours sur ce trade"""
+        return trade_id in self._busy
+
+    # =================== TICKS ===================
+
+    def handle_message(self, raw, received_at: float):
+        """Traite un message brut du stream combiné"""
+        try:
+            message = json.loads(raw)
+            data = message.get('data')
+            if not data or 'b' not in data or 's' not in data:
+                return  # Réponse d'abonnement ou message inconnu
+            self.on_price(data['s'], float(data['b']), received_at)
+            for callback in self._tick_listeners:
+                callback(data['s'], float(data['b']), float(data['B']), float(data['a']), float(data['A']))
+        except Exception as e:
+            self.logger.error(f"❌ Erreur message bookTicker: {e}")
+
+    def on_price(self, symbol: str, price: float, received_at: float):
+        """Évalue les positions de la paire au prix de sortie (meilleur bid)"""
+        self.stats['ticks'] += 1
+        self._last_tick[symbol] = received_at
+        self._refresh_index()
+
+        for trade_id in self._index.get(symbol, ()):
+            trade = self.positions.get(trade_id)
+            if trade is None:
+                continue
+            if trade_id in self._busy:
+                self.stats['suppressed'] += 1
+                continue
+
+            self.stats['evaluations'] += 1
+            decision = evaluate_exit(trade, price, self.trailing_step_percent)
+            self.decision_latency.record(time.perf_counter() - received_at)
+            if decision is None or self._handler is None:
+                continue
+
+            self.stats['decisions'] += 1
+            self._busy.add(trade_id)
+            task = asyncio.get_running_loop().create_task(self._act(trade_id, trade, decision, price, received_at))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _act(self, trade_id: str, trade, decision: str, price: float, received_at: float):
+        try:
+            await self._handler(trade_id, trade, decision, price)
+        except Exception as e:
+            self.logger.error(f"❌ Erreur action {decision} {trade_id}: {e}")
+        finally:
+            self.action_latency.record(time.perf_counter() - received_at)
+            self._busy.discard(trade_id)
+
+    def latency_report(self) -> Dict[str, Dict[str, float]]:
+        """Percentiles des latences tick -> décision et tick -> fin d'action"""
+        return {'decision': self.decision_latency.percentiles(), 'action': self.action_latency.percentiles()}
@@ -0,0 +1,94 @@
+"""
+Snapshot des prix de toutes les paires
+Une seule requête /ticker/price pour tout le marché, lectures servies depuis la mémoire
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+
+class PriceSnapshot:
+    """Prix courants de toutes les paires, rafraîchis en bloc quand ils dépassent leur TTL
+
+    - get_price(symbol): prix du snapshot (rafraîchi en une requête si périmé)
+    - get_price(symbol, force_refresh=True): prix relu à l'unité, pour les chemins critiques (ordres)
+    - update(prices): alimentation par d'autres sources (tickers 24h du scan, etc.)
+    """
+
+    def __init__(self, exchange, ttl_seconds: float = 2.0):
+        self.logger = logging.getLogger(__name__)
+        self.exchange = exchange
+        self.ttl_seconds = ttl_seconds
+        self._prices: Dict[str, float] = {}
+        self._updated_at: Dict[str, float] = {}
+        self._refreshed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self.version = 0  # Incrémenté à chaque modification des prix
+        self.symbols_version = 0  # Incrémenté quand de nouvelles paires apparaissent
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'bulk_refreshes': 0,
+            'forced_refreshes': 0
+        }
+
+    def is_fresh(self) -> bool:
+        """True si le snapshot complet a moins de ttl_seconds"""
+        return self._refreshed_at is not None and time.monotonic() - self._refreshed_at <= self.ttl_seconds
+
+    def _is_fresh(self, symbol: str) -> bool:
+        updated_at = self._updated_at.get(symbol)
+        return updated_at is not None and time.monotonic() - updated_at <= self.ttl_seconds
+
+    async def refresh(self) -> Dict[str, float]:
+        """Recharge tous les prix en une requête (un seul rafraîchissement simultané)"""
+        async with self._lock:
+            if self.is_fresh():
+                return self._prices  # Rafraîchi par une autre tâche pendant l'attente
+
+            tickers = await self.exchange.get_symbol_ticker()
+            self.update({ticker['symbol']: ticker['price'] for ticker in tickers})
+            self._refreshed_at = time.monotonic()
+            self.stats['bulk_refreshes'] += 1
+            return self._prices
+
+    def update(self, prices: Dict[str, float]):
+        """Intègre des prix obtenus par ailleurs (ex: tickers 24h du scan)"""
+        now = time.monotonic()
+        known = len(self._prices)
+        for symbol, price in prices.items():
+            self._prices[symbol] = float(price)
+            self._updated_at[symbol] = now
+        if len(self._prices) != known:
+            self.symbols_version += 1
+        self.version += 1
+
+    async def get_price(self, symbol: str, force_refresh: bool = False) -> float:
+        """Prix courant d'une paire (KeyError si la paire n'existe pas)"""
+        if force_refresh:
+            ticker = await self.exchange.get_symbol_ticker(symbol=symbol)
+            self.update({symbol: ticker['price']})
+            self.stats['forced_refreshes'] += 1
+            return self._prices[symbol]
+
+        if self._is_fresh(symbol):
+            self.stats['hits'] += 1
+            return self._prices[symbol]
+
+        self.stats['misses'] += 1
+        prices = await self.refresh()
+        if symbol not in prices:
+            raise KeyError(f"Prix indisponible pour {symbol}")
+        return prices[symbol]
+
+    async def get_prices(self) -> Dict[str, float]:
+        """Tous les prix du snapshot (rafraîchi si périmé)"""
+        if self.is_fresh():
+            self.stats['hits'] += 1
+            return self._prices
+        self.stats['misses'] += 1
+        return await self.refresh()
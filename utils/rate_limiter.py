@@ -0,0 +1,203 @@
+"""
+Limiteur de poids API Binance
+Seau à jetons en poids de requête (et non en nombre d'appels), resynchronisé sur les en-têtes
+X-MBX-USED-WEIGHT-1M; les ordres passent avant le compte, le compte avant le scan
+"""
+
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+# Classes de priorité (plus petit = plus urgent)
+PRIORITY_ORDERS = 0   # Création / annulation / statut d'ordres
+PRIORITY_ACCOUNT = 1  # Soldes, listenKey, prix unitaire avant ordre
+PRIORITY_SCAN = 2     # Bougies, tickers de tout le marché, exchangeInfo
+
+# Poids Binance des endpoints utilisés par le bot
+ENDPOINT_WEIGHTS = {
+    'get_account': 20,
+    'get_my_trades': 20,
+    'get_exchange_info': 20,
+    'get_symbol_info': 20,  # Lit exchangeInfo complet
+    'get_order': 4,
+    'create_order': 1,
+    'create_oco_order': 1,
+    'order_market_buy': 1,
+    'order_market_sell': 1,
+    'cancel_order': 1,
+    'cancel_order_list': 1,
+    'cancel_replace_order': 1,
+    'stream_get_listen_key': 2,
+    'stream_keepalive': 2,
+    'stream_close': 2,
+    'transfer_dust': 10,
+}
+
+ENDPOINT_PRIORITIES = {
+    'create_order': PRIORITY_ORDERS,
+    'create_oco_order': PRIORITY_ORDERS,
+    'order_market_buy': PRIORITY_ORDERS,
+    'order_market_sell': PRIORITY_ORDERS,
+    'cancel_order': PRIORITY_ORDERS,
+    'cancel_order_list': PRIORITY_ORDERS,
+    'cancel_replace_order': PRIORITY_ORDERS,
+    'get_order': PRIORITY_ORDERS,
+    'get_account': PRIORITY_ACCOUNT,
+    'get_my_trades': PRIORITY_ACCOUNT,
+    'get_symbol_info': PRIORITY_ACCOUNT,
+    'stream_get_listen_key': PRIORITY_ACCOUNT,
+    'stream_keepalive': PRIORITY_ACCOUNT,
+    'stream_close': PRIORITY_ACCOUNT,
+    'transfer_dust': PRIORITY_ACCOUNT,
+}
+
+
+def klines_weight(limit: int) -> int:
+    """Poids d'une requête klines selon le nombre de bougies demandées"""
+    if limit <= 100:
+        return 1
+    if limit <= 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+def request_weight(method: str, params: Dict) -> int:
+    """Poids Binance d'un appel AsyncClient"""
+    if method == 'get_klines':
+        return klines_weight(params.get('limit', 500))
+    if method == 'get_historical_klines':
+        # Premier timestamp valide (limit=1) puis pages de 1000 bougies (une seule pour 12h en 1h)
+        return klines_weight(1) + klines_weight(1000)
+    if method == 'get_ticker':
+        return 2 if params.get('symbol') else 80
+    if method == 'get_symbol_ticker':
+        return 2 if params.get('symbol') else 4
+    return ENDPOINT_WEIGHTS.get(method, 1)
+
+
+def request_priority(method: str, params: Dict) -> int:
+    """Classe de priorité d'un appel (le prix d'une seule paire sert aux ordres)"""
+    if method in ('get_symbol_ticker', 'get_ticker') and params.get('symbol'):
+        return PRIORITY_ACCOUNT
+    return ENDPOINT_PRIORITIES.get(method, PRIORITY_SCAN)
+
+
+class WeightRateLimiter:
+    """Seau à jetons en poids de requête Binance
+
+    - capacité: limite de poids par minute, rechargée en continu (limit / 60 par seconde)
+    - réserves: le scan ne peut pas descendre sous ``reserve_ratio`` de la capacité, le compte
+      sous la moitié de cette réserve; les ordres peuvent tout consommer
+    - attentes servies par priorité: un ordre n'attend jamais derrière une requête de scan
+    - en-têtes: le poids utilisé annoncé par Binance borne les jetons disponibles
+    - 429 / 418: toutes les requêtes sont suspendues jusqu'à l'expiration du Retry-After, puis le
+      seau repart plein (nouvelle fenêtre côté Binance)
+    """
+
+    def __init__(self, weight_per_minute: int = 6000, reserve_ratio: float = 0.2):
+        self.logger = logging.getLogger(__name__)
+        self.capacity = float(weight_per_minute)
+        self.refill_per_second = weight_per_minute / 60.0
+        reserve = self.capacity * reserve_ratio
+        self._floors = {PRIORITY_ORDERS: 0.0, PRIORITY_ACCOUNT: reserve / 2, PRIORITY_SCAN: reserve}
+
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._waiting = {priority: 0 for priority in self._floors}
+        self._blocked_until = 0.0
+        self.server_used_weight: Optional[int] = None
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'requests': 0,
+            'weight': 0,
+            'waits': 0,
+            'wait_seconds': 0.0,
+            'header_syncs': 0,
+            'throttled': 0,
+            'banned': 0
+        }
+
+    def _refill(self, now: float):
+        if self._blocked_until and now >= self._blocked_until:
+            # Fin du Retry-After: la fenêtre de poids Binance est repartie de zéro
+            self._blocked_until = 0.0
+            self._tokens = self.capacity
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_per_second)
+            self._updated_at = now
+
+    def _higher_priority_waiting(self, priority: int) -> bool:
+        return any(count for level, count in self._waiting.items() if level < priority)
+
+    async def acquire(self, weight: int, priority: int = PRIORITY_SCAN) -> float:
+        """Réserve un poids de requête (attend si nécessaire), retourne l'attente en secondes"""
+        floor = self._floors.get(priority, self._floors[PRIORITY_SCAN])
+        weight = min(float(weight), self.capacity - floor)  # Une requête énorme ne doit pas bloquer à vie
+        started_at = time.monotonic()
+        self._waiting[priority] = self._waiting.get(priority, 0) + 1
+        try:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif self._higher_priority_waiting(priority):
+                    delay = 0.01
+                elif self._tokens - weight >= floor:
+                    self._tokens -= weight
+                    break
+                else:
+                    delay = max((weight + floor - self._tokens) / self.refill_per_second, 0.005)
+
+                await asyncio.sleep(delay)
+        finally:
+            self._waiting[priority] -= 1
+
+        waited = time.monotonic() - started_at
+        self.stats['requests'] += 1
+        self.stats['weight'] += weight
+        if waited > 0.001:
+            self.stats['waits'] += 1
+            self.stats['wait_seconds'] += waited
+        return waited
+
+    def update_from_headers(self, headers, status: int = 200):
+        """Resynchronise le seau sur les en-têtes d'une réponse Binance"""
+        try:
+            used = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('X-MBX-USED-WEIGHT')
+            if used is not None:
+                self.server_used_weight = int(used)
+                self._refill(time.monotonic())
+                self._tokens = min(self._tokens, self.capacity - self.server_used_weight)
+                self.stats['header_syncs'] += 1
+
+            if status in (418, 429):
+                retry_after = float(headers.get('Retry-After') or 60)
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+                if status == 418:
+                    self.stats['banned'] += 1
+                    self.logger.error(f"🚫 IP bannie par Binance (418) - requêtes suspendues {retry_after:.0f}s")
+                else:
+                    self.stats['throttled'] += 1
+                    self.logger.warning(f"⚠️ Limite de poids Binance atteinte (429) - requêtes suspendues {retry_after:.0f}s")
+        except Exception as e:
+            self.logger.error(f"❌ Erreur lecture en-têtes de poids: {e}")
+
+    def headroom(self, priority: int = PRIORITY_SCAN) -> int:
+        """Poids consommable immédiatement par une classe de priorité (0 si suspendu)"""
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return 0
+        self._refill(now)
+        floor = self._floors.get(priority, self._floors[PRIORITY_SCAN])
+        return max(0, int(self._tokens - floor))
+
+    def is_blocked(self) -> bool:
+        """True si Binance a demandé de suspendre les requêtes (429/418)"""
+        return time.monotonic() < self._blocked_until
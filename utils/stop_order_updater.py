@@ -0,0 +1,224 @@
+"""
+Mises à jour des ordres stop loss Binance par cancelReplace
+Une seule requête (annulation + nouvel ordre côté Binance) au lieu de deux allers-retours, et
+demandes regroupées par position: seule la dernière valeur du stop est envoyée
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+# Codes d'erreur Binance de cancelReplace (mode STOP_ON_FAILURE)
+CANCEL_REPLACE_PARTIAL_FAILURE = -2021  # Annulation effectuée, nouvel ordre refusé
+CANCEL_REPLACE_FAILURE = -2022          # Annulation refusée, nouvel ordre non tenté
+
+FILLED_STATUSES = ('FILLED', 'PARTIALLY_FILLED')
+
+
+class StopOrderUpdater:
+    """Déplace les ordres STOP_LOSS_LIMIT des positions ouvertes
+
+    - submit(trade_id, trade): demande non bloquante; pendant qu'une mise à jour est en vol, les
+      demandes suivantes se remplacent et seule la dernière est envoyée (au plus une requête par
+      position toutes les ``min_interval_seconds``)
+    - replace(trade, stop_price): remplacement immédiat (cancelReplace), création si aucun ordre;
+      un stop jambe de l'OCO d'entrée (trade.oco_order_list_id) est remplacé une fois par annulation
+      de la liste + nouvel ordre stop, cancelReplace ensuite
+    - cancel(trade_id): abandonne les demandes d'une position fermée et attend celle en vol
+    """
+
+    def __init__(self, exchange, symbol_filters, positions: Dict,
+                 create_stop: Optional[Callable[..., Awaitable[Optional[str]]]] = None,
+                 limit_offset_percent: float = 0.5, min_interval_seconds: float = 1.0):
+        self.logger = logging.getLogger(__name__)
+        self.exchange = exchange
+        self.symbol_filters = symbol_filters
+        self.positions = positions
+        self.create_stop = create_stop
+        self.limit_offset_percent = limit_offset_percent
+        self.min_interval_seconds = min_interval_seconds
+
+        self._pending: Dict[str, float] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._last_sent: Dict[str, float] = {}
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'requests': 0,
+            'coalesced': 0,
+            'replaces': 0,
+            'creates': 0,
+            'recoveries': 0,
+            'order_lists': 0,
+            'failures': 0,
+            'skipped_closed': 0
+        }
+
+    def submit(self, trade_id: str, trade, stop_price: Optional[float] = None):
+        """Demande de déplacement du stop (par défaut au niveau trade.stop_loss courant)"""
+        self.stats['requests'] += 1
+        if trade_id in self._pending:
+            self.stats['coalesced'] += 1
+        self._pending[trade_id] = stop_price if stop_price is not None else trade.stop_loss
+
+        task = self._tasks.get(trade_id)
+        if task is None or task.done():
+            self._tasks[trade_id] = asyncio.get_running_loop().create_task(self._drain(trade_id, trade))
+
+    def is_pending(self, trade_id: str) -> bool:
+        """True si une mise à jour est en attente ou en vol pour cette position"""
+        task = self._tasks.get(trade_id)
+        return trade_id in self._pending or (task is not None and not task.done())
+
+    async def _drain(self, trade_id: str, trade):
+        try:
+            while trade_id in self._pending:
+                wait = self.min_interval_seconds - (time.monotonic() - self._last_sent.get(trade_id, 0.0))
+                if wait > 0:
+                    await asyncio.sleep(wait)  # Les demandes reçues pendant l'attente sont regroupées
+
+                stop_price = self._pending.pop(trade_id, None)
+                if stop_price is None:
+                    break
+                if trade_id not in self.positions:
+                    self.stats['skipped_closed'] += 1
+                    break
+
+                self._last_sent[trade_id] = time.monotonic()
+                await self.replace(trade, stop_price)
+        except Exception as e:
+            self.logger.error(f"❌ Erreur mise à jour stop loss {trade_id}: {e}")
+        finally:
+            if self._tasks.get(trade_id) is asyncio.current_task():
+                del self._tasks[trade_id]
+
+    async def cancel(self, trade_id: str):
+        """Abandonne les mises à jour d'une position (avant sa fermeture) et attend celle en vol"""
+        self._pending.pop(trade_id, None)
+        self._last_sent.pop(trade_id, None)
+        task = self._tasks.get(trade_id)
+        if task is not None and task is not asyncio.current_task():
+            await asyncio.gather(task, return_exceptions=True)
+
+    def _stop_params(self, trade, stop_price: float) -> Dict:
+        symbol = trade.pair
+        stop_price = self.symbol_filters.round_price(symbol, stop_price)
+        return {
+            'symbol': symbol,
+            'side': 'SELL',
+            'type': 'STOP_LOSS_LIMIT',
+            'timeInForce': 'GTC',
+            'quantity': self.symbol_filters.round_quantity(symbol, trade.size),
+            'price': self.symbol_filters.round_price(symbol, stop_price * (1 - self.limit_offset_percent / 100)),
+            'stopPrice': stop_price
+        }
+
+    async def _create(self, trade, params: Dict) -> Optional[str]:
+        if self.create_stop is not None:
+            return await self.create_stop(trade, trade.pair, trade.size)
+        order = await self.exchange.create_order(**params)
+        return str(order['orderId'])
+
+    async def replace(self, trade, stop_price: float) -> Optional[str]:
+        """Remplace l'ordre stop loss du trade, retourne l'ID du nouvel ordre (None si échec)"""
+        symbol = trade.pair
+        params = self._stop_params(trade, stop_price)
+        old_order_id = trade.stop_loss_order_id
+        order_list_id = getattr(trade, 'oco_order_list_id', None)
+        if old_order_id and order_list_id:
+            # cancelReplace toujours refusé sur une jambe d'OCO: directement annulation de la liste
+            return await self._replace_order_list(trade, params, old_order_id, int(order_list_id))
+        try:
+            if not old_order_id:
+                new_order_id = await self._create(trade, params)
+                self.stats['creates'] += 1
+            else:
+                response = await self.exchange.cancel_replace_order(
+                    cancelReplaceMode='STOP_ON_FAILURE',
+                    cancelOrderId=int(old_order_id),
+                    **params
+                )
+                new_order_id = str(response['newOrderResponse']['orderId'])
+                self.stats['replaces'] += 1
+
+            trade.stop_loss_order_id = new_order_id
+            self.logger.debug(f"🔄 Stop loss {symbol} déplacé à {params['stopPrice']} (ordre {new_order_id})")
+            return new_order_id
+
+        except Exception as e:
+            self.stats['failures'] += 1
+            code = getattr(e, 'code', None)
+            if code == CANCEL_REPLACE_FAILURE:
+                return await self._recover(trade, params, old_order_id)
+            if code == CANCEL_REPLACE_PARTIAL_FAILURE:
+                # Ancien ordre annulé mais nouveau refusé: surveillance par le bot jusqu'au prochain stop
+                trade.stop_loss_order_id = None
+                self.logger.error(f"❌ Nouveau stop loss {symbol} refusé après annulation: {e}")
+            else:
+                self.logger.error(f"❌ Erreur remplacement stop loss {symbol}: {e}")
+            return None
+
+    async def _recover(self, trade, params: Dict, old_order_id: str) -> Optional[str]:
+        """Annulation refusée: l'ancien ordre est exécuté (rien à faire) ou n'existe plus (recréé)"""
+        symbol = trade.pair
+        try:
+            order = await self.exchange.get_order(symbol=symbol, orderId=int(old_order_id))
+            status = order.get('status')
+        except Exception:
+            order, status = {}, None  # Ordre inconnu de Binance
+
+        if status in FILLED_STATUSES:
+            self.logger.info(f"ℹ️ Stop loss {symbol} déjà exécuté ({old_order_id}): remplacement abandonné")
+            return None
+        order_list_id = int(order.get('orderListId', -1))
+        if status == 'NEW' and order_list_id != -1:
+            # Jambe d'un OCO dont la liste n'est pas connue (position restaurée): la liste doit être annulée
+            return await self._replace_order_list(trade, params, old_order_id, order_list_id)
+        if status == 'NEW':
+            self.logger.warning(f"⚠️ Stop loss {symbol} toujours actif ({old_order_id}): remplacement reporté")
+            return None
+
+        try:
+            trade.stop_loss_order_id = await self._create(trade, params)
+            self.stats['recoveries'] += 1
+            self.logger.warning(f"⚠️ Stop loss {symbol} introuvable ({old_order_id}): nouvel ordre {trade.stop_loss_order_id}")
+            return trade.stop_loss_order_id
+        except Exception as e:
+            trade.stop_loss_order_id = None
+            self.logger.error(f"❌ Impossible de recréer le stop loss {symbol}: {e}")
+            return None
+
+    async def _replace_order_list(self, trade, params: Dict, old_order_id: str, order_list_id: int) -> Optional[str]:
+        """Stop jambe d'un OCO: annulation de la liste (take profit compris) puis nouvel ordre stop
+
+        La quantité reste bloquée par l'OCO tant qu'il existe: le nouveau stop ne peut être placé qu'après
+        l'annulation. Il est envoyé aussitôt avec les paramètres déjà calculés (deux requêtes, une seule
+        fois par position: les déplacements suivants passent par cancelReplace)
+        """
+        symbol = trade.pair
+        try:
+            response = await self.exchange.cancel_order_list(symbol=symbol, orderListId=order_list_id)
+        except Exception as e:
+            self.stats['failures'] += 1
+            self.logger.error(f"❌ Impossible d'annuler l'OCO {order_list_id} du stop loss {symbol}: {e}")
+            return None
+
+        # La jambe take profit disparaît avec la liste: take profit surveillé par le bot
+        cancelled = {str(order.get('orderId')) for order in response.get('orders', [])}
+        if str(getattr(trade, 'take_profit_order_id', None)) in cancelled:
+            trade.take_profit_order_id = None
+        trade.oco_order_list_id = None
+        trade.stop_loss_order_id = None
+
+        try:
+            order = await self.exchange.create_order(**params)
+            trade.stop_loss_order_id = str(order['orderId'])
+            self.stats['order_lists'] += 1
+            self.logger.info(f"🔄 Stop loss {symbol} sorti de l'OCO {order_list_id} ({old_order_id}): "
+                             f"nouvel ordre {trade.stop_loss_order_id} à {params['stopPrice']}")
+            return trade.stop_loss_order_id
+        except Exception as e:
+            self.stats['failures'] += 1
+            self.logger.error(f"❌ Impossible de recréer le stop loss {symbol} après annulation de l'OCO: {e}")
+            return None
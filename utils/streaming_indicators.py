@@ -0,0 +1,362 @@
+"""
+Indicateurs techniques incrémentaux (O(1) par bougie)
+Même amorçage que talib: EMA amorcée par une SMA, RSI/ATR lissés selon Wilder, MACD aligné sur l'EMA lente
+
+Chaque indicateur expose:
+- update(...): intègre une bougie clôturée et retourne la nouvelle valeur
+- preview(...): valeur qu'aurait l'indicateur avec cette bougie (bougie en cours), sans modifier l'état
+"""
+
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import numpy as np
+import talib
+
+NAN = float('nan')
+
+# Seuil talib TA_IS_ZERO
+_EPSILON = 1e-8
+
+
+class StreamingSMA:
+    """Moyenne mobile simple par somme glissante"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window: Deque[float] = deque()
+        self._sum = 0.0
+        self._updates = 0
+        self.value = NAN
+
+    def _sum_with(self, x: float) -> float:
+        total = self._sum + x
+        if len(self._window) == self.period:
+            total -= self._window[0]
+        return total
+
+    def update(self, x: float) -> float:
+        self._sum = self._sum_with(x)
+        self._window.append(x)
+        if len(self._window) > self.period:
+            self._window.popleft()
+
+        # Resommation périodique pour borner la dérive numérique (coût amorti O(1))
+        self._updates += 1
+        if self._updates % (self.period * 64) == 0:
+            self._sum = math.fsum(self._window)
+
+        self.value = self._sum / self.period if len(self._window) == self.period else NAN
+        return self.value
+
+    def preview(self, x: float) -> float:
+        if len(self._window) + 1 < self.period:
+            return NAN
+        return self._sum_with(x) / self.period
+
+
+class StreamingEMA:
+    """EMA amorcée par la SMA des `period` premières valeurs (comme talib.EMA)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.k = 2.0 / (period + 1)
+        self.count = 0
+        self._seed_sum = 0.0
+        self.value = NAN
+
+    def _next(self, x: float) -> Tuple[float, float]:
+        count = self.count + 1
+        if count < self.period:
+            return self._seed_sum + x, NAN
+        if count == self.period:
+            seed_sum = self._seed_sum + x
+            return seed_sum, seed_sum / self.period
+        return self._seed_sum, (x - self.value) * self.k + self.value
+
+    def update(self, x: float) -> float:
+        self._seed_sum, self.value = self._next(x)
+        self.count += 1
+        return self.value
+
+    def preview(self, x: float) -> float:
+        return self._next(x)[1]
+
+
+class StreamingRSI:
+    """RSI de Wilder (moyennes des gains/pertes amorcées sur `period` variations, comme talib.RSI)"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev_close = NAN
+        self._gain = 0.0
+        self._loss = 0.0
+        self.value = NAN
+
+    def _next(self, close: float) -> Tuple[float, float, float]:
+        if self.count == 0:
+            return 0.0, 0.0, NAN
+
+        diff = close - self.prev_close
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+
+        if self.count < self.period:
+            return self._gain + up, self._loss + down, NAN
+        if self.count == self.period:
+            gain = (self._gain + up) / self.period
+            loss = (self._loss + down) / self.period
+        else:
+            gain = (self._gain * (self.period - 1) + up) / self.period
+            loss = (self._loss * (self.period - 1) + down) / self.period
+
+        total = gain + loss
+        return gain, loss, 100.0 * gain / total if abs(total) >= _EPSILON else 0.0
+
+    def update(self, close: float) -> float:
+        self._gain, self._loss, self.value = self._next(close)
+        self.prev_close = close
+        self.count += 1
+        return self.value
+
+    def preview(self, close: float) -> float:
+        return self._next(close)[2]
+
+
+class StreamingMACD:
+    """MACD, ligne de signal et histogramme
+
+    Comme talib.MACD, l'EMA rapide démarre de sorte que sa première valeur coïncide
+    avec celle de l'EMA lente; aucune sortie avant l'amorçage de la ligne de signal.
+    """
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        if fast > slow:
+            fast, slow = slow, fast
+        self.fast_period = fast
+        self.slow_period = slow
+        self.fast = StreamingEMA(fast)
+        self.slow = StreamingEMA(slow)
+        self.signal = StreamingEMA(signal)
+        self.count = 0
+        self.value: Tuple[float, float, float] = (NAN, NAN, NAN)
+
+    def _feeds_fast(self) -> bool:
+        return self.count >= self.slow_period - self.fast_period
+
+    @staticmethod
+    def _output(macd: float, signal: float) -> Tuple[float, float, float]:
+        if math.isnan(signal):
+            return NAN, NAN, NAN
+        return macd, signal, macd - signal
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        slow = self.slow.update(close)
+        fast = self.fast.update(close) if self._feeds_fast() else NAN
+        self.count += 1
+
+        if math.isnan(slow):
+            return self.value
+        macd = fast - slow
+        self.value = self._output(macd, self.signal.update(macd))
+        return self.value
+
+    def preview(self, close: float) -> Tuple[float, float, float]:
+        slow = self.slow.preview(close)
+        if math.isnan(slow):
+            return NAN, NAN, NAN
+        macd = self.fast.preview(close) - slow
+        return self._output(macd, self.signal.preview(macd))
+
+
+class StreamingBollinger:
+    """Bandes de Bollinger (SMA + écart-type population) par sommes glissantes, comme talib.BBANDS"""
+
+    def __init__(self, period: int = 20, nbdevup: float = 2.0, nbdevdn: float = 2.0):
+        self.period = period
+        self.nbdevup = nbdevup
+        self.nbdevdn = nbdevdn
+        self._window: Deque[float] = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._updates = 0
+        self.value: Tuple[float, float, float] = (NAN, NAN, NAN)
+
+    def _bands(self, total: float, total_sq: float) -> Tuple[float, float, float]:
+        mean = total / self.period
+        variance = total_sq / self.period - mean * mean
+        std = math.sqrt(variance) if variance >= _EPSILON else 0.0
+        return mean + self.nbdevup * std, mean, mean - self.nbdevdn * std
+
+    def _sums_with(self, x: float) -> Tuple[float, float]:
+        total, total_sq = self._sum + x, self._sum_sq + x * x
+        if len(self._window) == self.period:
+            oldest = self._window[0]
+            total -= oldest
+            total_sq -= oldest * oldest
+        return total, total_sq
+
+    def update(self, close: float) -> Tuple[float, float, float]:
+        self._sum, self._sum_sq = self._sums_with(close)
+        self._window.append(close)
+        if len(self._window) > self.period:
+            self._window.popleft()
+
+        # Resommation périodique pour borner la dérive numérique (coût amorti O(1))
+        self._updates += 1
+        if self._updates % (self.period * 64) == 0:
+            self._sum = math.fsum(self._window)
+            self._sum_sq = math.fsum(v * v for v in self._window)
+
+        if len(self._window) == self.period:
+            self.value = self._bands(self._sum, self._sum_sq)
+        return self.value
+
+    def preview(self, close: float) -> Tuple[float, float, float]:
+        if len(self._window) + 1 < self.period:
+            return NAN, NAN, NAN
+        return self._bands(*self._sums_with(close))
+
+
+class StreamingATR:
+    """ATR de Wilder amorcé par la moyenne des `period` premiers True Range, comme talib.ATR"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.count = 0
+        self.prev_close = NAN
+        self._tr_sum = 0.0
+        self.value = NAN
+
+    def _next(self, high: float, low: float, close: float) -> Tuple[float, float]:
+        if self.count == 0:
+            return 0.0, NAN
+
+        true_range = max(high, self.prev_close) - min(low, self.prev_close)
+        if self.count < self.period:
+            return self._tr_sum + true_range, NAN
+        if self.count == self.period:
+            return self._tr_sum, (self._tr_sum + true_range) / self.period
+        return self._tr_sum, (self.value * (self.period - 1) + true_range) / self.period
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self._tr_sum, self.value = self._next(high, low, close)
+        self.prev_close = close
+        self.count += 1
+        return self.value
+
+    def preview(self, high: float, low: float, close: float) -> float:
+        return self._next(high, low, close)[1]
+
+
+class StreamingIndicatorSet:
+    """Indicateurs de l'analyse technique d'une paire, maintenus bougie par bougie
+
+    sync() intègre les bougies clôturées nouvelles depuis le dernier appel (la dernière bougie
+    est toujours traitée comme bougie en cours), puis indicators() retourne les mêmes clés que
+    TechnicalAnalyzer.compute_indicators sous forme d'historiques courts (les dernières valeurs).
+    Si la fenêtre ne contient plus la dernière bougie intégrée, l'état est ré-amorcé sur la fenêtre.
+    """
+
+    # Bougies nécessaires aux patterns de chandeliers talib (calculés sur la fin de fenêtre)
+    PATTERN_TAIL = 32
+    # Bougies clôturées minimum pour (ré)amorcer l'état (EMA50)
+    MIN_SEED_CANDLES = 50
+
+    def __init__(self, history: int = 20):
+        self.history = history
+        self.reset()
+
+    # Ordre des valeurs dans l'historique
+    KEYS = ('ema9', 'ema20', 'ema21', 'ema50', 'macd', 'macdsignal', 'macdhist', 'rsi',
+            'bb_upper', 'bb_middle', 'bb_lower', 'atr', 'volume_sma20')
+
+    def reset(self):
+        self.last_open_time: Optional[float] = None
+        self.ema9, self.ema20, self.ema21, self.ema50 = (StreamingEMA(p) for p in (9, 20, 21, 50))
+        self.rsi = StreamingRSI(14)
+        self.macd = StreamingMACD(12, 26, 9)
+        self.bbands = StreamingBollinger(20, 2, 2)
+        self.atr = StreamingATR(14)
+        self.volume_sma = StreamingSMA(20)
+        # Historique circulaire (valeurs x 2*history): les dernières valeurs restent contiguës
+        self._ring = np.full((len(self.KEYS), 2 * self.history), np.nan)
+        self._slot = -1
+
+    def _record(self, values: Tuple[float, ...]):
+        self._slot = (self._slot + 1) % self.history
+        self._ring[:, self._slot] = values
+        self._ring[:, self._slot + self.history] = values
+
+    def _values(self, high: float, low: float, close: float, volume: float, commit: bool) -> Tuple[float, ...]:
+        """Valeurs de tous les indicateurs, dans l'ordre de KEYS"""
+        if commit:
+            return (self.ema9.update(close), self.ema20.update(close), self.ema21.update(close),
+                    self.ema50.update(close), *self.macd.update(close), self.rsi.update(close),
+                    *self.bbands.update(close), self.atr.update(high, low, close),
+                    self.volume_sma.update(volume))
+        return (self.ema9.preview(close), self.ema20.preview(close), self.ema21.preview(close),
+                self.ema50.preview(close), *self.macd.preview(close), self.rsi.preview(close),
+                *self.bbands.preview(close), self.atr.preview(high, low, close),
+                self.volume_sma.preview(volume))
+
+    def update(self, open_time: float, high: float, low: float, close: float, volume: float):
+        """Intègre une bougie clôturée"""
+        self._record(self._values(high, low, close, volume, commit=True))
+        self.last_open_time = open_time
+
+    def sync(self, candles: Dict[str, np.ndarray]) -> bool:
+        """Intègre les bougies clôturées nouvelles (toutes sauf la dernière, considérée en cours)
+
+        Retourne False si la fenêtre est en retard sur l'état, ou trop courte pour un ré-amorçage.
+        """
+        open_time = candles['open_time']
+        last = len(open_time) - 1
+        if last < 0:
+            return False
+
+        start = 0
+        if self.last_open_time is not None:
+            if self.last_open_time >= open_time[last]:
+                return False  # Fenêtre plus ancienne que l'état
+            idx = int(np.searchsorted(open_time[:last], self.last_open_time))
+            if idx < last and open_time[idx] == self.last_open_time:
+                start = idx + 1
+            elif last < self.MIN_SEED_CANDLES:
+                return False
+            else:
+                self.reset()
+        elif last < self.MIN_SEED_CANDLES:
+            return False
+
+        high, low, close, volume = candles['high'], candles['low'], candles['close'], candles['volume']
+        for i in range(start, last):
+            self.update(float(open_time[i]), float(high[i]), float(low[i]), float(close[i]), float(volume[i]))
+        return True
+
+    def indicators(self, candles: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Indicateurs incluant la bougie en cours (mêmes clés que TechnicalAnalyzer.compute_indicators)"""
+        high, low, close, volume = candles['high'], candles['low'], candles['close'], candles['volume']
+        end = self._slot + 1 + self.history
+        values = np.empty((len(self.KEYS), self.history))
+        values[:, :-1] = self._ring[:, end - self.history + 1:end]
+        values[:, -1] = self._values(float(high[-1]), float(low[-1]), float(close[-1]), float(volume[-1]),
+                                     commit=False)
+        indicators = dict(zip(self.KEYS, values))
+
+        # Patterns de chandeliers: talib sur la fin de fenêtre (résultat identique, coût constant)
+        tail = slice(max(0, len(close) - self.PATTERN_TAIL), None)
+        o, h, l, c = candles['open'][tail], high[tail], low[tail], close[tail]
+        indicators['hammer'] = talib.CDLHAMMER(o, h, l, c)
+        indicators['engulfing'] = talib.CDLENGULFING(o, h, l, c)
+        indicators['morning_star'] = talib.CDLMORNINGSTAR(o, h, l, c)
+
+        # ROC 10 de la dernière bougie (même formule que talib.ROC)
+        if len(close) <= 10:
+            roc = NAN
+        else:
+            roc = (close[-1] / close[-11] - 1.0) * 100.0 if close[-11] != 0.0 else 0.0
+        indicators['roc'] = np.array([roc])
+        return indicators
@@ -0,0 +1,192 @@
+"""
+Table des filtres de trading par paire
+Une requête exchangeInfo au démarrage (puis rafraîchissement en tâche de fond), lectures O(1)
+et arrondis exacts en arithmétique entière (prix au tick, quantités au pas)
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from decimal import ROUND_CEILING, ROUND_FLOOR, ROUND_HALF_UP, Decimal
+from typing import Dict, Optional
+
+# Précisions utilisées quand une paire est inconnue (comportement historique)
+DEFAULT_PRICE_PRECISION = 4
+DEFAULT_QUANTITY_PRECISION = 6
+
+
+def decimals_of(step: str) -> int:
+    """Nombre de décimales significatives d'un pas Binance ('0.01000000' -> 2)"""
+    exponent = Decimal(step).normalize().as_tuple().exponent
+    return max(0, -exponent)
+
+
+def round_to_step(value: float, step_units: int, precision: int, rounding: str = ROUND_HALF_UP) -> float:
+    """Arrondit une valeur à un multiple du pas (step_units * 10^-precision) en arithmétique entière
+
+    value est lue par sa représentation décimale la plus courte (0.1 -> 1/10 exactement), puis
+    ramenée au nombre de pas le plus proche (ROUND_HALF_UP), inférieur (ROUND_FLOOR) ou supérieur
+    (ROUND_CEILING).
+    """
+    numerator, denominator = Decimal(repr(value)).as_integer_ratio()
+    numerator *= 10 ** precision
+    denominator *= step_units
+    if rounding == ROUND_FLOOR:
+        steps = numerator // denominator
+    elif rounding == ROUND_CEILING:
+        steps = -(-numerator // denominator)
+    else:
+        steps = (2 * numerator + denominator) // (2 * denominator)
+    return steps * step_units / 10 ** precision  # Division entière correctement arrondie: repr exacte
+
+
+@dataclass
+class SymbolFilters:
+    """Filtres d'une paire: pas de prix et de quantité en unités entières de leur précision"""
+    symbol: str
+    price_precision: int
+    tick_units: int
+    quantity_precision: int
+    step_units: int
+    tick_size: float = 0.0
+    step_size: float = 0.0
+    min_price: float = 0.0
+    max_price: float = float('inf')
+    min_qty: float = 0.0
+    max_qty: float = float('inf')
+    min_notional: float = 0.0
+
+    def round_price(self, price: float) -> float:
+        """Prix au tick le plus proche"""
+        return round_to_step(price, self.tick_units, self.price_precision)
+
+    def round_quantity(self, quantity: float, round_up: bool = False) -> float:
+        """Quantité au pas inférieur (jamais plus que le solde), ou supérieur si round_up"""
+        return round_to_step(quantity, self.step_units, self.quantity_precision,
+                             ROUND_CEILING if round_up else ROUND_FLOOR)
+
+    def as_dict(self) -> Dict[str, float]:
+        """Format historique de get_symbol_filters"""
+        return {
+            'min_qty': self.min_qty,
+            'max_qty': self.max_qty,
+            'step_size': self.step_size,
+            'min_notional': self.min_notional,
+            'min_price': self.min_price,
+            'max_price': self.max_price,
+            'tick_size': self.tick_size
+        }
+
+
+def parse_symbol_filters(info: Dict) -> SymbolFilters:
+    """Construit les filtres d'une paire depuis son entrée exchangeInfo"""
+    values = {}
+    tick, step = '0.0001', '0.000001'
+    for filter_item in info.get('filters', []):
+        filter_type = filter_item.get('filterType')
+        if filter_type == 'PRICE_FILTER':
+            tick = filter_item['tickSize']
+            values['min_price'] = float(filter_item['minPrice'])
+            values['max_price'] = float(filter_item['maxPrice']) or float('inf')
+        elif filter_type == 'LOT_SIZE':
+            step = filter_item['stepSize']
+            values['min_qty'] = float(filter_item['minQty'])
+            values['max_qty'] = float(filter_item['maxQty']) or float('inf')
+        elif filter_type in ('MIN_NOTIONAL', 'NOTIONAL'):
+            values['min_notional'] = float(filter_item['minNotional'])
+
+    price_precision = decimals_of(tick)
+    quantity_precision = decimals_of(step)
+    return SymbolFilters(
+        symbol=info['symbol'],
+        price_precision=price_precision,
+        tick_units=max(1, int(Decimal(tick).scaleb(price_precision))),
+        quantity_precision=quantity_precision,
+        step_units=max(1, int(Decimal(step).scaleb(quantity_precision))),
+        tick_size=float(tick),
+        step_size=float(step),
+        **values
+    )
+
+
+class SymbolFilterTable:
+    """Filtres de toutes les paires, chargés en une requête exchangeInfo
+
+    - load(): (re)charge la table complète (démarrage puis rafraîchissement périodique)
+    - get(symbol): lecture O(1), None si la paire est inconnue
+    - ensure(symbol): recharge une fois si la paire est inconnue (nouveau listing)
+    - round_price / round_quantity: arrondis exacts, précisions par défaut si paire inconnue
+    """
+
+    def __init__(self, exchange, min_reload_interval_seconds: float = 60.0):
+        self.logger = logging.getLogger(__name__)
+        self.exchange = exchange
+        self.min_reload_interval_seconds = min_reload_interval_seconds
+        self._filters: Dict[str, SymbolFilters] = {}
+        self._attempted_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'loads': 0,
+            'errors': 0
+        }
+
+    def __len__(self) -> int:
+        return len(self._filters)
+
+    async def load(self):
+        """Recharge la table depuis exchangeInfo (table précédente conservée en cas d'erreur)"""
+        async with self._lock:
+            self._attempted_at = time.monotonic()
+            try:
+                exchange_info = await self.exchange.get_exchange_info()
+                filters = {}
+                for info in exchange_info.get('symbols', []):
+                    try:
+                        filters[info['symbol']] = parse_symbol_filters(info)
+                    except Exception as e:
+                        self.logger.debug(f"⚠️ Filtres illisibles pour {info.get('symbol')}: {e}")
+                self._filters = filters
+                self.stats['loads'] += 1
+                self.logger.info(f"📐 Filtres de trading chargés: {len(filters)} paires")
+            except Exception as e:
+                self.stats['errors'] += 1
+                self.logger.error(f"❌ Erreur chargement filtres de trading: {e}")
+
+    def get(self, symbol: str) -> Optional[SymbolFilters]:
+        """Filtres d'une paire (lecture mémoire)"""
+        filters = self._filters.get(symbol)
+        if filters is None:
+            self.stats['misses'] += 1
+        else:
+            self.stats['hits'] += 1
+        return filters
+
+    async def ensure(self, symbol: str) -> Optional[SymbolFilters]:
+        """Filtres d'une paire, avec rechargement si elle est absente de la table"""
+        filters = self._filters.get(symbol)
+        if filters is None:
+            # Rechargement borné: une paire délistée ou une erreur réseau ne relance pas exchangeInfo à chaque appel
+            recently_attempted = (self._attempted_at is not None
+                                  and time.monotonic() - self._attempted_at < self.min_reload_interval_seconds)
+            if not recently_attempted:
+                await self.load()
+        return self.get(symbol)
+
+    def round_price(self, symbol: str, price: float) -> float:
+        """Arrondit un prix au tick de la paire"""
+        filters = self.get(symbol)
+        if filters is None:
+            return round(price, DEFAULT_PRICE_PRECISION)
+        return filters.round_price(price)
+
+    def round_quantity(self, symbol: str, quantity: float, round_up: bool = False) -> float:
+        """Arrondit une quantité au pas de la paire (inférieur par défaut)"""
+        filters = self.get(symbol)
+        if filters is None:
+            return round(quantity, DEFAULT_QUANTITY_PRECISION)
+        return filters.round_quantity(quantity, round_up=round_up)
@@ -0,0 +1,174 @@
+"""
+Ordonnanceur de tâches asyncio périodiques
+Chaque tâche a sa cadence et sa priorité; l'état partagé est protégé par des verrous nommés
+attribués par priorité (la gestion des positions passe avant le scan, les métriques et le ménage)
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Priorités (plus petit = plus urgent)
+PRIORITY_POSITIONS = 0
+PRIORITY_SCAN = 1
+PRIORITY_CONSISTENCY = 2
+PRIORITY_MAINTENANCE = 3
+PRIORITY_METRICS = 4
+
+
+class PriorityLock:
+    """Verrou asyncio dont les attentes sont servies par priorité puis par ordre d'arrivée"""
+
+    def __init__(self):
+        self._locked = False
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    def locked(self) -> bool:
+        return self._locked
+
+    async def acquire(self, priority: int = PRIORITY_METRICS):
+        if not self._locked and not self._waiters:
+            self._locked = True
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # Verrou transmis pendant l'annulation: le rendre
+            raise
+
+    def release(self):
+        # Transmission directe au prochain en attente (le verrou reste pris)
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+        self._locked = False
+
+
+@dataclass
+class ScheduledTask:
+    """Tâche périodique: func() peut retourner un délai (s) pour remplacer l'intervalle au prochain tour"""
+    name: str
+    func: Callable[[], Awaitable[Optional[float]]]
+    interval_seconds: float
+    priority: int = PRIORITY_METRICS
+    locks: Tuple[str, ...] = ()
+    initial_delay_seconds: float = 0.0
+    stats: Dict[str, float] = field(default_factory=lambda: {
+        'runs': 0, 'errors': 0, 'last_duration': 0.0, 'max_duration': 0.0, 'max_lock_wait': 0.0
+    })
+
+
+class TaskScheduler:
+    """Exécute des tâches périodiques indépendantes jusqu'à stop()
+
+    Une tâche lente (ex: scan de 30s) ne retarde plus les autres: seules les sections protégées
+    par un même verrou s'excluent, et le verrou libéré va à la tâche la plus prioritaire.
+    """
+
+    def __init__(self, error_handler: Optional[Callable[[str, Exception], None]] = None):
+        self.logger = logging.getLogger(__name__)
+        self.error_handler = error_handler
+        self._tasks: Dict[str, ScheduledTask] = {}
+        self._locks: Dict[str, PriorityLock] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+        self._stopped: Optional[asyncio.Event] = None
+
+    def add(self, name: str, func: Callable[[], Awaitable[Optional[float]]], interval_seconds: float,
+            priority: int = PRIORITY_METRICS, locks: Tuple[str, ...] = (), initial_delay_seconds: float = 0.0):
+        """Déclare une tâche (à faire avant run())"""
+        self._tasks[name] = ScheduledTask(name, func, interval_seconds, priority, tuple(locks), initial_delay_seconds)
+
+    def _lock(self, name: str) -> PriorityLock:
+        lock = self._locks.get(name)
+        if lock is None:
+            lock = PriorityLock()
+            self._locks[name] = lock
+        return lock
+
+    @asynccontextmanager
+    async def locked(self, *names: str, priority: int = PRIORITY_METRICS):
+        """Section critique sur un ou plusieurs verrous nommés (pris dans un ordre fixe)"""
+        acquired = []
+        try:
+            for name in sorted(set(names)):
+                lock = self._lock(name)
+                await lock.acquire(priority)
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+    async def _loop(self, task: ScheduledTask):
+        if task.initial_delay_seconds > 0:
+            await asyncio.sleep(task.initial_delay_seconds)
+
+        while not self._stopped.is_set():
+            delay = task.interval_seconds
+            requested_at = time.perf_counter()
+            try:
+                async with self.locked(*task.locks, priority=task.priority):
+                    started_at = time.perf_counter()
+                    override = await task.func()
+                if override is not None:
+                    delay = float(override)
+
+                duration = time.perf_counter() - started_at
+                task.stats['runs'] += 1
+                task.stats['last_duration'] = duration
+                task.stats['max_duration'] = max(task.stats['max_duration'], duration)
+                task.stats['max_lock_wait'] = max(task.stats['max_lock_wait'], started_at - requested_at)
+                delay = max(0.0, delay - duration)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                task.stats['errors'] += 1
+                self.logger.error(f"❌ Erreur tâche {task.name}: {e}")
+                if self.error_handler is not None:
+                    try:
+                        self.error_handler(task.name, e)
+                    except Exception:
+                        pass  # Éviter les boucles d'erreur
+
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def run(self):
+        """Lance toutes les tâches et attend stop()"""
+        self._stopped = asyncio.Event()
+        for task in sorted(self._tasks.values(), key=lambda t: t.priority):
+            self._running[task.name] = asyncio.create_task(self._loop(task), name=f"scheduler:{task.name}")
+        self.logger.info(f"🗓️ Ordonnanceur démarré: {', '.join(self._running)}")
+
+        try:
+            await self._stopped.wait()
+        finally:
+            for running in self._running.values():
+                running.cancel()
+            await asyncio.gather(*self._running.values(), return_exceptions=True)
+            self._running.clear()
+            self.logger.info("🗓️ Ordonnanceur arrêté")
+
+    def stop(self):
+        """Demande l'arrêt de toutes les tâches (les tâches en cours sont annulées)"""
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Statistiques par tâche (exécutions, erreurs, durées, attente de verrou)"""
+        return {name: dict(task.stats) for name, task in self._tasks.items()}
@@ -11,6 +11,10 @@ import numpy as np
 import pandas as pd
 import talib
 
+from utils.batch_indicators import batch_indicators
+from utils.indicator_cache import IndicatorCache
+from utils.streaming_indicators import StreamingIndicatorSet
+
 
 class SignalStrength(Enum):
     WEAK = 1
@@ -38,40 +42,200 @@ class MarketAnalysis:
     momentum: str
     volatility: str
 
+# Indicateurs maintenus par StreamingIndicatorSet: paramètres -> clés
+STREAMING_KEYS = {
+    ('EMA', 9): ('ema9',),
+    ('EMA', 20): ('ema20',),
+    ('EMA', 21): ('ema21',),
+    ('EMA', 50): ('ema50',),
+    ('RSI', 14): ('rsi',),
+    ('MACD', 12, 26, 9): ('macd', 'macdsignal', 'macdhist'),
+    ('ATR', 14): ('atr',),
+}
+
 class TechnicalAnalyzer:
     """Analyseur technique avancé"""
     
-    def __init__(self):
+    def __init__(self, indicator_cache: Optional[IndicatorCache] = None, timeframe: str = "",
+                 streaming: bool = False):
         self.logger = logging.getLogger(__name__)
+        # Cache partagé (main.py + analyse): un indicateur n'est calculé qu'une fois par bougie
+        self.indicator_cache = indicator_cache
+        self.timeframe = timeframe
+        # Indicateurs incrémentaux par paire (O(1) par nouvelle bougie)
+        self.streaming_states: Optional[Dict[str, StreamingIndicatorSet]] = {} if streaming else None
         self.logger.info("📊 Analyseur technique initialisé")
 
     def analyze_pair(self, df: pd.DataFrame, pair: str) -> MarketAnalysis:
-        """Analyse technique complète d'une paire"""
+        """Analyse technique complète d'une paire (DataFrame OHLCV)"""
+        return self.analyze_arrays(
+            pair,
+            open_=np.ascontiguousarray(df['open'].to_numpy(dtype=np.float64)),
+            high=np.ascontiguousarray(df['high'].to_numpy(dtype=np.float64)),
+            low=np.ascontiguousarray(df['low'].to_numpy(dtype=np.float64)),
+            close=np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64)),
+            volume=np.ascontiguousarray(df['volume'].to_numpy(dtype=np.float64)),
+            open_time=(df['timestamp'].to_numpy(dtype=np.float64)
+                       if 'timestamp' in df.columns and pd.api.types.is_numeric_dtype(df['timestamp']) else None)
+        )
+
+    def analyze_candles(self, candles: Dict[str, np.ndarray], pair: str) -> MarketAnalysis:
+        """Analyse technique sur les colonnes OHLCV du CandleStore / KlineBundle"""
+        return self.analyze_arrays(
+            pair, candles['open'], candles['high'], candles['low'], candles['close'], candles['volume'],
+            open_time=candles.get('open_time')
+        )
+
+    # =================== CACHE DES INDICATEURS ===================
+
+    def _cache_context(self, pair: Optional[str], open_time: Optional[np.ndarray], open_: np.ndarray,
+                       high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                       volume: np.ndarray) -> Optional[Tuple[tuple, tuple]]:
+        """Clé (paire, timeframe, open_time de la dernière bougie, nombre de bougies) et empreinte
+
+        L'empreinte (OHLCV de la dernière bougie) invalide l'entrée quand la bougie en cours évolue.
+        """
+        if self.indicator_cache is None or not pair or open_time is None or len(close) == 0:
+            return None
+        key = (pair, self.timeframe, int(open_time[-1]), len(close))
+        fingerprint = (float(open_[-1]), float(high[-1]), float(low[-1]), float(close[-1]), float(volume[-1]))
+        return key, fingerprint
+
+    def _cached(self, context: Optional[Tuple[tuple, tuple]], params: tuple, compute):
+        if context is None:
+            return compute()
+        key, fingerprint = context
+        return self.indicator_cache.get_or_compute(key + params, fingerprint, compute)
+
+    def streaming_indicators(self, candles: Dict[str, np.ndarray], pair: str) -> Optional[Dict[str, np.ndarray]]:
+        """Indicateurs incrémentaux de la paire mis à jour avec ces bougies (None si indisponibles)"""
+        if self.streaming_states is None or not pair or candles.get('open_time') is None:
+            return None
+        state = self.streaming_states.get(pair)
+        if state is None:
+            state = self.streaming_states[pair] = StreamingIndicatorSet()
+        if not state.sync(candles):
+            return None
+        return state.indicators(candles)
+
+    def _indicator(self, candles: Dict[str, np.ndarray], pair: str, params: tuple, compute):
+        """Indicateur incrémental si disponible, sinon talib via le cache partagé"""
+        keys = STREAMING_KEYS.get(params)
+        if keys is not None:
+            streamed = self.streaming_indicators(candles, pair)
+            if streamed is not None:
+                return streamed[keys[0]] if len(keys) == 1 else tuple(streamed[key] for key in keys)
+        return self._cached(self._candles_context(candles, pair), params, compute)
+
+    def _candles_context(self, candles: Dict[str, np.ndarray], pair: str) -> Optional[Tuple[tuple, tuple]]:
+        return self._cache_context(
+            pair, candles.get('open_time'), candles['open'], candles['high'],
+            candles['low'], candles['close'], candles['volume']
+        )
+
+    def ema(self, candles: Dict[str, np.ndarray], pair: str, period: int) -> np.ndarray:
+        """EMA des clôtures (via le cache partagé)"""
+        close = candles['close']
+        return self._indicator(candles, pair, ('EMA', period),
+                            lambda: talib.EMA(close, timeperiod=period))
+
+    def rsi(self, candles: Dict[str, np.ndarray], pair: str, period: int = 14) -> np.ndarray:
+        """RSI des clôtures (via le cache partagé)"""
+        close = candles['close']
+        return self._indicator(candles, pair, ('RSI', period),
+                            lambda: talib.RSI(close, timeperiod=period))
+
+    def macd(self, candles: Dict[str, np.ndarray], pair: str, fast: int = 12, slow: int = 26,
+             signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """MACD, ligne de signal et histogramme (via le cache partagé)"""
+        close = candles['close']
+        return self._indicator(candles, pair, ('MACD', fast, slow, signal),
+                            lambda: talib.MACD(close, fastperiod=fast, slowperiod=slow, signalperiod=signal))
+
+    def atr(self, candles: Dict[str, np.ndarray], pair: str, period: int = 14) -> np.ndarray:
+        """ATR (via le cache partagé)"""
+        high, low, close = candles['high'], candles['low'], candles['close']
+        return self._indicator(candles, pair, ('ATR', period),
+                            lambda: talib.ATR(high, low, close, timeperiod=period))
+
+    def compute_indicators(self, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                           close: np.ndarray, volume: np.ndarray, pair: Optional[str] = None,
+                           open_time: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """Calcule une seule fois chaque indicateur utilisé par l'analyse (tableaux float64 contigus)
+
+        Avec une paire et les open_time: indicateurs incrémentaux si activés, sinon cache partagé.
+        """
+        if open_time is not None:
+            streamed = self.streaming_indicators(
+                {'open_time': open_time, 'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume},
+                pair
+            )
+            if streamed is not None:
+                return streamed
+        
+        context = self._cache_context(pair, open_time, open_, high, low, close, volume)
+        
+        macd, macdsignal, macdhist = self._cached(
+            context, ('MACD', 12, 26, 9),
+            lambda: talib.MACD(close, fastperiod=12, slowperiod=26, signalperiod=9))
+        bb_upper, bb_middle, bb_lower = self._cached(
+            context, ('BBANDS', 20, 2, 2),
+            lambda: talib.BBANDS(close, timeperiod=20, nbdevup=2, nbdevdn=2))
+        
+        return {
+            'ema9': self._cached(context, ('EMA', 9), lambda: talib.EMA(close, timeperiod=9)),
+            'ema21': self._cached(context, ('EMA', 21), lambda: talib.EMA(close, timeperiod=21)),
+            'ema20': self._cached(context, ('EMA', 20), lambda: talib.EMA(close, timeperiod=20)),
+            'ema50': self._cached(context, ('EMA', 50), lambda: talib.EMA(close, timeperiod=50)),
+            'macd': macd,
+            'macdsignal': macdsignal,
+            'macdhist': macdhist,
+            'rsi': self._cached(context, ('RSI', 14), lambda: talib.RSI(close, timeperiod=14)),
+            'bb_upper': bb_upper,
+            'bb_middle': bb_middle,
+            'bb_lower': bb_lower,
+            'hammer': self._cached(context, ('CDLHAMMER',), lambda: talib.CDLHAMMER(open_, high, low, close)),
+            'engulfing': self._cached(context, ('CDLENGULFING',), lambda: talib.CDLENGULFING(open_, high, low, close)),
+            'morning_star': self._cached(context, ('CDLMORNINGSTAR',), lambda: talib.CDLMORNINGSTAR(open_, high, low, close)),
+            'roc': self._cached(context, ('ROC', 10), lambda: talib.ROC(close, timeperiod=10)),
+            'atr': self._cached(context, ('ATR', 14), lambda: talib.ATR(high, low, close, timeperiod=14))
+        }
+
+    def analyze_arrays(self, pair: str, open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                       close: np.ndarray, volume: np.ndarray,
+                       indicators: Optional[Dict[str, np.ndarray]] = None,
+                       open_time: Optional[np.ndarray] = None) -> MarketAnalysis:
+        """Analyse technique complète d'une paire sur des tableaux numpy OHLCV
+
+        Chemin rapide: pas de DataFrame, chaque indicateur n'est calculé qu'une fois.
+        """
+        if indicators is None:
+            indicators = self.compute_indicators(open_, high, low, close, volume, pair=pair, open_time=open_time)
         
         signals = []
         
         # Analyse des moyennes mobiles
-        ema_signals = self.analyze_ema(df)
+        ema_signals = self.analyze_ema(close, indicators)
         signals.extend(ema_signals)
         
         # Analyse MACD
-        macd_signals = self.analyze_macd(df)
+        macd_signals = self.analyze_macd(indicators)
         signals.extend(macd_signals)
         
         # Analyse RSI
-        rsi_signals = self.analyze_rsi(df)
+        rsi_signals = self.analyze_rsi(indicators)
         signals.extend(rsi_signals)
         
         # Analyse Bollinger Bands
-        bb_signals = self.analyze_bollinger_bands(df)
+        bb_signals = self.analyze_bollinger_bands(close, indicators)
         signals.extend(bb_signals)
         
         # Analyse du volume
-        volume_signals = self.analyze_volume(df)
+        volume_signals = self.analyze_volume(volume, indicators)
         signals.extend(volume_signals)
         
         # Analyse des chandeliers
-        candle_signals = self.analyze_candlesticks(df)
+        candle_signals = self.analyze_candlesticks(indicators)
         signals.extend(candle_signals)
         
         # Calcul du score total
@@ -81,9 +245,9 @@ class TechnicalAnalyzer:
         recommendation = self.get_recommendation(total_score, len(signals))
         
         # Analyse de tendance
-        trend = self.analyze_trend(df)
-        momentum = self.analyze_momentum(df)
-        volatility = self.analyze_volatility(df)
+        trend = self.analyze_trend(close, indicators)
+        momentum = self.analyze_momentum(indicators)
+        volatility = self.analyze_volatility(indicators)
         
         return MarketAnalysis(
             pair=pair,
@@ -95,18 +259,18 @@ class TechnicalAnalyzer:
             volatility=volatility
         )
 
-    def analyze_ema(self, df: pd.DataFrame) -> List[TechnicalSignal]:
+    def analyze_ema(self, close: np.ndarray, indicators: Dict[str, np.ndarray]) -> List[TechnicalSignal]:
         """Analyse des moyennes mobiles exponentielles"""
         signals = []
         
         try:
-            # Calcul EMA 9 et 21
-            ema9 = talib.EMA(df['close'], timeperiod=9) # type: ignore
-            ema21 = talib.EMA(df['close'], timeperiod=21) # type: ignore
+            # EMA 9 et 21
+            ema9 = indicators['ema9']
+            ema21 = indicators['ema21']
             
-            current_price = df['close'].iloc[-1]
-            current_ema9 = ema9.iloc[-1]
-            current_ema21 = ema21.iloc[-1]
+            current_price = close[-1]
+            current_ema9 = ema9[-1]
+            current_ema21 = ema21[-1]
             
             # Signal 1: EMA9 > EMA21 (tendance haussière)
             if current_ema9 > current_ema21:
@@ -131,8 +295,8 @@ class TechnicalAnalyzer:
             
             # Signal 3: Croisement récent
             if len(ema9) > 2 and len(ema21) > 2:
-                prev_ema9 = ema9.iloc[-2]
-                prev_ema21 = ema21.iloc[-2]
+                prev_ema9 = ema9[-2]
+                prev_ema21 = ema21[-2]
                 
                 if prev_ema9 <= prev_ema21 and current_ema9 > current_ema21:
                     signals.append(TechnicalSignal(
@@ -148,18 +312,20 @@ class TechnicalAnalyzer:
         
         return signals
 
-    def analyze_macd(self, df: pd.DataFrame) -> List[TechnicalSignal]:
+    def analyze_macd(self, indicators: Dict[str, np.ndarray]) -> List[TechnicalSignal]:
         """Analyse MACD"""
         signals = []
         
         try:
-            # Calcul MACD
-            macd, macdsignal, macdhist = talib.MACD(df['close'], fastperiod=12, slowperiod=26, signalperiod=9) # type: ignore
+            # MACD (12, 26, 9)
+            macd = indicators['macd']
+            macdsignal = indicators['macdsignal']
+            macdhist = indicators['macdhist']
             
-            if len(macd) > 1 and not np.isnan(macd.iloc[-1]):
-                current_macd = macd.iloc[-1]
-                current_signal = macdsignal.iloc[-1]
-                current_hist = macdhist.iloc[-1]
+            if len(macd) > 1 and not np.isnan(macd[-1]):
+                current_macd = macd[-1]
+                current_signal = macdsignal[-1]
+                current_hist = macdhist[-1]
                 
                 # Signal 1: MACD > Signal Line
                 if current_macd > current_signal:
@@ -184,7 +350,7 @@ class TechnicalAnalyzer:
                 
                 # Signal 3: Histogramme croissant
                 if len(macdhist) > 2:
-                    prev_hist = macdhist.iloc[-2]
+                    prev_hist = macdhist[-2]
                     if current_hist > prev_hist:
                         signals.append(TechnicalSignal(
                             indicator="MACD",
@@ -199,16 +365,16 @@ class TechnicalAnalyzer:
         
         return signals
 
-    def analyze_rsi(self, df: pd.DataFrame) -> List[TechnicalSignal]:
+    def analyze_rsi(self, indicators: Dict[str, np.ndarray]) -> List[TechnicalSignal]:
         """Analyse RSI"""
         signals = []
         
         try:
-            # Calcul RSI
-            rsi = talib.RSI(df['close'], timeperiod=14) # type: ignore
+            # RSI 14
+            rsi = indicators['rsi']
             
-            if len(rsi) > 1 and not np.isnan(rsi.iloc[-1]):
-                current_rsi = rsi.iloc[-1]
+            if len(rsi) > 1 and not np.isnan(rsi[-1]):
+                current_rsi = rsi[-1]
                 
                 # Signal 1: RSI en zone de rebond (pour long)
                 if current_rsi < 40:
@@ -223,7 +389,7 @@ class TechnicalAnalyzer:
                 
                 # Signal 2: RSI sortant de survente
                 if len(rsi) > 2:
-                    prev_rsi = rsi.iloc[-2]
+                    prev_rsi = rsi[-2]
                     if prev_rsi < 30 and current_rsi > 30:
                         signals.append(TechnicalSignal(
                             indicator="RSI",
@@ -248,19 +414,21 @@ class TechnicalAnalyzer:
         
         return signals
 
-    def analyze_bollinger_bands(self, df: pd.DataFrame) -> List[TechnicalSignal]:
+    def analyze_bollinger_bands(self, close: np.ndarray, indicators: Dict[str, np.ndarray]) -> List[TechnicalSignal]:
         """Analyse des Bollinger Bands"""
         signals = []
         
         try:
-            # Calcul Bollinger Bands
-            bb_upper, bb_middle, bb_lower = talib.BBANDS(df['close'], timeperiod=20, nbdevup=2, nbdevdn=2) # type: ignore
+            # Bollinger Bands (20, 2)
+            bb_upper = indicators['bb_upper']
+            bb_middle = indicators['bb_middle']
+            bb_lower = indicators['bb_lower']
             
-            if len(bb_lower) > 0 and not np.isnan(bb_lower.iloc[-1]):
-                current_price = df['close'].iloc[-1]
-                current_upper = bb_upper.iloc[-1]
-                current_middle = bb_middle.iloc[-1]
-                current_lower = bb_lower.iloc[-1]
+            if len(bb_lower) > 0 and not np.isnan(bb_lower[-1]):
+                current_price = close[-1]
+                current_upper = bb_upper[-1]
+                current_middle = bb_middle[-1]
+                current_lower = bb_lower[-1]
                 
                 # Signal 1: Prix proche ou touche bande inférieure
                 distance_to_lower = abs(current_price - current_lower) / current_lower
@@ -276,11 +444,11 @@ class TechnicalAnalyzer:
                 
                 # Signal 2: Bandes qui se resserrent (faible volatilité)
                 if len(bb_upper) > 2:
-                    prev_upper = bb_upper.iloc[-2]
-                    prev_lower = bb_lower.iloc[-2]
+                    prev_upper = bb_upper[-2]
+                    prev_lower = bb_lower[-2]
                     
                     current_width = (current_upper - current_lower) / current_middle
-                    prev_width = (prev_upper - prev_lower) / bb_middle.iloc[-2]
+                    prev_width = (prev_upper - prev_lower) / bb_middle[-2]
                     
                     if current_width < prev_width * 0.95:
                         signals.append(TechnicalSignal(
@@ -306,14 +474,18 @@ class TechnicalAnalyzer:
         
         return signals
 
-    def analyze_volume(self, df: pd.DataFrame) -> List[TechnicalSignal]:
+    def analyze_volume(self, volume: np.ndarray,
+                       indicators: Optional[Dict[str, np.ndarray]] = None) -> List[TechnicalSignal]:
         """Analyse du volume"""
         signals = []
         
         try:
-            if 'volume' in df.columns and len(df) > 20:
-                current_volume = df['volume'].iloc[-1]
-                avg_volume = df['volume'].rolling(window=20).mean().iloc[-1]
+            if len(volume) > 20:
+                current_volume = volume[-1]
+                if indicators is not None and 'volume_sma20' in indicators:
+                    avg_volume = indicators['volume_sma20'][-1]
+                else:
+                    avg_volume = volume[-20:].mean()
                 
                 # Signal 1: Volume au-dessus de la moyenne
                 if current_volume > avg_volume * 1.5:
@@ -327,8 +499,8 @@ class TechnicalAnalyzer:
                     ))
                 
                 # Signal 2: Volume croissant
-                if len(df) > 3:
-                    recent_volumes = df['volume'].iloc[-3:].values
+                if len(volume) > 3:
+                    recent_volumes = volume[-3:]
                     if recent_volumes[-1] > recent_volumes[-2] > recent_volumes[-3]:
                         signals.append(TechnicalSignal(
                             indicator="Volume",
@@ -343,40 +515,40 @@ class TechnicalAnalyzer:
         
         return signals
 
-    def analyze_candlesticks(self, df: pd.DataFrame) -> List[TechnicalSignal]:
+    def analyze_candlesticks(self, indicators: Dict[str, np.ndarray]) -> List[TechnicalSignal]:
         """Analyse des patterns de chandeliers"""
         signals = []
         
         try:
             # Patterns haussiers
-            hammer = talib.CDLHAMMER(df['open'], df['high'], df['low'], df['close']) # type: ignore
-            engulfing = talib.CDLENGULFING(df['open'], df['high'], df['low'], df['close']) # type: ignore
-            morning_star = talib.CDLMORNINGSTAR(df['open'], df['high'], df['low'], df['close']) # type: ignore
+            hammer = indicators['hammer']
+            engulfing = indicators['engulfing']
+            morning_star = indicators['morning_star']
             
             # Vérification des patterns récents
-            if len(hammer) > 0 and hammer.iloc[-1] > 0:
+            if len(hammer) > 0 and hammer[-1] > 0:
                 signals.append(TechnicalSignal(
                     indicator="Candlestick",
                     condition="Hammer",
-                    value=hammer.iloc[-1],
+                    value=hammer[-1],
                     strength=SignalStrength.MODERATE,
                     description="Pattern Hammer détecté"
                 ))
             
-            if len(engulfing) > 0 and engulfing.iloc[-1] > 0:
+            if len(engulfing) > 0 and engulfing[-1] > 0:
                 signals.append(TechnicalSignal(
                     indicator="Candlestick",
                     condition="Bullish Engulfing",
-                    value=engulfing.iloc[-1],
+                    value=engulfing[-1],
                     strength=SignalStrength.STRONG,
                     description="Pattern Engulfing haussier"
                 ))
             
-            if len(morning_star) > 0 and morning_star.iloc[-1] > 0:
+            if len(morning_star) > 0 and morning_star[-1] > 0:
                 signals.append(TechnicalSignal(
                     indicator="Candlestick",
                     condition="Morning Star",
-                    value=morning_star.iloc[-1],
+                    value=morning_star[-1],
                     strength=SignalStrength.VERY_STRONG,
                     description="Pattern Morning Star"
                 ))
@@ -386,18 +558,18 @@ class TechnicalAnalyzer:
         
         return signals
 
-    def analyze_trend(self, df: pd.DataFrame) -> str:
+    def analyze_trend(self, close: np.ndarray, indicators: Dict[str, np.ndarray]) -> str:
         """Analyse de la tendance"""
         try:
             # Analyse basée sur les EMAs
-            ema20 = talib.EMA(df['close'], timeperiod=20) # type: ignore
-            ema50 = talib.EMA(df['close'], timeperiod=50) # type: ignore
+            ema20 = indicators['ema20']
+            ema50 = indicators['ema50']
             
-            current_price = df['close'].iloc[-1]
+            current_price = close[-1]
             
             if len(ema20) > 0 and len(ema50) > 0:
-                current_ema20 = ema20.iloc[-1]
-                current_ema50 = ema50.iloc[-1]
+                current_ema20 = ema20[-1]
+                current_ema50 = ema50[-1]
                 
                 if current_price > current_ema20 > current_ema50:
                     return "HAUSSIER FORT"
@@ -415,14 +587,14 @@ class TechnicalAnalyzer:
         
         return "INDETERMINE"
 
-    def analyze_momentum(self, df: pd.DataFrame) -> str:
+    def analyze_momentum(self, indicators: Dict[str, np.ndarray]) -> str:
         """Analyse du momentum"""
         try:
-            # Calcul du momentum basé sur ROC
-            roc = talib.ROC(df['close'], timeperiod=10) # type: ignore
+            # Momentum basé sur ROC 10
+            roc = indicators['roc']
             
-            if len(roc) > 0 and not np.isnan(roc.iloc[-1]):
-                current_roc = roc.iloc[-1]
+            if len(roc) > 0 and not np.isnan(roc[-1]):
+                current_roc = roc[-1]
                 
                 if current_roc > 2:
                     return "TRES FORT"
@@ -440,15 +612,15 @@ class TechnicalAnalyzer:
         
         return "INDETERMINE"
 
-    def analyze_volatility(self, df: pd.DataFrame) -> str:
+    def analyze_volatility(self, indicators: Dict[str, np.ndarray]) -> str:
         """Analyse de la volatilité"""
         try:
-            # Calcul ATR pour la volatilité
-            atr = talib.ATR(df['high'], df['low'], df['close'], timeperiod=14) # type: ignore
+            # ATR 14 pour la volatilité
+            atr = indicators['atr']
             
-            if len(atr) > 0 and not np.isnan(atr.iloc[-1]):
-                current_atr = atr.iloc[-1]
-                avg_atr = atr.rolling(window=20).mean().iloc[-1]
+            if len(atr) > 0 and not np.isnan(atr[-1]):
+                current_atr = atr[-1]
+                avg_atr = atr[-20:].mean() if len(atr) >= 20 else np.nan
                 
                 ratio = current_atr / avg_atr
                 
@@ -466,6 +638,208 @@ class TechnicalAnalyzer:
         
         return "INDETERMINE"
 
+    # =================== ANALYSE GROUPÉE (MATRICE PAIRES x BOUGIES) ===================
+
+    def analyze_batch_candles(self, candles_by_pair: Dict[str, Dict[str, np.ndarray]]) -> Dict[str, MarketAnalysis]:
+        """Analyse groupée de plusieurs paires (colonnes OHLCV), regroupées par nombre de bougies"""
+        by_length: Dict[int, List[str]] = {}
+        for pair, candles in candles_by_pair.items():
+            by_length.setdefault(len(candles['close']), []).append(pair)
+
+        analyses = {}
+        for pairs in by_length.values():
+            open_, high, low, close, volume = (
+                np.vstack([candles_by_pair[pair][field] for pair in pairs])
+                for field in ('open', 'high', 'low', 'close', 'volume')
+            )
+            analyses.update(zip(pairs, self.analyze_batch(pairs, open_, high, low, close, volume)))
+        return analyses
+
+    def analyze_batch(self, pairs: List[str], open_: np.ndarray, high: np.ndarray, low: np.ndarray,
+                      close: np.ndarray, volume: np.ndarray) -> List[MarketAnalysis]:
+        """Analyse technique de toutes les paires d'une matrice alignée (paires x bougies)
+
+        Indicateurs et conditions des signaux évalués en passes vectorisées; mêmes règles
+        que analyze_arrays, une MarketAnalysis par paire.
+        """
+        ind = batch_indicators(open_, high, low, close, volume)
+        price, rules = self._batch_rules(close, volume, ind)
+
+        # Signaux créés règle par règle pour les seules paires concernées (ordre des règles conservé)
+        strengths = {s.value: s for s in SignalStrength}
+        signals_by_pair: List[List[TechnicalSignal]] = [[] for _ in pairs]
+        for indicator, condition, mask, strength, value, describe in rules:
+            for i in np.flatnonzero(mask).tolist():
+                signals_by_pair[i].append(TechnicalSignal(
+                    indicator=indicator,
+                    condition=condition,
+                    value=value[i],
+                    strength=strengths[strength if np.isscalar(strength) else int(strength[i])],
+                    description=describe(i)
+                ))
+
+        trends = self._batch_trend(price, ind['ema20'][:, -1], ind['ema50'][:, -1])
+        momentums = self._batch_momentum(ind['roc'][:, -1])
+        volatilities = self._batch_volatility(ind['atr'])
+
+        analyses = []
+        for i, (pair, signals) in enumerate(zip(pairs, signals_by_pair)):
+            total_score = sum(signal.strength.value for signal in signals)
+            analyses.append(MarketAnalysis(
+                pair=pair,
+                signals=signals,
+                total_score=total_score,
+                recommendation=self.get_recommendation(total_score, len(signals)),
+                trend=trends[i],
+                momentum=momentums[i],
+                volatility=volatilities[i]
+            ))
+        return analyses
+
+    def batch_valid_signals(self, open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                            volume: np.ndarray, min_conditions: int = 3) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Validité des signaux de chaque ligne d'une matrice (fenêtres x bougies), sans MarketAnalysis
+
+        Retourne (valide, nombre de signaux, score total): mêmes règles que analyze_batch suivi de
+        is_valid_signal, pour évaluer des milliers de fenêtres glissantes en une passe (backtest).
+        """
+        ind = batch_indicators(open_, high, low, close, volume, tail=2)
+        _, rules = self._batch_rules(close, volume, ind)
+
+        count = np.zeros(len(close), dtype=np.int64)
+        score = np.zeros(len(close), dtype=np.int64)
+        strong = np.zeros(len(close), dtype=bool)
+        moderate = np.zeros(len(close), dtype=np.int64)
+        for _, _, mask, strength, _, _ in rules:
+            mask = np.asarray(mask, dtype=bool)
+            strength = np.broadcast_to(strength, mask.shape)
+            count += mask
+            score += np.where(mask, strength, 0)
+            strong |= mask & (strength >= SignalStrength.STRONG.value)
+            moderate += mask & (strength == SignalStrength.MODERATE.value)
+
+        # is_valid_signal: nombre et score minimum, recommandation hors AUCUN SIGNAL / EVITER,
+        # au moins un signal fort ou 5+ signaux dont 3 modérés
+        valid = (
+            (count >= min_conditions)
+            & (score >= min_conditions * 1.75)
+            & (count > 0) & (score >= 1.5 * count)
+            & (strong | ((count >= 5) & (moderate >= 3)))
+        )
+        return valid, count, score
+
+    def _batch_rules(self, close: np.ndarray, volume: np.ndarray, ind: Dict[str, np.ndarray]) -> Tuple[np.ndarray, list]:
+        """Règles des signaux évaluées sur toutes les lignes: (prix, [(indicateur, condition, masque, force,
+        valeur, description)]) dans l'ordre de analyze_arrays"""
+        length = close.shape[1]
+        weak, moderate, strong, very_strong = (s.value for s in SignalStrength)
+
+        price = close[:, -1]
+        ema9, ema21 = ind['ema9'][:, -1], ind['ema21'][:, -1]
+        macd, macdsignal, macdhist = ind['macd'][:, -1], ind['macdsignal'][:, -1], ind['macdhist'][:, -1]
+        rsi, prev_rsi = ind['rsi'][:, -1], ind['rsi'][:, -2]
+        bb_upper, bb_middle, bb_lower = ind['bb_upper'][:, -1], ind['bb_middle'][:, -1], ind['bb_lower'][:, -1]
+        current_volume, avg_volume = volume[:, -1], ind['volume_sma20'][:, -1]
+        macd_ok = ~np.isnan(macd) & (length > 1)
+        rsi_ok = ~np.isnan(rsi) & (length > 1)
+        bb_ok = ~np.isnan(bb_lower)
+        volume_ok = length > 20
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            distance_to_lower = np.abs(price - bb_lower) / bb_lower
+            width = (bb_upper - bb_lower) / bb_middle
+            prev_width = (ind['bb_upper'][:, -2] - ind['bb_lower'][:, -2]) / ind['bb_middle'][:, -2]
+            volume_ratio = current_volume / avg_volume
+
+        # (indicateur, condition, masque, force, valeur, description) dans l'ordre de analyze_arrays
+        rules = [
+            ("EMA", "EMA9 > EMA21", ema9 > ema21,
+             np.where(ema9 > ema21 * 1.002, strong, moderate), ema9 - ema21,
+             lambda i: f"EMA9 ({ema9[i]:.4f}) > EMA21 ({ema21[i]:.4f})"),
+            ("EMA", "Prix > EMAs", (price > ema9) & (price > ema21),
+             moderate, price - np.fmax(ema9, ema21),
+             lambda i: f"Prix ({price[i]:.4f}) au-dessus des EMAs"),
+            ("EMA", "Croisement Golden Cross",
+             (length > 2) & (ind['ema9'][:, -2] <= ind['ema21'][:, -2]) & (ema9 > ema21),
+             very_strong, ema9 - ema21,
+             lambda i: "Croisement haussier EMA9/EMA21"),
+            ("MACD", "MACD > Signal", macd_ok & (macd > macdsignal),
+             np.where(macdhist > 0, strong, moderate), macd - macdsignal,
+             lambda i: f"MACD ({macd[i]:.6f}) > Signal ({macdsignal[i]:.6f})"),
+            ("MACD", "MACD > 0", macd_ok & (macd > 0),
+             moderate, macd,
+             lambda i: f"MACD positif ({macd[i]:.6f})"),
+            ("MACD", "Histogramme croissant", macd_ok & (length > 2) & (macdhist > ind['macdhist'][:, -2]),
+             weak, macdhist - ind['macdhist'][:, -2],
+             lambda i: "Momentum en amélioration"),
+            ("RSI", "RSI < 40", rsi_ok & (rsi < 40),
+             np.where(rsi < 30, strong, moderate), 40 - rsi,
+             lambda i: f"RSI en zone de rebond ({rsi[i]:.1f})"),
+            ("RSI", "RSI sortant de survente", rsi_ok & (length > 2) & (prev_rsi < 30) & (rsi > 30),
+             strong, rsi - 30,
+             lambda i: f"RSI sortant de survente ({rsi[i]:.1f})"),
+            ("RSI", "RSI neutre", rsi_ok & (rsi >= 40) & (rsi <= 60),
+             weak, 50 - np.abs(rsi - 50),
+             lambda i: f"RSI en zone neutre ({rsi[i]:.1f})"),
+            ("Bollinger", "Prix proche BB inférieure", bb_ok & (distance_to_lower <= 0.005),
+             np.where(distance_to_lower <= 0.002, very_strong, strong), bb_lower - price,
+             lambda i: f"Prix près de BB inf. ({price[i]:.4f} vs {bb_lower[i]:.4f})"),
+            ("Bollinger", "Bandes se resserrent", bb_ok & (length > 2) & (width < prev_width * 0.95),
+             weak, prev_width - width,
+             lambda i: "Volatilité en baisse - potentiel breakout"),
+            ("Bollinger", "Prix > BB moyenne", bb_ok & (price > bb_middle),
+             weak, price - bb_middle,
+             lambda i: f"Prix au-dessus BB moyenne ({price[i]:.4f} > {bb_middle[i]:.4f})"),
+            ("Volume", "Volume élevé", volume_ok & (current_volume > avg_volume * 1.5),
+             np.where(current_volume > avg_volume * 2, strong, moderate), current_volume - avg_volume,
+             lambda i: f"Volume {volume_ratio[i]:.1f}x supérieur à la moyenne"),
+            ("Volume", "Volume croissant",
+             volume_ok & (volume[:, -1] > volume[:, -2]) & (volume[:, -2] > volume[:, -3]),
+             moderate, volume[:, -1] - volume[:, -3],
+             lambda i: "Volume en augmentation sur 3 périodes"),
+            ("Candlestick", "Hammer", ind['hammer'][:, -1] > 0,
+             moderate, ind['hammer'][:, -1],
+             lambda i: "Pattern Hammer détecté"),
+            ("Candlestick", "Bullish Engulfing", ind['engulfing'][:, -1] > 0,
+             strong, ind['engulfing'][:, -1],
+             lambda i: "Pattern Engulfing haussier"),
+            ("Candlestick", "Morning Star", ind['morning_star'][:, -1] > 0,
+             very_strong, ind['morning_star'][:, -1],
+             lambda i: "Pattern Morning Star"),
+        ]
+        return price, rules
+
+    @staticmethod
+    def _batch_trend(price: np.ndarray, ema20: np.ndarray, ema50: np.ndarray) -> List[str]:
+        """Tendance par paire (mêmes règles que analyze_trend)"""
+        return np.select(
+            [(price > ema20) & (ema20 > ema50), (price < ema20) & (ema20 < ema50)],
+            ["HAUSSIER FORT", "BAISSIER FORT"],
+            default="NEUTRE"
+        ).tolist()
+
+    @staticmethod
+    def _batch_momentum(roc: np.ndarray) -> List[str]:
+        """Momentum par paire (mêmes règles que analyze_momentum)"""
+        return np.select(
+            [np.isnan(roc), roc > 2, roc > 1, roc > 0, roc > -1],
+            ["INDETERMINE", "TRES FORT", "FORT", "POSITIF", "NEGATIF"],
+            default="FAIBLE"
+        ).tolist()
+
+    @staticmethod
+    def _batch_volatility(atr: np.ndarray) -> List[str]:
+        """Volatilité par paire (mêmes règles que analyze_volatility)"""
+        current_atr = atr[:, -1]
+        avg_atr = atr[:, -20:].mean(axis=1) if atr.shape[1] >= 20 else np.full(len(atr), np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = current_atr / avg_atr
+        return np.select(
+            [np.isnan(current_atr), ratio > 1.5, ratio > 1.2, ratio > 0.8],
+            ["INDETERMINE", "TRES ELEVEE", "ELEVEE", "NORMALE"],
+            default="FAIBLE"
+        ).tolist()
+
     def get_recommendation(self, total_score: float, signal_count: int) -> str:
         """Détermine la recommandation basée sur le score"""
         if signal_count == 0:
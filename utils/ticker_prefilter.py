@@ -0,0 +1,73 @@
+"""
+Pré-filtre vectorisé de l'univers USDC
+Snapshot des tickers 24h parsé une seule fois en colonnes, filtres appliqués du moins cher au plus cher
+"""
+
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+# Motifs de rejet du pré-filtre (dans l'ordre d'application)
+REJECT_NONE = ""
+REJECT_STATIC_BLACKLIST = "blacklisted_static"
+REJECT_DYNAMIC_BLACKLIST = "blacklisted_dynamic"
+REJECT_LOW_VOLUME = "low_volume"
+REJECT_HIGH_SPREAD = "high_spread"
+
+
+def _column(frame: pd.DataFrame, *keys: str) -> pd.Series:
+    """Première colonne numérique disponible parmi les clés possibles du ticker"""
+    result = pd.Series(np.nan, index=frame.index)
+    for key in keys:
+        if key in frame.columns:
+            result = result.fillna(pd.to_numeric(frame[key], errors='coerce'))
+    return result
+
+
+def parse_ticker_snapshot(tickers: List[Dict]) -> pd.DataFrame:
+    """Convertit la liste des tickers 24h en colonnes: symbol, price, volume, bid, ask, spread, price_change
+
+    Les tickers sans prix exploitable sont écartés.
+    """
+    raw = pd.DataFrame(tickers)
+    if raw.empty:
+        return pd.DataFrame(columns=['symbol', 'price', 'volume', 'bid', 'ask', 'spread', 'price_change'])
+
+    frame = pd.DataFrame({'symbol': raw['symbol'].astype(str)})
+    frame['price'] = _column(raw, 'lastPrice', 'price', 'close')
+    frame = frame[frame['price'].notna()].copy()
+    raw = raw.loc[frame.index]
+
+    frame['volume'] = _column(raw, 'quoteVolume', 'volume').fillna(0.0)
+    frame['bid'] = _column(raw, 'bidPrice', 'bid').fillna(frame['price'] * 0.999)
+    frame['ask'] = _column(raw, 'askPrice', 'ask').fillna(frame['price'] * 1.001)
+
+    bid = frame['bid'].to_numpy()
+    ask = frame['ask'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frame['spread'] = np.where(bid > 0, (ask - bid) / bid * 100, 0.0)
+    frame['price_change'] = _column(raw, 'priceChangePercent', 'priceChange').fillna(0.0).abs()
+
+    return frame.reset_index(drop=True)
+
+
+def apply_prefilter(frame: pd.DataFrame, static_blacklist: Iterable[str], dynamic_blacklist: Iterable[str],
+                    min_volume: float, max_spread: float) -> pd.DataFrame:
+    """Ajoute la colonne reject_reason (vide si la paire passe) en une passe vectorisée
+
+    Ordre des filtres: blacklist statique, blacklist dynamique, volume, spread
+    (le premier motif rencontré est conservé, comme dans le scan séquentiel).
+    """
+    symbols = frame['symbol']
+    conditions = [
+        symbols.isin(set(static_blacklist)).to_numpy(),
+        symbols.isin(set(dynamic_blacklist)).to_numpy(),
+        (frame['volume'] < min_volume).to_numpy(),
+        (frame['spread'] > max_spread).to_numpy(),
+    ]
+    choices = [REJECT_STATIC_BLACKLIST, REJECT_DYNAMIC_BLACKLIST, REJECT_LOW_VOLUME, REJECT_HIGH_SPREAD]
+
+    frame = frame.copy()
+    frame['reject_reason'] = np.select(conditions, choices, default=REJECT_NONE)
+    return frame
@@ -0,0 +1,131 @@
+"""
+Règles de décision du bot sous forme de fonctions pures
+Partagées par ScalpingBot (temps réel) et le backtest: l'instant courant et les données de marché
+sont passés en paramètres, aucune horloge ni appel réseau ici.
+"""
+
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def pnl_percent(entry_price: float, current_price: float) -> float:
+    """P&L d'une position longue en %"""
+    return (current_price - entry_price) / entry_price * 100
+
+
+def timeout_reason(config, duration_minutes: float, pnl: float, volatility: float) -> Optional[str]:
+    """Motif de sortie par timeout adaptatif (None si la position doit rester ouverte)"""
+    # Déterminer timeout selon volatilité
+    timeout_threshold = config.TRADE_TIMEOUT_LOW_VOLATILITY if volatility < 2.0 else config.TRADE_TIMEOUT_HIGH_VOLATILITY
+    if duration_minutes <= timeout_threshold:
+        return None
+
+    # P&L dans la zone de timeout
+    min_range, max_range = config.MIN_TIMEOUT_PROFIT_RANGE
+    if min_range <= pnl <= max_range:
+        return f"TIMEOUT_ADAPTATIF ({duration_minutes:.0f}min, P&L:{pnl:+.2f}%)"
+    return None
+
+
+def momentum_exit_window(config, duration_minutes: float, pnl: float) -> bool:
+    """True si la position est éligible à la sortie momentum (durée minimale et P&L dans la zone)"""
+    if duration_minutes < config.MOMENTUM_MIN_DURATION_MINUTES:
+        return False  # Trop tôt pour sortie momentum
+    min_range, max_range = config.MOMENTUM_PNL_RANGE
+    return min_range <= pnl <= max_range
+
+
+def momentum_exit_reason(config, rsi: float, macdhist: float, pnl: float) -> Optional[str]:
+    """Motif de sortie pour momentum faible (RSI et histogramme MACD de la dernière bougie)"""
+    if np.isnan(rsi) or np.isnan(macdhist):
+        return None
+
+    rsi_condition = rsi < config.MOMENTUM_RSI_THRESHOLD
+    macd_condition = macdhist < 0 if config.MOMENTUM_MACD_NEGATIVE else True
+    if rsi_condition and macd_condition:
+        return f"Momentum faible détecté (RSI:{rsi:.1f}, MACD_hist:{macdhist:.6f}, P&L:{pnl:+.2f}%)"
+    return None
+
+
+def breakout_threshold(highs: np.ndarray, breakout_percent: float) -> Optional[float]:
+    """Seuil de cassure: plus haut des bougies précédentes (bougie courante exclue) + marge
+
+    highs: plus hauts des 20 dernières bougies, bougie courante en dernier.
+    None si pas assez de données (la cassure n'est alors pas exigée).
+    """
+    if len(highs) < 10:
+        return None
+    last_high = float(highs[:-1].max())
+    return last_high * (1 + breakout_percent / 100)
+
+
+def trailing_levels(config, current_price: float, stop_loss: float,
+                    trailing_stop: float) -> Optional[Tuple[float, float]]:
+    """Nouveaux (stop loss, take profit) si le prix remonte le trailing, sinon None"""
+    if current_price < trailing_stop:
+        return None
+    new_stop = current_price * (1 - config.TRAILING_STEP_PERCENT / 100)
+    if new_stop <= stop_loss:
+        return None
+    # Nouveau TP = prix actuel + même écart relatif que le TP initial
+    return new_stop, current_price * (1 + config.TAKE_PROFIT_PERCENT / 100)
+
+
+def entry_levels(config, price: float) -> Tuple[float, float, float]:
+    """Niveaux initiaux (stop loss, take profit, activation du trailing) d'une entrée au prix donné"""
+    return (
+        price * (1 - config.STOP_LOSS_PERCENT / 100),
+        price * (1 + config.TAKE_PROFIT_PERCENT / 100),
+        price * (1 + config.TRAILING_ACTIVATION_PERCENT / 100)
+    )
+
+
+def position_size(config, total_capital: float, trading_intensity: float,
+                  volatility: Optional[float] = None) -> float:
+    """Taille de position (USDC): part du capital ajustée par l'intensité horaire et la volatilité"""
+    base_size = total_capital * config.BASE_POSITION_SIZE_PERCENT / 100 * trading_intensity
+    if volatility is None:
+        return base_size
+
+    if volatility > config.HIGH_VOLATILITY_THRESHOLD:
+        # Réduire la taille pour paires très volatiles
+        reduction_factor = min(0.5, config.VOLATILITY_REDUCTION_FACTOR * (volatility / config.HIGH_VOLATILITY_THRESHOLD))
+        return base_size * (1 - reduction_factor)
+    if volatility < config.LOW_VOLATILITY_THRESHOLD:
+        # Augmenter légèrement pour paires peu volatiles (plus sûres)
+        return base_size * 1.1
+    return base_size
+
+
+def trades_last_hour(trade_times: List[datetime], now: datetime) -> List[datetime]:
+    """Horodatages des trades de moins d'une heure"""
+    return [trade_time for trade_time in trade_times if (now - trade_time).total_seconds() < 3600]
+
+
+def record_trade_result(results: List[bool], is_profit: bool, history: int = 10) -> int:
+    """Ajoute un résultat (10 derniers conservés) et retourne le nombre de pertes consécutives"""
+    results.append(is_profit)
+    if len(results) > history:
+        results.pop(0)
+
+    consecutive_losses = 0
+    for result in reversed(results):
+        if result:
+            break
+        consecutive_losses += 1
+    return consecutive_losses
+
+
+def loss_pause_end(config, consecutive_losses: int, now: datetime) -> Optional[datetime]:
+    """Fin de la pause de sécurité déclenchée par les pertes consécutives (None si pas de pause)"""
+    if (consecutive_losses >= config.MAX_CONSECUTIVE_LOSSES and config.ENABLE_CONSECUTIVE_LOSS_PROTECTION
+            and config.AUTO_RESUME_AFTER_PAUSE):
+        return now + timedelta(minutes=config.CONSECUTIVE_LOSS_PAUSE_MINUTES)
+    return None
+
+
+def pair_score(price_change, volume_usdc):
+    """Score de classement des paires validées par le scan (scalaires ou tableaux numpy)"""
+    return 0.6 * price_change + 0.4 * (volume_usdc / 1000000)
@@ -0,0 +1,171 @@
+"""
+Service de volatilité incrémental
+Fenêtre glissante 12h (max/min/moyenne des clôtures horaires) par paire, lecture en O(1)
+"""
+
+import logging
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+HOUR_MS = 3_600_000
+
+
+class RollingWindow:
+    """Max/min/somme glissants sur les N dernières valeurs (mise à jour O(1) amortie)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._values = deque()
+        self._max = deque()  # (index, valeur) décroissants
+        self._min = deque()  # (index, valeur) croissants
+        self._sum = 0.0
+        self._index = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def push(self, value: float):
+        self._values.append(value)
+        self._sum += value
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((self._index, value))
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((self._index, value))
+
+        if len(self._values) > self.size:
+            self._sum -= self._values.popleft()
+        oldest_index = self._index - len(self._values) + 1
+        while self._max[0][0] < oldest_index:
+            self._max.popleft()
+        while self._min[0][0] < oldest_index:
+            self._min.popleft()
+
+        self._index += 1
+
+    @property
+    def max(self) -> float:
+        return self._max[0][1]
+
+    @property
+    def min(self) -> float:
+        return self._min[0][1]
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+
+class SymbolVolatility:
+    """État de volatilité d'une paire: clôtures horaires fermées + bougie en cours"""
+
+    def __init__(self, window_hours: int):
+        self.window = RollingWindow(window_hours)
+        self.last_closed_open_time: Optional[int] = None
+        self.current_close: Optional[float] = None
+
+    def close_candle(self, open_time: int, close: float):
+        if self.last_closed_open_time is not None and open_time <= self.last_closed_open_time:
+            return
+        self.window.push(close)
+        self.last_closed_open_time = open_time
+        self.current_close = None
+
+    def volatility(self) -> Optional[float]:
+        """(max - min) / moyenne des clôtures, en %"""
+        count = len(self.window)
+        if count == 0:
+            return None
+
+        max_price, min_price, total = self.window.max, self.window.min, self.window.sum
+        if self.current_close is not None:
+            max_price = max(max_price, self.current_close)
+            min_price = min(min_price, self.current_close)
+            total += self.current_close
+            count += 1
+
+        if count < 2:
+            return 0.0
+
+        avg_price = total / count
+        if avg_price <= 0:
+            return 0.0
+        return (max_price - min_price) / avg_price * 100
+
+
+class VolatilityService:
+    """Volatilité 12h de chaque paire mise à jour à la clôture de chaque bougie horaire
+
+    - amorçage une fois par paire depuis les bougies 1h (bundle / REST)
+    - mises à jour par le CandleStore (stream kline 1h) et par le prix des tickers du scan
+    - lecture O(1), sans appel réseau tant que l'état est à jour
+    """
+
+    def __init__(self, window_hours: int = 12):
+        self.logger = logging.getLogger(__name__)
+        self.window_hours = window_hours
+        self._states: Dict[str, SymbolVolatility] = {}
+
+        # Statistiques d'utilisation
+        self.stats = {
+            'seeds': 0,
+            'lookups': 0
+        }
+
+    @staticmethod
+    def _now_ms() -> int:
+        return int(time.time() * 1000)
+
+    def seed(self, symbol: str, open_times: np.ndarray, closes: np.ndarray, now_ms: Optional[int] = None):
+        """Initialise l'état d'une paire depuis des bougies 1h (la dernière peut être en cours)"""
+        now_ms = now_ms or self._now_ms()
+        state = SymbolVolatility(self.window_hours)
+        for open_time, close in zip(open_times, closes):
+            if int(open_time) + HOUR_MS <= now_ms:
+                state.close_candle(int(open_time), float(close))
+            else:
+                state.current_close = float(close)
+        self._states[symbol] = state
+        self.stats['seeds'] += 1
+
+    def on_kline(self, symbol: str, interval: str, row, closed: bool):
+        """Listener CandleStore: bougie 1h en cours ou clôturée"""
+        if interval != "1h":
+            return
+        state = self._states.get(symbol)
+        if state is None:
+            return
+
+        open_time, close = int(row[0]), float(row[4])
+        if closed:
+            state.close_candle(open_time, close)
+        elif state.last_closed_open_time is not None and open_time > state.last_closed_open_time:
+            state.current_close = close
+
+    def update_price(self, symbol: str, price: float):
+        """Met à jour la clôture de la bougie horaire en cours (prix ticker)"""
+        state = self._states.get(symbol)
+        if state is not None:
+            state.current_close = price
+
+    def is_fresh(self, symbol: str, now_ms: Optional[int] = None) -> bool:
+        """True si la dernière bougie horaire clôturée est intégrée"""
+        state = self._states.get(symbol)
+        if state is None or state.last_closed_open_time is None:
+            return False
+        now_ms = now_ms or self._now_ms()
+        last_closed_expected = (now_ms // HOUR_MS) * HOUR_MS - HOUR_MS
+        return state.last_closed_open_time >= last_closed_expected
+
+    def get(self, symbol: str) -> Optional[float]:
+        """Volatilité 12h en % (None si la paire n'est pas amorcée)"""
+        self.stats['lookups'] += 1
+        state = self._states.get(symbol)
+        if state is None:
+            return None
+        return state.volatility()
@@ -0,0 +1,170 @@
+"""
+Optimisation walk-forward de TradingConfig et validation hors échantillon
+Plis successifs: optimisation sur une fenêtre d'entraînement (in-sample), évaluation des meilleurs
+paramètres sur la fenêtre suivante (out-of-sample), puis décalage d'une fenêtre de test.
+
+Tous les plis sont calculés en parallèle (pool de ParameterSweep, bougies partagées par memory-map).
+Le rapport compare chaque fenêtre de test à la configuration de référence et mesure la stabilité des
+paramètres retenus d'un pli à l'autre.
+"""
+
+import logging
+from dataclasses import dataclass
+from numbers import Number
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config import TradingConfig
+from utils.backtester import DAY_MINUTES, MarketData, to_datetime
+from utils.parameter_sweep import ParameterSweep, validate_space
+
+
+def walk_forward_windows(minutes: int, train_days: int, test_days: int,
+                         step_days: Optional[int] = None) -> List[Tuple[int, int, int, int]]:
+    """Plis (début entraînement, fin entraînement, début test, fin test) en minutes de la grille"""
+    train, test = train_days * DAY_MINUTES, test_days * DAY_MINUTES
+    step = (step_days or test_days) * DAY_MINUTES
+    windows = []
+    start = 0
+    while start + train + test <= minutes:
+        windows.append((start, start + train, start + train, start + train + test))
+        start += step
+    return windows
+
+
+def backtest_window(start: int, end: int) -> Tuple[int, int, int]:
+    """Fenêtre de backtest avec 24h de chauffe avant `start` (volume 24h, volatilité), entrées dès `start`"""
+    return max(0, start - DAY_MINUTES), end, start
+
+
+def parameter_stability(folds: pd.DataFrame, names: List[str]) -> pd.DataFrame:
+    """Stabilité des paramètres retenus: valeur dominante, changements entre plis, dispersion"""
+    rows = []
+    for name in names:
+        values = folds[name]
+        counts = values.value_counts()
+        row = {
+            'parameter': name,
+            'history': ", ".join(f"{value:g}" if isinstance(value, float) else str(value) for value in values),
+            'distinct': int(values.nunique()),
+            'mode': counts.index[0],
+            'mode_share': float(counts.iloc[0] / len(values)),
+            'changes': int((values != values.shift()).iloc[1:].sum())
+        }
+        if all(isinstance(value, Number) and not isinstance(value, bool) for value in values):
+            mean, std = float(values.mean()), float(values.std(ddof=0))
+            row.update(mean=mean, std=std, cv=std / abs(mean) if mean else np.nan)
+        rows.append(row)
+    return pd.DataFrame(rows).set_index('parameter')
+
+
+@dataclass
+class WalkForwardReport:
+    """Résultats par pli (paramètres retenus, in-sample, out-of-sample, référence) et stabilité"""
+    folds: pd.DataFrame
+    stability: pd.DataFrame
+    train_days: int
+    test_days: int
+
+    def summary(self) -> Dict[str, float]:
+        folds = self.folds
+        if folds.empty:
+            return {'folds': 0}
+        train_pnl, test_pnl = float(folds['train_pnl'].sum()), float(folds['test_pnl'].sum())
+        # Efficacité walk-forward: PnL par jour hors échantillon / PnL par jour en échantillon
+        efficiency = (test_pnl / self.test_days) / (train_pnl / self.train_days) if train_pnl > 0 else np.nan
+        return {
+            'folds': len(folds),
+            'train_pnl': train_pnl,
+            'test_pnl': test_pnl,
+            'baseline_test_pnl': float(folds['baseline_test_pnl'].sum()),
+            'efficiency': efficiency,
+            'profitable_folds_percent': float((folds['test_pnl'] > 0).mean() * 100),
+            'test_trades': int(folds['test_trades'].sum()),
+            'worst_test_drawdown_percent': float(folds['test_max_drawdown_percent'].max())
+        }
+
+
+class WalkForward:
+    """Optimisation sur chaque fenêtre d'entraînement puis évaluation sur la fenêtre suivante"""
+
+    def __init__(self, data: MarketData, combinations: List[Dict[str, Any]],
+                 base_config: Optional[TradingConfig] = None, train_days: Optional[int] = None,
+                 test_days: Optional[int] = None, step_days: Optional[int] = None,
+                 objective: str = 'pnl', workers: Optional[int] = None):
+        if not combinations:
+            raise ValueError("Aucune combinaison de paramètres à optimiser")
+        for params in combinations:
+            validate_space(params)
+        self.logger = logging.getLogger(__name__)
+        self.data = data
+        self.combinations = combinations
+        self.base_config = base_config or TradingConfig()
+        self.train_days = train_days or self.base_config.WALK_FORWARD_TRAIN_DAYS
+        self.test_days = test_days or self.base_config.WALK_FORWARD_TEST_DAYS
+        self.step_days = step_days or self.test_days
+        self.objective = objective
+        self.workers = workers
+        self.parameters = sorted({name for params in combinations for name in params})
+
+    def windows(self) -> List[Tuple[int, int, int, int]]:
+        return walk_forward_windows(len(self.data.open_time), self.train_days, self.test_days, self.step_days)
+
+    def run(self) -> WalkForwardReport:
+        windows = self.windows()
+        if not windows:
+            raise ValueError(f"Pas assez de données pour un pli ({self.train_days}j + {self.test_days}j)")
+        self.logger.info(f"🔄 Walk-forward: {len(windows)} plis x {len(self.combinations)} combinaisons")
+
+        with ParameterSweep(self.data, self.base_config, workers=self.workers) as sweep:
+            # 1. Optimisation: toutes les combinaisons de tous les plis dans le même pool
+            train_tasks = [(params, backtest_window(train_start, train_end))
+                           for train_start, train_end, _, _ in windows for params in self.combinations]
+            train_rows = sweep.run_windows(train_tasks)
+
+            folds, test_tasks = [], []
+            for index, window in enumerate(windows):
+                rows = train_rows[index * len(self.combinations):(index + 1) * len(self.combinations)]
+                rows = [row for row in rows if 'error' not in row]
+                if not rows:
+                    self.logger.warning(f"⚠️ Pli {index + 1}: aucune combinaison évaluée, ignoré")
+                    continue
+                best = max(rows, key=lambda row: (row[self.objective], -row['max_drawdown_percent']))
+                params = {name: best[name] for name in self.parameters if name in best}
+                folds.append((index, window, params, best))
+                test_window = backtest_window(window[2], window[3])
+                test_tasks.extend([(params, test_window), ({}, test_window)])
+
+            # 2. Évaluation hors échantillon des paramètres retenus et de la configuration de référence
+            test_rows = sweep.run_windows(test_tasks)
+
+        open_time = self.data.open_time
+        records = []
+        for position, (index, (train_start, _, test_start, test_end), params, best) in enumerate(folds):
+            test, baseline = test_rows[2 * position], test_rows[2 * position + 1]
+            record = {
+                'fold': index + 1,
+                'train_start': to_datetime(int(open_time[train_start])),
+                'test_start': to_datetime(int(open_time[test_start])),
+                'test_end': to_datetime(int(open_time[test_end - 1])),
+                **params,
+                'train_pnl': best['pnl'],
+                'train_trades': best['trades'],
+                'test_pnl': test.get('pnl', np.nan),
+                'test_pnl_percent': test.get('pnl_percent', np.nan),
+                'test_trades': test.get('trades', 0),
+                'test_win_rate': test.get('win_rate', np.nan),
+                'test_max_drawdown_percent': test.get('max_drawdown_percent', np.nan),
+                'test_fee_drag_percent': test.get('fee_drag_percent', np.nan),
+                'baseline_test_pnl': baseline.get('pnl', np.nan)
+            }
+            records.append(record)
+
+        table = pd.DataFrame(records)
+        if not table.empty:
+            table = table.set_index('fold')
+        stability = parameter_stability(table, self.parameters) if not table.empty else pd.DataFrame()
+        return WalkForwardReport(folds=table, stability=stability, train_days=self.train_days,
+                                 test_days=self.test_days)